@@ -1,5 +1,20 @@
 from mangum import Mangum
 
 from .main import app
+from .utils import log
+from .utils.warmup import warm_up
 
-handler = Mangum(app)
+# Runs during the Lambda init phase, before the first invocation. Lifespan
+# is off because Mangum would otherwise run startup on every invocation.
+warm_up()
+
+_mangum = Mangum(app, lifespan="off")
+
+
+def handler(event, context):
+    try:
+        return _mangum(event, context)
+    finally:
+        # Lambda freezes the process once this returns; get the queued
+        # log records out first.
+        log.flush()
@@ -0,0 +1,32 @@
+import json
+
+from .utils import log
+from .utils.import_jobs import run_queued_job
+from .utils.log import logger
+
+
+def handler(event, context):
+    """
+    Lambda entry point for the import queue (see infra/app.yaml). Each SQS
+    message names one job; a failed message is reported back so SQS
+    redelivers it alone, and the job resumes from its checkpoint.
+    """
+    failures = []
+    try:
+        for record in event.get("Records", []):
+            try:
+                body = json.loads(record["body"])
+                attempt = int(
+                    record.get("attributes", {}).get("ApproximateReceiveCount", 1)
+                )
+                run_queued_job(body["user_sub"], body["job_id"], attempt=attempt)
+            except Exception as e:
+                logger.exception(
+                    f"Import message failed message_id={record.get('messageId')} err={e}"
+                )
+                failures.append({"itemIdentifier": record["messageId"]})
+    finally:
+        # Lambda freezes the process once this returns; get the queued
+        # log records out first.
+        log.flush()
+    return {"batchItemFailures": failures}
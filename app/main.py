@@ -1,28 +1,52 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.csrf import CSRFMiddleware
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.session_prefs import SessionPrefsMiddleware
 from app.middleware.theme import ThemeMiddleware
 
 from .error_handlers import register_error_handlers
-from .routes import auth, data, exercise, home, profile, progress, template, workout
+from .routes import exercise, home, profile, progress, template, workout
+from .routes.lazy import include_lazy_router
 from .settings import settings
+from .utils.static_assets import STATIC_DIR, StaticAssets
+from .utils.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # uvicorn only; Lambda warms up at module init in handler.py.
+    await run_in_threadpool(warm_up)
+    yield
 
-app = FastAPI(title="GymByte")
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app = FastAPI(title="GymByte", lifespan=lifespan)
+
+app.mount("/static", StaticAssets(directory=STATIC_DIR), name="static")
 
 register_error_handlers(app)
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(ThemeMiddleware)
+app.add_middleware(SessionPrefsMiddleware)
 app.add_middleware(CSRFMiddleware, excluded_prefixes=settings.CSRF_EXCLUDED_PREFIXES)
+# Outermost, so every response (error pages and CSRF 403s included) is compressed.
+app.add_middleware(CompressionMiddleware)
+# Outside everything else, so its total covers the whole request.
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(home.router)
-app.include_router(auth.router)
 app.include_router(profile.router)
 app.include_router(workout.router)
 app.include_router(template.router)
 app.include_router(exercise.router)
 app.include_router(progress.router)
-app.include_router(data.router)
+
+# Rarely hit and heavy to import (requests; export/import tooling), so
+# these are imported on their first request instead of at cold start.
+include_lazy_router(app, "/auth", "app.routes.auth")
+include_lazy_router(app, "/profile/data", "app.routes.data")
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.settings import settings
+from app.utils.static_assets import accepted_encodings
+
+# Nothing to compress, or a body the client must get exactly as sent.
+_NO_BODY_STATUSES = frozenset({204, 304})
+
+
+class CompressionMiddleware:
+    """
+    gzip responses whose content type is in COMPRESSION_CONTENT_TYPES.
+
+    Raw ASGI rather than BaseHTTPMiddleware: it only wraps `send`, so the
+    response is never buffered in a task of its own. A response sent in one
+    body message is left alone below COMPRESSION_MIN_SIZE; a streaming one
+    (more_body=True) is compressed chunk by chunk as it goes out. Responses
+    that already carry a Content-Encoding, such as precompressed static
+    files, pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int | None = None,
+        content_types: tuple[str, ...] | None = None,
+        level: int | None = None,
+    ):
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        )
+        self.content_types = (
+            settings.COMPRESSION_CONTENT_TYPES
+            if content_types is None
+            else content_types
+        )
+        self.level = settings.COMPRESSION_LEVEL if level is None else level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        accepts_gzip = "gzip" in accepted_encodings(Headers(scope=scope))
+        responder = _GzipResponder(self, send, accepts_gzip)
+        await self.app(scope, receive, responder.send)
+
+
+class _GzipResponder:
+    """Per-response state for CompressionMiddleware's wrapped `send`."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, send: Send, accepts_gzip: bool
+    ):
+        self.middleware = middleware
+        self.downstream = send
+        self.accepts_gzip = accepts_gzip
+        self.start: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if self.start["status"] in _NO_BODY_STATUSES or "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return media_type in self.middleware.content_types
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held until the first body message shows how big the body is.
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send_start()
+            await self.downstream(message)
+            return
+
+        if self.start is not None:
+            await self._first_body(message)
+        elif self.passthrough:
+            await self.downstream(message)
+        else:
+            await self._compress(message)
+
+    async def _send_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            self.passthrough = self.passthrough or self.compressor is None
+            await self.downstream(start)
+
+    async def _first_body(self, message: Message) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._compressible(headers):
+            self.passthrough = True
+        else:
+            headers.add_vary_header("Accept-Encoding")
+            if not self.accepts_gzip:
+                self.passthrough = True
+            elif not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+
+        if self.passthrough:
+            await self._send_start()
+            await self.downstream(message)
+            return
+
+        # wbits 16 + MAX_WBITS: gzip framing rather than a bare zlib stream.
+        self.compressor = zlib.compressobj(
+            self.middleware.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+        headers["Content-Encoding"] = "gzip"
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The bytes differ from the identity representation's.
+            headers["ETag"] = f"W/{etag}"
+
+        if more_body:
+            del headers["Content-Length"]
+            await self._send_start()
+            await self._compress(message)
+            return
+
+        compressed = self.compressor.compress(body) + self.compressor.flush()
+        headers["Content-Length"] = str(len(compressed))
+        await self._send_start()
+        await self.downstream({"type": "http.response.body", "body": compressed})
+
+    async def _compress(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        data = self.compressor.compress(message.get("body", b""))
+        if not more_body:
+            data += self.compressor.flush()
+        elif not data:
+            return  # compressor is still buffering; nothing to send yet
+        await self.downstream(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
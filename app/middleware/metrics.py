@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.settings import settings
+from app.utils import metrics
+from app.utils.log import logger
+
+
+class MetricsMiddleware:
+    """
+    Collect per-request metrics (see app/utils/metrics.py) and report them.
+
+    In dev they go out in a Server-Timing header, for the browser's network
+    panel; elsewhere as one summary log line when the response is done.
+    Raw ASGI, like CompressionMiddleware, so measuring adds no task of its own.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        server_timing = settings.ENV == "dev"
+        status_code = 500
+
+        with metrics.collecting() as collected:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if server_timing:
+                        headers = MutableHeaders(raw=message["headers"])
+                        headers.append(
+                            "Server-Timing", metrics.server_timing(collected)
+                        )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if not server_timing:
+                    fields = metrics.summary(collected)
+                    # Readable as text; JSON logs also get each field as a key.
+                    logger.info(
+                        "Request metrics method=%s path=%s status=%s %s",
+                        scope["method"],
+                        scope["path"],
+                        status_code,
+                        " ".join(f"{k}={v}" for k, v in fields.items()),
+                        extra={
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "status": status_code,
+                            **fields,
+                        },
+                    )
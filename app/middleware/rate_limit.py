@@ -76,7 +76,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         if not allowed:
             logger.info(
-                f"Request blocked by rate limiter path={path} method={request.method} retry_after={retry_after}",
+                "Request blocked by rate limiter path=%s method=%s retry_after=%s",
+                path,
+                request.method,
+                retry_after,
             )
             return PlainTextResponse(
                 "Rate limit exceeded. Please try again shortly.",
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.settings import settings
+from app.utils.auth import COOKIE_OPTS
+from app.utils.session_prefs import COOKIE_NAME, PENDING_COOKIE_ATTR
+
+
+class SessionPrefsMiddleware:
+    """
+    Sets the session-preferences cookie a route queued while handling the
+    request (see app/utils/session_prefs.py). Routes return their own
+    Response objects, so a dependency has no other way to add a cookie.
+    Raw ASGI, like CompressionMiddleware, so it adds no task per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # request.state lives in this dict, shared with the route's Request.
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                value = state.get(PENDING_COOKIE_ATTR)
+                if value:
+                    headers = MutableHeaders(raw=message["headers"])
+                    headers.append("set-cookie", _cookie_header(value))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _cookie_header(value: str) -> str:
+    # Built by Starlette's own set_cookie, so attributes match every other cookie.
+    response = Response()
+    response.set_cookie(
+        key=COOKIE_NAME,
+        value=value,
+        max_age=settings.SESSION_PREFS_MAX_AGE_SECONDS,
+        path="/",
+        **COOKIE_OPTS,
+    )
+    return response.headers["set-cookie"]
@@ -4,6 +4,7 @@ from typing import Annotated, Literal, Optional
 from fastapi import Form
 from pydantic import BaseModel, Field, StringConstraints, field_validator
 
+from app.models.trusted import stamp
 from app.utils.dates import dt_to_iso
 from app.utils.taxonomy import EQUIPMENT_TYPES, EXERCISE_CATEGORIES, MUSCLE_GROUPS
 
@@ -94,7 +95,7 @@ class Exercise(BaseModel):
         data = self.model_dump()
         data["created_at"] = dt_to_iso(self.created_at)
         data["updated_at"] = dt_to_iso(self.updated_at)
-        return data
+        return stamp(data)
 
 
 class ExerciseFormBase(BaseModel):
@@ -145,7 +146,9 @@ class ExerciseCreate(ExerciseFormBase):
         category: Annotated[Optional[str], Form()] = None,
         muscles: Annotated[list[str], Form()] = [],
     ) -> "ExerciseCreate":
-        return cls(name=name, equipment=equipment, category=category or None, muscles=muscles)
+        return cls(
+            name=name, equipment=equipment, category=category or None, muscles=muscles
+        )
 
 
 class ExerciseUpdate(ExerciseFormBase):
@@ -157,4 +160,6 @@ class ExerciseUpdate(ExerciseFormBase):
         category: Annotated[Optional[str], Form()] = None,
         muscles: Annotated[list[str], Form()] = [],
     ) -> "ExerciseUpdate":
-        return cls(name=name, equipment=equipment, category=category or None, muscles=muscles)
+        return cls(
+            name=name, equipment=equipment, category=category or None, muscles=muscles
+        )
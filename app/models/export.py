@@ -1,7 +1,8 @@
 from datetime import date as DateType
 from datetime import datetime
+from typing import Annotated, Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ExportSet(BaseModel):
@@ -35,6 +36,36 @@ class ExportExercise(BaseModel):
     updated_at: datetime
 
 
+# Deletions reported by a schema v2 (delta) export.
+
+
+class ExportDeletedExercise(BaseModel):
+    kind: Literal["exercise"]
+    id: str
+    deleted_at: datetime
+
+
+class ExportDeletedWorkout(BaseModel):
+    kind: Literal["workout"]
+    id: str
+    date: DateType
+    deleted_at: datetime
+
+
+class ExportDeletedSet(BaseModel):
+    kind: Literal["set"]
+    workout_id: str
+    date: DateType
+    set_number: int
+    deleted_at: datetime
+
+
+ExportDeletion = Annotated[
+    Union[ExportDeletedExercise, ExportDeletedWorkout, ExportDeletedSet],
+    Field(discriminator="kind"),
+]
+
+
 class ExportUser(BaseModel):
     display_name: str
     email: str
@@ -45,9 +76,12 @@ class ExportUser(BaseModel):
 class ExportPayload(BaseModel):
     schema_version: int
     exported_at: datetime
+    # Schema v2 only: records changed after `since`, and deletions.
+    since: datetime | None = None
     user: ExportUser
     exercises: list[ExportExercise] = []
     workouts: list[ExportWorkout] = []
+    deleted: list[ExportDeletion] = []
 
 
 class ImportSummary(BaseModel):
@@ -56,4 +90,19 @@ class ImportSummary(BaseModel):
     workouts_created: int = 0
     workouts_skipped: int = 0
     sets_created: int = 0
+    # Delta (schema v2) imports update records in place and apply deletions.
+    exercises_updated: int = 0
+    workouts_updated: int = 0
+    items_deleted: int = 0
+    # Outcome of the DynamoDB writes; the *_created counts above are items
+    # built and queued, items_failed of which were not saved.
+    items_written: int = 0
+    items_failed: int = 0
     warnings: list[str] = []
+
+
+class ExportSummary(BaseModel):
+    exercises: int = 0
+    workouts: int = 0
+    sets: int = 0
+    deleted: int = 0
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.models.export import ImportSummary
+from app.utils.dates import dt_to_iso
+
+ImportJobStatus = Literal["pending", "running", "complete", "failed"]
+
+
+class ImportJob(BaseModel):
+    PK: str
+    SK: str  # "IMPORT_JOB#<uuid>"
+    type: Literal["import_job"]
+    status: ImportJobStatus = "pending"
+    filename: str
+    upload_path: str
+
+    # Checkpoint: records (after the header) already imported, and the
+    # exercise id remapping those records established.
+    records_processed: int = 0
+    id_remap: dict[str, str] = {}
+    summary: ImportSummary = ImportSummary()
+    error: str | None = None
+
+    created_at: datetime
+    updated_at: datetime
+    expires_at: int | None = None
+
+    @property
+    def job_id(self) -> str:
+        return self.SK.split("#")[-1]
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("complete", "failed")
+
+    def to_ddb_item(self) -> dict:
+        data = self.model_dump()
+        data["created_at"] = dt_to_iso(self.created_at)
+        data["updated_at"] = dt_to_iso(self.updated_at)
+        return data
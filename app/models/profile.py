@@ -1,6 +1,5 @@
 from datetime import datetime
 from typing import Annotated, Literal
-from zoneinfo import available_timezones
 
 from pydantic import (
     BaseModel,
@@ -11,8 +10,9 @@ from pydantic import (
     model_validator,
 )
 
+from app.models.trusted import stamp
 from app.settings import settings
-from app.utils.dates import dt_to_iso
+from app.utils.dates import dt_to_iso, is_valid_timezone
 
 DisplayNameStr = Annotated[
     str,
@@ -30,7 +30,7 @@ def _check_theme(v: str) -> str:
 
 
 def _check_timezone(v: str) -> str:
-    if v not in available_timezones():
+    if not is_valid_timezone(v):
         raise ValueError(f"Invalid timezone: {v}")
     return v
 
@@ -60,11 +60,19 @@ class UserProfile(BaseModel):
 
     preferences: Preferences = Preferences()
 
+    # Bumped on every change to the user's exercises, so anything cached
+    # from them (see app/utils/fragment_cache.py) can be keyed on it.
+    exercise_catalog_version: int = 0
+
     @model_validator(mode="after")
     def validate_timezone(self) -> "UserProfile":
         _check_timezone(self.timezone)
         return self
 
+    @property
+    def user_sub(self) -> str:
+        return self.PK.removeprefix("USER#")
+
     @property
     def weight_unit(self) -> Literal["kg", "lb"]:
         return "lb" if self.preferences.units == "imperial" else "kg"
@@ -73,7 +81,7 @@ class UserProfile(BaseModel):
         data = self.model_dump()
         data["created_at"] = dt_to_iso(self.created_at)
         data["updated_at"] = dt_to_iso(self.updated_at)
-        return data
+        return stamp(data)
 
 
 class AccountUpdateForm(BaseModel):
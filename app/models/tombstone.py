@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.settings import settings
+from app.utils import db
+from app.utils.dates import dt_to_iso
+
+
+class Tombstone(BaseModel):
+    """Marker left when an exercise, workout or set item is deleted."""
+
+    PK: str
+    SK: str  # "TOMBSTONE#<deleted_at>#<deleted item SK>"
+    type: Literal["tombstone"]
+    deleted_sk: str
+    deleted_at: datetime
+    expires_at: int
+
+    @classmethod
+    def for_item(cls, pk: str, deleted_sk: str, deleted_at: datetime) -> "Tombstone":
+        expires = deleted_at + timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+        return cls(
+            PK=pk,
+            SK=db.build_tombstone_sk(deleted_at, deleted_sk),
+            type="tombstone",
+            deleted_sk=deleted_sk,
+            deleted_at=deleted_at,
+            expires_at=int(expires.timestamp()),
+        )
+
+    def to_ddb_item(self) -> dict:
+        data = self.model_dump()
+        data["deleted_at"] = dt_to_iso(self.deleted_at)
+        return data
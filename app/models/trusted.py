@@ -0,0 +1,106 @@
+"""
+Trusted loading of items this app wrote itself.
+
+Every model's to_ddb_item() stamps the item with ITEM_SCHEMA_VERSION. Such
+an item was validated before it was written, so reading it back only needs
+the types DynamoDB does not keep (numbers come back as Decimal, dates and
+datetimes as ISO strings) restoring; construct_trusted() does that and
+builds the model with model_construct(), skipping validators. Items without
+the marker (written before it existed, or by hand) are fully validated.
+
+Only worth it where validation runs slow Python-side checks: pydantic-core
+validates a plain model faster than model_construct() builds one. See
+benchmarks/model_loading.py; today that means UserProfile (EmailStr and the
+timezone check), read on almost every request.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from types import UnionType
+from typing import Any, Callable, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from app.settings import settings
+from app.utils.dates import iso_to_dt
+
+# Bump when a stored field's meaning or format changes, so items written
+# before the change are validated (and normalised) again on read.
+ITEM_SCHEMA_VERSION = 1
+SCHEMA_VERSION_ATTR = "schema_version"
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def stamp(item: dict) -> dict:
+    """Mark an item about to be written from a validated model."""
+    item[SCHEMA_VERSION_ATTR] = ITEM_SCHEMA_VERSION
+    return item
+
+
+def is_trusted(item: dict) -> bool:
+    return item.get(SCHEMA_VERSION_ATTR) == ITEM_SCHEMA_VERSION
+
+
+def _to_datetime(value: Any) -> Any:
+    return iso_to_dt(value) if isinstance(value, str) else value
+
+
+def _to_date(value: Any) -> Any:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _to_int(value: Any) -> Any:
+    return int(value) if isinstance(value, Decimal) else value
+
+
+_SCALAR_COERCERS: dict[type, Callable[[Any], Any]] = {
+    datetime: _to_datetime,
+    date: _to_date,
+    int: _to_int,
+}
+
+
+def _coercer_for(annotation: Any) -> Callable[[Any], Any] | None:
+    if get_origin(annotation) in (Union, UnionType):
+        # Optional[X]: None passes through untouched below.
+        options = [a for a in get_args(annotation) if a is not type(None)]
+        if len(options) != 1:
+            return None
+        annotation = options[0]
+
+    if annotation in _SCALAR_COERCERS:
+        return _SCALAR_COERCERS[annotation]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: (
+            construct_trusted(annotation, value) if isinstance(value, dict) else value
+        )
+    return None
+
+
+@lru_cache(maxsize=None)
+def _field_coercers(model_cls: type[BaseModel]) -> dict[str, Callable[[Any], Any]]:
+    coercers = {}
+    for name, field in model_cls.model_fields.items():
+        coercer = _coercer_for(field.annotation)
+        if coercer is not None:
+            coercers[name] = coercer
+    return coercers
+
+
+def construct_trusted(model_cls: type[M], item: dict) -> M:
+    """Build model_cls from a stored item without running validation."""
+    values = dict(item)
+    for name, coerce in _field_coercers(model_cls).items():
+        value = values.get(name)
+        if value is not None:
+            values[name] = coerce(value)
+    return model_cls.model_construct(**values)
+
+
+def load_model(model_cls: type[M], item: dict) -> M:
+    """construct_trusted() for stamped items, full validation otherwise."""
+    if settings.TRUSTED_MODEL_LOADS and is_trusted(item):
+        return construct_trusted(model_cls, item)
+    return model_cls.model_validate(item)
@@ -6,6 +6,7 @@ from typing import Annotated, Literal
 from fastapi import Form
 from pydantic import BaseModel, Field, StringConstraints
 
+from app.models.trusted import stamp
 from app.utils.dates import date_to_iso, dt_to_iso
 
 NameStr = Annotated[
@@ -38,7 +39,7 @@ class Workout(BaseModel):
         data["date"] = date_to_iso(self.date)
         data["created_at"] = dt_to_iso(self.created_at)
         data["updated_at"] = dt_to_iso(self.updated_at)
-        return data
+        return stamp(data)
 
 
 class WorkoutCreate(BaseModel):
@@ -93,8 +94,10 @@ class WorkoutSet(BaseModel):
         data["updated_at"] = dt_to_iso(self.updated_at)
         # Populate ExerciseIndex GSI keys so sets can be queried by exercise.
         data["ExercisePK"] = f"EXERCISE#{self.exercise_id}"
-        data["ExerciseSK"] = f"{self.workout_date}#{self.workout_id}#{self.set_number:03d}"
-        return data
+        data["ExerciseSK"] = (
+            f"{self.workout_date}#{self.workout_id}#{self.set_number:03d}"
+        )
+        return stamp(data)
 
     @property
     def workout_date(self) -> str:
@@ -111,6 +114,39 @@ class WorkoutSet(BaseModel):
         return parts[2]
 
 
+class WorkoutSetSummary(BaseModel):
+    """
+    Slim read model for set items returned by the ExerciseProgressIndex GSI.
+
+    The index only projects the attributes the progress builders need, so
+    timestamps and GSI keys are deliberately absent.
+    """
+
+    SK: str  # "WORKOUT#2025-11-04#W1#SET#001"
+    exercise_id: str
+    reps: int
+    weight_kg: Decimal | None = None
+    rpe: int | None = None
+
+    @property
+    def workout_date(self) -> str:
+        parts = self.SK.split("#")
+        if len(parts) < 3:
+            raise ValueError(f"Invalid SK format: {self.SK}")
+        return parts[1]
+
+    @property
+    def workout_id(self) -> str:
+        parts = self.SK.split("#")
+        if len(parts) < 3:
+            raise ValueError(f"Invalid SK format: {self.SK}")
+        return parts[2]
+
+    @property
+    def set_number(self) -> int:
+        return int(self.SK.split("#")[-1])
+
+
 class WorkoutSetBase(BaseModel):
     reps: int = Field(ge=1)
     weight_kg: Decimal | None = Field(default=None, ge=0)
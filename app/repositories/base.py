@@ -1,12 +1,30 @@
-from typing import Any, Dict, Generic, List, TypeVar
+import time
+from typing import Any, Dict, Generic, Iterator, List, TypeVar
 
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 
 from app.repositories.errors import RepoError
+from app.utils import metrics
 from app.utils.log import logger
 
 T = TypeVar("T")
 
+_BATCH_GET_LIMIT = 100  # BatchGetItem hard limit
+_BATCH_GET_ATTEMPTS = 4
+_BATCH_GET_BACKOFF_SECONDS = 0.05
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _serialize(item: dict) -> dict:
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+def _deserialize(item: dict) -> dict:
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
+
 
 class DynamoRepository(Generic[T]):
     """
@@ -24,31 +42,56 @@ class DynamoRepository(Generic[T]):
 
     def _safe_query(self, **kwargs) -> List[dict]:
         """Execute query with automatic pagination to handle result sets >1 MB."""
-        try:
-            items: List[dict] = []
-            while True:
-                response = self._table.query(**kwargs)
-                items.extend(response.get("Items", []))
-                last_key = response.get("LastEvaluatedKey")
-                if not last_key:
-                    break
-                kwargs["ExclusiveStartKey"] = last_key
-            return items
-        except ClientError as e:
-            logger.exception("DynamoDB query failed")
-            raise RepoError("Failed to query database") from e
+        items: List[dict] = []
+        for page in self._safe_query_pages(**kwargs):
+            items.extend(page)
+        return items
+
+    def _safe_query_pages(self, **kwargs) -> Iterator[List[dict]]:
+        """
+        Execute query lazily, yielding one page of items at a time.
+        The next page is only requested once the caller asks for it.
+        """
+        while True:
+            try:
+                response = metrics.ddb_call("query", self._table.query, **kwargs)
+            except ClientError as e:
+                logger.exception("DynamoDB query failed")
+                raise RepoError("Failed to query database") from e
+            yield response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+    def _safe_scan_pages(self, **kwargs) -> Iterator[List[dict]]:
+        """
+        Scan lazily, one page at a time, like _safe_query_pages. Pass
+        Segment/TotalSegments to read one slice of a parallel scan.
+        """
+        while True:
+            try:
+                response = metrics.ddb_call("scan", self._table.scan, **kwargs)
+            except ClientError as e:
+                logger.exception("DynamoDB scan failed")
+                raise RepoError("Failed to scan database") from e
+            yield response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
 
     def _safe_put(self, item: dict) -> None:
         """Safely put item"""
         try:
-            self._table.put_item(Item=item)
+            metrics.ddb_call("put_item", self._table.put_item, Item=item)
         except ClientError as e:
             logger.exception("DynamoDB put_item failed")
             raise RepoError("Failed to write to database") from e
 
     def _safe_update(self, **kwargs) -> Dict[str, Any]:
         try:
-            resp = self._table.update_item(**kwargs)
+            resp = metrics.ddb_call("update_item", self._table.update_item, **kwargs)
             return resp
         except ClientError as e:
             logger.exception("DynamoDB update_item failed")
@@ -56,7 +99,7 @@ class DynamoRepository(Generic[T]):
 
     def _safe_get(self, **kwargs) -> dict | None:
         try:
-            resp = self._table.get_item(**kwargs)
+            resp = metrics.ddb_call("get_item", self._table.get_item, **kwargs)
             return resp.get("Item")
         except ClientError as e:
             logger.exception("DynamoDB get_item failed")
@@ -64,7 +107,53 @@ class DynamoRepository(Generic[T]):
 
     def _safe_delete(self, **kwargs) -> None:
         try:
-            self._table.delete_item(**kwargs)
+            metrics.ddb_call("delete_item", self._table.delete_item, **kwargs)
         except ClientError as e:
             logger.exception("DynamoDB delete_item failed")
             raise RepoError("Failed to delete from database") from e
+
+    def _safe_batch_get(
+        self, keys: List[dict], projection: str | None = None
+    ) -> List[dict]:
+        """
+        Fetch items by primary key with BatchGetItem, 100 keys per call,
+        re-requesting UnprocessedKeys. Keys and returned items use plain
+        Python values, like the rest of the resource API.
+        """
+        client = self._table.meta.client
+        table_name = self._table.name
+        items: List[dict] = []
+
+        try:
+            for start in range(0, len(keys), _BATCH_GET_LIMIT):
+                request: Dict[str, Any] = {
+                    "Keys": [
+                        _serialize(key)
+                        for key in keys[start : start + _BATCH_GET_LIMIT]
+                    ]
+                }
+                if projection:
+                    request["ProjectionExpression"] = projection
+
+                for attempt in range(_BATCH_GET_ATTEMPTS):
+                    if attempt:
+                        time.sleep(_BATCH_GET_BACKOFF_SECONDS * 2 ** (attempt - 1))
+                    resp = metrics.ddb_call(
+                        "batch_get_item",
+                        client.batch_get_item,
+                        RequestItems={table_name: request},
+                    )
+                    items.extend(
+                        _deserialize(item)
+                        for item in resp.get("Responses", {}).get(table_name, [])
+                    )
+                    request = resp.get("UnprocessedKeys", {}).get(table_name)
+                    if not request:
+                        break
+                else:
+                    raise RepoError("Batch read left keys unprocessed")
+        except ClientError as e:
+            logger.exception("DynamoDB batch_get_item failed")
+            raise RepoError("Failed to read from database") from e
+
+        return items
@@ -0,0 +1,162 @@
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import BotoCoreError, ClientError
+from pydantic import BaseModel
+
+from app.utils.log import logger
+
+BATCH_SIZE = 25  # BatchWriteItem hard limit
+MAX_WORKERS = 8
+MAX_ATTEMPTS = 5
+BASE_BACKOFF_SECONDS = 0.05
+MAX_BACKOFF_SECONDS = 1.0
+
+
+class BulkWriteResult(BaseModel):
+    written: int = 0
+    failed: int = 0
+
+
+class BulkWriter:
+    """
+    Parallel, chunked replacement for table.batch_writer().
+
+    Items are buffered into 25-request BatchWriteItem calls which run on a
+    bounded thread pool. UnprocessedItems are retried with jittered
+    exponential backoff; anything still unwritten after MAX_ATTEMPTS, or in
+    a batch DynamoDB rejects outright, is counted as failed rather than
+    raised. Use as a context manager; `result` is final once it exits.
+
+        with BulkWriter(table) as writer:
+            writer.put_item(Item=item)
+        writer.result.failed
+
+    Like batch_writer(overwrite_by_pkeys=["PK", "SK"]), a request for a key
+    already waiting in the current batch replaces it.
+    """
+
+    def __init__(
+        self,
+        table,
+        *,
+        max_workers: int = MAX_WORKERS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        # The low-level client is thread-safe; the Table resource is not.
+        self._client = table.meta.client
+        self._table_name = table.name
+        self._max_attempts = max_attempts
+        self._serializer = TypeSerializer()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bulk-write"
+        )
+        # Bounds how many batches are queued or in flight, so a fast producer
+        # can't buffer an entire import in memory.
+        self._slots = threading.BoundedSemaphore(max_workers * 2)
+        self._futures: list[Future] = []
+        self._pending: dict[tuple, dict] = {}
+        self._superseded = 0
+
+        self.result = BulkWriteResult()
+
+    def __enter__(self) -> "BulkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # ----------------------- Requests -----------------------------
+
+    def put_item(self, Item: dict) -> None:
+        request = {"PutRequest": {"Item": self._serialize(Item)}}
+        self._add((Item["PK"], Item["SK"]), request)
+
+    def delete_item(self, Key: dict) -> None:
+        request = {"DeleteRequest": {"Key": self._serialize(Key)}}
+        self._add((Key["PK"], Key["SK"]), request)
+
+    def _serialize(self, item: dict) -> dict:
+        return {k: self._serializer.serialize(v) for k, v in item.items()}
+
+    def _add(self, key: tuple, request: dict) -> None:
+        if key in self._pending:
+            self._superseded += 1
+        self._pending[key] = request
+        if len(self._pending) >= BATCH_SIZE:
+            self._submit()
+
+    def _submit(self) -> None:
+        if not self._pending:
+            return
+        batch = list(self._pending.values())
+        self._pending = {}
+
+        self._slots.acquire()
+        ctx = contextvars.copy_context()
+        future = self._executor.submit(ctx.run, self._write_batch, batch)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    # ----------------------- Writing -----------------------------
+
+    def _write_batch(self, requests: list[dict]) -> BulkWriteResult:
+        result = BulkWriteResult()
+
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                resp = self._client.batch_write_item(
+                    RequestItems={self._table_name: requests}
+                )
+            except (ClientError, BotoCoreError) as e:
+                logger.error(
+                    f"BulkWriter batch failed table={self._table_name} "
+                    f"requests={len(requests)} err={e}"
+                )
+                result.failed += len(requests)
+                return result
+
+            unprocessed = resp.get("UnprocessedItems", {}).get(self._table_name, [])
+            result.written += len(requests) - len(unprocessed)
+            requests = unprocessed
+            if not requests:
+                return result
+
+            if attempt < self._max_attempts:
+                time.sleep(self._backoff(attempt))
+
+        logger.warning(
+            f"BulkWriter gave up on unprocessed items table={self._table_name} "
+            f"count={len(requests)} attempts={self._max_attempts}"
+        )
+        result.failed += len(requests)
+        return result
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        ceiling = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def close(self) -> BulkWriteResult:
+        """Send any partial batch, wait for every batch and total the results."""
+        self._submit()
+        wait(self._futures)
+        self._executor.shutdown(wait=True)
+
+        for future in self._futures:
+            batch_result = future.result()
+            self.result.written += batch_result.written
+            self.result.failed += batch_result.failed
+        self._futures = []
+
+        # Superseded requests were overwritten in place, just as two
+        # sequential writes to the same key would be.
+        self.result.written += self._superseded
+        self._superseded = 0
+        return self.result
@@ -42,3 +42,23 @@ class TemplateNotFoundError(TemplateRepoError):
     """Raised when a template cannot be found for the given key."""
 
     pass
+
+
+# ------------------------- IMPORT JOB -------------------------
+class ImportJobRepoError(RepoError):
+    """Generic import job repository error."""
+
+    pass
+
+
+class ImportJobNotFoundError(ImportJobRepoError):
+    """Raised when an import job cannot be found for the given key."""
+
+    pass
+
+
+# ------------------------- TOMBSTONE -------------------------
+class TombstoneRepoError(RepoError):
+    """Generic tombstone repository error."""
+
+    pass
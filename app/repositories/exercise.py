@@ -1,9 +1,10 @@
 import uuid
-from typing import List
+from typing import Iterator, List
 
 from boto3.dynamodb.conditions import Key
 
 from app.models.exercise import Exercise, ExerciseCreate, ExerciseUpdate
+from app.models.tombstone import Tombstone
 from app.repositories.base import DynamoRepository
 from app.repositories.errors import ExerciseRepoError, RepoError
 from app.utils import dates, db
@@ -42,6 +43,24 @@ class DynamoExerciseRepository(DynamoRepository[Exercise]):
 
         return [self._to_model(item) for item in items]
 
+    def iter_all_for_user(self, user_sub: str) -> Iterator[Exercise]:
+        """
+        Yield this user's exercises one query page at a time, in the same
+        order as get_all_for_user.
+        """
+
+        pk = db.build_user_pk(user_sub)
+
+        try:
+            for page in self._safe_query_pages(
+                KeyConditionExpression=Key("PK").eq(pk)
+                & Key("SK").begins_with("EXERCISE#")
+            ):
+                for item in page:
+                    yield self._to_model(item)
+        except RepoError as e:
+            raise ExerciseRepoError("Failed to get all exercises for user") from e
+
     def get_exercise_by_id(self, user_sub: str, exercise_id: str) -> Exercise | None:
         """
         Return a single exercise by its id for this user
@@ -62,6 +81,26 @@ class DynamoExerciseRepository(DynamoRepository[Exercise]):
 
     # ----------------------- Write -----------------------------
 
+    def bump_catalog_version(self, user_sub: str) -> None:
+        """
+        Increment exercise_catalog_version on the user's profile, so
+        fragments cached from the old exercise list stop being used.
+        Best effort: the exercise write has already happened, so a failure
+        is logged rather than raised.
+        """
+        try:
+            self._safe_update(
+                Key={"PK": db.build_user_pk(user_sub), "SK": "PROFILE"},
+                UpdateExpression="ADD exercise_catalog_version :one",
+                ExpressionAttributeValues={":one": 1},
+                # Never create a bare profile item for a user without one.
+                ConditionExpression="attribute_exists(PK)",
+            )
+        except RepoError as e:
+            logger.warning(
+                f"Could not bump exercise catalog version user_sub={user_sub} err={e}"
+            )
+
     def create_exercise(self, user_sub: str, data: ExerciseCreate) -> Exercise:
         new_id = str(uuid.uuid4())
         now = dates.now()
@@ -83,6 +122,7 @@ class DynamoExerciseRepository(DynamoRepository[Exercise]):
         except RepoError as e:
             raise ExerciseRepoError("Failed to create exercise") from e
 
+        self.bump_catalog_version(user_sub)
         return exercise
 
     def update_exercise(self, exercise: Exercise) -> None:
@@ -91,11 +131,19 @@ class DynamoExerciseRepository(DynamoRepository[Exercise]):
         except RepoError as e:
             raise ExerciseRepoError("Failed to update exercise") from e
 
+        self.bump_catalog_version(exercise.PK.removeprefix("USER#"))
+
     def delete_exercise(self, user_sub: str, exercise_id: str) -> None:
         pk = db.build_user_pk(user_sub)
         sk = db.build_exercise_sk(exercise_id)
+        tombstone = Tombstone.for_item(pk, sk, dates.now())
 
         try:
+            # Tombstone first: one left beside a surviving item is ignored
+            # by delta exports, a missing one would hide the deletion.
+            self._safe_put(tombstone.to_ddb_item())
             self._safe_delete(Key={"PK": pk, "SK": sk})
         except RepoError as e:
             raise ExerciseRepoError("Failed to delete exercise") from e
+
+        self.bump_catalog_version(user_sub)
@@ -0,0 +1,85 @@
+import time
+
+from app.models.import_job import ImportJob
+from app.repositories.base import DynamoRepository
+from app.repositories.errors import (
+    ImportJobNotFoundError,
+    ImportJobRepoError,
+    RepoError,
+)
+from app.settings import settings
+from app.utils import dates, db
+from app.utils.log import logger
+
+
+class DynamoImportJobRepository(DynamoRepository[ImportJob]):
+    """
+    DynamoDB access for background import jobs (IMPORT_JOB#<id> items).
+    """
+
+    def _to_model(self, item: dict) -> ImportJob:
+        try:
+            return ImportJob.model_validate(item)
+        except Exception as e:
+            logger.error(f"_to_model failed for import job: {e}")
+            raise ImportJobRepoError(
+                "Failed to create import job model from item"
+            ) from e
+
+    def create_job(
+        self, user_sub: str, job_id: str, *, filename: str, upload_path: str
+    ) -> ImportJob:
+        """
+        Persist a new pending job for an upload already stored at upload_path.
+        """
+        now = dates.now()
+        job = ImportJob(
+            PK=db.build_user_pk(user_sub),
+            SK=db.build_import_job_sk(job_id),
+            type="import_job",
+            filename=filename,
+            upload_path=upload_path,
+            created_at=now,
+            updated_at=now,
+            expires_at=int(time.time()) + settings.IMPORT_JOB_TTL_SECONDS,
+        )
+
+        try:
+            self._safe_put(job.to_ddb_item())
+        except RepoError as e:
+            logger.error(f"Failed to put import job {job_id}: {e}")
+            raise ImportJobRepoError("Failed to create import job in database") from e
+
+        return job
+
+    def get_job(self, user_sub: str, job_id: str) -> ImportJob:
+        pk = db.build_user_pk(user_sub)
+        sk = db.build_import_job_sk(job_id)
+
+        try:
+            raw_item = self._safe_get(Key={"PK": pk, "SK": sk}, ConsistentRead=True)
+        except RepoError as e:
+            logger.error(f"Failed to load import job {job_id}: {e}")
+            raise ImportJobRepoError("Failed to load import job from database") from e
+
+        if not raw_item:
+            logger.warning(f"Import job not found: {job_id}")
+            raise ImportJobNotFoundError(
+                f"Import job {job_id} not found for user {user_sub}"
+            )
+
+        return self._to_model(raw_item)
+
+    def save_job(self, job: ImportJob) -> ImportJob:
+        """
+        Write the job's current status and checkpoint.
+        """
+        job.updated_at = dates.now()
+
+        try:
+            self._safe_put(job.to_ddb_item())
+        except RepoError as e:
+            logger.error(f"Failed to save import job {job.job_id}: {e}")
+            raise ImportJobRepoError("Failed to save import job to database") from e
+
+        return job
@@ -1,4 +1,9 @@
+from typing import Iterator
+
+from boto3.dynamodb.conditions import Attr
+
 from app.models.profile import UserProfile
+from app.models.trusted import load_model
 from app.repositories.base import DynamoRepository
 from app.repositories.errors import ProfileRepoError, RepoError
 from app.utils import db
@@ -13,7 +18,8 @@ class DynamoProfileRepository(DynamoRepository[UserProfile]):
 
     def _to_model(self, item: dict) -> UserProfile:
         try:
-            return UserProfile.model_validate(item)
+            # Trusted: skips EmailStr and timezone checks on every request.
+            return load_model(UserProfile, item)
         except Exception as e:
             logger.error(f"_to_model failed for profile: {e}")
             raise ProfileRepoError("Failed to create profile model from item") from e
@@ -34,6 +40,33 @@ class DynamoProfileRepository(DynamoRepository[UserProfile]):
 
         return self._to_model(item)
 
+    def scan_profiles(
+        self, *, segment: int = 0, total_segments: int = 1, page_size: int | None = None
+    ) -> Iterator[UserProfile]:
+        """
+        Yield every user's profile from one segment of a parallel scan.
+        For offline tooling (bulk export); the scan reads the whole table.
+        Profiles that fail validation are logged and skipped.
+        """
+        kwargs: dict = {
+            "FilterExpression": Attr("SK").eq("PROFILE"),
+            "Segment": segment,
+            "TotalSegments": total_segments,
+        }
+        if page_size:
+            kwargs["Limit"] = page_size
+
+        try:
+            for page in self._safe_scan_pages(**kwargs):
+                for item in page:
+                    try:
+                        yield self._to_model(item)
+                    except ProfileRepoError:
+                        logger.warning(f"Skipping invalid profile PK={item.get('PK')}")
+        except RepoError as e:
+            logger.error(f"Repo error scanning profiles segment={segment}: {e}")
+            raise ProfileRepoError("Failed to scan profiles") from e
+
     def update_account(
         self, user_sub: str, *, display_name: str, timezone: str
     ) -> UserProfile:
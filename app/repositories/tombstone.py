@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List
+
+from boto3.dynamodb.conditions import Key
+
+from app.models.tombstone import Tombstone
+from app.repositories.base import DynamoRepository
+from app.repositories.errors import RepoError, TombstoneRepoError
+from app.utils import db
+from app.utils.log import logger
+
+
+class DynamoTombstoneRepository(DynamoRepository[Tombstone]):
+    """
+    Reads the tombstones that deletes leave behind, for delta exports.
+    """
+
+    def _to_model(self, item: dict) -> Tombstone:
+        try:
+            return Tombstone.model_validate(item)
+        except Exception as e:
+            logger.error(f"_to_model failed for tombstone: {e}")
+            raise TombstoneRepoError(
+                "Failed to create tombstone model from item"
+            ) from e
+
+    def get_since(self, user_sub: str, since: datetime) -> List[Tombstone]:
+        """
+        Return the user's tombstones for deletions at or after `since`,
+        oldest first. Tombstone SKs sort by deletion time, so this is a
+        single range query.
+        """
+        pk = db.build_user_pk(user_sub)
+
+        try:
+            items = self._safe_query(
+                KeyConditionExpression=Key("PK").eq(pk)
+                & Key("SK").between(db.build_tombstone_prefix(since), "TOMBSTONE#~")
+            )
+        except RepoError as e:
+            logger.error(f"Repo error fetching tombstones user_sub={user_sub}: {e}")
+            raise TombstoneRepoError("Failed to fetch tombstones from database") from e
+
+        return [self._to_model(item) for item in items]
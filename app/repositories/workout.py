@@ -1,18 +1,21 @@
 import uuid
 from datetime import date as DateType
-from typing import List
+from typing import Iterator, List
 
 from boto3.dynamodb.conditions import Key
 
+from app.models.tombstone import Tombstone
 from app.models.workout import (
     Workout,
     WorkoutCreate,
     WorkoutSet,
     WorkoutSetCreate,
+    WorkoutSetSummary,
     WorkoutSetUpdate,
 )
 from app.repositories.base import DynamoRepository
 from app.repositories.errors import RepoError, WorkoutNotFoundError, WorkoutRepoError
+from app.settings import settings
 from app.utils import dates, db
 from app.utils.log import logger
 
@@ -44,8 +47,10 @@ class DynamoWorkoutRepository(DynamoRepository[Workout]):
         """
 
         logger.debug(
-            f"_build_moved_workout: moving workout {workout.workout_id} "
-            f"from {workout.date} → {new_date}"
+            "_build_moved_workout: moving workout %s " "from %s → %s",
+            workout.workout_id,
+            workout.date,
+            new_date,
         )
 
         pk = db.build_user_pk(user_sub)
@@ -67,7 +72,9 @@ class DynamoWorkoutRepository(DynamoRepository[Workout]):
         Create new WorkoutSet model instances with updated keys for the moved workout.
         """
         logger.debug(
-            f"_build_moved_sets: moving {len(sets)} sets to new workout {new_workout.workout_id}"
+            "_build_moved_sets: moving %s sets to new workout %s",
+            len(sets),
+            new_workout.workout_id,
         )
 
         pk = db.build_user_pk(user_sub)
@@ -120,26 +127,35 @@ class DynamoWorkoutRepository(DynamoRepository[Workout]):
 
     # ----------------------- Get -----------------------------
 
-    def get_sets_for_exercise(self, exercise_id: str) -> List[WorkoutSet]:
+    def get_set_summaries_for_exercise(
+        self, exercise_id: str
+    ) -> List[WorkoutSetSummary]:
         """
-        Fetch all sets for a specific exercise using the ExerciseIndex GSI.
+        Fetch slim set summaries for an exercise from the ExerciseProgressIndex GSI.
         ExercisePK is globally unique per exercise (UUID-based), so no user
         scoping is needed — but callers must verify exercise ownership first.
         """
         exercise_pk = f"EXERCISE#{exercise_id}"
         try:
             items = self._safe_query(
-                IndexName="ExerciseIndex",
+                IndexName=settings.DDB_EXERCISE_PROGRESS_INDEX,
                 KeyConditionExpression=Key("ExercisePK").eq(exercise_pk),
+                ProjectionExpression=", ".join(
+                    ("SK", *db.EXERCISE_PROGRESS_INDEX_ATTRS)
+                ),
             )
         except RepoError as e:
-            logger.error(f"Repo error fetching sets for exercise {exercise_id}: {e}")
-            raise WorkoutRepoError("Failed to fetch sets for exercise from database") from e
+            logger.error(
+                f"Repo error fetching set summaries for exercise {exercise_id}: {e}"
+            )
+            raise WorkoutRepoError(
+                "Failed to fetch sets for exercise from database"
+            ) from e
 
         try:
-            return [WorkoutSet(**item) for item in items if item.get("type") == "set"]
+            return [WorkoutSetSummary(**item) for item in items]
         except Exception as e:
-            logger.error(f"Unexpected error parsing sets for exercise: {e}")
+            logger.error(f"Unexpected error parsing set summaries for exercise: {e}")
             raise WorkoutRepoError("Failed to parse sets for exercise") from e
 
     def get_all_for_user(self, user_sub: str) -> List[Workout]:
@@ -205,6 +221,125 @@ class DynamoWorkoutRepository(DynamoRepository[Workout]):
                 "Failed to parse workout data from database response"
             ) from e
 
+    def iter_workout_data_for_user(
+        self, user_sub: str
+    ) -> Iterator[tuple[Workout, List[WorkoutSet]]]:
+        """
+        Yield (workout, sets) pairs newest date first, with sets sorted by
+        set_number, reading one query page at a time.
+
+        Same ordering as get_all_workout_data_for_user, but only one day of
+        items is held in memory, so exports don't load the full history.
+        """
+        pk = db.build_user_pk(user_sub)
+
+        try:
+            pages = self._safe_query_pages(
+                KeyConditionExpression=Key("PK").eq(pk)
+                & Key("SK").begins_with("WORKOUT#"),
+                ScanIndexForward=False,
+            )
+            day: str | None = None
+            day_items: List[Workout | WorkoutSet] = []
+            for page in pages:
+                for item in page:
+                    model = self._to_model(item)
+                    model_day = model.SK.split("#")[1]
+                    if model_day != day:
+                        yield from self._group_day(day_items)
+                        day, day_items = model_day, []
+                    day_items.append(model)
+            yield from self._group_day(day_items)
+
+        except RepoError as e:
+            logger.error(f"Repo error streaming workout data: {e}")
+            raise WorkoutRepoError("Failed to fetch workout data from database") from e
+        except WorkoutRepoError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error parsing streamed workout data: {e}")
+            raise WorkoutRepoError(
+                "Failed to parse workout data from database response"
+            ) from e
+
+    @staticmethod
+    def _group_day(
+        items: List[Workout | WorkoutSet],
+    ) -> Iterator[tuple[Workout, List[WorkoutSet]]]:
+        # The query runs newest-first, so within a day SKs arrive descending;
+        # sort them back so same-day workouts keep their ascending-SK order.
+        workouts = sorted(
+            (m for m in items if isinstance(m, Workout)), key=lambda w: w.SK
+        )
+        sets_by_workout: dict[str, List[WorkoutSet]] = {}
+        for m in items:
+            if isinstance(m, WorkoutSet):
+                sets_by_workout.setdefault(m.workout_id, []).append(m)
+
+        for w in workouts:
+            sets = sorted(
+                sets_by_workout.get(w.workout_id, []), key=lambda s: s.set_number
+            )
+            yield w, sets
+
+    def get_workout_data_between(
+        self, user_sub: str, start_date: DateType, end_date: DateType
+    ) -> tuple[List[Workout], List[WorkoutSet]]:
+        """
+        Return workout and set items dated start_date..end_date (inclusive)
+        in a single range query, so callers needing a recent window don't
+        read the user's full history.
+        Workouts are sorted by date desc; sets are unsorted.
+        """
+        pk = db.build_user_pk(user_sub)
+        sk_from, sk_to = db.build_workout_sk_range(start_date, end_date)
+
+        try:
+            items = self._safe_query(
+                KeyConditionExpression=Key("PK").eq(pk)
+                & Key("SK").between(sk_from, sk_to)
+            )
+        except RepoError as e:
+            logger.error(f"Repo error fetching workout data in range: {e}")
+            raise WorkoutRepoError("Failed to fetch workout data from database") from e
+
+        try:
+            models = [self._to_model(item) for item in items]
+            workouts = [m for m in models if isinstance(m, Workout)]
+            sets = [m for m in models if isinstance(m, WorkoutSet)]
+            workouts.sort(key=lambda w: w.date, reverse=True)
+            return workouts, sets
+
+        except WorkoutRepoError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error parsing workout data in range: {e}")
+            raise WorkoutRepoError(
+                "Failed to parse workout data from database response"
+            ) from e
+
+    def get_existing_workout_ids(
+        self, user_sub: str, workouts: List[tuple[DateType, str]]
+    ) -> set[str]:
+        """
+        Return the ids of the given (date, workout_id) pairs that already exist.
+        Looks the keys up directly with a keys-only BatchGetItem, so the cost
+        follows the number of candidates rather than the user's history.
+        """
+        pk = db.build_user_pk(user_sub)
+        # BatchGetItem rejects duplicate keys in one request.
+        sks = dict.fromkeys(db.build_workout_sk(d, wid) for d, wid in workouts)
+
+        try:
+            items = self._safe_batch_get(
+                [{"PK": pk, "SK": sk} for sk in sks], projection="SK"
+            )
+        except RepoError as e:
+            logger.error(f"Repo error checking existing workouts: {e}")
+            raise WorkoutRepoError("Failed to check existing workouts") from e
+
+        return {item["SK"].split("#")[2] for item in items}
+
     def get_workout_with_sets(
         self, user_sub: str, workout_date: DateType, workout_id: str
     ) -> tuple[Workout, List[WorkoutSet]]:
@@ -366,8 +501,11 @@ class DynamoWorkoutRepository(DynamoRepository[Workout]):
     ) -> Workout:
 
         logger.debug(
-            f"Moving workout {workout.workout_id} from {workout.date} → {new_date} "
-            f"with {len(sets)} sets"
+            "Moving workout %s from %s → %s " "with %s sets",
+            workout.workout_id,
+            workout.date,
+            new_date,
+            len(sets),
         )
 
         old_date = workout.date
@@ -452,9 +590,12 @@ class DynamoWorkoutRepository(DynamoRepository[Workout]):
 
         # use batch_writer here to make bulk delete easier
         # batch_writer bundles into batches and auto retries unprocessed items
+        deleted_at = dates.now()
         try:
             with self._table.batch_writer() as batch:
                 for item in items:
+                    tombstone = Tombstone.for_item(item["PK"], item["SK"], deleted_at)
+                    batch.put_item(Item=tombstone.to_ddb_item())
                     batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
         except Exception as e:
             logger.error(f"Batch delete failed: {e}")
@@ -471,8 +612,10 @@ class DynamoWorkoutRepository(DynamoRepository[Workout]):
 
         pk = db.build_user_pk(user_sub)
         sk = db.build_set_sk(workout_date, workout_id, set_number)
+        tombstone = Tombstone.for_item(pk, sk, dates.now())
 
         try:
+            self._safe_put(tombstone.to_ddb_item())
             self._safe_delete(Key={"PK": pk, "SK": sk})
         except RepoError as e:
             logger.error(f"Failed to delete set: {e}")
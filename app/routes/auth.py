@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import RedirectResponse
 
 from app.settings import settings
+from app.utils import session_prefs
 from app.utils.auth import COOKIE_OPTS
 from app.utils.log import logger
 from app.utils.theme import get_theme_cookie_from_profile
@@ -12,6 +13,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 CLIENT_ID = settings.COGNITO_AUDIENCE
 REDIRECT_URI = settings.COGNITO_REDIRECT_URI
 
+
 def set_cookies(response: Response, token_data: dict) -> None:
     logger.debug("Setting auth cookies")
     response.set_cookie(
@@ -67,7 +69,7 @@ def auth_callback(request: Request, code: str):
     response_token = requests.post(
         settings.token_url(), data=data, headers=headers, timeout=5
     )
-    logger.debug(f"Token exchange status_code={response_token.status_code}")
+    logger.debug("Token exchange status_code=%s", response_token.status_code)
 
     if response_token.status_code != 200:
         logger.error(f"Token exchange failed: {response_token.text}")
@@ -98,6 +100,11 @@ async def logout(response: Response):
 
     response = RedirectResponse(url="/", status_code=303)
 
-    for cookie in ["id_token", "access_token", "refresh_token"]:
+    for cookie in [
+        "id_token",
+        "access_token",
+        "refresh_token",
+        session_prefs.COOKIE_NAME,
+    ]:
         response.delete_cookie(cookie, path="/", **COOKIE_OPTS)
     return response
@@ -3,21 +3,41 @@ from __future__ import annotations
 import secrets
 import uuid
 from datetime import date as DateType
-from decimal import Decimal
-
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile
-from fastapi.responses import RedirectResponse, Response
-
-from app.models.export import ImportSummary
-from app.models.exercise import Exercise
-from app.models.workout import Workout, WorkoutSet
+from datetime import datetime
+from typing import Iterator
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile
+from fastapi.responses import RedirectResponse, StreamingResponse
+
+from app.repositories.errors import (
+    ImportJobNotFoundError,
+    ImportJobRepoError,
+    RepoError,
+    TombstoneRepoError,
+)
 from app.repositories.exercise import DynamoExerciseRepository
-from app.repositories.errors import RepoError
+from app.repositories.import_job import DynamoImportJobRepository
 from app.repositories.profile import DynamoProfileRepository
+from app.repositories.tombstone import DynamoTombstoneRepository
 from app.repositories.workout import DynamoWorkoutRepository
-from app.utils import auth, db
+from app.templates.templates import render_template
+from app.utils import auth
 from app.utils.db import RateLimitDdbError, rate_limit_hit
-from app.utils.export import build_export_payload, parse_import_file, serialise_export
+from app.utils.export import (
+    EXPORT_MEDIA_TYPES,
+    ExportDelta,
+    ExportFormat,
+    check_delta_since,
+    export_chunks,
+    iter_import_records,
+    read_first_pages,
+)
+from app.utils.import_jobs import (
+    ImportDispatchError,
+    enqueue_import_job,
+    store_upload,
+)
 from app.utils.log import logger
 
 router = APIRouter(prefix="/profile/data", tags=["data"])
@@ -37,6 +57,14 @@ def get_profile_repo() -> DynamoProfileRepository:  # pragma: no cover
     return DynamoProfileRepository()
 
 
+def get_import_job_repo() -> DynamoImportJobRepository:  # pragma: no cover
+    return DynamoImportJobRepository()
+
+
+def get_tombstone_repo() -> DynamoTombstoneRepository:  # pragma: no cover
+    return DynamoTombstoneRepository()
+
+
 # ─────────────────────────────────────────────────────────────
 # Export
 # ─────────────────────────────────────────────────────────────
@@ -45,13 +73,31 @@ def get_profile_repo() -> DynamoProfileRepository:  # pragma: no cover
 @router.get("/export")
 def export_data(
     request: Request,
+    export_format: ExportFormat = Query("json", alias="format"),
+    since: datetime | None = None,
     claims=Depends(auth.require_auth),
     workout_repo: DynamoWorkoutRepository = Depends(get_workout_repo),
     exercise_repo: DynamoExerciseRepository = Depends(get_exercise_repo),
     profile_repo: DynamoProfileRepository = Depends(get_profile_repo),
+    tombstone_repo: DynamoTombstoneRepository = Depends(get_tombstone_repo),
 ):
+    """
+    Stream the user's data as a download.
+
+    The first workout and exercise pages are read before the response
+    starts, so a failing repository still gets a 500. A read that fails
+    after that, once the 200 and part of the body have gone out, is logged
+    and aborts the stream: the connection closes without the body's end,
+    so clients see an incomplete download rather than a complete-looking
+    but truncated file.
+    """
     user_sub = claims["sub"]
-    logger.info(f"Data export requested user_sub={user_sub}")
+    logger.info(
+        "Data export requested user_sub=%s format=%s since=%s",
+        user_sub,
+        export_format,
+        since,
+    )
 
     # Per-user export rate limit
     try:
@@ -73,15 +119,43 @@ def export_data(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    payload_dict = build_export_payload(user_sub, profile, workout_repo, exercise_repo)
-    json_str = serialise_export(payload_dict)
+    # ?since= asks for a schema v2 delta: changes after that point, plus
+    # deletions, which are only remembered for TOMBSTONE_RETENTION_DAYS.
+    delta = None
+    if since is not None:
+        try:
+            since = check_delta_since(since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            tombstones = tombstone_repo.get_since(user_sub, since)
+        except TombstoneRepoError as e:
+            logger.exception(f"Error fetching tombstones user_sub={user_sub} err={e}")
+            raise HTTPException(
+                status_code=500, detail="Internal error reading deletions"
+            )
+        delta = ExportDelta(since, tombstones)
 
     today = DateType.today().isoformat()
-    filename = f"gymbyte-export-{today}.json"
+    kind = "export" if delta is None else "delta"
+    filename = f"gymbyte-{kind}-{today}.{export_format}"
 
-    return Response(
-        content=json_str,
-        media_type="application/json",
+    try:
+        workout_repo, exercise_repo = read_first_pages(
+            user_sub, workout_repo, exercise_repo
+        )
+    except RepoError as e:
+        logger.exception(f"Error starting export user_sub={user_sub} err={e}")
+        raise HTTPException(status_code=500, detail="Internal error reading data")
+
+    # Records are read from the repositories (and compressed, for .gz) as the
+    # body is sent, so the full history is never held in memory.
+    chunks = export_chunks(
+        export_format, user_sub, profile, workout_repo, exercise_repo, delta=delta
+    )
+    return StreamingResponse(
+        _logged_stream(chunks, user_sub),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
@@ -95,11 +169,10 @@ def export_data(
 async def import_data(
     request: Request,
     claims=Depends(auth.require_auth),
-    workout_repo: DynamoWorkoutRepository = Depends(get_workout_repo),
-    exercise_repo: DynamoExerciseRepository = Depends(get_exercise_repo),
+    job_repo: DynamoImportJobRepository = Depends(get_import_job_repo),
 ):
     user_sub = claims["sub"]
-    logger.info(f"Data import requested user_sub={user_sub}")
+    logger.info("Data import requested user_sub=%s", user_sub)
 
     form = await request.form()
 
@@ -116,152 +189,56 @@ async def import_data(
     if not file or not file.filename:
         return _import_redirect(error="No file provided.")
 
-    content = await file.read()
-
+    # Reject unreadable files now, while the user is still on the page.
+    records = iter_import_records(file.file)
     try:
-        payload = parse_import_file(content)
+        next(records)
     except ValueError as e:
         return _import_redirect(error=str(e))
+    finally:
+        records.close()
 
-    summary = ImportSummary()
-
-    # ── Fetch existing data for deduplication ──
+    # The records themselves are imported by a background job, in
+    # checkpointed chunks, so large files don't run into the request timeout.
+    job_id = str(uuid.uuid4())
     try:
-        existing_exercises = exercise_repo.get_all_for_user(user_sub)
-        existing_workouts = workout_repo.get_all_for_user(user_sub)
-    except RepoError as e:
-        logger.exception(f"Failed to fetch existing data for import user_sub={user_sub} err={e}")
-        return _import_redirect(error="Could not read existing data. Please try again.")
-
-    existing_workout_ids = {w.workout_id for w in existing_workouts}
-
-    # Build lookup: (name.lower(), equipment.lower()) -> [exercise_id, ...]
-    existing_by_name_equip: dict[tuple, list[str]] = {}
-    for e in existing_exercises:
-        key = (e.name.lower(), e.equipment.lower())
-        existing_by_name_equip.setdefault(key, []).append(e.exercise_id)
-
-    # ── Process exercises ──
-    id_remap: dict[str, str] = {}  # imported_id -> resolved_id in this account
-    items_to_write: list[dict] = []
-
-    for ex in payload.exercises:
-        key = (ex.name.lower(), ex.equipment.lower())
-        matches = existing_by_name_equip.get(key, [])
-
-        if len(matches) == 1:
-            id_remap[ex.id] = matches[0]
-            summary.exercises_matched += 1
-        else:
-            new_id = str(uuid.uuid4())
-            id_remap[ex.id] = new_id
-            if len(matches) > 1:
-                summary.warnings.append(
-                    f"Exercise '{ex.name}' ({ex.equipment}) matched multiple existing entries — created fresh"
-                )
-            try:
-                exercise = Exercise(
-                    PK=db.build_user_pk(user_sub),
-                    SK=db.build_exercise_sk(new_id),
-                    type="exercise",
-                    name=ex.name,
-                    muscles=ex.muscles,
-                    equipment=ex.equipment,
-                    category=ex.category,
-                    created_at=ex.created_at,
-                    updated_at=ex.updated_at,
-                )
-                items_to_write.append(exercise.to_ddb_item())
-                summary.exercises_created += 1
-            except Exception as exc:
-                summary.warnings.append(
-                    f"Exercise '{ex.name}' could not be imported ({exc}) — skipped"
-                )
-                del id_remap[ex.id]  # no valid mapping
-
-    # ── Process workouts and sets ──
-    for w in payload.workouts:
-        if w.id in existing_workout_ids:
-            summary.workouts_skipped += 1
-            continue
-
-        pk = db.build_user_pk(user_sub)
-        sk = db.build_workout_sk(w.date, w.id)
+        upload_path = store_upload(file.file, job_id)
+        job = job_repo.create_job(
+            user_sub, job_id, filename=file.filename, upload_path=upload_path
+        )
+        enqueue_import_job(user_sub, job.job_id)
+    except (OSError, RepoError, ImportDispatchError) as e:
+        logger.exception(f"Failed to start import job user_sub={user_sub} err={e}")
+        return _import_redirect(error="Could not start the import. Please try again.")
 
-        try:
-            workout = Workout(
-                PK=pk,
-                SK=sk,
-                type="workout",
-                date=w.date,
-                name=w.name,
-                tags=w.tags,
-                notes=w.notes,
-                created_at=w.created_at,
-                updated_at=w.updated_at,
-            )
-        except Exception as exc:
-            summary.warnings.append(
-                f"Workout '{w.name}' ({w.date}) could not be imported ({exc}) — skipped"
-            )
-            continue
-
-        items_to_write.append(workout.to_ddb_item())
-        summary.workouts_created += 1
-
-        for s in w.sets:
-            resolved_exercise_id = id_remap.get(s.exercise_id)
-            if resolved_exercise_id is None:
-                summary.warnings.append(
-                    f"Set #{s.set_number} in workout '{w.name}' ({w.date}) references "
-                    f"unknown exercise — skipped"
-                )
-                continue
-
-            set_sk = db.build_set_sk(w.date, w.id, s.set_number)
-            weight = Decimal(str(s.weight_kg)) if s.weight_kg is not None else None
-
-            try:
-                workout_set = WorkoutSet(
-                    PK=pk,
-                    SK=set_sk,
-                    type="set",
-                    exercise_id=resolved_exercise_id,
-                    set_number=s.set_number,
-                    reps=s.reps,
-                    weight_kg=weight,
-                    rpe=s.rpe,
-                    created_at=s.created_at,
-                    updated_at=s.updated_at,
-                )
-            except Exception as exc:
-                summary.warnings.append(
-                    f"Set #{s.set_number} in workout '{w.name}' ({w.date}) is invalid ({exc}) — skipped"
-                )
-                continue
-
-            items_to_write.append(workout_set.to_ddb_item())
-            summary.sets_created += 1
-
-    # ── Batch write ──
-    if items_to_write:
-        try:
-            table = db.get_table()
-            with table.batch_writer() as batch:
-                for item in items_to_write:
-                    batch.put_item(Item=item)
-        except Exception as e:
-            logger.exception(f"Batch write failed during import user_sub={user_sub} err={e}")
-            return _import_redirect(error="Import failed while writing to database. Some items may have been saved.")
+    logger.info("Import job queued job_id=%s user_sub=%s", job.job_id, user_sub)
 
-    logger.info(
-        f"Import complete user_sub={user_sub} "
-        f"exercises_created={summary.exercises_created} exercises_matched={summary.exercises_matched} "
-        f"workouts_created={summary.workouts_created} workouts_skipped={summary.workouts_skipped} "
-        f"sets_created={summary.sets_created} warnings={len(summary.warnings)}"
-    )
+    return RedirectResponse(f"/profile/?import_job={job.job_id}", status_code=303)
+
+
+@router.get("/import/{job_id}")
+def import_status(
+    request: Request,
+    job_id: str,
+    claims=Depends(auth.require_auth),
+    job_repo: DynamoImportJobRepository = Depends(get_import_job_repo),
+):
+    """Progress partial for an import job; polled by the profile data card."""
+    user_sub = claims["sub"]
 
-    return _import_redirect(summary=summary)
+    try:
+        job = job_repo.get_job(user_sub, job_id)
+    except ImportJobNotFoundError:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    except ImportJobRepoError as e:
+        logger.exception(f"Error fetching import job job_id={job_id} err={e}")
+        raise HTTPException(status_code=500, detail="Internal error reading import job")
+
+    return render_template(
+        request,
+        "profile/_import_status.html",
+        context={"request": request, "job": job},
+    )
 
 
 # ─────────────────────────────────────────────────────────────
@@ -269,27 +246,18 @@ async def import_data(
 # ─────────────────────────────────────────────────────────────
 
 
-def _import_redirect(
-    summary: ImportSummary | None = None,
-    error: str | None = None,
-) -> RedirectResponse:
-    if error:
-        from urllib.parse import quote
-
-        return RedirectResponse(
-            f"/profile/?import_error={quote(error)}",
-            status_code=303,
-        )
-
-    assert summary is not None
-    from urllib.parse import urlencode
-
-    params: dict[str, str | int] = {
-        "import_exercises": summary.exercises_created,
-        "import_matched": summary.exercises_matched,
-        "import_workouts": summary.workouts_created,
-        "import_skipped": summary.workouts_skipped,
-        "import_sets": summary.sets_created,
-        "import_warnings": len(summary.warnings),
-    }
-    return RedirectResponse(f"/profile/?{urlencode(params)}", status_code=303)
+def _logged_stream(chunks: Iterator[bytes], user_sub: str) -> Iterator[bytes]:
+    try:
+        yield from chunks
+    except Exception as e:
+        # Too late for an error status: re-raise so the server drops the
+        # connection instead of ending the body as if it were complete.
+        logger.exception(f"Export failed mid-stream user_sub={user_sub} err={e}")
+        raise
+
+
+def _import_redirect(error: str) -> RedirectResponse:
+    return RedirectResponse(
+        f"/profile/?import_error={quote(error)}",
+        status_code=303,
+    )
@@ -1,12 +1,14 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import HTMLResponse
 
 from app.models.exercise import ExerciseCreate, ExerciseUpdate
 from app.repositories.errors import ExerciseRepoError
 from app.repositories.exercise import DynamoExerciseRepository
-from app.templates.templates import render_template
+from app.templates.templates import render_fragment, render_template, request_theme
 from app.utils import auth, dates
+from app.utils.fragment_cache import fragment_cache
 from app.utils.log import logger
 from app.utils.taxonomy import EQUIPMENT_TYPES, EXERCISE_CATEGORIES, MUSCLE_GROUPS
 
@@ -18,7 +20,9 @@ def get_exercise_repo() -> DynamoExerciseRepository:  # pragma: no cover
     return DynamoExerciseRepository()
 
 
-def _form_context(exercise=None, action_url="", submit_label="Save", cancel_target="") -> dict:
+def _form_context(
+    exercise=None, action_url="", submit_label="Save", cancel_target=""
+) -> dict:
     return {
         "exercise": exercise,
         "action_url": action_url,
@@ -41,7 +45,7 @@ def get_all_exercises(
 ):
     """Get all exercises for the current authenticated user"""
     user_sub = claims["sub"]
-    logger.info(f"Fetching exercises for user {user_sub}")
+    logger.info("Fetching exercises for user %s", user_sub)
 
     try:
         exercises = repo.get_all_for_user(user_sub)
@@ -64,16 +68,23 @@ def get_new_exercise_form(
     request: Request,
     claims=Depends(auth.require_auth),
 ):
-    return render_template(
-        request,
-        "exercises/_exercise_form.html",
-        context=_form_context(
-            exercise=None,
-            action_url=str(request.url_for("create_exercise")),
-            submit_label="Create",
-            cancel_target="#new-exercise-form-container",
-        ),
-    )
+    action_url = str(request.url_for("create_exercise"))
+
+    def render() -> str:
+        return render_fragment(
+            request,
+            "exercises/_exercise_form.html",
+            _form_context(
+                exercise=None,
+                action_url=action_url,
+                submit_label="Create",
+                cancel_target="#new-exercise-form-container",
+            ),
+        )
+
+    # Nothing user-specific in the blank form, so every user shares it.
+    key = ("new_exercise_form", request_theme(request), action_url)
+    return HTMLResponse(fragment_cache.get_or_render(key, render))
 
 
 @router.post("/create")
@@ -140,7 +151,9 @@ def update_exercise(
     try:
         exercise = repo.get_exercise_by_id(user_sub, exercise_id)
     except ExerciseRepoError:
-        logger.exception(f"Error fetching exercise {exercise_id} for update, user {user_sub}")
+        logger.exception(
+            f"Error fetching exercise {exercise_id} for update, user {user_sub}"
+        )
         raise HTTPException(status_code=500, detail="Error fetching exercise")
 
     if not exercise:
@@ -0,0 +1,75 @@
+import copy
+import importlib
+import threading
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match
+from starlette.types import Receive, Scope, Send
+
+from app.utils.log import logger
+
+# Serialises loads: each replaces the app's whole route list.
+_load_lock = threading.Lock()
+
+
+class LazyRouter(BaseRoute):
+    """
+    Placeholder for a router module that is imported on first use.
+
+    Matches every path under `prefix`. The first request to one (or the
+    first url_for that reaches it) imports `module_name`, includes its
+    `router` in the app in place of this placeholder and re-dispatches, so
+    routers a Lambda container never serves never cost it an import.
+    Its routes only appear in the OpenAPI schema once loaded.
+    """
+
+    def __init__(self, app: FastAPI, prefix: str, module_name: str):
+        self._app = app
+        self.prefix = prefix
+        self.module_name = module_name
+
+    def load(self) -> None:
+        if self not in self._app.router.routes:
+            return  # already swapped out for the real routes
+
+        with _load_lock:
+            routes = self._app.router.routes
+            if self not in routes:
+                return  # loaded by a concurrent request
+
+            logger.debug("Loading router module=%s", self.module_name)
+            module = importlib.import_module(self.module_name)
+            # Include into a copy of the app's router (same dependency
+            # overrides, route class, etc.) with routes of its own, then
+            # publish a new list with them in this placeholder's place, so
+            # requests matching against the old list never see it change.
+            staging = copy.copy(self._app.router)
+            staging.routes = []
+            staging.include_router(module.router)
+            index = routes.index(self)
+            self._app.router.routes = (
+                routes[:index] + staging.routes + routes[index + 1 :]
+            )
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        self.load()
+        return self._app.router.url_path_for(name, **path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self._app.router.app(scope, receive, send)
+
+
+def include_lazy_router(app: FastAPI, prefix: str, module_name: str) -> None:
+    """
+    Register a router module to be imported on its first request. Add these
+    after the eagerly included routers so lookups for those never load it.
+    """
+    app.router.routes.append(LazyRouter(app, prefix, module_name))
@@ -1,4 +1,4 @@
-from zoneinfo import available_timezones
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import ValidationError
@@ -8,7 +8,8 @@ from app.repositories.errors import ProfileRepoError
 from app.repositories.profile import DynamoProfileRepository
 from app.settings import settings
 from app.templates.templates import render_template
-from app.utils import auth
+from app.utils import auth, session_prefs
+from app.utils.dates import timezone_names
 from app.utils.log import logger
 from app.utils.theme import set_theme_cookie
 
@@ -17,9 +18,6 @@ router = APIRouter(prefix="/profile", tags=["profile"])
 # ------------------------- Helpers ------------------------
 
 
-_TZ_OPTIONS: list[str] = sorted(available_timezones())
-
-
 def _errors_dict(e: ValidationError) -> dict[str, str]:
     return {str(err["loc"][0]): err["msg"] for err in e.errors() if err["loc"]}
 
@@ -49,18 +47,14 @@ def profile(
     request: Request,
     claims=Depends(auth.require_auth),
     repo: DynamoProfileRepository = Depends(get_profile_repo),
-    # Import flash params (set by redirect after a successful/failed import)
+    # Set by the redirect after an import upload: the job to show progress
+    # for, or why the upload was rejected.
+    import_job: UUID | None = None,
     import_error: str | None = None,
-    import_exercises: int | None = None,
-    import_matched: int | None = None,
-    import_workouts: int | None = None,
-    import_skipped: int | None = None,
-    import_sets: int | None = None,
-    import_warnings: int | None = None,
 ):
     """Get the profile of the current authenticated user."""
     user_sub = claims["sub"]
-    logger.info(f"Fetching profile for user_sub={user_sub}")
+    logger.info("Fetching profile for user_sub=%s", user_sub)
 
     try:
         profile = _get_profile_or_404(repo, user_sub)
@@ -74,9 +68,8 @@ def profile(
             )
         raise
 
-    logger.debug(f"Profile retrieved for user_sub={user_sub}")
-
-    import_success = import_workouts is not None
+    logger.debug("Profile retrieved for user_sub=%s", user_sub)
+    session_prefs.remember_profile(request, profile)
 
     return render_template(
         request,
@@ -86,7 +79,7 @@ def profile(
             "themes": settings.THEMES,
             "profile": profile,
             "user_sub": user_sub,
-            "tz_options": _TZ_OPTIONS,
+            "tz_options": timezone_names(),
             # placeholders for card swaps / validation later
             "account_form": None,
             "account_errors": None,
@@ -96,14 +89,8 @@ def profile(
             "prefs_success": False,
             # data card
             "csrf_token": request.cookies.get("csrf_token", ""),
+            "import_job": import_job,
             "import_error": import_error,
-            "import_success": import_success,
-            "import_exercises": import_exercises,
-            "import_matched": import_matched,
-            "import_workouts": import_workouts,
-            "import_skipped": import_skipped,
-            "import_sets": import_sets,
-            "import_warnings": import_warnings,
         },
         status_code=200,
     )
@@ -119,7 +106,7 @@ async def update_account(
     repo: DynamoProfileRepository = Depends(get_profile_repo),
 ):
     user_sub = claims["sub"]
-    logger.info(f"Updating account user_sub={user_sub}")
+    logger.info("Updating account user_sub=%s", user_sub)
     profile = _get_profile_or_404(repo, user_sub)
 
     form = await request.form()
@@ -139,7 +126,7 @@ async def update_account(
             context={
                 "request": request,
                 "profile": profile,
-                "tz_options": _TZ_OPTIONS,
+                "tz_options": timezone_names(),
                 "account_form": data,
                 "account_errors": errors,
                 "account_success": False,
@@ -157,19 +144,22 @@ async def update_account(
         logger.exception(f"Error updating account user_sub={user_sub} err={e}")
         raise HTTPException(status_code=500, detail="Internal error updating account")
 
-    return render_template(
+    response = render_template(
         request,
         "profile/_account_card.html",
         context={
             "request": request,
             "profile": profile,
-            "tz_options": _TZ_OPTIONS,
+            "tz_options": timezone_names(),
             "account_form": None,
             "account_errors": None,
             "account_success": True,
         },
         status_code=200,
     )
+    session_prefs.set_cookie(response, profile)
+
+    return response
 
 
 @router.post("/preferences")
@@ -179,7 +169,7 @@ async def update_preferences(
     repo: DynamoProfileRepository = Depends(get_profile_repo),
 ):
     user_sub = claims["sub"]
-    logger.info(f"Updating preferences user_sub={user_sub}")
+    logger.info("Updating preferences user_sub=%s", user_sub)
     profile = _get_profile_or_404(repo, user_sub)
 
     form = await request.form()
@@ -237,5 +227,6 @@ async def update_preferences(
 
     # Set cookie so ThemeMiddleware picks it up next request
     set_theme_cookie(response, validated.theme)
+    session_prefs.set_cookie(response, profile)
 
     return response
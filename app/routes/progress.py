@@ -1,3 +1,5 @@
+from datetime import date
+
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from app.repositories.errors import WorkoutRepoError
@@ -7,7 +9,8 @@ from app.repositories.workout import DynamoWorkoutRepository
 from app.routes.profile import get_profile_repo
 from app.routes.workout import get_exercise_repo, get_workout_repo
 from app.templates.templates import render_template
-from app.utils import auth, progress
+from app.utils import auth, progress, session_prefs
+from app.utils.concurrency import fan_out
 from app.utils.log import logger
 
 router = APIRouter(tags=["progress"])
@@ -23,20 +26,30 @@ def progress_page(
 ):
     user_sub = claims["sub"]
 
+    workout_data_f, exercises_f, prefs_f = fan_out(
+        lambda: workout_repo.get_all_workout_data_for_user(user_sub),
+        lambda: exercise_repo.get_all_for_user(user_sub),
+        lambda: session_prefs.load(request, user_sub, profile_repo),
+    )
+
     try:
-        workouts, sets = workout_repo.get_all_workout_data_for_user(user_sub)
+        workouts, sets = workout_data_f.result()
     except WorkoutRepoError:
-        logger.exception(f"Error fetching workouts for progress page user_sub={user_sub}")
+        logger.exception(
+            f"Error fetching workouts for progress page user_sub={user_sub}"
+        )
         raise HTTPException(status_code=500, detail="Error fetching workouts")
 
     try:
-        exercises = exercise_repo.get_all_for_user(user_sub)
+        exercises = exercises_f.result()
     except Exception:
-        logger.exception(f"Error fetching exercises for progress page user_sub={user_sub}")
+        logger.exception(
+            f"Error fetching exercises for progress page user_sub={user_sub}"
+        )
         raise HTTPException(status_code=500, detail="Error fetching exercises")
 
-    profile = profile_repo.get_for_user(user_sub)
-    weight_unit = profile.weight_unit if profile else "kg"
+    prefs = prefs_f.result()
+    weight_unit = prefs.weight_unit if prefs else "kg"
 
     return render_template(
         request,
@@ -61,22 +74,32 @@ def volume_chart(
 ):
     user_sub = claims["sub"]
 
+    if exercise_id:
+        # Sets are fetched alongside the ownership check but only used once
+        # the exercise is confirmed to belong to this user.
+        exercise_f, sets_f, prefs_f = fan_out(
+            lambda: exercise_repo.get_exercise_by_id(user_sub, exercise_id),
+            lambda: workout_repo.get_set_summaries_for_exercise(exercise_id),
+            lambda: session_prefs.load(request, user_sub, profile_repo),
+        )
+        if not exercise_f.result():
+            raise HTTPException(status_code=404, detail="Exercise not found")
+    else:
+        sets_f, prefs_f = fan_out(
+            lambda: workout_repo.get_all_workout_data_for_user(user_sub)[1],
+            lambda: session_prefs.load(request, user_sub, profile_repo),
+        )
+
     try:
-        if exercise_id:
-            exercise = exercise_repo.get_exercise_by_id(user_sub, exercise_id)
-            if not exercise:
-                raise HTTPException(status_code=404, detail="Exercise not found")
-            sets = workout_repo.get_sets_for_exercise(exercise_id)
-        else:
-            _, sets = workout_repo.get_all_workout_data_for_user(user_sub)
+        sets = sets_f.result()
     except WorkoutRepoError:
         logger.exception(
             f"Error fetching workout data for volume chart user_sub={user_sub}"
         )
         raise HTTPException(status_code=500, detail="Error fetching workout data")
 
-    profile = profile_repo.get_for_user(user_sub)
-    weight_unit = profile.weight_unit if profile else "kg"
+    prefs = prefs_f.result()
+    weight_unit = prefs.weight_unit if prefs else "kg"
 
     chart_data = progress.build_volume_chart_data(
         sets, weight_unit, exercise_id=exercise_id or None
@@ -100,20 +123,26 @@ def exercise_chart(
 ):
     user_sub = claims["sub"]
 
-    exercise = exercise_repo.get_exercise_by_id(user_sub, exercise_id)
+    exercise_f, sets_f, prefs_f = fan_out(
+        lambda: exercise_repo.get_exercise_by_id(user_sub, exercise_id),
+        lambda: workout_repo.get_set_summaries_for_exercise(exercise_id),
+        lambda: session_prefs.load(request, user_sub, profile_repo),
+    )
+
+    exercise = exercise_f.result()
     if not exercise:
         raise HTTPException(status_code=404, detail="Exercise not found")
 
     try:
-        sets = workout_repo.get_sets_for_exercise(exercise_id)
+        sets = sets_f.result()
     except WorkoutRepoError:
         logger.exception(
             f"Error fetching workout data for exercise chart user_sub={user_sub}"
         )
         raise HTTPException(status_code=500, detail="Error fetching workout data")
 
-    profile = profile_repo.get_for_user(user_sub)
-    weight_unit = profile.weight_unit if profile else "kg"
+    prefs = prefs_f.result()
+    weight_unit = prefs.weight_unit if prefs else "kg"
 
     chart_data = progress.build_exercise_progress_data(sets, exercise_id, weight_unit)
 
@@ -138,20 +167,26 @@ def one_rm_chart(
 ):
     user_sub = claims["sub"]
 
-    exercise = exercise_repo.get_exercise_by_id(user_sub, exercise_id)
+    exercise_f, sets_f, prefs_f = fan_out(
+        lambda: exercise_repo.get_exercise_by_id(user_sub, exercise_id),
+        lambda: workout_repo.get_set_summaries_for_exercise(exercise_id),
+        lambda: session_prefs.load(request, user_sub, profile_repo),
+    )
+
+    exercise = exercise_f.result()
     if not exercise:
         raise HTTPException(status_code=404, detail="Exercise not found")
 
     try:
-        sets = workout_repo.get_sets_for_exercise(exercise_id)
+        sets = sets_f.result()
     except WorkoutRepoError:
         logger.exception(
             f"Error fetching workout data for 1RM chart user_sub={user_sub}"
         )
         raise HTTPException(status_code=500, detail="Error fetching workout data")
 
-    profile = profile_repo.get_for_user(user_sub)
-    weight_unit = profile.weight_unit if profile else "kg"
+    prefs = prefs_f.result()
+    weight_unit = prefs.weight_unit if prefs else "kg"
 
     chart_data = progress.build_1rm_chart_data(sets, exercise_id, weight_unit)
 
@@ -163,3 +198,39 @@ def one_rm_chart(
             "exercise_name": exercise.name,
         },
     )
+
+
+@router.get("/progress/workload")
+def workload_chart(
+    request: Request,
+    claims=Depends(auth.require_auth),
+    workout_repo: DynamoWorkoutRepository = Depends(get_workout_repo),
+    profile_repo: DynamoProfileRepository = Depends(get_profile_repo),
+):
+    user_sub = claims["sub"]
+
+    sets_f, prefs_f = fan_out(
+        lambda: workout_repo.get_workout_data_between(
+            user_sub, progress.workload_start_date(), date.today()
+        )[1],
+        lambda: session_prefs.load(request, user_sub, profile_repo),
+    )
+
+    try:
+        sets = sets_f.result()
+    except WorkoutRepoError:
+        logger.exception(
+            f"Error fetching workout data for workload chart user_sub={user_sub}"
+        )
+        raise HTTPException(status_code=500, detail="Error fetching workout data")
+
+    prefs = prefs_f.result()
+    weight_unit = prefs.weight_unit if prefs else "kg"
+
+    chart_data = progress.build_workload_chart_data(sets, weight_unit)
+
+    return render_template(
+        request,
+        "progress/_workload_chart.html",
+        context={"chart_data": chart_data},
+    )
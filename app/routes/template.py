@@ -2,6 +2,7 @@ from typing import Annotated, Literal, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response
 
+from app.models.profile import UserProfile
 from app.models.template import (
     TemplateCreate,
     TemplateSetCreate,
@@ -18,7 +19,9 @@ from app.repositories.profile import DynamoProfileRepository
 from app.repositories.template import DynamoTemplateRepository
 from app.repositories.workout import DynamoWorkoutRepository
 from app.templates.templates import render_template
-from app.utils import auth, dates
+from app.utils import auth, dates, session_prefs
+from app.utils.concurrency import fan_out
+from app.utils.fragment_cache import exercise_options
 from app.utils.log import logger
 from app.utils.units import kg_to_lb, lb_to_kg
 
@@ -45,16 +48,28 @@ def get_profile_repo() -> DynamoProfileRepository:  # pragma: no cover
     return DynamoProfileRepository()
 
 
+def get_profile_for_user(
+    user_sub: str,
+    profile_repo: DynamoProfileRepository,
+) -> UserProfile | None:
+    try:
+        return profile_repo.get_for_user(user_sub)
+    except Exception:
+        logger.exception(f"Error fetching profile for user_sub={user_sub}")
+        raise HTTPException(status_code=500, detail="Error fetching user profile")
+
+
 def get_weight_unit_for_user(
+    request: Request,
     user_sub: str,
     profile_repo: DynamoProfileRepository,
 ) -> Literal["kg", "lb"]:
     try:
-        profile = profile_repo.get_for_user(user_sub)
+        prefs = session_prefs.load(request, user_sub, profile_repo)
     except Exception:
         logger.exception(f"Error fetching profile for user_sub={user_sub}")
         raise HTTPException(status_code=500, detail="Error fetching user profile")
-    return profile.weight_unit if profile else "kg"
+    return prefs.weight_unit if prefs else "kg"
 
 
 # ---------------------- List all ---------------------------
@@ -69,7 +84,7 @@ def get_all_templates(
     """Get all templates for the current authenticated user."""
     user_sub = claims["sub"]
 
-    logger.info(f"Fetching templates for user {user_sub}")
+    logger.info("Fetching templates for user %s", user_sub)
 
     try:
         templates = repo.get_all_templates(user_sub)
@@ -137,8 +152,13 @@ def view_template(
     """Full detail page for a single template."""
     user_sub = claims["sub"]
 
+    template_f, unit_f = fan_out(
+        lambda: template_repo.get_template_with_sets(user_sub, template_id),
+        lambda: get_weight_unit_for_user(request, user_sub, profile_repo),
+    )
+
     try:
-        template, sets = template_repo.get_template_with_sets(user_sub, template_id)
+        template, sets = template_f.result()
     except TemplateNotFoundError:
         logger.warning(f"Template {template_id} not found for {user_sub}")
         raise HTTPException(status_code=404, detail="Template not found")
@@ -148,7 +168,7 @@ def view_template(
 
     sets = sorted(sets, key=lambda s: s.set_number)
 
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = unit_f.result()
 
     if unit == "lb":
         for s in sets:
@@ -194,28 +214,27 @@ def get_add_exercise_form(
 ):
     """Return a form to pick an exercise and add the first set for it."""
     user_sub = claims["sub"]
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    profile = get_profile_for_user(user_sub, profile_repo)
+    catalog_version = profile.exercise_catalog_version if profile else None
+    if profile:
+        session_prefs.remember_profile(request, profile)
 
     try:
-        exercises = exercise_repo.get_all_for_user(user_sub)
+        options = exercise_options(request, user_sub, catalog_version, exercise_repo)
     except ExerciseRepoError:
         logger.exception(f"Error fetching exercises for user {user_sub}")
         raise HTTPException(status_code=500, detail="Error fetching exercises")
 
-    exercises = sorted(exercises, key=lambda e: e.name.lower())
-
-    action_url = str(
-        request.url_for("add_template_set", template_id=template_id)
-    )
+    action_url = str(request.url_for("add_template_set", template_id=template_id))
 
     return render_template(
         request,
         "templates/_add_exercise_form.html",
         context={
             "template_id": template_id,
-            "exercises": exercises,
+            "exercise_options": options,
             "action_url": action_url,
-            "weight_unit": unit,
+            "weight_unit": profile.weight_unit if profile else "kg",
         },
     )
 
@@ -230,7 +249,7 @@ def get_new_set_form(
 ):
     """Return the HTMX partial set form for adding a new set to a template."""
     user_sub = claims["sub"]
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     action_url = (
         str(request.url_for("add_template_set", template_id=template_id))
@@ -254,6 +273,7 @@ def get_new_set_form(
 
 @router.post("/{template_id}/set/add")
 def add_template_set(
+    request: Request,
     template_id: str,
     form: Annotated[TemplateSetCreate, Depends(TemplateSetCreate.as_form)],
     claims=Depends(auth.require_auth),
@@ -282,7 +302,7 @@ def add_template_set(
     if not exercise:
         raise HTTPException(status_code=404, detail="Exercise not found")
 
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     if unit == "lb" and form.weight_kg is not None:
         form.weight_kg = lb_to_kg(form.weight_kg)
@@ -364,7 +384,9 @@ def update_template_meta(
     user_sub = claims["sub"]
 
     logger.info(
-        f"Updating template meta user_sub={user_sub} template_id={template_id}"
+        "Updating template meta user_sub=%s template_id=%s",
+        user_sub,
+        template_id,
     )
 
     try:
@@ -408,7 +430,7 @@ def get_edit_set_form(
         )
         raise HTTPException(status_code=500, detail="Error fetching set")
 
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     if unit == "lb" and set_.weight_kg is not None:
         set_.weight_kg = kg_to_lb(set_.weight_kg)
@@ -439,6 +461,7 @@ def get_edit_set_form(
 
 @router.post("/{template_id}/set/{set_number}")
 def edit_template_set(
+    request: Request,
     template_id: str,
     set_number: int,
     form: Annotated[TemplateSetUpdate, Depends(TemplateSetUpdate.as_form)],
@@ -449,7 +472,7 @@ def edit_template_set(
     """Save edits to a template set."""
     user_sub = claims["sub"]
 
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     if unit == "lb" and form.weight_kg is not None:
         form.weight_kg = lb_to_kg(form.weight_kg)
@@ -483,7 +506,9 @@ def delete_template(
     user_sub = claims["sub"]
 
     try:
-        logger.info(f"Deleting template template_id={template_id} user_sub={user_sub}")
+        logger.info(
+            "Deleting template template_id=%s user_sub=%s", template_id, user_sub
+        )
         repo.delete_template(user_sub, template_id)
     except TemplateRepoError:
         logger.exception(f"Error deleting template {template_id}")
@@ -504,7 +529,10 @@ def delete_template_set(
 
     try:
         logger.info(
-            f"Deleting template set set_number={set_number} template_id={template_id} user_sub={user_sub}"
+            "Deleting template set set_number=%s template_id=%s user_sub=%s",
+            set_number,
+            template_id,
+            user_sub,
         )
         repo.delete_set(user_sub, template_id, set_number)
     except TemplateRepoError:
@@ -521,6 +549,7 @@ def delete_template_set(
 
 @router.post("/{template_id}/copy")
 def copy_template_to_workout(
+    request: Request,
     template_id: str,
     claims=Depends(auth.require_auth),
     template_repo: DynamoTemplateRepository = Depends(get_template_repo),
@@ -535,12 +564,12 @@ def copy_template_to_workout(
     user_sub = claims["sub"]
 
     try:
-        profile = profile_repo.get_for_user(user_sub)
+        prefs = session_prefs.load(request, user_sub, profile_repo)
     except Exception:
         logger.exception(f"Error fetching profile for user_sub={user_sub}")
         raise HTTPException(status_code=500, detail="Error fetching user profile")
 
-    tz = profile.timezone if profile else None
+    tz = prefs.timezone if prefs else None
     today = dates.today_in_tz(tz)
 
     try:
@@ -563,7 +592,10 @@ def copy_template_to_workout(
     redirect_url = f"/workout/{workout.date.isoformat()}/{workout.workout_id}"
 
     logger.info(
-        f"Template {template_id} copied to workout {workout.workout_id} for user {user_sub}"
+        "Template %s copied to workout %s for user %s",
+        template_id,
+        workout.workout_id,
+        user_sub,
     )
 
     return Response(status_code=204, headers={"HX-Redirect": redirect_url})
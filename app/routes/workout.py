@@ -1,8 +1,10 @@
+import logging
 from datetime import date as DateType
 from typing import Annotated, Literal, Optional, Sequence
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response
 
+from app.models.profile import UserProfile
 from app.models.workout import (
     WorkoutCreate,
     WorkoutSet,
@@ -19,7 +21,9 @@ from app.repositories.exercise import DynamoExerciseRepository
 from app.repositories.profile import DynamoProfileRepository
 from app.repositories.workout import DynamoWorkoutRepository
 from app.templates.templates import render_template
-from app.utils import auth, dates
+from app.utils import auth, dates, session_prefs
+from app.utils.concurrency import fan_out
+from app.utils.fragment_cache import exercise_options
 from app.utils.log import logger
 from app.utils.units import kg_to_lb, lb_to_kg
 
@@ -41,16 +45,28 @@ def get_profile_repo() -> DynamoProfileRepository:  # pragma: no cover
     return DynamoProfileRepository()
 
 
+def get_profile_for_user(
+    user_sub: str,
+    profile_repo: DynamoProfileRepository,
+) -> UserProfile | None:
+    try:
+        return profile_repo.get_for_user(user_sub)
+    except Exception:
+        logger.exception(f"Error fetching profile for user_sub={user_sub}")
+        raise HTTPException(status_code=500, detail="Error fetching user profile")
+
+
 def get_weight_unit_for_user(
+    request: Request,
     user_sub: str,
     profile_repo: DynamoProfileRepository,
 ) -> Literal["kg", "lb"]:
     try:
-        profile = profile_repo.get_for_user(user_sub)
+        prefs = session_prefs.load(request, user_sub, profile_repo)
     except Exception:
         logger.exception(f"Error fetching profile for user_sub={user_sub}")
         raise HTTPException(status_code=500, detail="Error fetching user profile")
-    return profile.weight_unit if profile else "kg"
+    return prefs.weight_unit if prefs else "kg"
 
 
 def get_sorted_sets_and_defaults(
@@ -87,7 +103,7 @@ def get_all_workouts(
     """Get all workouts for the current authenticated user"""
     user_sub = claims["sub"]
 
-    logger.info(f"Fetching workouts for user {user_sub}")
+    logger.info("Fetching workouts for user %s", user_sub)
 
     try:
         workouts = repo.get_all_for_user(user_sub)
@@ -112,8 +128,8 @@ def get_new_form(
     profile_repo: DynamoProfileRepository = Depends(get_profile_repo),
 ):
     user_sub = claims["sub"]
-    profile = profile_repo.get_for_user(user_sub)
-    tz = profile.timezone if profile else None
+    prefs = session_prefs.load(request, user_sub, profile_repo)
+    tz = prefs.timezone if prefs else None
 
     return render_template(
         request,
@@ -133,16 +149,17 @@ def get_add_exercise_form(
 ):
     """Return a form to pick an exercise and log the first set for it."""
     user_sub = claims["sub"]
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    profile = get_profile_for_user(user_sub, profile_repo)
+    catalog_version = profile.exercise_catalog_version if profile else None
+    if profile:
+        session_prefs.remember_profile(request, profile)
 
     try:
-        exercises = exercise_repo.get_all_for_user(user_sub)
+        options = exercise_options(request, user_sub, catalog_version, exercise_repo)
     except ExerciseRepoError:
         logger.exception(f"Error fetching exercises for user {user_sub}")
         raise HTTPException(status_code=500, detail="Error fetching exercises")
 
-    exercises = sorted(exercises, key=lambda e: e.name.lower())
-
     action_url = str(
         request.url_for("add_set", workout_date=workout_date, workout_id=workout_id)
     )
@@ -151,9 +168,9 @@ def get_add_exercise_form(
         request,
         "workouts/_add_exercise_form.html",
         context={
-            "exercises": exercises,
+            "exercise_options": options,
             "action_url": action_url,
-            "weight_unit": unit,
+            "weight_unit": profile.weight_unit if profile else "kg",
         },
     )
 
@@ -168,11 +185,14 @@ def get_new_set_form(
     profile_repo: DynamoProfileRepository = Depends(get_profile_repo),
 ):
     logger.debug(
-        f"Getting new set form for workout {workout_id} on {workout_date} for exercise {exercise_id}"
+        "Getting new set form for workout %s on %s for exercise %s",
+        workout_id,
+        workout_date,
+        exercise_id,
     )
 
     user_sub = claims["sub"]
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     action_url = (
         str(
@@ -216,12 +236,15 @@ def create_workout(
 
     return Response(
         status_code=204,
-        headers={"HX-Redirect": f"/workout/{workout.date.isoformat()}/{workout.workout_id}"},
+        headers={
+            "HX-Redirect": f"/workout/{workout.date.isoformat()}/{workout.workout_id}"
+        },
     )
 
 
 @router.post("/{workout_date}/{workout_id}/set/add")
 def add_set(
+    request: Request,
     workout_date: DateType,
     workout_id: str,
     form: Annotated[WorkoutSetCreate, Depends(WorkoutSetCreate.as_form)],
@@ -239,7 +262,7 @@ def add_set(
         raise HTTPException(status_code=422, detail="exercise_id is required")
 
     user_sub = claims["sub"]
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     if unit == "lb" and form.weight_kg is not None:
         form.weight_kg = lb_to_kg(form.weight_kg)
@@ -247,7 +270,9 @@ def add_set(
     try:
         repo.add_set(user_sub, workout_date, workout_id, resolved_exercise_id, form)
     except WorkoutRepoError:
-        logger.exception(f"Error creating workout set user_sub={user_sub} workout_id={workout_id}")
+        logger.exception(
+            f"Error creating workout set user_sub={user_sub} workout_id={workout_id}"
+        )
         raise HTTPException(status_code=500, detail="Error creating workout set")
 
     return Response(status_code=204, headers={"HX-Trigger": "workoutSetChanged"})
@@ -268,11 +293,15 @@ def view_workout(
 ):
     user_sub = claims["sub"]
 
+    # The workout query and the profile read are independent, so issue both at once
+    workout_f, unit_f = fan_out(
+        lambda: workout_repo.get_workout_with_sets(user_sub, workout_date, workout_id),
+        lambda: get_weight_unit_for_user(request, user_sub, profile_repo),
+    )
+
     # ---- Fetch workout and sets -----
     try:
-        workout, sets = workout_repo.get_workout_with_sets(
-            user_sub, workout_date, workout_id
-        )
+        workout, sets = workout_f.result()
     except WorkoutNotFoundError:
         logger.warning(
             f"Workout {workout_id} not found for {user_sub}",
@@ -284,14 +313,18 @@ def view_workout(
         )
         raise HTTPException(status_code=500, detail="Error fetching workout")
 
-    logger.debug(
-        f"Fetched workout {workout_id} and {len(sets)} sets. Set numbers: {[s.set_number for s in sets]}",
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Fetched workout %s and %s sets. Set numbers: %s",
+            workout_id,
+            len(sets),
+            [s.set_number for s in sets],
+        )
 
     sets, defaults = get_sorted_sets_and_defaults(sets)
 
     # ---- Sort out units -----
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = unit_f.result()
 
     if unit == "lb":
         for s in sets:
@@ -381,7 +414,7 @@ def edit_workout_meta(
         )
         raise HTTPException(status_code=500, detail="Error fetching workout")
 
-    logger.debug(f"Loading edit meta form for workout {workout.workout_id}")
+    logger.debug("Loading edit meta form for workout %s", workout.workout_id)
 
     return render_template(
         request, "workouts/_edit_meta_form.html", context={"workout": workout}
@@ -401,7 +434,10 @@ def update_workout_meta(
     user_sub = claims["sub"]
 
     logger.info(
-        f"Updating workout meta user_sub={user_sub} date={workout_date.isoformat()} workout_id={workout_id}",
+        "Updating workout meta user_sub=%s date=%s workout_id=%s",
+        user_sub,
+        workout_date.isoformat(),
+        workout_id,
     )
 
     try:
@@ -435,7 +471,7 @@ def update_workout_meta(
             )
             raise HTTPException(status_code=500, detail="Error updating workout")
 
-        logger.debug(f"Updated metadata for workout {workout_id}. No date change.")
+        logger.debug("Updated metadata for workout %s. No date change.", workout_id)
 
         return render_template(
             request,
@@ -447,7 +483,10 @@ def update_workout_meta(
     else:
         try:
             logger.debug(
-                f"Moving workout date from {old_date} to {new_date} for {workout.workout_id}"
+                "Moving workout date from %s to %s for %s",
+                old_date,
+                new_date,
+                workout.workout_id,
             )
             workout = repo.move_workout_date(user_sub, workout, new_date, sets)
         except WorkoutRepoError:
@@ -463,7 +502,9 @@ def update_workout_meta(
         )
 
         logger.info(
-            f"Workout date changed for {workout_id}, issuing HX-Redirect to {new_url}",
+            "Workout date changed for %s, issuing HX-Redirect to %s",
+            workout_id,
+            new_url,
         )
 
         return Response(status_code=204, headers={"HX-Redirect": str(new_url)})
@@ -492,7 +533,7 @@ def get_edit_set_form(
         )
         raise HTTPException(status_code=500, detail="Error fetching set")
 
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     if unit == "lb" and set_.weight_kg is not None:
         set_.weight_kg = kg_to_lb(set_.weight_kg)
@@ -525,6 +566,7 @@ def get_edit_set_form(
 
 @router.post("/{workout_date}/{workout_id}/set/{set_number}")
 def edit_set(
+    request: Request,
     workout_date: DateType,
     workout_id: str,
     set_number: int,
@@ -535,7 +577,7 @@ def edit_set(
 ):
     user_sub = claims["sub"]
 
-    unit = get_weight_unit_for_user(user_sub, profile_repo)
+    unit = get_weight_unit_for_user(request, user_sub, profile_repo)
 
     if unit == "lb" and form.weight_kg is not None:
         form.weight_kg = lb_to_kg(form.weight_kg)
@@ -543,7 +585,9 @@ def edit_set(
     try:
         repo.edit_set(user_sub, workout_date, workout_id, set_number, form)
     except WorkoutNotFoundError:
-        logger.warning(f"Set {set_number} not found workout_id={workout_id} user_sub={user_sub}")
+        logger.warning(
+            f"Set {set_number} not found workout_id={workout_id} user_sub={user_sub}"
+        )
         raise HTTPException(status_code=404, detail="Set not found")
     except WorkoutRepoError:
         logger.exception(
@@ -567,7 +611,7 @@ def delete_workout(
     user_sub = claims["sub"]
 
     try:
-        logger.info(f"Deleting workout workout_id={workout_id} user_sub={user_sub}")
+        logger.info("Deleting workout workout_id=%s user_sub=%s", workout_id, user_sub)
         repo.delete_workout_and_sets(user_sub, workout_date, workout_id)
     except WorkoutRepoError:
         logger.exception(
@@ -591,7 +635,12 @@ def delete_set(
     user_sub = claims["sub"]
 
     try:
-        logger.info(f"Deleting set set_number={set_number} workout_id={workout_id} user_sub={user_sub}")
+        logger.info(
+            "Deleting set set_number=%s workout_id=%s user_sub=%s",
+            set_number,
+            workout_id,
+            user_sub,
+        )
         repo.delete_set(user_sub, workout_date, workout_id, set_number)
     except WorkoutRepoError:
         logger.exception(
@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     ENV: str = "dev"
     DDB_TABLE_NAME: str = "gymbyte-dev-table"
     DDB_ENDPOINT_URL: str | None = None
+    # Slim INCLUDE-projected GSI read by the progress charts.
+    # See scripts/migrate_exercise_index.py for the cutover from ExerciseIndex.
+    DDB_EXERCISE_PROGRESS_INDEX: str = "ExerciseProgressIndex"
     model_config = SettingsConfigDict(env_file=None)
 
     # ──────────────────── Auth ─────────────────────
@@ -53,11 +56,89 @@ class Settings(BaseSettings):
         "/auth",
     )
 
+    # ──────────────────── Metrics ─────────────────────
+    # Per-request DynamoDB, JWT and render timings (see app/utils/metrics.py):
+    # a Server-Timing header when ENV=dev, a summary log line otherwise.
+    METRICS_ENABLED: bool = True
+
+    # ──────────────────── Compression ─────────────────────
+    # gzip for dynamic responses (see app/middleware/compression.py); static
+    # files are precompressed at build time instead.
+    COMPRESSION_ENABLED: bool = True
+    # Smaller bodies gain too little to pay for the compressor.
+    COMPRESSION_MIN_SIZE: int = 500
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_CONTENT_TYPES: Tuple[str, ...] = (
+        "text/html",
+        "application/json",
+        "text/plain",
+    )
+
+    # ──────────────────── Session preferences ─────────────────────
+    # Key for the signed cookie that carries units and timezone so most
+    # requests skip the profile read (see app/utils/session_prefs.py).
+    # Empty: no cookie, every request reads the profile.
+    SESSION_PREFS_SECRET: str = ""
+    # Past this age the cookie is re-checked against the profile.
+    SESSION_PREFS_MAX_AGE_SECONDS: int = 3600
+
     # ──────────────────── Theme ─────────────────────
     DEFAULT_THEME: str = "volt"
     THEMES: Tuple[str, ...] = ("volt", "arctic", "ultraviolet")
     THEME_EXCLUDED_PREFIXES: Tuple[str, ...] = ("/static",)
 
+    # ──────────────────── Imports ─────────────────────
+    # Local ENV=dev runs import jobs on in-process threads, with uploads
+    # waiting here until their job has finished with them.
+    IMPORT_UPLOAD_DIR: str = "/tmp/gymbyte-imports"
+    IMPORT_WORKER_THREADS: int = 2
+    # Deployed, uploads go to this bucket and jobs to this SQS queue, whose
+    # worker Lambda runs app/import_worker.py (see infra/app.yaml).
+    IMPORT_UPLOAD_BUCKET: str = ""
+    IMPORT_QUEUE_URL: str = ""
+    # Worker time per delivery before a job checkpoints and re-queues
+    # itself; inside the worker Lambda's timeout.
+    IMPORT_JOB_MAX_SECONDS: int = 240
+    # Deliveries of a crashing job before it is marked failed.
+    IMPORT_JOB_MAX_ATTEMPTS: int = 3
+    # Records processed between checkpoints of an import job.
+    IMPORT_CHUNK_RECORDS: int = 200
+    IMPORT_JOB_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # ──────────────────── Warm-up ─────────────────────
+    # Done at Lambda init / uvicorn startup so the first request doesn't pay
+    # for it: DynamoDB client and connection, JWKS fetch, template compiles.
+    WARMUP_ENABLED: bool = True
+    WARMUP_TEMPLATES: Tuple[str, ...] = (
+        "base.html",
+        "home.html",
+        "error.html",
+        "workouts/workouts.html",
+        "workouts/workout_detail.html",
+        "progress/progress.html",
+        "profile/profile.html",
+    )
+
+    # ──────────────────── Templates ─────────────────────
+    # Compiled template bytecode, for templates missing from the precompiled
+    # zip (see app/templates/templates.py). Empty disables the cache.
+    TEMPLATE_BYTECODE_CACHE_DIR: str = "/tmp/gymbyte-jinja"
+
+    # ──────────────────── Fragment cache ─────────────────────
+    # Rendered partials kept per process (see app/utils/fragment_cache.py),
+    # e.g. each user's exercise picker. 0 disables caching.
+    FRAGMENT_CACHE_MAX_ENTRIES: int = 1000
+
+    # ──────────────────── Reads ─────────────────────
+    # Build models from items stamped by to_ddb_item() without re-running
+    # validation (see app/models/trusted.py). Off: validate every read.
+    TRUSTED_MODEL_LOADS: bool = True
+
+    # ──────────────────── Delta exports ─────────────────────
+    # Deleted exercises, workouts and sets leave a tombstone this long, so
+    # `?since=` exports can report them. Older `since` values need a full export.
+    TOMBSTONE_RETENTION_DAYS: int = 90
+
     # ─────────────────────────────────────────
 
     def cognito_base_url(self) -> str:
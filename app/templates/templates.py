@@ -1,11 +1,114 @@
+import logging
+import os
+
 from fastapi import Request
 from fastapi.templating import Jinja2Templates
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+    pass_context,
+    select_autoescape,
+)
+from starlette.datastructures import URL
 
 from app.settings import settings
-from app.utils import dates
+from app.utils import dates, metrics
 from app.utils.log import logger
+from app.utils.static_assets import asset_path
+
+# Logs on every render; sampled by default (see LOG_SAMPLE_RATES).
+render_logger = logging.getLogger("gymbyte.render")
+
+TEMPLATE_DIR = "app/templates"
+TEMPLATE_EXTENSIONS = ("html",)
+# Built into the Lambda artifact by scripts/compile_templates.py; absent in a
+# checkout, where templates load (and reload) from source.
+PRECOMPILED_TEMPLATES = os.path.join(TEMPLATE_DIR, "compiled.zip")
+
 
-templates = Jinja2Templates(directory="app/templates")
+def _source_environment(**kwargs) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(), **kwargs
+    )
+
+
+def compile_templates(target: str) -> None:
+    """Compile every template to a zip of Python modules for ModuleLoader."""
+    _source_environment().compile_templates(
+        target,
+        extensions=TEMPLATE_EXTENSIONS,
+        zip="deflated",
+        ignore_errors=False,
+        log_function=logger.debug,
+    )
+
+
+def _bytecode_cache() -> BytecodeCache | None:
+    cache_dir = settings.TEMPLATE_BYTECODE_CACHE_DIR
+    if not cache_dir:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Template bytecode cache disabled dir={cache_dir} err={e}")
+        return None
+    return FileSystemBytecodeCache(cache_dir)
+
+
+@pass_context
+def _url_for(context: dict, name: str, /, **path_params) -> URL:
+    """Starlette's url_for, with static paths resolved to their fingerprinted names."""
+    if name == "static" and "path" in path_params:
+        path_params["path"] = asset_path(path_params["path"])
+    return context["request"].url_for(name, **path_params)
+
+
+def create_environment(precompiled: str = PRECOMPILED_TEMPLATES) -> Environment:
+    """
+    Templates come from the precompiled zip when there is one, skipping
+    parsing and code generation entirely; anything missing from it (or all
+    of them, without one) is compiled from source through the bytecode
+    cache, which is keyed on the source checksum so edits are picked up.
+    """
+    loader: BaseLoader = FileSystemLoader(TEMPLATE_DIR)
+    if os.path.exists(precompiled):
+        loader = ChoiceLoader([ModuleLoader(precompiled), loader])
+    env = Environment(
+        loader=loader,
+        autoescape=select_autoescape(),
+        bytecode_cache=_bytecode_cache(),
+    )
+    env.globals["url_for"] = _url_for
+    return env
+
+
+templates = Jinja2Templates(env=create_environment())
+
+
+def request_theme(request: Request) -> str:
+    return getattr(request.state, "theme", settings.DEFAULT_THEME)
+
+
+def _base_context(request: Request) -> dict:
+    return {
+        "current_year": dates.now().year,
+        "theme": request_theme(request),
+    }
+
+
+def render_fragment(
+    request: Request, template_name: str, context: dict | None = None
+) -> str:
+    """Render a partial to a string, with the same context render_template gives it."""
+    with metrics.timed("render"):
+        return templates.get_template(template_name).render(
+            {"request": request, **_base_context(request), **(context or {})}
+        )
 
 
 def render_template(
@@ -16,19 +119,16 @@ def render_template(
     status_code: int = 200,
     headers: dict | None = None,
 ):
-    theme = getattr(request.state, "theme", settings.DEFAULT_THEME)
+    base_context = _base_context(request)
 
-    base_context = {
-        "current_year": dates.now().year,
-        "theme": theme,
-    }
-
-    logger.debug(f"Base context: {base_context}")
+    render_logger.debug("Base context: %s", base_context)
 
-    return templates.TemplateResponse(
-        request,
-        template_name,
-        {**base_context, **(context or {})},
-        status_code=status_code,
-        headers=headers,
-    )
+    # TemplateResponse renders the template as it is built.
+    with metrics.timed("render"):
+        return templates.TemplateResponse(
+            request,
+            template_name,
+            {**base_context, **(context or {})},
+            status_code=status_code,
+            headers=headers,
+        )
@@ -2,11 +2,11 @@ from datetime import datetime, timezone
 from typing import Any, Dict
 
 import jwt
-import requests
 from fastapi import HTTPException, Request, Response
 from jwt import InvalidTokenError, PyJWKClient
 
 from app.settings import settings
+from app.utils import metrics
 from app.utils.log import logger
 
 ISSUER_URL = settings.COGNITO_ISSUER_URL
@@ -66,16 +66,17 @@ def decode_and_validate_id_token(
     """
     Decode the ID token, verify signature and claims, return decoded
     """
-    jwks_client = _get_jwks_client(jwks_url)
-    signing_key = jwks_client.get_signing_key_from_jwt(id_token).key
-
-    decoded_token = jwt.decode(
-        id_token,
-        signing_key,
-        algorithms=["RS256"],
-        issuer=issuer,
-        audience=audience,
-    )
+    with metrics.timed("jwt"):
+        jwks_client = _get_jwks_client(jwks_url)
+        signing_key = jwks_client.get_signing_key_from_jwt(id_token).key
+
+        decoded_token = jwt.decode(
+            id_token,
+            signing_key,
+            algorithms=["RS256"],
+            issuer=issuer,
+            audience=audience,
+        )
 
     logger.debug("JWT successfully decoded and verified")
 
@@ -98,7 +99,7 @@ def log_sub_and_exp(decoded_token: Dict[str, Any]):  # pragma: no cover
         else None
     )
     sub = decoded_token.get("sub")
-    logger.info(f"Authenticated user sub={sub}, token exp={exp_time}")
+    logger.info("Authenticated user sub=%s, token exp=%s", sub, exp_time)
 
 
 def set_state(sub, request):
@@ -108,6 +109,8 @@ def set_state(sub, request):
 
 def attempt_token_refresh(refresh_token: str) -> dict:
     """Call Cognito's token endpoint with grant_type=refresh_token. Returns response JSON."""
+    import requests  # only needed on refresh; kept out of cold start
+
     data = {
         "grant_type": "refresh_token",
         "client_id": AUDIENCE,
@@ -115,11 +118,13 @@ def attempt_token_refresh(refresh_token: str) -> dict:
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     resp = requests.post(settings.token_url(), data=data, headers=headers, timeout=5)
-    logger.debug(f"Token refresh status_code={resp.status_code}")
+    logger.debug("Token refresh status_code=%s", resp.status_code)
 
     if resp.status_code != 200:
         logger.warning(f"Token refresh failed: {resp.text}")
-        raise HTTPException(status_code=401, detail="Session expired. Please log in again.")
+        raise HTTPException(
+            status_code=401, detail="Session expired. Please log in again."
+        )
 
     return resp.json()
 
@@ -158,23 +163,46 @@ def require_auth(request: Request, response: Response):
 
         refresh_token = request.cookies.get("refresh_token")
         if not refresh_token:
-            raise HTTPException(status_code=401, detail="Session expired. Please log in again.")
+            raise HTTPException(
+                status_code=401, detail="Session expired. Please log in again."
+            )
 
         token_data = attempt_token_refresh(refresh_token)
 
-        response.set_cookie(key="id_token", value=token_data["id_token"], max_age=token_data["expires_in"], **COOKIE_OPTS)
-        response.set_cookie(key="access_token", value=token_data["access_token"], max_age=token_data["expires_in"], **COOKIE_OPTS)
+        response.set_cookie(
+            key="id_token",
+            value=token_data["id_token"],
+            max_age=token_data["expires_in"],
+            **COOKIE_OPTS,
+        )
+        response.set_cookie(
+            key="access_token",
+            value=token_data["access_token"],
+            max_age=token_data["expires_in"],
+            **COOKIE_OPTS,
+        )
         if "refresh_token" in token_data:
-            response.set_cookie(key="refresh_token", value=token_data["refresh_token"], max_age=60 * 60 * 24 * 7, **COOKIE_OPTS)
+            response.set_cookie(
+                key="refresh_token",
+                value=token_data["refresh_token"],
+                max_age=60 * 60 * 24 * 7,
+                **COOKIE_OPTS,
+            )
 
         new_id_token = token_data["id_token"]
         try:
             decoded_token = decode_and_validate_id_token(
-                id_token=new_id_token, jwks_url=jwks_url, issuer=issuer_url, audience=AUDIENCE
+                id_token=new_id_token,
+                jwks_url=jwks_url,
+                issuer=issuer_url,
+                audience=AUDIENCE,
             )
         except Exception as e:
             logger.error(f"Failed to validate refreshed id_token: {e}")
-            raise HTTPException(status_code=401, detail="Refreshed token is invalid. Please log in again.")
+            raise HTTPException(
+                status_code=401,
+                detail="Refreshed token is invalid. Please log in again.",
+            )
         sub = decoded_token.get("sub")
         set_state(sub, request)
         return decoded_token
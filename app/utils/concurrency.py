@@ -0,0 +1,26 @@
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+# Shared across requests so warm Lambda containers reuse the threads.
+_MAX_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="fanout")
+
+
+def fan_out(*calls: Callable[[], Any]) -> list[Future]:
+    """
+    Run independent blocking calls (typically repository reads) concurrently.
+
+    Returns one Future per call, in the same order, once every call has
+    finished. Call .result() on each to get its value or re-raise its
+    exception, so routes keep their per-call error handling.
+
+    Each call runs in a copy of the caller's context, so contextvars set for
+    the request are visible inside it. Calls must not share a Table object:
+    pass callables bound to different repositories, each of which gets its
+    own Table from db.get_table() over the process-wide resource.
+    """
+    futures = [_executor.submit(contextvars.copy_context().run, call) for call in calls]
+    wait(futures)
+    return futures
@@ -1,5 +1,6 @@
 from datetime import date, datetime, timezone
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
 
 # ----------- ISO -----------
 
@@ -33,6 +34,24 @@ def now() -> datetime:
 # ----------- Timezone -----------
 
 
+@lru_cache(maxsize=1)
+def timezone_names() -> tuple[str, ...]:
+    """
+    Sorted IANA timezone names. available_timezones() walks the tz database
+    on every call, so this is built once, on first use.
+    """
+    return tuple(sorted(available_timezones()))
+
+
+@lru_cache(maxsize=1)
+def _timezone_name_set() -> frozenset[str]:
+    return frozenset(timezone_names())
+
+
+def is_valid_timezone(tz_name: str) -> bool:
+    return tz_name in _timezone_name_set()
+
+
 def _safe_zoneinfo(tz_name: str | None) -> ZoneInfo:
     """
     Return a ZoneInfo for tz_name, falling back to UTC if tz_name is missing/invalid.
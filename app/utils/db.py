@@ -1,27 +1,57 @@
+import threading
 import time
 from datetime import date as DateType
+from datetime import datetime, timezone
 
 import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from app.settings import settings
+from app.utils import metrics
 from app.utils.log import logger
 
 REGION_NAME = settings.REGION
 TABLE_NAME = settings.DDB_TABLE_NAME
 
+# Non-key attributes projected into ExerciseProgressIndex. Table and index
+# keys (PK, SK, ExercisePK, ExerciseSK) are always projected by DynamoDB.
+EXERCISE_PROGRESS_INDEX_ATTRS = ("exercise_id", "reps", "weight_kg", "rpe")
+
+
+_dynamo_resource = None
+_dynamo_resource_lock = threading.Lock()
+
 
 def get_dynamo_resource():
-    kwargs = {"region_name": REGION_NAME}
-    if settings.DDB_ENDPOINT_URL:
-        kwargs["endpoint_url"] = settings.DDB_ENDPOINT_URL
-    return boto3.resource("dynamodb", **kwargs)
+    """
+    Return the process-wide DynamoDB service resource, creating it on first use.
+
+    Creating one resolves credentials and the endpoint, loads the service
+    model and starts a new connection pool (so a new TLS handshake), so
+    this happens once per container rather than once per repository.
+    """
+    global _dynamo_resource
+    if _dynamo_resource is None:
+        with _dynamo_resource_lock:
+            if _dynamo_resource is None:
+                kwargs = {"region_name": REGION_NAME}
+                if settings.DDB_ENDPOINT_URL:
+                    kwargs["endpoint_url"] = settings.DDB_ENDPOINT_URL
+                _dynamo_resource = boto3.resource("dynamodb", **kwargs)
+    return _dynamo_resource
 
 
 def get_table():
+    """
+    Return a new Table for the app's table. Each caller gets its own Table
+    object (resources are not thread-safe); they share the resource's
+    low-level client, which is, and with it the open connections.
+    """
     resource = get_dynamo_resource()
     logger.debug(
-        f"DynamoDB table config table_name={TABLE_NAME} endpoint_url={settings.DDB_ENDPOINT_URL}"
+        "DynamoDB table config table_name=%s endpoint_url=%s",
+        TABLE_NAME,
+        settings.DDB_ENDPOINT_URL,
     )
     return resource.Table(TABLE_NAME)  # type: ignore
 
@@ -42,6 +72,16 @@ def build_workout_sk(workout_date: DateType, workout_id: str) -> str:
     return f"WORKOUT#{workout_date.isoformat()}#{workout_id}"
 
 
+def build_workout_sk_range(start_date: DateType, end_date: DateType) -> tuple[str, str]:
+    """
+    Inclusive SK bounds covering every workout and set item dated
+    start_date..end_date, for use with Key("SK").between(...). e.g.:
+    (WORKOUT#2025-11-01, WORKOUT#2025-11-30~)
+    "~" sorts after "#", so the upper bound includes all items on end_date.
+    """
+    return f"WORKOUT#{start_date.isoformat()}", f"WORKOUT#{end_date.isoformat()}~"
+
+
 def build_set_prefix(workout_date: DateType, workout_id: str) -> str:
     """
     Prefix for set items under a workout, e.g.:
@@ -91,6 +131,36 @@ def build_template_set_sk(template_id: str, set_number: int) -> str:
     return f"{build_template_set_prefix(template_id)}{set_number:03d}"
 
 
+def build_import_job_sk(job_id: str) -> str:
+    """
+    Sort key for an import job item.
+    Example: IMPORT_JOB#<uuid>
+    """
+    return f"IMPORT_JOB#{job_id}"
+
+
+# Fixed-width so that tombstone SKs sort by deletion time.
+_TOMBSTONE_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def build_tombstone_prefix(deleted_at: datetime) -> str:
+    """
+    SK prefix for tombstones written at deleted_at; as a lower bound it
+    selects every later deletion. e.g.:
+    TOMBSTONE#2025-11-04T09:30:00.000000Z
+    """
+    stamp = deleted_at.astimezone(timezone.utc).strftime(_TOMBSTONE_TIME_FORMAT)
+    return f"TOMBSTONE#{stamp}"
+
+
+def build_tombstone_sk(deleted_at: datetime, deleted_sk: str) -> str:
+    """
+    Sort key recording the deletion of the item with SK deleted_sk, e.g.:
+    TOMBSTONE#2025-11-04T09:30:00.000000Z#WORKOUT#2025-11-01#W1
+    """
+    return f"{build_tombstone_prefix(deleted_at)}#{deleted_sk}"
+
+
 # ─────────────────────────────────────────────────────────────
 # Rate limiting
 # ─────────────────────────────────────────────────────────────
@@ -135,7 +205,9 @@ def rate_limit_hit(
     table = get_table()
 
     try:
-        resp = table.update_item(
+        resp = metrics.ddb_call(
+            "rate_limit",
+            table.update_item,
             Key={"PK": pk, "SK": sk},
             UpdateExpression="ADD #count :inc SET #expires_at = :expires_at",
             ExpressionAttributeNames={
@@ -162,7 +234,12 @@ def rate_limit_hit(
     count = int(resp["Attributes"]["count"])
     if count > limit:
         logger.info(
-            f"Rate limit exceeded.\nClient bucket: {client_id[:64]}\nCount: {count}\nLimit: {limit}\nWindow id: {window_id}\nRetry after: {retry_after}",
+            "Rate limit exceeded.\nClient bucket: %s\nCount: %s\nLimit: %s\nWindow id: %s\nRetry after: %s",
+            client_id[:64],
+            count,
+            limit,
+            window_id,
+            retry_after,
         )
         return (False, retry_after)
 
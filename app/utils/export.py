@@ -1,23 +1,138 @@
 from __future__ import annotations
 
+import gzip
+import io
+import itertools
 import json
-from datetime import date, datetime
+import os
+import shutil
+import sqlite3
+import tempfile
+import zlib
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from typing import BinaryIO, Iterable, Iterator, Literal, TextIO
 
-from app.models.export import (
-    ExportExercise,
-    ExportPayload,
-    ExportSet,
-    ExportUser,
-    ExportWorkout,
-)
+from app.models.exercise import Exercise
+from app.models.export import ExportPayload, ExportSummary
 from app.models.profile import UserProfile
+from app.models.tombstone import Tombstone
+from app.models.workout import Workout, WorkoutSet
 from app.repositories.exercise import DynamoExerciseRepository
 from app.repositories.workout import DynamoWorkoutRepository
+from app.settings import settings
 from app.utils.dates import dt_to_iso, now
 
-SUPPORTED_SCHEMA_VERSIONS = frozenset({1})
-_MAX_IMPORT_BYTES = 5 * 1024 * 1024  # 5 MB
+# Schema v2 is the delta format: changes since a timestamp, plus deletions.
+DELTA_SCHEMA_VERSION = 2
+SUPPORTED_SCHEMA_VERSIONS = frozenset({1, DELTA_SCHEMA_VERSION})
+# Applies to the decompressed file. Imports are parsed incrementally, so this
+# bounds request time rather than memory.
+_MAX_IMPORT_MB = 50
+_MAX_IMPORT_BYTES = _MAX_IMPORT_MB * 1024 * 1024
+_READ_CHUNK_CHARS = 64 * 1024
+_INDENT = 2
+
+ExportFormat = Literal["json", "json.gz", "ndjson", "ndjson.gz", "sqlite"]
+
+# Each format name doubles as the download's file extension.
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "json": "application/json",
+    "json.gz": "application/gzip",
+    "ndjson": "application/x-ndjson",
+    "ndjson.gz": "application/gzip",
+    "sqlite": "application/vnd.sqlite3",
+}
+
+_HEADER = "header"
+_DELETED = "deleted"
+# top-level array key -> record kind, in the order they appear in a file
+_RECORD_ARRAYS = {"exercises": "exercise", "workouts": "workout", "deleted": _DELETED}
+_RECORD_ORDER = {kind: rank for rank, kind in enumerate(_RECORD_ARRAYS.values())}
+_GZIP_MAGIC = b"\x1f\x8b"
+_GZIP_WBITS = 16 + zlib.MAX_WBITS  # gzip container rather than raw zlib
+_GZIP_LEVEL = 6
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+_SQLITE_ROWS_PER_INSERT = 500
+_FILE_CHUNK_BYTES = 64 * 1024
+
+# Normalised tables for the sqlite format. List fields (muscles, tags) and
+# the header's user are stored as JSON text, timestamps as ISO 8601 text.
+# Indexes are created after the rows are loaded.
+_SQLITE_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE exercises (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    muscles TEXT NOT NULL,
+    equipment TEXT NOT NULL,
+    category TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE workouts (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    name TEXT NOT NULL,
+    tags TEXT,
+    notes TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE sets (
+    workout_id TEXT NOT NULL REFERENCES workouts (id),
+    set_number INTEGER NOT NULL,
+    exercise_id TEXT NOT NULL,
+    reps INTEGER NOT NULL,
+    weight_kg REAL,
+    rpe INTEGER,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (workout_id, set_number)
+);
+CREATE TABLE deleted (
+    kind TEXT NOT NULL,
+    id TEXT,
+    workout_id TEXT,
+    date TEXT,
+    set_number INTEGER,
+    deleted_at TEXT NOT NULL
+);
+"""
+_SQLITE_INDEXES = """
+CREATE INDEX workouts_date ON workouts (date);
+CREATE INDEX sets_exercise_id ON sets (exercise_id);
+"""
+_EXERCISE_COLUMNS = (
+    "id",
+    "name",
+    "muscles",
+    "equipment",
+    "category",
+    "created_at",
+    "updated_at",
+)
+_WORKOUT_COLUMNS = ("id", "date", "name", "tags", "notes", "created_at", "updated_at")
+_SET_COLUMNS = (
+    "workout_id",
+    "set_number",
+    "exercise_id",
+    "reps",
+    "weight_kg",
+    "rpe",
+    "created_at",
+    "updated_at",
+)
+_SELECT_WORKOUT_SETS = f"SELECT {', '.join(_SET_COLUMNS[1:])} FROM sets WHERE workout_id = ? ORDER BY set_number"
+_DELETED_COLUMNS = ("kind", "id", "workout_id", "date", "set_number", "deleted_at")
+# An uploaded SQLite file is untrusted: import reads only these, and each
+# must be a real table. A view (or a trigger) could run any query at all.
+_SQLITE_IMPORT_TABLES = ("meta", "exercises", "workouts", "sets", "deleted")
+# Reading aborts after this many SQLite VM steps. A 50 MB export takes
+# about 4 million; a runaway query reaches the limit in about a second.
+_SQLITE_MAX_STEPS = 50_000_000
+_SQLITE_PROGRESS_INTERVAL = 10_000
+_NOT_SQLITE_EXPORT = "File is not a valid GymByte SQLite export"
 
 
 class _ExportEncoder(json.JSONEncoder):
@@ -31,106 +146,795 @@ class _ExportEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-def build_export_payload(
+def check_delta_since(since: datetime) -> datetime:
+    """
+    Return `since` as an aware UTC datetime, or raise ValueError if it is
+    older than the tombstones that record deletions are kept for.
+    """
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if since < now() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS):
+        raise ValueError(
+            f"'since' is more than {settings.TOMBSTONE_RETENTION_DAYS} days ago; "
+            "use a full export instead."
+        )
+    return since
+
+
+class ExportDelta:
+    """
+    Selects the contents of a schema v2 export: records updated after
+    `since`, and the deletions in `tombstones` whose item has not been
+    re-created since (set numbers, for one, can be reused).
+
+    Every exported item must be passed through changed(), which is also
+    how re-created items are spotted.
+    """
+
+    def __init__(self, since: datetime, tombstones: Iterable[Tombstone]):
+        self.since = since
+        self._tombstones: dict[str, Tombstone] = {}
+        for t in sorted(tombstones, key=lambda t: t.deleted_at):
+            self._tombstones[t.deleted_sk] = t
+
+    def changed(self, item: Exercise | Workout | WorkoutSet) -> bool:
+        self._tombstones.pop(item.SK, None)
+        return item.updated_at > self.since
+
+    def deletions(self) -> Iterator[dict]:
+        for t in sorted(self._tombstones.values(), key=lambda t: t.deleted_at):
+            record = _deletion_record(t)
+            if record is not None:
+                yield record
+
+
+def _deletion_record(t: Tombstone) -> dict | None:
+    # Keys follow the ExportDeleted* models.
+    parts = t.deleted_sk.split("#")
+    if parts[0] == "EXERCISE" and len(parts) == 2:
+        return {"kind": "exercise", "id": parts[1], "deleted_at": t.deleted_at}
+    if parts[0] == "WORKOUT" and len(parts) == 3:
+        return {
+            "kind": "workout",
+            "id": parts[2],
+            "date": parts[1],
+            "deleted_at": t.deleted_at,
+        }
+    if parts[0] == "WORKOUT" and len(parts) == 5 and parts[3] == "SET":
+        return {
+            "kind": "set",
+            "workout_id": parts[2],
+            "date": parts[1],
+            "set_number": int(parts[4]),
+            "deleted_at": t.deleted_at,
+        }
+    return None
+
+
+def _exercise_record(e: Exercise) -> dict:
+    # Keys follow ExportExercise field order; schema v1 output depends on it.
+    return {
+        "id": e.exercise_id,
+        "name": e.name,
+        "muscles": e.muscles,
+        "equipment": e.equipment,
+        "category": e.category,
+        "created_at": e.created_at,
+        "updated_at": e.updated_at,
+    }
+
+
+def _workout_record(w: Workout, sets: list[WorkoutSet]) -> dict:
+    return {
+        "id": w.workout_id,
+        "date": w.date,
+        "name": w.name,
+        "tags": w.tags,
+        "notes": w.notes,
+        "created_at": w.created_at,
+        "updated_at": w.updated_at,
+        "sets": [
+            {
+                "set_number": s.set_number,
+                "exercise_id": s.exercise_id,
+                "reps": s.reps,
+                "weight_kg": s.weight_kg,
+                "rpe": s.rpe,
+                "created_at": s.created_at,
+                "updated_at": s.updated_at,
+            }
+            for s in sets
+        ],
+    }
+
+
+def _encode(value, depth: int) -> str:
+    """
+    Encode one value as it would appear `depth` levels deep in a document
+    dumped with indent=2. JSON strings never contain raw newlines, so
+    re-indenting the continuation lines is safe.
+    """
+    text = json.dumps(value, indent=_INDENT, cls=_ExportEncoder)
+    return text.replace("\n", "\n" + " " * (_INDENT * depth))
+
+
+def _encode_array(records: Iterable[dict], depth: int) -> Iterator[str]:
+    pad = " " * (_INDENT * (depth + 1))
+    first = True
+    for record in records:
+        yield ("[\n" if first else ",\n") + pad + _encode(record, depth + 1)
+        first = False
+    yield "[]" if first else "\n" + " " * (_INDENT * depth) + "]"
+
+
+def _user_record(profile: UserProfile) -> dict:
+    return {
+        "display_name": profile.display_name,
+        "email": profile.email,
+        "timezone": profile.timezone,
+        "preferences": profile.preferences.model_dump(),
+    }
+
+
+def _iter_exercises(
+    user_sub: str,
+    exercise_repo: DynamoExerciseRepository,
+    summary: ExportSummary,
+    delta: ExportDelta | None = None,
+) -> Iterator[dict]:
+    for e in exercise_repo.iter_all_for_user(user_sub):
+        if delta is not None and not delta.changed(e):
+            continue
+        summary.exercises += 1
+        yield _exercise_record(e)
+
+
+def _iter_workouts(
+    user_sub: str,
+    workout_repo: DynamoWorkoutRepository,
+    summary: ExportSummary,
+    delta: ExportDelta | None = None,
+) -> Iterator[dict]:
+    for w, sets in workout_repo.iter_workout_data_for_user(user_sub):
+        if delta is not None:
+            # A changed set re-exports its workout with all current sets.
+            changed = [delta.changed(w)] + [delta.changed(s) for s in sets]
+            if not any(changed):
+                continue
+        summary.workouts += 1
+        summary.sets += len(sets)
+        yield _workout_record(w, sets)
+
+
+def _iter_deletions(delta: ExportDelta, summary: ExportSummary) -> Iterator[dict]:
+    for record in delta.deletions():
+        summary.deleted += 1
+        yield record
+
+
+def stream_export(
+    user_sub: str,
+    profile: UserProfile,
+    workout_repo: DynamoWorkoutRepository,
+    exercise_repo: DynamoExerciseRepository,
+    summary: ExportSummary | None = None,
+    delta: ExportDelta | None = None,
+) -> Iterator[str]:
+    """
+    Yield a schema v1 export document as text chunks.
+
+    Repository pages are consumed lazily and each record is encoded once
+    as it is written, so only a single day of workouts is held in memory.
+    The output is identical to dumping the full ExportPayload with indent=2.
+    If `summary` is given, its counts are updated as records are written.
+
+    With `delta`, yields a schema v2 document instead: "since", the records
+    it selects and a trailing "deleted" array.
+    """
+    summary = summary if summary is not None else ExportSummary()
+    schema_version = 1 if delta is None else DELTA_SCHEMA_VERSION
+
+    yield "{\n"
+    yield f'  "schema_version": {schema_version},\n'
+    yield f'  "exported_at": {_encode(now(), 1)},\n'
+    if delta is not None:
+        yield f'  "since": {_encode(delta.since, 1)},\n'
+    yield f'  "user": {_encode(_user_record(profile), 1)},\n'
+    yield '  "exercises": '
+    yield from _encode_array(
+        _iter_exercises(user_sub, exercise_repo, summary, delta), 1
+    )
+    yield ',\n  "workouts": '
+    yield from _encode_array(_iter_workouts(user_sub, workout_repo, summary, delta), 1)
+    if delta is not None:
+        yield ',\n  "deleted": '
+        yield from _encode_array(_iter_deletions(delta, summary), 1)
+    yield "\n}"
+
+
+def stream_export_ndjson(
     user_sub: str,
     profile: UserProfile,
     workout_repo: DynamoWorkoutRepository,
     exercise_repo: DynamoExerciseRepository,
-) -> dict:
-    exercises = exercise_repo.get_all_for_user(user_sub)
-    workouts, sets = workout_repo.get_all_workout_data_for_user(user_sub)
-
-    # Group sets by workout_id
-    sets_by_workout: dict[str, list] = {}
-    for s in sets:
-        sets_by_workout.setdefault(s.workout_id, []).append(s)
-
-    export_exercises = [
-        ExportExercise(
-            id=e.exercise_id,
-            name=e.name,
-            muscles=e.muscles,
-            equipment=e.equipment,
-            category=e.category,
-            created_at=e.created_at,
-            updated_at=e.updated_at,
+    summary: ExportSummary | None = None,
+    delta: ExportDelta | None = None,
+) -> Iterator[str]:
+    """
+    Yield a schema v1 export as NDJSON, one compact record per line.
+
+    The first line is the header (schema_version, exported_at, user); every
+    following line is an exercise or a workout with its sets, tagged by
+    "type". With `delta`, a schema v2 export: the header adds "since" and
+    "deleted" lines follow the workouts.
+    """
+    summary = summary if summary is not None else ExportSummary()
+
+    def line(record: dict) -> str:
+        return json.dumps(record, separators=(",", ":"), cls=_ExportEncoder) + "\n"
+
+    header: dict = {
+        "type": _HEADER,
+        "schema_version": 1 if delta is None else DELTA_SCHEMA_VERSION,
+        "exported_at": now(),
+    }
+    if delta is not None:
+        header["since"] = delta.since
+    header["user"] = _user_record(profile)
+    yield line(header)
+
+    for record in _iter_exercises(user_sub, exercise_repo, summary, delta):
+        yield line({"type": "exercise", **record})
+    for record in _iter_workouts(user_sub, workout_repo, summary, delta):
+        yield line({"type": "workout", **record})
+    if delta is not None:
+        for record in _iter_deletions(delta, summary):
+            yield line({"type": _DELETED, **record})
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip text chunks incrementally, yielding compressed bytes as they fill."""
+    compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _sql_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, cls=_ExportEncoder)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return dt_to_iso(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class _SqliteTable:
+    """Buffers rows for one table and inserts them in batches."""
+
+    def __init__(self, conn: sqlite3.Connection, table: str, columns: tuple[str, ...]):
+        self._conn = conn
+        self._columns = columns
+        self._sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
         )
-        for e in exercises
-    ]
+        self._rows: list[tuple] = []
+
+    def add(self, record: dict) -> None:
+        self._rows.append(tuple(_sql_value(record.get(c)) for c in self._columns))
+        if len(self._rows) >= _SQLITE_ROWS_PER_INSERT:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._rows:
+            self._conn.executemany(self._sql, self._rows)
+            self._rows = []
 
-    export_workouts = []
-    for w in workouts:
-        workout_sets = sorted(
-            sets_by_workout.get(w.workout_id, []), key=lambda s: s.set_number
+
+def write_sqlite_export(
+    path: str,
+    user_sub: str,
+    profile: UserProfile,
+    workout_repo: DynamoWorkoutRepository,
+    exercise_repo: DynamoExerciseRepository,
+    summary: ExportSummary | None = None,
+    delta: ExportDelta | None = None,
+) -> None:
+    """
+    Write the export as a SQLite database at `path`.
+
+    Holds the same records as the JSON formats, normalised into exercises,
+    workouts and sets tables (plus "deleted" for deltas) with the header
+    fields in a key/value "meta" table. Rows are inserted in batches inside
+    one transaction; the file is scratch space until it is complete, so
+    journaling and syncing are turned off.
+    """
+    summary = summary if summary is not None else ExportSummary()
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(_SQLITE_SCHEMA)
+
+        meta: dict = {
+            "schema_version": 1 if delta is None else DELTA_SCHEMA_VERSION,
+            "exported_at": now(),
+            "user": _user_record(profile),
+        }
+        if delta is not None:
+            meta["since"] = delta.since
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [
+                (key, json.dumps(value, cls=_ExportEncoder))
+                for key, value in meta.items()
+            ],
         )
-        export_sets = [
-            ExportSet(
-                set_number=s.set_number,
-                exercise_id=s.exercise_id,
-                reps=s.reps,
-                weight_kg=float(s.weight_kg) if s.weight_kg is not None else None,
-                rpe=s.rpe,
-                created_at=s.created_at,
-                updated_at=s.updated_at,
-            )
-            for s in workout_sets
-        ]
-        export_workouts.append(
-            ExportWorkout(
-                id=w.workout_id,
-                date=w.date,
-                name=w.name,
-                tags=w.tags,
-                notes=w.notes,
-                created_at=w.created_at,
-                updated_at=w.updated_at,
-                sets=export_sets,
-            )
+
+        exercises = _SqliteTable(conn, "exercises", _EXERCISE_COLUMNS)
+        for record in _iter_exercises(user_sub, exercise_repo, summary, delta):
+            exercises.add(record)
+        exercises.flush()
+
+        workouts = _SqliteTable(conn, "workouts", _WORKOUT_COLUMNS)
+        sets = _SqliteTable(conn, "sets", _SET_COLUMNS)
+        for record in _iter_workouts(user_sub, workout_repo, summary, delta):
+            workouts.add(record)
+            for s in record["sets"]:
+                sets.add({"workout_id": record["id"], **s})
+        workouts.flush()
+        sets.flush()
+
+        if delta is not None:
+            deleted = _SqliteTable(conn, "deleted", _DELETED_COLUMNS)
+            for record in _iter_deletions(delta, summary):
+                deleted.add(record)
+            deleted.flush()
+
+        conn.executescript(_SQLITE_INDEXES)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def sqlite_export_chunks(
+    user_sub: str,
+    profile: UserProfile,
+    workout_repo: DynamoWorkoutRepository,
+    exercise_repo: DynamoExerciseRepository,
+    summary: ExportSummary | None = None,
+    delta: ExportDelta | None = None,
+) -> Iterator[bytes]:
+    """
+    Build the SQLite export in a temp file, then yield its bytes.
+
+    A database can't be streamed while it is written, so nothing is yielded
+    until the file is complete. The temp file is removed once it has been
+    read, or if the consumer stops early.
+    """
+    fd, path = tempfile.mkstemp(prefix="gymbyte-export-", suffix=".sqlite")
+    os.close(fd)
+    try:
+        write_sqlite_export(
+            path, user_sub, profile, workout_repo, exercise_repo, summary, delta
+        )
+        with open(path, "rb") as f:
+            while chunk := f.read(_FILE_CHUNK_BYTES):
+                yield chunk
+    finally:
+        os.remove(path)
+
+
+def export_chunks(
+    export_format: ExportFormat,
+    user_sub: str,
+    profile: UserProfile,
+    workout_repo: DynamoWorkoutRepository,
+    exercise_repo: DynamoExerciseRepository,
+    summary: ExportSummary | None = None,
+    delta: ExportDelta | None = None,
+) -> Iterator[bytes]:
+    """Yield the export encoded as bytes in the requested format."""
+    if export_format == "sqlite":
+        return sqlite_export_chunks(
+            user_sub, profile, workout_repo, exercise_repo, summary, delta
         )
 
-    payload = ExportPayload(
-        schema_version=1,
-        exported_at=now(),
-        user=ExportUser(
-            display_name=profile.display_name,
-            email=profile.email,
-            timezone=profile.timezone,
-            preferences=profile.preferences.model_dump(),
-        ),
-        exercises=export_exercises,
-        workouts=export_workouts,
+    writer = (
+        stream_export_ndjson if export_format.startswith("ndjson") else stream_export
     )
+    chunks = writer(user_sub, profile, workout_repo, exercise_repo, summary, delta)
+
+    if export_format.endswith(".gz"):
+        return gzip_chunks(chunks)
+    return (chunk.encode("utf-8") for chunk in chunks)
+
 
-    return json.loads(json.dumps(payload.model_dump(), cls=_ExportEncoder))
+class _Started:
+    """
+    A repository whose `method` iterator has already been started, and so
+    has read its first query page. Everything else passes through.
+    """
 
+    def __init__(self, repo, method: str, user_sub: str):
+        records = getattr(repo, method)(user_sub)
+        first = list(itertools.islice(records, 1))
+        self._repo = repo
+        self._method = method
+        self._records = itertools.chain(first, records)
 
-def serialise_export(payload_dict: dict) -> str:
-    return json.dumps(payload_dict, indent=2, cls=_ExportEncoder)
+    def __getattr__(self, name: str):
+        if name == self._method:
+            return lambda user_sub: self._records
+        return getattr(self._repo, name)
 
 
-def parse_import_file(content: bytes) -> ExportPayload:
+def read_first_pages(
+    user_sub: str,
+    workout_repo: DynamoWorkoutRepository,
+    exercise_repo: DynamoExerciseRepository,
+):
     """
-    Validate raw file bytes and return a parsed ExportPayload.
+    Start the workout and exercise reads an export makes, reading their
+    first pages now, and return (workout_repo, exercise_repo) to pass to
+    export_chunks instead. A repository that is failing outright raises
+    here, before any of the response has been sent.
+    """
+    return (
+        _Started(workout_repo, "iter_workout_data_for_user", user_sub),
+        _Started(exercise_repo, "iter_all_for_user", user_sub),
+    )
 
-    Raises ValueError with a human-readable message on any failure.
+
+class _LimitedReader(io.RawIOBase):
+    """Binary stream wrapper that fails once more than `limit` bytes are read."""
+
+    def __init__(self, stream: BinaryIO, limit: int):
+        self._stream = stream
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(min(len(buffer), self._remaining + 1))
+        self._remaining -= len(data)
+        if self._remaining < 0:
+            raise ValueError(f"File exceeds the {_MAX_IMPORT_MB} MB size limit.")
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class _JsonReader:
     """
-    if len(content) > _MAX_IMPORT_BYTES:
-        raise ValueError("File exceeds the 5 MB size limit.")
+    Pull-parser over a text stream for one top-level JSON object.
 
-    try:
-        raw = json.loads(content)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"File is not valid JSON: {e.msg}") from e
+    Individual values are decoded with json's raw_decode once enough of the
+    stream is buffered; already-consumed text is dropped on each refill, so
+    memory is bounded by the largest single value rather than the file.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, text: TextIO, initial: str = ""):
+        self._text = text
+        self._buf = initial
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int = _READ_CHUNK_CHARS) -> None:
+        chunk = self._text.read(size)
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        self._eof = not chunk
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos : self._pos + 1]
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"File is not valid JSON: expected {char!r}")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        size = _READ_CHUNK_CHARS
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number running into the end of the buffer may continue
+                # in the next chunk, so only accept a value with text after it.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise ValueError(f"File is not valid JSON: {e.msg}") from e
+            # Grow reads geometrically so a large value isn't re-parsed once
+            # per fixed-size chunk.
+            self._fill(size)
+            size *= 2
 
-    if not isinstance(raw, dict):
+
+def _iter_json_records(reader: _JsonReader) -> Iterator[tuple[str, dict]]:
+    if reader.peek() != "{":
+        reader.value()  # raises if the file isn't JSON at all
         raise ValueError("File must contain a JSON object at the top level.")
+    reader.expect("{")
 
-    schema_version = raw.get("schema_version")
-    if schema_version not in SUPPORTED_SCHEMA_VERSIONS:
-        raise ValueError(
-            f"Unsupported export version: {schema_version!r}. "
-            "Please re-export from a current version of GymByte."
+    header: dict = {}
+    header_sent = False
+    closed = reader.peek() == "}"
+
+    while not closed:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("File is not valid JSON: expected an object key")
+        reader.expect(":")
+
+        kind = _RECORD_ARRAYS.get(key)
+        if kind is None:
+            value = reader.value()
+            if not header_sent:
+                header[key] = value
+        else:
+            if not header_sent:
+                yield _HEADER, header
+                header_sent = True
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield kind, reader.value()
+                    if reader.peek() == "]":
+                        reader.expect("]")
+                        break
+                    reader.expect(",")
+
+        if reader.peek() == "}":
+            closed = True
+        else:
+            reader.expect(",")
+
+    reader.expect("}")
+    if reader.peek():
+        raise ValueError("File is not valid JSON: Extra data")
+    if not header_sent:
+        yield _HEADER, header
+
+
+def _iter_ndjson_records(lines: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {number} is not valid JSON: {e.msg}") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {number} must contain a JSON object.")
+
+        record_type = record.pop("type", None)
+        if record_type == _HEADER or record_type in _RECORD_ARRAYS.values():
+            yield record_type, record
+        else:
+            raise ValueError(f"Line {number} has unknown record type: {record_type!r}")
+
+
+def _is_ndjson_header(first_line: str) -> bool:
+    try:
+        first = json.loads(first_line)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(first, dict) and first.get("type") == _HEADER
+
+
+def _checked(records: Iterator[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+    """
+    Enforce the record order: header first, then exercises, workouts and
+    (schema v2 only) deletions.
+    """
+    schema_version = None
+    last_rank = 0
+    for index, (kind, record) in enumerate(records):
+        if kind == _HEADER:
+            if index:
+                raise ValueError("Import file header must come before any records.")
+            schema_version = record.get("schema_version")
+            if schema_version not in SUPPORTED_SCHEMA_VERSIONS:
+                raise ValueError(
+                    f"Unsupported export version: {schema_version!r}. "
+                    "Please re-export from a current version of GymByte."
+                )
+            if schema_version == DELTA_SCHEMA_VERSION and not record.get("since"):
+                raise ValueError("Delta export is missing its 'since' timestamp.")
+            yield kind, record
+            continue
+
+        if index == 0:
+            raise ValueError("Import file must start with its schema_version header.")
+        if kind == _DELETED and schema_version != DELTA_SCHEMA_VERSION:
+            raise ValueError(
+                "Only delta exports (schema_version 2) can contain deletions."
+            )
+
+        rank = _RECORD_ORDER[kind]
+        if rank < last_rank:
+            if kind == "exercise":
+                raise ValueError(
+                    "Exercises must come before workouts in the import file."
+                )
+            raise ValueError("Deletions must come last in the import file.")
+        last_rank = rank
+        yield kind, record
+
+
+def _rows(conn: sqlite3.Connection, sql: str, *params) -> Iterator[dict]:
+    cursor = conn.execute(sql, params)
+    columns = [c[0] for c in cursor.description]
+    for row in cursor:
+        yield {c: v for c, v in zip(columns, row) if v is not None}
+
+
+def _iter_sqlite_records(conn: sqlite3.Connection) -> Iterator[tuple[str, dict]]:
+    header = {
+        key: json.loads(value)
+        for key, value in conn.execute("SELECT key, value FROM meta")
+    }
+    yield _HEADER, header
+
+    for record in _rows(conn, "SELECT * FROM exercises ORDER BY rowid"):
+        record["muscles"] = json.loads(record["muscles"])
+        yield "exercise", record
+
+    for record in _rows(conn, "SELECT * FROM workouts ORDER BY rowid"):
+        if "tags" in record:
+            record["tags"] = json.loads(record["tags"])
+        record["sets"] = list(_rows(conn, _SELECT_WORKOUT_SETS, record["id"]))
+        yield "workout", record
+
+    if header.get("schema_version") == DELTA_SCHEMA_VERSION:
+        for record in _rows(conn, "SELECT * FROM deleted ORDER BY rowid"):
+            yield _DELETED, record
+
+
+def _connect_untrusted_sqlite(path: str) -> sqlite3.Connection:
+    """
+    Open an uploaded sqlite file read-only, with its schema distrusted and
+    a step budget over everything read from it, and check its tables.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        conn.execute("PRAGMA trusted_schema=OFF")
+        conn.setconfig(sqlite3.SQLITE_DBCONFIG_DEFENSIVE, True)
+        steps = itertools.count(1)
+        conn.set_progress_handler(
+            lambda: next(steps) * _SQLITE_PROGRESS_INTERVAL > _SQLITE_MAX_STEPS,
+            _SQLITE_PROGRESS_INTERVAL,
         )
+        _check_sqlite_schema(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def _check_sqlite_schema(conn: sqlite3.Connection) -> None:
+    schema = conn.execute("SELECT type, name, sql FROM sqlite_master").fetchall()
+    tables = set()
+    for kind, name, sql in schema:
+        if kind in ("view", "trigger"):
+            raise ValueError(f"{_NOT_SQLITE_EXPORT}: unexpected {kind} {name!r}")
+        if kind == "table" and not (sql or "").upper().startswith("CREATE VIRTUAL"):
+            tables.add(name)
+
+    names = {name for _, name, _ in schema}
+    for name in _SQLITE_IMPORT_TABLES:
+        # deleted is only in delta exports, so only checked when there.
+        if name not in tables and (name in names or name != "deleted"):
+            raise ValueError(f"{_NOT_SQLITE_EXPORT}: {name!r} is not a table")
+
+
+def _iter_sqlite_file(stream: BinaryIO) -> Iterator[tuple[str, dict]]:
+    """
+    Read a sqlite export. SQLite needs a real file, so the upload is copied
+    to a temp file (within the size limit) and opened read-only.
+    """
+    fd, path = tempfile.mkstemp(prefix="gymbyte-import-", suffix=".sqlite")
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            shutil.copyfileobj(
+                _LimitedReader(stream, _MAX_IMPORT_BYTES), dst, _FILE_CHUNK_BYTES
+            )
+
+        try:
+            conn = _connect_untrusted_sqlite(path)
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"{_NOT_SQLITE_EXPORT}: {e}") from e
+        try:
+            yield from _checked(_iter_sqlite_records(conn))
+        except (sqlite3.DatabaseError, json.JSONDecodeError, KeyError) as e:
+            raise ValueError(f"{_NOT_SQLITE_EXPORT}: {e}") from e
+        finally:
+            conn.close()
+    finally:
+        os.remove(path)
+
+
+def iter_import_records(stream: BinaryIO) -> Iterator[tuple[str, dict]]:
+    """
+    Incrementally parse an export file, yielding (kind, raw record) pairs.
+
+    The first pair is always ("header", {...}) with the top-level fields
+    (schema_version, exported_at, user; since for deltas), followed by
+    ("exercise", {...}), then ("workout", {...}) and, for schema v2,
+    ("deleted", {...}) pairs in file order. Accepts every format
+    produced by export_chunks; gzip, NDJSON and SQLite are detected from
+    the content. `stream` must be seekable (an upload's spooled temp file is).
+
+    Records are not validated here so callers can skip bad ones; ValueError
+    is raised for anything that makes the rest of the file unreadable.
+    """
+    magic = stream.read(len(_SQLITE_MAGIC))
+    stream.seek(0)
+    if magic == _SQLITE_MAGIC:
+        yield from _iter_sqlite_file(stream)
+        return
+
+    raw: BinaryIO = stream
+    if magic.startswith(_GZIP_MAGIC):
+        raw = gzip.GzipFile(fileobj=stream, mode="rb")  # type: ignore[assignment]
+    text = io.TextIOWrapper(
+        io.BufferedReader(_LimitedReader(raw, _MAX_IMPORT_BYTES)), encoding="utf-8"
+    )
+
+    try:
+        initial = text.read(_READ_CHUNK_CHARS)
+        first_line, newline, _ = initial.lstrip().partition("\n")
+        if newline and _is_ndjson_header(first_line):
+            # Finish the partially read line, then hand the rest over lazily.
+            head = initial + text.readline()
+            records = _iter_ndjson_records(itertools.chain(head.splitlines(), text))
+        else:
+            records = _iter_json_records(_JsonReader(text, initial))
+        yield from _checked(records)
+    except UnicodeDecodeError as e:
+        raise ValueError("File is not valid UTF-8 text.") from e
+    except (gzip.BadGzipFile, EOFError, zlib.error) as e:
+        raise ValueError("File is not a valid gzip archive.") from e
+
+
+def parse_import_file(content: bytes) -> ExportPayload:
+    """
+    Validate raw file bytes and return a parsed ExportPayload.
+
+    Collects iter_import_records into a single payload; the import route
+    consumes the records incrementally instead.
+
+    Raises ValueError with a human-readable message on any failure.
+    """
+    arrays = {kind: key for key, kind in _RECORD_ARRAYS.items()}
+    raw: dict = {key: [] for key in _RECORD_ARRAYS}
+    for kind, record in iter_import_records(io.BytesIO(content)):
+        if kind == _HEADER:
+            raw.update(record)
+        else:
+            raw[arrays[kind]].append(record)
 
     try:
         return ExportPayload.model_validate(raw)
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from fastapi import Request
+from markupsafe import Markup
+
+from app.settings import settings
+from app.templates.templates import render_fragment, request_theme
+
+
+class FragmentCache:
+    """
+    Size-bounded LRU of rendered HTML fragments, shared by every request
+    this process serves. Keys must capture everything the markup depends
+    on; entries are never invalidated, only evicted, so a key that stops
+    being requested simply ages out.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Markup] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Markup | None:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def put(self, key: Hashable, html: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = Markup(html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> Markup:
+        """Return the cached fragment, rendering and storing it on a miss."""
+        html = self.get(key)
+        if html is None:
+            html = Markup(render())
+            self.put(key, html)
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+fragment_cache = FragmentCache(settings.FRAGMENT_CACHE_MAX_ENTRIES)
+
+
+def exercise_options(
+    request: Request, user_sub: str, catalog_version: int | None, exercise_repo
+) -> Markup:
+    """
+    The <option>s for the user's exercise picker, sorted by name. Cached
+    per user, exercise catalog version and theme, so a hit skips both the
+    exercise query and the render. Without a catalog version (no profile
+    to bump it on) nothing is cached. If the query on a miss fails,
+    ExerciseRepoError propagates.
+    """
+
+    def render() -> str:
+        exercises = sorted(
+            exercise_repo.get_all_for_user(user_sub), key=lambda e: e.name.lower()
+        )
+        return render_fragment(
+            request, "exercises/_exercise_options.html", {"exercises": exercises}
+        )
+
+    if catalog_version is None:
+        return Markup(render())
+    key = ("exercise_options", user_sub, catalog_version, request_theme(request))
+    return fragment_cache.get_or_render(key, render)
@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date as DateType
+from typing import BinaryIO, Iterator
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.models.export import ImportSummary
+from app.models.import_job import ImportJob
+from app.repositories.bulk import BulkWriter, BulkWriteResult
+from app.repositories.errors import RepoError
+from app.repositories.exercise import DynamoExerciseRepository
+from app.repositories.import_job import DynamoImportJobRepository
+from app.repositories.workout import DynamoWorkoutRepository
+from app.settings import settings
+from app.utils import db
+from app.utils.export import DELTA_SCHEMA_VERSION, iter_import_records
+from app.utils.importer import RecordImporter
+from app.utils.log import logger
+
+# Stored on the job item, which DynamoDB caps at 400 KB.
+_MAX_JOB_WARNINGS = 100
+_WARNINGS_OMITTED = "Further warnings omitted"
+_COPY_BUFFER_BYTES = 1024 * 1024
+_S3_SCHEME = "s3://"
+# Expired by the bucket's lifecycle rule if a job never removes its upload.
+_S3_UPLOAD_PREFIX = "imports/"
+_CRASHED = "Import stopped unexpectedly. Some items may have been saved."
+
+# Local ENV=dev stand-in for the job queue: jobs run on a small pool of
+# threads in the same process (see _runs_in_process).
+_worker = ThreadPoolExecutor(
+    max_workers=settings.IMPORT_WORKER_THREADS, thread_name_prefix="import-job"
+)
+
+_clients: dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+class ImportDispatchError(Exception):
+    """An upload could not be stored, or its job could not be queued."""
+
+
+def _runs_in_process() -> bool:
+    """
+    Whether jobs run on _worker, with uploads on local disk: only for
+    ENV=dev outside Lambda. A Lambda container is frozen once its response
+    is returned and its /tmp is its own, so deployed jobs (the dev stack's
+    included) go through S3 and SQS to the import worker Lambda instead.
+    """
+    return settings.ENV == "dev" and "AWS_LAMBDA_FUNCTION_NAME" not in os.environ
+
+
+def _client(service: str):
+    """Process-wide boto3 client for service; clients are thread-safe."""
+    with _clients_lock:
+        if service not in _clients:
+            _clients[service] = boto3.client(service, region_name=settings.REGION)
+        return _clients[service]
+
+
+def _split_s3_path(path: str) -> tuple[str, str]:
+    bucket, _, key = path[len(_S3_SCHEME) :].partition("/")
+    return bucket, key
+
+
+def store_upload(src: BinaryIO, job_id: str) -> str:
+    """
+    Copy an uploaded file somewhere it outlives the request; return its
+    path: a local file in process, an s3:// URL otherwise.
+    """
+    src.seek(0)
+    if not _runs_in_process():
+        return _store_upload_in_s3(src, job_id)
+
+    os.makedirs(settings.IMPORT_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.IMPORT_UPLOAD_DIR, f"{job_id}.upload")
+    with open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst, _COPY_BUFFER_BYTES)
+    return path
+
+
+def _store_upload_in_s3(src: BinaryIO, job_id: str) -> str:
+    bucket = settings.IMPORT_UPLOAD_BUCKET
+    if not bucket:
+        raise ImportDispatchError("IMPORT_UPLOAD_BUCKET is not set")
+    key = f"{_S3_UPLOAD_PREFIX}{job_id}.upload"
+    try:
+        _client("s3").upload_fileobj(src, bucket, key)
+    except (BotoCoreError, ClientError) as e:
+        raise ImportDispatchError(f"Could not store upload in S3: {e}") from e
+    return f"{_S3_SCHEME}{bucket}/{key}"
+
+
+@contextmanager
+def _open_upload(path: str) -> Iterator[BinaryIO]:
+    """
+    Open a stored upload for reading. One in S3 is downloaded to a
+    temporary file first: the SQLite reader needs a seekable local file.
+    A missing upload raises OSError.
+    """
+    if not path.startswith(_S3_SCHEME):
+        with open(path, "rb") as f:
+            yield f
+        return
+
+    bucket, key = _split_s3_path(path)
+    with tempfile.TemporaryFile() as f:
+        try:
+            _client("s3").download_fileobj(bucket, key, f)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise FileNotFoundError(path) from e
+            raise
+        f.seek(0)
+        yield f
+
+
+def _remove_upload(path: str) -> None:
+    try:
+        if path.startswith(_S3_SCHEME):
+            bucket, key = _split_s3_path(path)
+            _client("s3").delete_object(Bucket=bucket, Key=key)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+    except (OSError, BotoCoreError, ClientError) as e:
+        logger.warning(f"Could not remove import upload path={path} err={e}")
+
+
+def enqueue_import_job(user_sub: str, job_id: str) -> None:
+    """
+    Start, or continue, a job: on _worker in process, otherwise as a
+    message on the import queue. Raises ImportDispatchError if the message
+    could not be sent.
+    """
+    if _runs_in_process():
+        _worker.submit(_run_in_worker, user_sub, job_id)
+        return
+
+    if not settings.IMPORT_QUEUE_URL:
+        raise ImportDispatchError("IMPORT_QUEUE_URL is not set")
+    try:
+        _client("sqs").send_message(
+            QueueUrl=settings.IMPORT_QUEUE_URL,
+            MessageBody=json.dumps({"user_sub": user_sub, "job_id": job_id}),
+        )
+    except (BotoCoreError, ClientError) as e:
+        raise ImportDispatchError(f"Could not queue import job: {e}") from e
+
+
+def _run_with_dynamo(
+    user_sub: str, job_id: str, max_seconds: float | None = None
+) -> ImportJob:
+    return run_import_job(
+        user_sub,
+        job_id,
+        job_repo=DynamoImportJobRepository(),
+        exercise_repo=DynamoExerciseRepository(),
+        workout_repo=DynamoWorkoutRepository(),
+        max_seconds=max_seconds,
+    )
+
+
+def _run_in_worker(user_sub: str, job_id: str) -> None:
+    try:
+        _run_with_dynamo(user_sub, job_id)
+    except Exception as e:
+        # Nothing will redeliver the job here, so stop the page polling.
+        _mark_crashed(user_sub, job_id, e)
+
+
+def run_queued_job(user_sub: str, job_id: str, attempt: int = 1) -> None:
+    """
+    Handle one delivery of a queued job: run it for up to
+    IMPORT_JOB_MAX_SECONDS, then queue it again if it is not finished.
+
+    Raises, so the queue redelivers the message and the job resumes from
+    its last checkpoint, until the IMPORT_JOB_MAX_ATTEMPTS-th delivery;
+    that one marks the job failed instead.
+    """
+    try:
+        job = _run_with_dynamo(
+            user_sub, job_id, max_seconds=settings.IMPORT_JOB_MAX_SECONDS
+        )
+        if not job.is_finished:
+            enqueue_import_job(user_sub, job_id)
+    except Exception as e:
+        if attempt < settings.IMPORT_JOB_MAX_ATTEMPTS:
+            logger.warning(
+                f"Import job delivery failed job_id={job_id} attempt={attempt} err={e}"
+            )
+            raise
+        _mark_crashed(user_sub, job_id, e)
+
+
+def _mark_crashed(user_sub: str, job_id: str, e: Exception) -> None:
+    logger.exception(f"Import job crashed job_id={job_id} user_sub={user_sub} err={e}")
+    try:
+        job_repo = DynamoImportJobRepository()
+        _finish(job_repo.get_job(user_sub, job_id), job_repo, error=_CRASHED)
+    except Exception:
+        logger.exception(f"Could not mark import job failed job_id={job_id}")
+
+
+def run_import_job(
+    user_sub: str,
+    job_id: str,
+    *,
+    job_repo,
+    exercise_repo,
+    workout_repo,
+    table=None,
+    max_seconds: float | None = None,
+) -> ImportJob:
+    """
+    Import the job's stored upload in chunks of IMPORT_CHUNK_RECORDS records.
+
+    After each chunk's writes have completed, the job item is saved with the
+    number of records processed, the exercise id remapping and the running
+    summary. Calling this again for an unfinished job skips the records
+    already processed, so an interrupted job resumes from its last
+    checkpoint; a chunk cut short is simply repeated, with its exercises
+    matched by name and its workouts skipped by id.
+
+    With max_seconds, returns after the first chunk that ends past that
+    budget, leaving the job "running" for the caller to call again.
+    Unreadable files and repository errors mark the job failed; anything
+    else propagates with the job left at its last checkpoint.
+    """
+    started = time.monotonic()
+    job = job_repo.get_job(user_sub, job_id)
+    if job.is_finished:
+        return job
+
+    if job.status != "running":
+        job.status = "running"
+        job_repo.save_job(job)
+
+    logger.info(
+        "Import job running job_id=%s user_sub=%s resume_from=%s",
+        job_id,
+        user_sub,
+        job.records_processed,
+    )
+    table = table or db.get_table()
+    catalog_before = _catalog_changes(job.summary)
+
+    try:
+        existing_exercises = exercise_repo.get_all_for_user(user_sub)
+
+        def find_existing_workouts(keys: list[tuple[DateType, str]]) -> set[str]:
+            return workout_repo.get_existing_workout_ids(user_sub, keys)
+
+        with _open_upload(job.upload_path) as f:
+            records = iter_import_records(f)
+            _, header = next(records)
+            delta = header.get("schema_version") == DELTA_SCHEMA_VERSION
+            # Drain, rather than re-validate, what earlier runs imported.
+            for _ in itertools.islice(records, job.records_processed):
+                pass
+
+            while True:
+                chunk, parse_error = _read_chunk(records, settings.IMPORT_CHUNK_RECORDS)
+                if chunk:
+                    _import_chunk(
+                        user_sub,
+                        job,
+                        chunk,
+                        existing_exercises,
+                        find_existing_workouts,
+                        table,
+                        delta,
+                    )
+                    job_repo.save_job(job)
+                if parse_error:
+                    raise parse_error
+                if len(chunk) < settings.IMPORT_CHUNK_RECORDS:
+                    break
+                if max_seconds is not None and time.monotonic() - started > max_seconds:
+                    logger.info(
+                        "Import job paused job_id=%s records_processed=%s",
+                        job_id,
+                        job.records_processed,
+                    )
+                    return job
+    except ValueError as e:
+        logger.warning(f"Import job stopped on unreadable file job_id={job_id} err={e}")
+        return _finish(
+            job,
+            job_repo,
+            error=f"{e} Records before this point may have been imported.",
+        )
+    except RepoError as e:
+        logger.exception(
+            f"Import job failed reading existing data job_id={job_id} err={e}"
+        )
+        return _finish(
+            job,
+            job_repo,
+            error="Could not read existing data. Some items may have been saved.",
+        )
+    except OSError as e:
+        logger.exception(
+            f"Import job could not read its upload job_id={job_id} err={e}"
+        )
+        return _finish(
+            job,
+            job_repo,
+            error="The uploaded file is no longer available. Please upload it again.",
+        )
+    finally:
+        # The importer writes exercises straight to the table, past the repo.
+        if _catalog_changes(job.summary) != catalog_before:
+            exercise_repo.bump_catalog_version(user_sub)
+
+    summary = job.summary
+    if summary.items_failed:
+        summary.warnings.append(
+            f"{summary.items_failed} item(s) could not be saved — try importing again"
+        )
+
+    logger.info(
+        "Import complete job_id=%s user_sub=%s "
+        "exercises_created=%s exercises_matched=%s "
+        "workouts_created=%s workouts_skipped=%s "
+        "sets_created=%s workouts_updated=%s "
+        "items_deleted=%s items_written=%s "
+        "items_failed=%s warnings=%s",
+        job_id,
+        user_sub,
+        summary.exercises_created,
+        summary.exercises_matched,
+        summary.workouts_created,
+        summary.workouts_skipped,
+        summary.sets_created,
+        summary.workouts_updated,
+        summary.items_deleted,
+        summary.items_written,
+        summary.items_failed,
+        len(summary.warnings),
+    )
+    return _finish(job, job_repo)
+
+
+def _read_chunk(
+    records: Iterator[tuple[str, dict]], size: int
+) -> tuple[list[tuple[str, dict]], ValueError | None]:
+    """Take up to size records, keeping those read before any parse error."""
+    chunk: list[tuple[str, dict]] = []
+    try:
+        for record in itertools.islice(records, size):
+            chunk.append(record)
+    except ValueError as e:
+        return chunk, e
+    return chunk, None
+
+
+def _import_chunk(
+    user_sub: str,
+    job: ImportJob,
+    chunk,
+    existing_exercises,
+    find_existing_workouts,
+    table,
+    delta: bool,
+) -> None:
+    with BulkWriter(table) as writer:
+        importer = RecordImporter(
+            user_sub,
+            existing_exercises,
+            find_existing_workouts,
+            writer,
+            id_remap=job.id_remap,
+            delta=delta,
+        )
+        try:
+            for kind, record in chunk:
+                importer.add(kind, record)
+        finally:
+            importer.finish()
+
+    _merge_summary(job.summary, importer.summary, writer.result)
+    job.records_processed += len(chunk)
+
+
+def _catalog_changes(summary: ImportSummary) -> tuple[int, int, int]:
+    # items_deleted also counts workouts and sets; an extra bump is harmless.
+    return summary.exercises_created, summary.exercises_updated, summary.items_deleted
+
+
+def _merge_summary(
+    total: ImportSummary, chunk: ImportSummary, result: BulkWriteResult
+) -> None:
+    total.exercises_created += chunk.exercises_created
+    total.exercises_matched += chunk.exercises_matched
+    total.workouts_created += chunk.workouts_created
+    total.workouts_skipped += chunk.workouts_skipped
+    total.sets_created += chunk.sets_created
+    total.exercises_updated += chunk.exercises_updated
+    total.workouts_updated += chunk.workouts_updated
+    total.items_deleted += chunk.items_deleted
+    total.items_written += result.written
+    total.items_failed += result.failed
+
+    room = max(_MAX_JOB_WARNINGS - len(total.warnings), 0)
+    total.warnings.extend(chunk.warnings[:room])
+    if len(chunk.warnings) > room and total.warnings[-1] != _WARNINGS_OMITTED:
+        total.warnings.append(_WARNINGS_OMITTED)
+
+
+def _finish(job: ImportJob, job_repo, error: str | None = None) -> ImportJob:
+    job.status = "failed" if error else "complete"
+    job.error = error
+    job_repo.save_job(job)
+
+    _remove_upload(job.upload_path)
+    return job
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date as DateType
+from decimal import Decimal
+from typing import Callable, Protocol
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.models.exercise import Exercise
+from app.models.export import (
+    ExportDeletedExercise,
+    ExportDeletedWorkout,
+    ExportDeletion,
+    ExportExercise,
+    ExportWorkout,
+    ImportSummary,
+)
+from app.models.workout import Workout, WorkoutSet
+from app.utils import db
+
+# Candidate workouts per existence check; matches the BatchGetItem key limit.
+WORKOUT_LOOKUP_BATCH = 100
+
+_deletion_adapter: TypeAdapter[ExportDeletion] = TypeAdapter(ExportDeletion)
+
+
+class ItemWriter(Protocol):
+    def put_item(self, Item: dict) -> None: ...
+
+    def delete_item(self, Key: dict) -> None: ...
+
+
+class RecordImporter:
+    """
+    Turn export records into DynamoDB items for one user, one record at a time.
+
+    Exercises are matched against the account by (name, equipment) and their
+    ids remapped. Workouts are buffered into groups of WORKOUT_LOOKUP_BATCH
+    and checked with `find_existing_workouts` (given (date, id) pairs, it
+    returns the ids already stored); those are skipped. Each item is handed
+    to `writer` (e.g. a BulkWriter) as soon as it is built, and the outcome
+    is tallied on `summary`. Call finish() after the last record.
+
+    `id_remap` carries exercise id mappings from earlier records when an
+    import is resumed part-way through a file; it is updated in place.
+
+    With `delta` (a schema v2 file) records are applied as changes: an
+    exercise whose id already exists here and any existing workout are
+    overwritten rather than matched or skipped, and "deleted" records
+    remove the items they name.
+    """
+
+    def __init__(
+        self,
+        user_sub: str,
+        existing_exercises: list[Exercise],
+        find_existing_workouts: Callable[[list[tuple[DateType, str]]], set[str]],
+        writer: ItemWriter,
+        id_remap: dict[str, str] | None = None,
+        delta: bool = False,
+    ):
+        self.user_sub = user_sub
+        self.delta = delta
+        self.summary = ImportSummary()
+        self._pk = db.build_user_pk(user_sub)
+        self._writer = writer
+        self._find_existing_workouts = find_existing_workouts
+        self._pending_workouts: list[ExportWorkout] = []
+        # imported_id -> resolved_id in this account
+        self.id_remap: dict[str, str] = id_remap if id_remap is not None else {}
+
+        self._existing_exercise_ids = {e.exercise_id for e in existing_exercises}
+        # (name.lower(), equipment.lower()) -> [exercise_id, ...]
+        self._existing_by_name_equip: dict[tuple, list[str]] = {}
+        for e in existing_exercises:
+            key = (e.name.lower(), e.equipment.lower())
+            self._existing_by_name_equip.setdefault(key, []).append(e.exercise_id)
+
+    def add(self, kind: str, record: dict) -> None:
+        if kind == "exercise":
+            self.add_exercise(record)
+        elif kind == "workout":
+            self.add_workout(record)
+        elif kind == "deleted":
+            self.add_deletion(record)
+
+    def finish(self) -> None:
+        """Process any workouts still waiting for their existence check."""
+        self._flush_workouts()
+
+    def add_exercise(self, record: dict) -> None:
+        try:
+            ex = ExportExercise.model_validate(record)
+        except ValidationError as exc:
+            self.summary.warnings.append(
+                f"Exercise {_label(record)} is invalid ({_first_error(exc)}) — skipped"
+            )
+            return
+
+        if self.delta and ex.id in self._existing_exercise_ids:
+            # Same account: the delta carries the exercise's new state.
+            if self._write_exercise(ex, ex.id):
+                self.summary.exercises_updated += 1
+            return
+
+        key = (ex.name.lower(), ex.equipment.lower())
+        matches = self._existing_by_name_equip.get(key, [])
+
+        if len(matches) == 1:
+            self.id_remap[ex.id] = matches[0]
+            self.summary.exercises_matched += 1
+            return
+
+        if len(matches) > 1:
+            self.summary.warnings.append(
+                f"Exercise '{ex.name}' ({ex.equipment}) matched multiple existing entries — created fresh"
+            )
+        if self._write_exercise(ex, str(uuid.uuid4())):
+            self.summary.exercises_created += 1
+
+    def _write_exercise(self, ex: ExportExercise, exercise_id: str) -> bool:
+        try:
+            exercise = Exercise(
+                PK=self._pk,
+                SK=db.build_exercise_sk(exercise_id),
+                type="exercise",
+                name=ex.name,
+                muscles=ex.muscles,
+                equipment=ex.equipment,
+                category=ex.category,
+                created_at=ex.created_at,
+                updated_at=ex.updated_at,
+            )
+        except Exception as exc:
+            self.summary.warnings.append(
+                f"Exercise '{ex.name}' could not be imported ({exc}) — skipped"
+            )
+            return False
+
+        self.id_remap[ex.id] = exercise_id
+        self._writer.put_item(Item=exercise.to_ddb_item())
+        return True
+
+    def add_workout(self, record: dict) -> None:
+        try:
+            w = ExportWorkout.model_validate(record)
+        except ValidationError as exc:
+            self.summary.warnings.append(
+                f"Workout {_label(record)} is invalid ({_first_error(exc)}) — skipped"
+            )
+            return
+
+        self._pending_workouts.append(w)
+        if len(self._pending_workouts) >= WORKOUT_LOOKUP_BATCH:
+            self._flush_workouts()
+
+    def _flush_workouts(self) -> None:
+        pending, self._pending_workouts = self._pending_workouts, []
+        if not pending:
+            return
+
+        existing_ids = self._find_existing_workouts([(w.date, w.id) for w in pending])
+        for w in pending:
+            if w.id not in existing_ids:
+                self._write_workout(w)
+            elif self.delta:
+                self._write_workout(w, updated=True)
+            else:
+                self.summary.workouts_skipped += 1
+
+    def add_deletion(self, record: dict) -> None:
+        # Workouts still waiting for their lookup come earlier in the file.
+        self._flush_workouts()
+
+        try:
+            d = _deletion_adapter.validate_python(record)
+        except ValidationError as exc:
+            self.summary.warnings.append(
+                f"Deletion record is invalid ({_first_error(exc)}) — skipped"
+            )
+            return
+
+        if isinstance(d, ExportDeletedExercise):
+            # Exercises matched by name elsewhere are left alone; only the
+            # account the delta came from shares its exercise ids.
+            if d.id not in self._existing_exercise_ids:
+                return
+            sk = db.build_exercise_sk(d.id)
+        elif isinstance(d, ExportDeletedWorkout):
+            sk = db.build_workout_sk(d.date, d.id)
+        else:
+            sk = db.build_set_sk(d.date, d.workout_id, d.set_number)
+
+        self._writer.delete_item(Key={"PK": self._pk, "SK": sk})
+        self.summary.items_deleted += 1
+
+    def _write_workout(self, w: ExportWorkout, updated: bool = False) -> None:
+        try:
+            workout = Workout(
+                PK=self._pk,
+                SK=db.build_workout_sk(w.date, w.id),
+                type="workout",
+                date=w.date,
+                name=w.name,
+                tags=w.tags,
+                notes=w.notes,
+                created_at=w.created_at,
+                updated_at=w.updated_at,
+            )
+        except Exception as exc:
+            self.summary.warnings.append(
+                f"Workout '{w.name}' ({w.date}) could not be imported ({exc}) — skipped"
+            )
+            return
+
+        self._writer.put_item(Item=workout.to_ddb_item())
+        if updated:
+            self.summary.workouts_updated += 1
+        else:
+            self.summary.workouts_created += 1
+
+        for s in w.sets:
+            resolved_exercise_id = self._resolve_exercise_id(s.exercise_id)
+            if resolved_exercise_id is None:
+                self.summary.warnings.append(
+                    f"Set #{s.set_number} in workout '{w.name}' ({w.date}) references "
+                    f"unknown exercise — skipped"
+                )
+                continue
+
+            weight = Decimal(str(s.weight_kg)) if s.weight_kg is not None else None
+
+            try:
+                workout_set = WorkoutSet(
+                    PK=self._pk,
+                    SK=db.build_set_sk(w.date, w.id, s.set_number),
+                    type="set",
+                    exercise_id=resolved_exercise_id,
+                    set_number=s.set_number,
+                    reps=s.reps,
+                    weight_kg=weight,
+                    rpe=s.rpe,
+                    created_at=s.created_at,
+                    updated_at=s.updated_at,
+                )
+            except Exception as exc:
+                self.summary.warnings.append(
+                    f"Set #{s.set_number} in workout '{w.name}' ({w.date}) is invalid ({exc}) — skipped"
+                )
+                continue
+
+            self._writer.put_item(Item=workout_set.to_ddb_item())
+            self.summary.sets_created += 1
+
+    def _resolve_exercise_id(self, exercise_id: str) -> str | None:
+        resolved = self.id_remap.get(exercise_id)
+        if (
+            resolved is None
+            and self.delta
+            and exercise_id in self._existing_exercise_ids
+        ):
+            # Deltas leave out unchanged exercises that their sets still use.
+            return exercise_id
+        return resolved
+
+
+def _label(record) -> str:
+    if isinstance(record, dict) and record.get("name"):
+        return f"'{record['name']}'"
+    return "record"
+
+
+def _first_error(exc: ValidationError) -> str:
+    err = exc.errors()[0]
+    loc = ".".join(str(part) for part in err["loc"])
+    return f"{loc}: {err['msg']}" if loc else err["msg"]
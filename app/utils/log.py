@@ -1,10 +1,116 @@
+"""
+Logging setup for the "gymbyte" logger and everything under it.
+
+Records are handed to a QueueHandler and written to stdout by a
+QueueListener thread, so a request never waits on the write. A record's
+%-style arguments are merged when it is queued (they may be mutated after
+the call returns); a record below the logger's level never gets that far,
+so pass arguments rather than building f-strings:
+
+    logger.debug("Fetched workout %s", workout_id)
+
+Configured from the environment:
+
+    LOG_LEVEL         DEBUG in dev, INFO elsewhere
+    LOG_FORMAT        "json" (one object per line, for CloudWatch) or
+                      "text"; json unless ENV=dev
+    LOG_ASYNC         "false" writes on the calling thread instead
+    LOG_SAMPLE_RATES  "logger=rate,...": the fraction of a logger's DEBUG
+                      records kept; "gymbyte.render=0.1" by default
+
+Lambda freezes the process between invocations, so the handler calls
+flush() before returning each response.
+"""
+
+import atexit
+import json
 import logging
 import os
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable
+
+ENV = os.getenv("ENV", "dev")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if ENV == "dev" else "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text" if ENV == "dev" else "json").lower()
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() not in ("0", "false", "no")
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "gymbyte.render=0.1")
 
-LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+# Attributes every LogRecord has; anything else came in through `extra=`.
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with `extra=` fields as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep `rate` of a logger's DEBUG records; higher levels always pass."""
+
+    def __init__(self, rate: float, rand: Callable[[], float] = random.random):
+        super().__init__()
+        self.rate = rate
+        self._rand = rand
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self._rand() < self.rate
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the whole record here, on the calling
+        # thread. Only merge the arguments (and render a traceback, which
+        # can't cross threads safely); the listener does the formatting.
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    rates = {}
+    for part in spec.split(","):
+        name, _, rate = part.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def _formatter() -> logging.Formatter:
+    return JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(FORMAT)
+
+
+_queue: queue.Queue = queue.Queue()
+_listener: QueueListener | None = None
+
 root = logging.getLogger()
 root.setLevel(LOG_LEVEL)
 
@@ -17,11 +123,28 @@ for name in noisy_loggers:
     logging.getLogger(name).setLevel(logging.INFO)
 
 handler = logging.StreamHandler(sys.stdout)
-handler.setFormatter(logging.Formatter(FORMAT))
-root.addHandler(handler)
+handler.setFormatter(_formatter())
+
+if LOG_ASYNC:
+    root.addHandler(_QueueHandler(_queue))
+    _listener = QueueListener(_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+else:  # pragma: no cover
+    root.addHandler(handler)
+
+for name, rate in parse_sample_rates(LOG_SAMPLE_RATES).items():
+    logging.getLogger(name).addFilter(SamplingFilter(rate))
 
 logger = logging.getLogger("gymbyte")
 logger.setLevel(LOG_LEVEL)
 logger.propagate = True
 
-logger.debug(f"Logger initialised level={LOG_LEVEL}")
+
+def flush() -> None:
+    """Block until every queued record has been written."""
+    if _listener is not None:
+        _queue.join()
+
+
+logger.debug("Logger initialised level=%s format=%s", LOG_LEVEL, LOG_FORMAT)
@@ -0,0 +1,184 @@
+"""
+Per-request performance metrics.
+
+MetricsMiddleware starts a RequestMetrics for each request and keeps it in
+a context variable, which follows the request into threadpool routes and
+fan_out() calls. Code on the request path adds to it:
+
+    with metrics.timed("render"):
+        ...
+
+    resp = metrics.ddb_call("query", table.query, **kwargs)
+
+ddb_call() asks DynamoDB for ReturnConsumedCapacity=TOTAL and records the
+call's latency and capacity units under its operation name. Outside a
+request (scripts, import jobs, tests) there is no collector: ddb_call()
+makes the plain call and timed() does nothing.
+
+The middleware reports the totals as a Server-Timing header in dev and as
+one summary log line per request everywhere else.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from app.settings import settings
+
+_current: ContextVar["RequestMetrics | None"] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+@dataclass
+class Timing:
+    count: int = 0
+    total_ms: float = 0.0
+    capacity: float = 0.0
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    # Operation name ("query", "rate_limit", ...) -> totals.
+    ddb: dict[str, Timing] = field(default_factory=dict)
+    # Section name ("jwt", "render") -> totals.
+    sections: dict[str, Timing] = field(default_factory=dict)
+    closed: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(
+        self,
+        group: dict[str, Timing],
+        name: str,
+        elapsed_ms: float,
+        capacity: float = 0.0,
+    ) -> None:
+        with self._lock:
+            timing = group.setdefault(name, Timing())
+            timing.count += 1
+            timing.total_ms += elapsed_ms
+            timing.capacity += capacity
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def ddb_total(self) -> Timing:
+        with self._lock:
+            total = Timing()
+            for timing in self.ddb.values():
+                total.count += timing.count
+                total.total_ms += timing.total_ms
+                total.capacity += timing.capacity
+            return total
+
+
+@contextmanager
+def collecting() -> Iterator[RequestMetrics]:
+    """Collect metrics for the code run inside the block (one request)."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.closed = True
+        _current.reset(token)
+
+
+def current() -> RequestMetrics | None:
+    """The collector for the request being handled, if there is one."""
+    if not settings.METRICS_ENABLED:
+        return None
+    metrics = _current.get()
+    # Work that outlives its request (e.g. an import job started from it)
+    # inherits the context but has nothing left to report to.
+    if metrics is None or metrics.closed:
+        return None
+    return metrics
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    metrics = current()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(metrics.sections, name, (time.perf_counter() - started) * 1000)
+
+
+def consumed_capacity(response: dict) -> float:
+    """Capacity units from a response's ConsumedCapacity (one entry or a list)."""
+    consumed = response.get("ConsumedCapacity")
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(float(entry.get("CapacityUnits", 0)) for entry in consumed)
+
+
+def ddb_call(operation: str, call: Callable[..., dict], **kwargs: Any) -> dict:
+    """Make a DynamoDB call, recording it against the current request."""
+    metrics = current()
+    if metrics is None:
+        return call(**kwargs)
+
+    kwargs.setdefault("ReturnConsumedCapacity", "TOTAL")
+    started = time.perf_counter()
+    response: dict = {}
+    try:
+        response = call(**kwargs)
+        return response
+    finally:
+        metrics.record(
+            metrics.ddb,
+            operation,
+            (time.perf_counter() - started) * 1000,
+            consumed_capacity(response or {}),
+        )
+
+
+# ─────────────────────────── Reporting ───────────────────────────
+
+
+def server_timing(metrics: RequestMetrics) -> str:
+    """Server-Timing header value: total, DynamoDB (overall and per operation), sections."""
+    ddb = metrics.ddb_total()
+    entries = [
+        f"app;dur={metrics.elapsed_ms():.1f}",
+        f'ddb;dur={ddb.total_ms:.1f};desc="{ddb.count} calls, {ddb.capacity:g} CU"',
+    ]
+    with metrics._lock:
+        for name, timing in sorted(metrics.ddb.items()):
+            entries.append(
+                f'ddb-{name.replace("_", "-")};dur={timing.total_ms:.1f};'
+                f'desc="{timing.count} calls, {timing.capacity:g} CU"'
+            )
+        for name, timing in sorted(metrics.sections.items()):
+            entries.append(f'{name};dur={timing.total_ms:.1f};desc="{timing.count}x"')
+    return ", ".join(entries)
+
+
+def summary(metrics: RequestMetrics) -> dict[str, Any]:
+    """Flat fields for the per-request summary log line."""
+    ddb = metrics.ddb_total()
+    fields: dict[str, Any] = {
+        "total_ms": round(metrics.elapsed_ms(), 1),
+        "ddb_calls": ddb.count,
+        "ddb_ms": round(ddb.total_ms, 1),
+        "ddb_cu": round(ddb.capacity, 2),
+    }
+    with metrics._lock:
+        for name, timing in sorted(metrics.sections.items()):
+            fields[f"{name}_ms"] = round(timing.total_ms, 1)
+        if metrics.ddb:
+            fields["ddb_ops"] = ",".join(
+                f"{name}:{timing.count}" for name, timing in sorted(metrics.ddb.items())
+            )
+    return fields
@@ -3,9 +3,13 @@ from datetime import date, timedelta
 from decimal import Decimal
 
 from app.models.exercise import Exercise
-from app.models.workout import Workout, WorkoutSet
+from app.models.workout import Workout, WorkoutSet, WorkoutSetSummary
 from app.utils.units import kg_to_lb
 
+# Builders that only need reps/weight/date accept either full sets or the
+# slim summaries read from ExerciseProgressIndex.
+SetLike = WorkoutSet | WorkoutSetSummary
+
 
 def build_frequency_chart_data(workouts: list[Workout], weeks: int = 12) -> dict:
     """
@@ -40,7 +44,7 @@ def build_frequency_chart_data(workouts: list[Workout], weeks: int = 12) -> dict
 
 
 def build_exercise_progress_data(
-    sets: list[WorkoutSet],
+    sets: list[SetLike],
     exercise_id: str,
     weight_unit: str,
 ) -> dict:
@@ -87,7 +91,7 @@ def build_exercise_progress_data(
 
 
 def build_volume_chart_data(
-    sets: list[WorkoutSet],
+    sets: list[SetLike],
     weight_unit: str,
     weeks: int = 12,
     exercise_id: str | None = None,
@@ -105,7 +109,9 @@ def build_volume_chart_data(
         for offset in range(weeks - 1, -1, -1)
     ]
 
-    filtered_sets = [s for s in sets if s.exercise_id == exercise_id] if exercise_id else sets
+    filtered_sets = (
+        [s for s in sets if s.exercise_id == exercise_id] if exercise_id else sets
+    )
 
     volume_kg: dict[date, Decimal] = {ws: Decimal(0) for ws in week_starts}
     for s in filtered_sets:
@@ -133,7 +139,7 @@ def build_volume_chart_data(
 
 
 def build_1rm_chart_data(
-    sets: list[WorkoutSet],
+    sets: list[SetLike],
     exercise_id: str,
     weight_unit: str,
 ) -> dict:
@@ -215,3 +221,84 @@ def build_distribution_chart_data(
         "by_muscle": _top10_with_other(muscle_counts),
         "by_exercise": _top10_with_other(exercise_counts),
     }
+
+
+ACUTE_WINDOW_DAYS = 7
+CHRONIC_WINDOW_DAYS = 28
+WORKLOAD_DAYS = 365
+
+
+def workload_start_date(
+    days: int = WORKLOAD_DAYS, chronic_days: int = CHRONIC_WINDOW_DAYS
+) -> date:
+    """
+    First date whose sets affect the workload chart: the chronic window of
+    the oldest charted day reaches back chronic_days - 1 days before it.
+    """
+    return date.today() - timedelta(days=days + chronic_days - 2)
+
+
+def build_workload_chart_data(
+    sets: list[SetLike],
+    weight_unit: str,
+    days: int = WORKLOAD_DAYS,
+    acute_days: int = ACUTE_WINDOW_DAYS,
+    chronic_days: int = CHRONIC_WINDOW_DAYS,
+) -> dict:
+    """
+    Return daily acute and chronic training load and their ratio (ACWR)
+    for the last N days.
+
+    Load is set volume (reps × weight). Acute load is the total over the
+    trailing acute_days; chronic load is the trailing chronic_days total
+    scaled to the same length, so a steady routine gives a ratio of 1.0.
+
+    Daily totals are built once and turned into prefix sums, so each
+    window is a single subtraction rather than a re-scan of the sets.
+
+    Returns {"labels": [...], "acute": [...], "chronic": [...],
+    "ratio": [... | None], "unit": "kg"|"lb"}. The ratio is None on days
+    with no chronic load.
+    """
+    start = workload_start_date(days, chronic_days)
+    span = days + chronic_days - 1
+
+    daily_kg = [Decimal(0)] * span
+    for s in sets:
+        if s.weight_kg is None:
+            continue
+        try:
+            workout_date = date.fromisoformat(s.workout_date)
+        except ValueError:
+            continue
+        offset = (workout_date - start).days
+        if 0 <= offset < span:
+            daily_kg[offset] += s.weight_kg * s.reps
+
+    # prefix[i] is the total load of days [0, i)
+    prefix = [Decimal(0)] * (span + 1)
+    for i, load in enumerate(daily_kg):
+        prefix[i + 1] = prefix[i] + load
+
+    scale = Decimal(acute_days) / Decimal(chronic_days)
+
+    labels, acute_values, chronic_values, ratios = [], [], [], []
+    for end in range(chronic_days, span + 1):
+        acute_kg = prefix[end] - prefix[end - acute_days]
+        chronic_kg = (prefix[end] - prefix[end - chronic_days]) * scale
+
+        labels.append((start + timedelta(days=end - 1)).isoformat())
+        ratios.append(round(float(acute_kg / chronic_kg), 2) if chronic_kg else None)
+
+        if weight_unit == "lb":
+            acute_kg, chronic_kg = kg_to_lb(acute_kg), kg_to_lb(chronic_kg)
+        acute_values.append(round(float(acute_kg), 1))
+        chronic_values.append(round(float(chronic_kg), 1))
+
+    return {
+        "labels": labels,
+        "acute": acute_values,
+        "chronic": chronic_values,
+        "ratio": ratios,
+        "unit": weight_unit,
+    }
@@ -1,7 +1,9 @@
+import math
+import random
 import uuid
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
 from app.models import Exercise, UserProfile, Workout, WorkoutSet
 from app.utils.dates import now
@@ -272,22 +274,39 @@ def build_workouts(pk: str) -> List[Tuple[Workout, List[WorkoutSet]]]:
     # ── Historical workouts (> 12 weeks ago, won't appear in frequency chart) ──
 
     w1 = mk_workout("W1", 148, "Upper Body", ["push", "pull"], "Pressy/pully.")
-    workouts.append((w1, [
-        mk_set(w1, 1, "DB_BENCH_PRESS", 8, 12.0, 7),
-        mk_set(w1, 2, "MACHINE_LAT_PULLDOWN", 10, 30.0, 8),
-    ]))
+    workouts.append(
+        (
+            w1,
+            [
+                mk_set(w1, 1, "DB_BENCH_PRESS", 8, 12.0, 7),
+                mk_set(w1, 2, "MACHINE_LAT_PULLDOWN", 10, 30.0, 8),
+            ],
+        )
+    )
 
     w2 = mk_workout("W2", 146, "Legs", ["legs"], "Lower body day.")
-    workouts.append((w2, [
-        mk_set(w2, 1, "BB_SQUAT", 6, 40.0, 7),
-        mk_set(w2, 2, "BB_DEADLIFT", 5, 60.0, 8),
-    ]))
+    workouts.append(
+        (
+            w2,
+            [
+                mk_set(w2, 1, "BB_SQUAT", 6, 40.0, 7),
+                mk_set(w2, 2, "BB_DEADLIFT", 5, 60.0, 8),
+            ],
+        )
+    )
 
-    w3 = mk_workout("W3", 144, "Accessories", ["push", "pull", "legs"], "Bits and bobs.")
-    workouts.append((w3, [
-        mk_set(w3, 1, "KB_LUNGE", 10, 12.0, 7),
-        mk_set(w3, 2, "DB_BICEP_CURL", 12, 8.0, 8),
-    ]))
+    w3 = mk_workout(
+        "W3", 144, "Accessories", ["push", "pull", "legs"], "Bits and bobs."
+    )
+    workouts.append(
+        (
+            w3,
+            [
+                mk_set(w3, 1, "KB_LUNGE", 10, 12.0, 7),
+                mk_set(w3, 2, "DB_BICEP_CURL", 12, 8.0, 8),
+            ],
+        )
+    )
 
     # ── Recent workouts (last 12 weeks, relative to today) ────────────────────
     #
@@ -311,50 +330,50 @@ def build_workouts(pk: str) -> List[Tuple[Workout, List[WorkoutSet]]]:
     # (days_back, wid, session_type, name, notes)
     schedule = [
         # Week 12 (~83 days ago) — 3 sessions
-        (83, "W04", "push", "Push Day",   "Back to it after a break."),
-        (81, "W05", "pull", "Pull Day",   None),
-        (79, "W06", "legs", "Leg Day",    None),
+        (83, "W04", "push", "Push Day", "Back to it after a break."),
+        (81, "W05", "pull", "Pull Day", None),
+        (79, "W06", "legs", "Leg Day", None),
         # Week 11 (~76 days) — 2 sessions
-        (76, "W07", "push", "Push Day",   None),
-        (74, "W08", "legs", "Legs",       None),
+        (76, "W07", "push", "Push Day", None),
+        (74, "W08", "legs", "Legs", None),
         # Week 10 (~69 days) — 3 sessions
-        (69, "W09", "push", "Push Day",   None),
-        (67, "W10", "pull", "Pull Day",   None),
-        (65, "W11", "legs", "Leg Day",    None),
+        (69, "W09", "push", "Push Day", None),
+        (67, "W10", "pull", "Pull Day", None),
+        (65, "W11", "legs", "Leg Day", None),
         # Week 9 (~62 days) — 2 sessions
         (62, "W12", "push", "Upper Body", None),
-        (60, "W13", "legs", "Legs",       None),
+        (60, "W13", "legs", "Legs", None),
         # Week 8 (~55 days) — 3 sessions
-        (55, "W14", "push", "Push Day",   "Felt strong today."),
-        (53, "W15", "pull", "Pull Day",   None),
-        (51, "W16", "legs", "Leg Day",    None),
+        (55, "W14", "push", "Push Day", "Felt strong today."),
+        (53, "W15", "pull", "Pull Day", None),
+        (51, "W16", "legs", "Leg Day", None),
         # Week 7 (~48 days) — 3 sessions
-        (48, "W17", "push", "Push Day",   None),
-        (46, "W18", "legs", "Legs",       None),
-        (44, "W19", "pull", "Pull Day",   None),
+        (48, "W17", "push", "Push Day", None),
+        (46, "W18", "legs", "Legs", None),
+        (44, "W19", "pull", "Pull Day", None),
         # Week 6 (~41 days) — 3 sessions
-        (41, "W20", "push", "Push Day",   None),
-        (39, "W21", "legs", "Leg Day",    None),
-        (37, "W22", "pull", "Pull Day",   None),
+        (41, "W20", "push", "Push Day", None),
+        (39, "W21", "legs", "Leg Day", None),
+        (37, "W22", "pull", "Pull Day", None),
         # Week 5 (~34 days) — 2 sessions (lighter week)
-        (34, "W23", "push", "Push Day",   None),
-        (32, "W24", "legs", "Legs",       None),
+        (34, "W23", "push", "Push Day", None),
+        (32, "W24", "legs", "Legs", None),
         # Week 4 (~27 days) — 3 sessions
-        (27, "W25", "push", "Push Day",   None),
-        (25, "W26", "pull", "Pull Day",   None),
-        (23, "W27", "legs", "Leg Day",    "Increased squat weight."),
+        (27, "W25", "push", "Push Day", None),
+        (25, "W26", "pull", "Pull Day", None),
+        (23, "W27", "legs", "Leg Day", "Increased squat weight."),
         # Week 3 (~20 days) — 3 sessions
-        (20, "W28", "push", "Push Day",   None),
-        (18, "W29", "legs", "Legs",       None),
-        (16, "W30", "pull", "Pull Day",   None),
+        (20, "W28", "push", "Push Day", None),
+        (18, "W29", "legs", "Legs", None),
+        (16, "W30", "pull", "Pull Day", None),
         # Week 2 (~13 days) — 3 sessions
-        (13, "W31", "push", "Push Day",   None),
-        (11, "W32", "legs", "Leg Day",    None),
-        (9,  "W33", "pull", "Pull Day",   None),
+        (13, "W31", "push", "Push Day", None),
+        (11, "W32", "legs", "Leg Day", None),
+        (9, "W33", "pull", "Pull Day", None),
         # Week 1 (last 6 days) — 3 sessions
-        (6,  "W34", "push", "Push Day",   "PB on bench press!"),
-        (4,  "W35", "legs", "Legs",       None),
-        (1,  "W36", "pull", "Pull Day",   None),
+        (6, "W34", "push", "Push Day", "PB on bench press!"),
+        (4, "W35", "legs", "Legs", None),
+        (1, "W36", "pull", "Pull Day", None),
     ]
 
     push_n = pull_n = legs_n = 0
@@ -365,11 +384,11 @@ def build_workouts(pk: str) -> List[Tuple[Workout, List[WorkoutSet]]]:
             tags = ["push"]
             w = mk_workout(wid, days_back, name, tags, notes)
             sets = [
-                mk_set(w, 1, "DB_BENCH_PRESS",         8,  BENCH_KG[i],  7),
-                mk_set(w, 2, "DB_BENCH_PRESS",         8,  BENCH_KG[i],  7),
-                mk_set(w, 3, "DB_BENCH_PRESS",         6,  BENCH_KG[i],  8),
-                mk_set(w, 4, "DB_OVERHEAD_PRESS",      10, OHP_KG[i],    7),
-                mk_set(w, 5, "DB_OVERHEAD_PRESS",      10, OHP_KG[i],    7),
+                mk_set(w, 1, "DB_BENCH_PRESS", 8, BENCH_KG[i], 7),
+                mk_set(w, 2, "DB_BENCH_PRESS", 8, BENCH_KG[i], 7),
+                mk_set(w, 3, "DB_BENCH_PRESS", 6, BENCH_KG[i], 8),
+                mk_set(w, 4, "DB_OVERHEAD_PRESS", 10, OHP_KG[i], 7),
+                mk_set(w, 5, "DB_OVERHEAD_PRESS", 10, OHP_KG[i], 7),
                 mk_set(w, 6, "MACHINE_TRICEP_EXTENSION", 12, TRICEP_KG[i], 7),
                 mk_set(w, 7, "MACHINE_TRICEP_EXTENSION", 12, TRICEP_KG[i], 8),
             ]
@@ -380,13 +399,13 @@ def build_workouts(pk: str) -> List[Tuple[Workout, List[WorkoutSet]]]:
             tags = ["pull"]
             w = mk_workout(wid, days_back, name, tags, notes)
             sets = [
-                mk_set(w, 1, "MACHINE_LAT_PULLDOWN", 10, LAT_KG[i],  7),
-                mk_set(w, 2, "MACHINE_LAT_PULLDOWN", 10, LAT_KG[i],  8),
-                mk_set(w, 3, "MACHINE_LAT_PULLDOWN", 8,  LAT_KG[i],  8),
-                mk_set(w, 4, "DB_BENT_OVER_ROW",     10, ROW_KG[i],  7),
-                mk_set(w, 5, "DB_BENT_OVER_ROW",     10, ROW_KG[i],  7),
-                mk_set(w, 6, "DB_BICEP_CURL",         12, CURL_KG[i], 7),
-                mk_set(w, 7, "DB_BICEP_CURL",         12, CURL_KG[i], 8),
+                mk_set(w, 1, "MACHINE_LAT_PULLDOWN", 10, LAT_KG[i], 7),
+                mk_set(w, 2, "MACHINE_LAT_PULLDOWN", 10, LAT_KG[i], 8),
+                mk_set(w, 3, "MACHINE_LAT_PULLDOWN", 8, LAT_KG[i], 8),
+                mk_set(w, 4, "DB_BENT_OVER_ROW", 10, ROW_KG[i], 7),
+                mk_set(w, 5, "DB_BENT_OVER_ROW", 10, ROW_KG[i], 7),
+                mk_set(w, 6, "DB_BICEP_CURL", 12, CURL_KG[i], 7),
+                mk_set(w, 7, "DB_BICEP_CURL", 12, CURL_KG[i], 8),
             ]
             pull_n += 1
 
@@ -395,16 +414,239 @@ def build_workouts(pk: str) -> List[Tuple[Workout, List[WorkoutSet]]]:
             tags = ["legs"]
             w = mk_workout(wid, days_back, name, tags, notes)
             sets = [
-                mk_set(w, 1, "BB_SQUAT",   5, SQUAT_KG[i],  7),
-                mk_set(w, 2, "BB_SQUAT",   5, SQUAT_KG[i],  8),
-                mk_set(w, 3, "BB_SQUAT",   5, SQUAT_KG[i],  8),
-                mk_set(w, 4, "BB_DEADLIFT", 4, DEAD_KG[i],   7),
-                mk_set(w, 5, "BB_DEADLIFT", 4, DEAD_KG[i],   8),
-                mk_set(w, 6, "KB_SQUAT",   12, GOBLET_KG[i], 7),
-                mk_set(w, 7, "KB_SQUAT",   12, GOBLET_KG[i], 8),
+                mk_set(w, 1, "BB_SQUAT", 5, SQUAT_KG[i], 7),
+                mk_set(w, 2, "BB_SQUAT", 5, SQUAT_KG[i], 8),
+                mk_set(w, 3, "BB_SQUAT", 5, SQUAT_KG[i], 8),
+                mk_set(w, 4, "BB_DEADLIFT", 4, DEAD_KG[i], 7),
+                mk_set(w, 5, "BB_DEADLIFT", 4, DEAD_KG[i], 8),
+                mk_set(w, 6, "KB_SQUAT", 12, GOBLET_KG[i], 7),
+                mk_set(w, 7, "KB_SQUAT", 12, GOBLET_KG[i], 8),
             ]
             legs_n += 1
 
         workouts.append((w, sets))
 
     return workouts
+
+
+# ──────────────── Synthetic histories ────────────────
+#
+# Benchmarks and load tests need users far bigger than the hand-written seed
+# above. These are generated, and deterministic: the same arguments always
+# give the same items, timestamps included, so runs can be compared.
+
+# Workout counts for the benchmark users.
+HISTORY_SIZES = {"small": 10, "medium": 1_000, "large": 50_000}
+
+HISTORY_END = date(2025, 1, 1)
+# At most this many days of history; bigger users train more than once a day.
+_HISTORY_MAX_DAYS = 3650
+
+# (reps, starting kg) per exercise key. Bodyweight lifts carry no weight and
+# progress in reps instead.
+_HISTORY_LIFTS = {
+    "BW_SQUAT": (15, 0.0),
+    "BW_KNEE_PUSHUP": (10, 0.0),
+    "BB_SQUAT": (5, 40.0),
+    "BB_DEADLIFT": (5, 60.0),
+    "KB_SQUAT": (12, 16.0),
+    "KB_LUNGE": (10, 12.0),
+    "KB_SINGLE_LEG_DEADLIFT": (10, 12.0),
+    "DB_OVERHEAD_PRESS": (10, 8.0),
+    "DB_BENCH_PRESS": (8, 12.0),
+    "DB_BICEP_CURL": (12, 8.0),
+    "DB_BENT_OVER_ROW": (10, 12.0),
+    "DB_SINGLE_LEG_DEADLIFT": (10, 10.0),
+    "MACHINE_LAT_PULLDOWN": (10, 30.0),
+    "MACHINE_TRICEP_EXTENSION": (12, 25.0),
+}
+# The default rotation: (name, exercise keys).
+_HISTORY_SESSIONS = [
+    ("Push Day", ["DB_BENCH_PRESS", "DB_OVERHEAD_PRESS", "MACHINE_TRICEP_EXTENSION"]),
+    ("Pull Day", ["MACHINE_LAT_PULLDOWN", "DB_BENT_OVER_ROW", "DB_BICEP_CURL"]),
+    ("Leg Day", ["BB_SQUAT", "BB_DEADLIFT", "KB_SQUAT"]),
+]
+# Weights rise quickly at first and level off near (1 + gain) x the start.
+_HISTORY_GAIN = 1.0
+_HISTORY_CURVE = 3.0
+# Chance a whole week is skipped (holidays, illness).
+_HISTORY_MISSED_WEEK = 0.08
+
+
+def history_sessions(exercises: List[str] | None = None) -> List[Tuple[str, List[str]]]:
+    """
+    The session rotation for `exercises` (keys of build_exercise_ids()),
+    three exercises per session. Push/pull/legs when none are given.
+    """
+    if not exercises:
+        return _HISTORY_SESSIONS
+    unknown = [key for key in exercises if key not in _HISTORY_LIFTS]
+    if unknown:
+        raise ValueError(f"Unknown exercise(s): {', '.join(unknown)}")
+    return [
+        (f"Session {chr(ord('A') + n)}", exercises[i : i + 3])
+        for n, i in enumerate(range(0, len(exercises), 3))
+    ]
+
+
+def _history_workout(
+    pk: str,
+    i: int,
+    day: date,
+    progress: float,
+    session: Tuple[str, List[str]],
+    sets_per_workout: int,
+    rng: random.Random,
+    exercise_ids: dict[str, str],
+) -> Tuple[Workout, List[WorkoutSet]]:
+    ts = datetime.combine(day, time(18, 0), tzinfo=timezone.utc)
+    name, lifts = session
+    workout = Workout(
+        PK=pk,
+        SK=f"WORKOUT#{day.isoformat()}#H{i:06d}",
+        type="workout",
+        date=day,
+        name=name,
+        tags=[name.split()[0].lower()],
+        created_at=ts,
+        updated_at=ts,
+    )
+
+    sets = []
+    for n in range(1, sets_per_workout + 1):
+        key = lifts[(n - 1) * len(lifts) // sets_per_workout]
+        reps, start_kg = _HISTORY_LIFTS[key]
+        if start_kg:
+            weight = start_kg * (1 + progress) + rng.choice((-2.5, 0, 0, 2.5))
+            weight_kg = Decimal(str(round(max(weight, 2.5) * 4) / 4))
+        else:
+            reps = round(reps * (1 + progress / 2))
+            weight_kg = None
+        sets.append(
+            WorkoutSet(
+                PK=pk,
+                SK=f"{workout.SK}#SET#{n:03d}",
+                type="set",
+                set_number=n,
+                exercise_id=exercise_ids[key],
+                reps=max(reps - rng.randint(0, 2), 1),
+                weight_kg=weight_kg,
+                rpe=rng.randint(6, 9),
+                created_at=ts,
+                updated_at=ts,
+            )
+        )
+    return workout, sets
+
+
+def build_history(
+    pk: str,
+    workouts: int,
+    *,
+    sets_per_workout: int = 6,
+    end: date = HISTORY_END,
+    seed: int = 0,
+) -> List[Tuple[Workout, List[WorkoutSet]]]:
+    """
+    Build exactly `workouts` workouts, the newest on `end`, rotating
+    push/pull/legs with weights that climb and then level off. Sets use
+    the exercises from build_exercises().
+    Returns (Workout, [WorkoutSet, ...]) tuples, oldest first.
+    """
+    rng = random.Random(seed)
+    exercise_ids = build_exercise_ids()
+    days = min(workouts, _HISTORY_MAX_DAYS)
+    history: List[Tuple[Workout, List[WorkoutSet]]] = []
+
+    for i in range(workouts):
+        day = end - timedelta(days=(workouts - 1 - i) * days // workouts)
+        progress = _HISTORY_GAIN * (
+            1 - math.exp(-_HISTORY_CURVE * i / max(workouts - 1, 1))
+        )
+        session = _HISTORY_SESSIONS[i % len(_HISTORY_SESSIONS)]
+        history.append(
+            _history_workout(
+                pk, i, day, progress, session, sets_per_workout, rng, exercise_ids
+            )
+        )
+
+    return history
+
+
+def iter_history(
+    pk: str,
+    *,
+    years: float = 1,
+    per_week: float = 3,
+    exercises: List[str] | None = None,
+    sets_per_workout: int = 6,
+    gain: float = _HISTORY_GAIN,
+    half_gain_years: float = 1.0,
+    end: date = HISTORY_END,
+    seed: int = 0,
+) -> Iterator[Tuple[Workout, List[WorkoutSet]]]:
+    """
+    Generate `years` of training ending on `end`, oldest first: about
+    `per_week` workouts a week on varying days, with the odd week missed,
+    rotating through history_sessions(exercises). Weights climb towards
+    (1 + gain) x the starting weight, fast at first and then slowing: half
+    the gain comes in the first `half_gain_years`.
+    Generated lazily, so a long history can be streamed into a writer;
+    arguments are checked straight away.
+    """
+    if not 0 < per_week <= 7:
+        raise ValueError("per_week must be between 0 and 7")
+    if half_gain_years <= 0:
+        raise ValueError("half_gain_years must be positive")
+    sessions = history_sessions(exercises)
+    return _iter_history(
+        pk,
+        years,
+        per_week,
+        sessions,
+        sets_per_workout,
+        gain,
+        half_gain_years,
+        end,
+        seed,
+    )
+
+
+def _iter_history(
+    pk: str,
+    years: float,
+    per_week: float,
+    sessions: List[Tuple[str, List[str]]],
+    sets_per_workout: int,
+    gain: float,
+    half_gain_years: float,
+    end: date,
+    seed: int,
+) -> Iterator[Tuple[Workout, List[WorkoutSet]]]:
+    rng = random.Random(seed)
+    exercise_ids = build_exercise_ids()
+    total_days = max(round(years * 365), 1)
+    start = end - timedelta(days=total_days - 1)
+    whole, fraction = divmod(per_week, 1)
+    i = 0
+
+    for week in range(0, total_days, 7):
+        if rng.random() < _HISTORY_MISSED_WEEK:
+            continue
+        count = int(whole) + (rng.random() < fraction)
+        for offset in sorted(rng.sample(range(7), count)):
+            elapsed = week + offset
+            if elapsed >= total_days:
+                break
+            progress = gain * (1 - 0.5 ** (elapsed / (half_gain_years * 365)))
+            yield _history_workout(
+                pk,
+                i,
+                start + timedelta(days=elapsed),
+                progress,
+                sessions[i % len(sessions)],
+                sets_per_workout,
+                rng,
+                exercise_ids,
+            )
+            i += 1
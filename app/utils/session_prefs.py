@@ -0,0 +1,193 @@
+"""
+Signed cookie carrying the profile fields most pages need.
+
+Weight unit and timezone are read on nearly every request. Rather than a
+consistent-read profile fetch each time, they travel in a compact cookie,
+HMAC-signed with SESSION_PREFS_SECRET so it can be trusted as it stands:
+
+    base64url(json payload) "." base64url(hmac-sha256 of that payload)
+
+The cookie is set at login and whenever the account or preferences are
+updated. load() returns its contents, and only reads the profile when
+the cookie is missing, fails its signature, belongs to another user or
+is older than SESSION_PREFS_MAX_AGE_SECONDS. It then queues a fresh cookie
+that SessionPrefsMiddleware sets on the response. The age limit bounds how
+long a change made from another device can go unnoticed. Pages that read
+the whole profile anyway pass it to remember_profile(), which re-issues
+the cookie if its profile version is out of date.
+
+Without a secret the cookie is never issued and every lookup reads the
+profile.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+
+from app.models.profile import UserProfile
+from app.settings import settings
+from app.utils.auth import COOKIE_OPTS
+from app.utils.log import logger
+
+COOKIE_NAME = "prefs"
+# request.state attributes: the prefs resolved for this request, and the
+# cookie value SessionPrefsMiddleware should set on its response.
+_STATE_ATTR = "session_prefs"
+PENDING_COOKIE_ATTR = "session_prefs_cookie"
+
+
+@dataclass(frozen=True)
+class SessionPrefs:
+    user_sub: str
+    units: str
+    timezone: str
+    # The profile's updated_at in milliseconds; changes with every update.
+    version: int
+    issued_at: int
+
+    @property
+    def weight_unit(self) -> str:
+        return "lb" if self.units == "imperial" else "kg"
+
+    @classmethod
+    def from_profile(cls, profile: UserProfile) -> "SessionPrefs":
+        return cls(
+            user_sub=profile.user_sub,
+            units=profile.preferences.units,
+            timezone=profile.timezone,
+            version=profile_version(profile),
+            issued_at=int(time.time()),
+        )
+
+
+def profile_version(profile: UserProfile) -> int:
+    return int(profile.updated_at.timestamp() * 1000)
+
+
+def enabled() -> bool:
+    return bool(settings.SESSION_PREFS_SECRET)
+
+
+# ─────────────────────────── Encoding ───────────────────────────
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(payload: str) -> str:
+    digest = hmac.new(
+        settings.SESSION_PREFS_SECRET.encode(), payload.encode("ascii"), hashlib.sha256
+    ).digest()
+    return _b64encode(digest)
+
+
+def encode(prefs: SessionPrefs) -> str:
+    body = {
+        "s": prefs.user_sub,
+        "u": prefs.units,
+        "tz": prefs.timezone,
+        "v": prefs.version,
+        "t": prefs.issued_at,
+    }
+    payload = _b64encode(json.dumps(body, separators=(",", ":")).encode())
+    return f"{payload}.{_signature(payload)}"
+
+
+def decode(value: str, user_sub: str) -> SessionPrefs | None:
+    """The cookie's prefs, or None if it is not valid for user_sub right now."""
+    payload, _, signature = value.partition(".")
+    if not payload or not hmac.compare_digest(signature, _signature(payload)):
+        return None
+
+    try:
+        body = json.loads(_b64decode(payload))
+        prefs = SessionPrefs(
+            user_sub=body["s"],
+            units=body["u"],
+            timezone=body["tz"],
+            version=int(body["v"]),
+            issued_at=int(body["t"]),
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    if prefs.user_sub != user_sub:
+        return None
+    if time.time() - prefs.issued_at > settings.SESSION_PREFS_MAX_AGE_SECONDS:
+        return None
+    return prefs
+
+
+# ─────────────────────────── Cookie ───────────────────────────
+
+
+def set_cookie(response: Response, profile: UserProfile) -> None:
+    if not enabled():
+        return
+    response.set_cookie(
+        key=COOKIE_NAME,
+        value=encode(SessionPrefs.from_profile(profile)),
+        max_age=settings.SESSION_PREFS_MAX_AGE_SECONDS,
+        path="/",
+        **COOKIE_OPTS,
+    )
+
+
+def delete_cookie(response: Response) -> None:
+    response.delete_cookie(COOKIE_NAME, path="/", **COOKIE_OPTS)
+
+
+def _queue_cookie(request: Request, prefs: SessionPrefs) -> None:
+    setattr(request.state, _STATE_ATTR, prefs)
+    if enabled():
+        setattr(request.state, PENDING_COOKIE_ATTR, encode(prefs))
+
+
+# ─────────────────────────── Lookup ───────────────────────────
+
+
+def load(request: Request, user_sub: str, profile_repo) -> SessionPrefs | None:
+    """
+    The user's prefs, from the cookie when it is valid and from the
+    profile otherwise. Returns None for a user without a profile. Errors
+    from profile_repo propagate.
+    """
+    prefs = getattr(request.state, _STATE_ATTR, None)
+    if prefs is not None and prefs.user_sub == user_sub:
+        return prefs
+
+    cookie = request.cookies.get(COOKIE_NAME)
+    if cookie and enabled():
+        prefs = decode(cookie, user_sub)
+        if prefs is not None:
+            setattr(request.state, _STATE_ATTR, prefs)
+            return prefs
+        logger.debug("Session prefs cookie rejected user_sub=%s", user_sub)
+
+    profile = profile_repo.get_for_user(user_sub)
+    if profile is None:
+        return None
+
+    prefs = SessionPrefs.from_profile(profile)
+    _queue_cookie(request, prefs)
+    return prefs
+
+
+def remember_profile(request: Request, profile: UserProfile) -> None:
+    """Re-issue the cookie if it doesn't describe this freshly read profile."""
+    if not enabled():
+        return
+    cookie = request.cookies.get(COOKIE_NAME)
+    current = decode(cookie, profile.user_sub) if cookie else None
+    if current is None or current.version != profile_version(profile):
+        _queue_cookie(request, SessionPrefs.from_profile(profile))
@@ -0,0 +1,183 @@
+"""
+Fingerprinted, precompressed static assets.
+
+The build step (scripts/build_static.py, run by deploy_code.sh) copies
+every file under static/ to a content-hashed name, e.g.
+CSS/base.css -> CSS/base.3f2a9c1d8e7b.css. For text assets it writes .gz
+and, when the optional brotli package is installed, .br variants. It also
+writes manifest.json, which maps each original path to its hashed one.
+
+At runtime url_for('static', path=...) in templates resolves through the
+manifest, and StaticAssets serves the hashed files with an immutable
+Cache-Control. A new deploy changes the names, so browsers never need to
+revalidate. Where the client accepts it, the precompressed variant is
+sent instead. Without a manifest (a checkout that never ran the build)
+paths are used as they are.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from functools import lru_cache
+from mimetypes import guess_type
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.utils.log import logger
+
+STATIC_DIR = "static"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_HASH_LENGTH = 12
+_COMPRESSIBLE = {".css", ".js", ".svg", ".ico", ".json", ".txt", ".map"}
+# Preferred first; the suffix each precompressed variant is written with.
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+# ─────────────────────────── Runtime ───────────────────────────
+
+
+@lru_cache(maxsize=1)
+def load_manifest(static_dir: str = STATIC_DIR) -> dict[str, str]:
+    try:
+        with open(os.path.join(static_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+@lru_cache(maxsize=1)
+def _fingerprinted(static_dir: str = STATIC_DIR) -> frozenset[str]:
+    return frozenset(load_manifest(static_dir).values())
+
+
+def asset_path(path: str) -> str:
+    """The fingerprinted path for a static file, or path itself if it has none."""
+    return load_manifest().get(path, path)
+
+
+def accepted_encodings(headers: Headers) -> set[str]:
+    """Content codings the client accepts, dropping any it refuses with q=0."""
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        name, _, q = params.strip().partition("=")
+        try:
+            if name.strip() == "q" and float(q) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticAssets(StaticFiles):
+    """
+    StaticFiles that marks fingerprinted files immutable and serves a
+    precompressed variant (.br, then .gz) when the client accepts one.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if path in _fingerprinted(str(self.directory)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        request_headers = Headers(scope=scope)
+        variants = [
+            (coding, f"{full_path}{suffix}")
+            for coding, suffix in _ENCODINGS
+            if os.path.isfile(f"{full_path}{suffix}")
+        ]
+        if not variants:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        accepted = accepted_encodings(request_headers)
+        # Ranges index into the bytes on disk; keep those on the original.
+        if "range" not in request_headers:
+            for coding, variant in variants:
+                if coding in accepted:
+                    response = FileResponse(
+                        variant,
+                        status_code=status_code,
+                        stat_result=os.stat(variant),
+                        # Typed as the original file, not as a .br/.gz archive.
+                        media_type=guess_type(str(full_path))[0] or "text/plain",
+                        headers={"Content-Encoding": coding, "Vary": "Accept-Encoding"},
+                    )
+                    if self.is_not_modified(response.headers, request_headers):
+                        return NotModifiedResponse(response.headers)
+                    return response
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+# ─────────────────────────── Build ───────────────────────────
+
+
+def _fingerprint(rel_path: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:_HASH_LENGTH]
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}.{digest}{ext}"
+
+
+def _brotli():
+    try:
+        import brotli  # optional: only the build step needs it
+    except ImportError:
+        return None
+    return brotli
+
+
+def _write_compressed(path: str, content: bytes, brotli) -> None:
+    # mtime=0 keeps the .gz byte-identical between builds.
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    for suffix, data in variants.items():
+        if len(data) < len(content):
+            with open(path + suffix, "wb") as f:
+                f.write(data)
+
+
+def build_static_assets(src_dir: str, dest_dir: str) -> dict[str, str]:
+    """
+    Write a fingerprinted copy (plus .gz/.br variants) of every file under
+    src_dir into dest_dir, then the manifest. Returns the manifest.
+    """
+    brotli = _brotli()
+    if brotli is None:
+        logger.warning("brotli is not installed; writing .gz variants only")
+
+    manifest: dict[str, str] = {}
+    for root, _, files in os.walk(src_dir):
+        for name in sorted(files):
+            src = os.path.join(root, name)
+            rel_path = os.path.relpath(src, src_dir).replace(os.sep, "/")
+            if rel_path == MANIFEST_NAME:
+                continue
+
+            with open(src, "rb") as f:
+                content = f.read()
+
+            hashed = _fingerprint(rel_path, content)
+            dest = os.path.join(dest_dir, hashed)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copyfile(src, dest)
+            if os.path.splitext(name)[1].lower() in _COMPRESSIBLE:
+                _write_compressed(dest, content, brotli)
+            manifest[rel_path] = hashed
+
+    os.makedirs(dest_dir, exist_ok=True)
+    with open(os.path.join(dest_dir, MANIFEST_NAME), "w") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+    return manifest
@@ -2,6 +2,7 @@ from fastapi import Response
 
 from app.repositories.profile import DynamoProfileRepository
 from app.settings import settings
+from app.utils import session_prefs
 from app.utils.auth import decode_and_validate_id_token, get_jwks_url
 
 THEME_COOKIE_OPTS = {
@@ -23,7 +24,8 @@ def set_theme_cookie(response: Response, theme: str) -> None:
 
 def get_theme_cookie_from_profile(response: Response, id_token: str) -> None:
     """
-    After a successful login, set the theme cookie based on the user's stored profile.
+    After a successful login, set the theme and session-preferences cookies
+    based on the user's stored profile.
     If profile/theme doesn't exist, do nothing (middleware will use DEFAULT_THEME).
     """
 
@@ -46,6 +48,9 @@ def get_theme_cookie_from_profile(response: Response, id_token: str) -> None:
         # don't fail login over theme; just fall back to default
         return
 
+    if profile is not None:
+        session_prefs.set_cookie(response, profile)
+
     theme = getattr(getattr(profile, "preferences", None), "theme", None)
     if not theme:
         return
@@ -0,0 +1,67 @@
+import time
+from typing import Callable
+
+from app.settings import settings
+from app.utils.log import logger
+
+# A key no item uses: the read opens a connection without returning data.
+_WARMUP_KEY = {"PK": "WARMUP", "SK": "WARMUP"}
+
+
+def _warm_dynamodb() -> None:
+    from app.utils import db
+
+    db.get_table().get_item(Key=_WARMUP_KEY)
+
+
+def _warm_jwks() -> None:
+    from app.utils import auth
+
+    if settings.DISABLE_AUTH_FOR_LOCAL_DEV or not settings.COGNITO_ISSUER_URL:
+        return
+    jwks_url = auth.get_jwks_url(settings.COGNITO_ISSUER_URL.rstrip("/"))
+    auth._get_jwks_client(jwks_url).get_signing_keys()
+
+
+def _warm_templates() -> None:
+    from app.templates.templates import templates
+
+    for name in settings.WARMUP_TEMPLATES:
+        templates.env.get_template(name)
+
+
+_STEPS: tuple[tuple[str, Callable[[], None]], ...] = (
+    ("dynamodb", _warm_dynamodb),
+    ("jwks", _warm_jwks),
+    ("templates", _warm_templates),
+)
+
+
+def warm_up() -> dict[str, float]:
+    """
+    Do the one-off work a container's first request would otherwise pay
+    for. Called at module init on Lambda (app/handler.py) and on lifespan
+    startup under uvicorn (app/main.py).
+
+    Each step is timed; a failing step is logged and skipped, never
+    raised, so a slow or unreachable dependency can't stop the app from
+    starting. Returns the step timings in milliseconds.
+    """
+    if not settings.WARMUP_ENABLED:
+        return {}
+
+    timings: dict[str, float] = {}
+    for name, step in _STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up step failed step={name} err={e}")
+        timings[name] = (time.perf_counter() - started) * 1000
+
+    logger.info(
+        "Warm-up complete "
+        + " ".join(f"{name}_ms={ms:.0f}" for name, ms in timings.items())
+        + f" total_ms={sum(timings.values()):.0f}"
+    )
+    return timings
@@ -0,0 +1,105 @@
+# Timing, percentiles and baseline comparison for benchmarks/suite.py.
+#
+# A baseline is the JSON written by `suite --update-baseline`: percentiles
+# per benchmark name. compare() flags a benchmark whose p50 is more than
+# `tolerance` (a fraction) above the baseline's. Differences under
+# `min_delta_ms` are ignored, so sub-millisecond timings don't flap.
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of already sorted samples."""
+    if not sorted_samples:
+        raise ValueError("no samples")
+    rank = (len(sorted_samples) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (
+        rank - low
+    )
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> dict[str, float]:
+    """Run fn `warmup` + `repeat` times; stats in ms over the timed runs."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+
+    stats = {f"p{p}_ms": round(percentile(samples, p), 3) for p in PERCENTILES}
+    stats["mean_ms"] = round(statistics.fmean(samples), 3)
+    stats["min_ms"] = round(samples[0], 3)
+    stats["max_ms"] = round(samples[-1], 3)
+    stats["runs"] = repeat
+    return stats
+
+
+@dataclass
+class Comparison:
+    name: str
+    current_ms: float
+    baseline_ms: float | None
+    regressed: bool
+
+    @property
+    def change(self) -> float | None:
+        if not self.baseline_ms:
+            return None
+        return self.current_ms / self.baseline_ms - 1
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    tolerance: float,
+    min_delta_ms: float = 0.5,
+) -> list[Comparison]:
+    comparisons = []
+    for name, stats in results.items():
+        current = stats["p50_ms"]
+        base = baseline.get(name, {}).get("p50_ms")
+        regressed = (
+            base is not None
+            and current > base * (1 + tolerance)
+            and current - base >= min_delta_ms
+        )
+        comparisons.append(Comparison(name, current, base, regressed))
+    return comparisons
+
+
+def load_baseline(path: str) -> dict[str, dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(
+    path: str, results: dict[str, dict], baseline: dict[str, dict]
+) -> None:
+    """Write results over the existing baseline, keeping entries not re-run."""
+    merged = {**baseline, **results}
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": dict(sorted(merged.items())),
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
@@ -0,0 +1,127 @@
+# Benchmark what logging costs on the render path: render_template() for
+# the home page under each logging setup, from the production default (INFO,
+# debug lines dropped before their arguments are formatted) to DEBUG written
+# synchronously, as app/utils/log.py used to. Also times a dropped debug
+# line built as an f-string against one with lazy %-style arguments.
+#
+# Run using:
+#   uv run python -m benchmarks.logging_overhead --renders 2000
+#
+# Output goes to os.devnull, so the numbers are the logging pipeline's own
+# CPU cost. devnull never blocks, so "DEBUG sync" is a best case: what the
+# queue buys is not waiting when stdout is a pipe that is slow to drain.
+
+import argparse
+import logging
+import os
+import queue
+import statistics
+import time
+from logging.handlers import QueueListener
+from typing import Callable
+
+from starlette.requests import Request
+
+from app.main import app
+from app.templates.templates import render_template
+from app.utils import log
+
+
+def _request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "app": app,
+            "router": app.router,
+            "method": "GET",
+            "path": "/",
+            "headers": [],
+            "query_string": b"",
+        }
+    )
+
+
+def _per_call_us(fn: Callable[[], object], calls: int, repeat: int) -> list[float]:
+    fn()  # template compile, url_for lookups, etc. outside the timings
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - started) * 1_000_000 / calls)
+    return sorted(timings)
+
+
+def _configure(level: int, handler: logging.Handler, sample_rate: float | None) -> None:
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(handler)
+    log.logger.setLevel(level)
+
+    render_logger = logging.getLogger("gymbyte.render")
+    for f in list(render_logger.filters):
+        render_logger.removeFilter(f)
+    if sample_rate is not None:
+        render_logger.addFilter(log.SamplingFilter(sample_rate))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logging on the render path")
+    parser.add_argument("--renders", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    sync_handler = logging.StreamHandler(devnull)
+    sync_handler.setFormatter(log.JsonFormatter())
+
+    listener_handler = logging.StreamHandler(devnull)
+    listener_handler.setFormatter(log.JsonFormatter())
+    records: queue.Queue = queue.Queue()
+    listener = QueueListener(records, listener_handler)
+    listener.start()
+    queued_handler = log._QueueHandler(records)
+
+    setups = (
+        ("INFO (prod default)", logging.INFO, queued_handler, None),
+        ("DEBUG sync", logging.DEBUG, sync_handler, None),
+        ("DEBUG queued", logging.DEBUG, queued_handler, None),
+        ("DEBUG queued 10%", logging.DEBUG, queued_handler, 0.1),
+    )
+
+    request = _request()
+    context = {"is_authed": False, "recent_workouts": []}
+
+    print(f"{'setup':<22} {'median us':>10} {'p95 us':>10}")
+    for name, level, handler, sample_rate in setups:
+        _configure(level, handler, sample_rate)
+        timings = _per_call_us(
+            lambda: render_template(request, "home.html", context=context),
+            args.renders,
+            args.repeat,
+        )
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<22} {statistics.median(timings):>10.2f} {p95:>10.2f}")
+        records.join()  # let the listener catch up before the next setup
+
+    # A debug line below the logger's level: the f-string is built anyway.
+    _configure(logging.INFO, queued_handler, None)
+    base_context = {"current_year": 2026, "theme": "volt"}
+    loops = args.renders * 10
+    eager = _per_call_us(
+        lambda: log.logger.debug(f"Base context: {base_context}"), loops, args.repeat
+    )
+    lazy = _per_call_us(
+        lambda: log.logger.debug("Base context: %s", base_context), loops, args.repeat
+    )
+    print(f"\n{'dropped debug line':<22} {'median us':>10}")
+    print(f"{'f-string':<22} {statistics.median(eager):>10.3f}")
+    print(f"{'%-style args':<22} {statistics.median(lazy):>10.3f}")
+
+    listener.stop()
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
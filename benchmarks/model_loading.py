@@ -0,0 +1,144 @@
+# Benchmark building models from DynamoDB items: trusted (model_construct
+# for items stamped by to_ddb_item) against full pydantic validation, per
+# model and on the workout listing and progress page read paths. The
+# per-model numbers decide which repositories use trusted loads (see
+# app/models/trusted.py).
+#
+# Run using:
+#   uv run python -m benchmarks.model_loading --workouts 500 --sets-per-workout 6
+#
+# Items are generated in memory and round-tripped through DynamoDB's type
+# serialiser, so numbers arrive as Decimal and timestamps as strings, just
+# as they do from the real table; no database is needed.
+
+import argparse
+import statistics
+import time
+from datetime import date
+from typing import Callable
+
+from app.models.exercise import Exercise
+from app.models.profile import UserProfile
+from app.models.trusted import construct_trusted
+from app.models.workout import Workout, WorkoutSet
+from app.repositories.base import _deserialize, _serialize
+from app.repositories.exercise import DynamoExerciseRepository
+from app.repositories.profile import DynamoProfileRepository
+from app.repositories.workout import DynamoWorkoutRepository
+from app.settings import settings
+from app.utils import db, progress
+from app.utils.seed_data import build_exercises, build_history, build_profile
+
+USER_SUB = "bench-user"
+
+
+class _StaticTable:
+    """Answers every query/get with the same pre-built items."""
+
+    def __init__(self, items: list[dict]):
+        self._items = items
+
+    def query(self, **kwargs) -> dict:
+        return {"Items": list(self._items)}
+
+    def get_item(self, **kwargs) -> dict:
+        return {"Item": self._items[0]}
+
+
+def _stored(item: dict) -> dict:
+    return _deserialize(_serialize(item))
+
+
+def build_items(workouts: int, sets_per_workout: int) -> tuple[list, list, list]:
+    pk = db.build_user_pk(USER_SUB)
+    workout_items: list[dict] = []
+    for workout, sets in build_history(
+        pk, workouts, sets_per_workout=sets_per_workout, end=date.today()
+    ):
+        workout_items.append(_stored(workout.to_ddb_item()))
+        workout_items.extend(_stored(s.to_ddb_item()) for s in sets)
+
+    exercise_items = [_stored(e.to_ddb_item()) for e in build_exercises(pk)]
+    profile_items = [_stored(build_profile(pk).to_ddb_item())]
+    return workout_items, exercise_items, profile_items
+
+
+def _time(fn: Callable[[], object], repeat: int) -> list[float]:
+    fn()  # warm caches (field coercers, tz index) outside the timings
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trusted model loading")
+    parser.add_argument("--workouts", type=int, default=500)
+    parser.add_argument("--sets-per-workout", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workout_items, exercise_items, profile_items = build_items(
+        args.workouts, args.sets_per_workout
+    )
+    workout_repo = DynamoWorkoutRepository(table=_StaticTable(workout_items))
+    exercise_repo = DynamoExerciseRepository(table=_StaticTable(exercise_items))
+    profile_repo = DynamoProfileRepository(table=_StaticTable(profile_items))
+
+    def listing():
+        workout_repo.get_all_for_user(USER_SUB)
+        profile_repo.get_for_user(USER_SUB)
+
+    def progress_page():
+        workouts, sets = workout_repo.get_all_workout_data_for_user(USER_SUB)
+        exercises = exercise_repo.get_all_for_user(USER_SUB)
+        profile = profile_repo.get_for_user(USER_SUB)
+        progress.build_frequency_chart_data(workouts)
+        progress.build_volume_chart_data(sets, profile.weight_unit)
+        progress.build_distribution_chart_data(sets, exercises)
+
+    print(f"{len(workout_items)} workout/set items, {len(exercise_items)} exercises\n")
+
+    samples = {
+        Workout: next(i for i in workout_items if i["type"] == "workout"),
+        WorkoutSet: next(i for i in workout_items if i["type"] == "set"),
+        Exercise: exercise_items[0],
+        UserProfile: profile_items[0],
+    }
+    loops = 1000
+    print(f"{'model':<12} {'validate us':>12} {'trusted us':>12}")
+    for model_cls, item in samples.items():
+        validate = statistics.median(
+            _time(
+                lambda: [model_cls.model_validate(item) for _ in range(loops)],
+                args.repeat,
+            )
+        )
+        trusted = statistics.median(
+            _time(
+                lambda: [construct_trusted(model_cls, item) for _ in range(loops)],
+                args.repeat,
+            )
+        )
+        # ms per `loops` calls -> us per call
+        print(f"{model_cls.__name__:<12} {validate:>12.2f} {trusted:>12.2f}")
+
+    print(f"\n{'path':<10} {'mode':<10} {'median ms':>10} {'p95 ms':>10}")
+    for name, fn in (("listing", listing), ("progress", progress_page)):
+        medians = {}
+        for trusted in (False, True):
+            settings.TRUSTED_MODEL_LOADS = trusted
+            timings = sorted(_time(fn, args.repeat))
+            mode = "trusted" if trusted else "validated"
+            medians[mode] = statistics.median(timings)
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{name:<10} {mode:<10} {medians[mode]:>10.2f} {p95:>10.2f}")
+        print(
+            f"{name:<10} speedup    {medians['validated'] / medians['trusted']:>10.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# Benchmark suite: the repositories, the progress chart builders, the export
+# round trip and the main read routes, against synthetic users of several
+# sizes (see build_history() in app/utils/seed_data.py), with p50/p95/p99
+# per case. Compared against benchmarks/baseline.json; exits 1 when a case's
+# p50 regresses by more than --tolerance.
+#
+# Run using:
+#   uv run python -m benchmarks.suite
+#   uv run python -m benchmarks.suite --sizes small,medium,large --repeat 5
+#   uv run python -m benchmarks.suite --only progress. --update-baseline
+#
+# Data lives in tests/memory_table.py, so by default this measures the app's
+# own work (queries, model loading, chart building, rendering), not the
+# network. --ddb-latency-ms adds a round trip to every DynamoDB call, to see
+# how a change in the number of calls would show up against the real table.
+# The baseline is only meaningful on the machine that wrote it: regenerate
+# it with --update-baseline before comparing on a new one.
+
+import argparse
+import logging
+import sys
+import time
+from datetime import date
+from typing import Callable
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.repositories.exercise import DynamoExerciseRepository
+from app.repositories.profile import DynamoProfileRepository
+from app.repositories.workout import DynamoWorkoutRepository
+from app.routes import data as data_routes
+from app.settings import settings
+from app.utils import auth, db, progress
+from app.utils.export import export_chunks, parse_import_file
+from app.utils.seed_data import (
+    HISTORY_SIZES,
+    build_exercise_ids,
+    build_exercises,
+    build_history,
+    build_profile,
+)
+from benchmarks.harness import compare, load_baseline, measure, save_baseline
+from tests.memory_table import Faults, MemoryTable
+
+USER_SUB = "bench-user"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+# Big users are slow to build and to run: opt in with --sizes.
+DEFAULT_SIZES = ("small", "medium")
+
+
+def load_table(workouts: int, latency_ms: float = 0.0) -> MemoryTable:
+    pk = db.build_user_pk(USER_SUB)
+    table = MemoryTable()
+    table.put_item(Item=build_profile(pk).to_ddb_item())
+    for exercise in build_exercises(pk):
+        table.put_item(Item=exercise.to_ddb_item())
+    # End today, so the 12-week and workload windows have data in them.
+    for workout, sets in build_history(pk, workouts, end=date.today()):
+        table.put_item(Item=workout.to_ddb_item())
+        for workout_set in sets:
+            table.put_item(Item=workout_set.to_ddb_item())
+    table.client.faults = Faults(latency_ms=latency_ms)
+    return table
+
+
+def cases(table: MemoryTable) -> dict[str, Callable[[], object]]:
+    workout_repo = DynamoWorkoutRepository(table=table)
+    exercise_repo = DynamoExerciseRepository(table=table)
+    profile_repo = DynamoProfileRepository(table=table)
+
+    workouts, sets = workout_repo.get_all_workout_data_for_user(USER_SUB)
+    exercises = exercise_repo.get_all_for_user(USER_SUB)
+    profile = profile_repo.get_for_user(USER_SUB)
+    squat_id = build_exercise_ids()["BB_SQUAT"]
+    latest = workouts[-1]
+
+    def export_round_trip():
+        payload = b"".join(
+            export_chunks("json", USER_SUB, profile, workout_repo, exercise_repo)
+        )
+        parse_import_file(payload)
+
+    client = TestClient(app)
+
+    def get(path: str) -> Callable[[], object]:
+        def request():
+            resp = client.get(path)
+            if resp.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {resp.status_code}")
+
+        return request
+
+    return {
+        "repo.workouts": lambda: workout_repo.get_all_for_user(USER_SUB),
+        "repo.workout_data": lambda: workout_repo.get_all_workout_data_for_user(
+            USER_SUB
+        ),
+        "repo.exercise_sets": lambda: workout_repo.get_set_summaries_for_exercise(
+            squat_id
+        ),
+        "repo.workout_with_sets": lambda: workout_repo.get_workout_with_sets(
+            USER_SUB, latest.date, latest.workout_id
+        ),
+        "progress.frequency": lambda: progress.build_frequency_chart_data(workouts),
+        "progress.volume": lambda: progress.build_volume_chart_data(sets, "kg"),
+        "progress.exercise": lambda: progress.build_exercise_progress_data(
+            sets, squat_id, "kg"
+        ),
+        "progress.1rm": lambda: progress.build_1rm_chart_data(sets, squat_id, "kg"),
+        "progress.distribution": lambda: progress.build_distribution_chart_data(
+            sets, exercises
+        ),
+        "progress.workload": lambda: progress.build_workload_chart_data(sets, "kg"),
+        "export.round_trip": export_round_trip,
+        "route.workouts": get("/workout/all"),
+        "route.workout": get(f"/workout/{latest.date.isoformat()}/{latest.workout_id}"),
+        "route.progress": get("/progress"),
+        "route.progress_volume": get("/progress/volume"),
+        "route.export": get("/profile/data/export"),
+    }
+
+
+def _configure(table: MemoryTable) -> None:
+    db.get_table = lambda: table
+    app.dependency_overrides[auth.require_auth] = lambda: {"sub": USER_SUB}
+    settings.RATE_LIMIT_ENABLED = False
+    data_routes._EXPORT_RATE_LIMIT = sys.maxsize  # per-user, not behind the flag
+    # Request logging (the app's, httpx's) would be timed along with the app.
+    logging.disable(logging.INFO)
+
+
+def _report(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float
+) -> bool:
+    comparisons = {c.name: c for c in compare(results, baseline, tolerance)}
+    print(
+        f"{'case':<36} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'baseline':>9} {'change':>8}"
+    )
+    for name, stats in results.items():
+        c = comparisons[name]
+        base = f"{c.baseline_ms:>9.2f}" if c.baseline_ms is not None else f"{'-':>9}"
+        change = f"{c.change:>+8.0%}" if c.change is not None else f"{'-':>8}"
+        flag = "  REGRESSED" if c.regressed else ""
+        print(
+            f"{name:<36} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+            f"{stats['p99_ms']:>9.2f} {base} {change}{flag}"
+        )
+    return any(c.regressed for c in comparisons.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(DEFAULT_SIZES),
+        help=f"comma-separated, from {', '.join(HISTORY_SIZES)}",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--only", default="", help="run cases whose name starts with this"
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed p50 slowdown, as a fraction",
+    )
+    parser.add_argument(
+        "--ddb-latency-ms",
+        type=float,
+        default=0.0,
+        help="simulated round trip per DynamoDB call; results are kept apart",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in HISTORY_SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    results: dict[str, dict] = {}
+    for size in sizes:
+        started = time.perf_counter()
+        table = load_table(HISTORY_SIZES[size], args.ddb_latency_ms)
+        _configure(table)
+        print(
+            f"{size}: {HISTORY_SIZES[size]} workouts, {len(table)} items "
+            f"(built in {time.perf_counter() - started:.1f}s)",
+            file=sys.stderr,
+        )
+        label = f"{size}@{args.ddb_latency_ms:g}ms" if args.ddb_latency_ms else size
+        for name, fn in cases(table).items():
+            if name.startswith(args.only):
+                # Large users take seconds per run: fewer runs there.
+                repeat = max(3, args.repeat // 5) if size == "large" else args.repeat
+                results[f"{label}/{name}"] = measure(fn, repeat)
+
+    baseline = load_baseline(args.baseline)
+    regressed = _report(results, baseline, args.tolerance)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, baseline)
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressed:
+        print(f"\nRegressions over {args.tolerance:.0%} against {args.baseline}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
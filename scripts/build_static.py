@@ -0,0 +1,37 @@
+# Write fingerprinted copies of the static files, with .gz (and, with the
+# brotli package installed, .br) variants and a manifest.json mapping each
+# original path to its hashed name. deploy_code.sh runs this against the
+# build folder:
+#
+#   uv run python -m scripts.build_static static build/static
+#
+# The app serves the hashed files with an immutable Cache-Control, and
+# url_for('static', ...) in templates resolves through the manifest. The
+# originals are left in place, so anything linking to them keeps working.
+# Don't point dest at static/ itself: a manifest there makes a dev server
+# serve stale hashed copies after you edit an asset.
+
+import argparse
+
+from app.utils.static_assets import build_static_assets
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fingerprint and precompress static files"
+    )
+    parser.add_argument("src", help="Directory of static files to read")
+    parser.add_argument(
+        "dest", help="Directory to write hashed files and manifest.json to"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    manifest = build_static_assets(args.src, args.dest)
+    print(f"Fingerprinted {len(manifest)} static files into {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# Precompile every Jinja2 template into a zip of Python modules, so a new
+# Lambda container loads them without parsing or compiling anything.
+# deploy_code.sh runs this against the build folder:
+#
+#   uv run python -m scripts.compile_templates build/app/templates/compiled.zip
+#
+# The app picks the zip up from app/templates/compiled.zip when it exists.
+# Don't write it into a checkout you develop in: templates in the zip are
+# never reloaded, so template edits would not show up until it is deleted.
+
+import argparse
+
+from app.templates.templates import compile_templates
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompile Jinja2 templates")
+    parser.add_argument("target", help="Path of the zip file to write")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    compile_templates(args.target)
+    print(f"Compiled templates to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
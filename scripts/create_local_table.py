@@ -6,6 +6,22 @@
 import boto3
 
 from app.settings import settings
+from app.utils.db import EXERCISE_PROGRESS_INDEX_ATTRS
+
+
+def exercise_progress_index_spec() -> dict:
+    """GSI definition for the slim, INCLUDE-projected progress index."""
+    return {
+        "IndexName": settings.DDB_EXERCISE_PROGRESS_INDEX,
+        "KeySchema": [
+            {"AttributeName": "ExercisePK", "KeyType": "HASH"},
+            {"AttributeName": "ExerciseSK", "KeyType": "RANGE"},
+        ],
+        "Projection": {
+            "ProjectionType": "INCLUDE",
+            "NonKeyAttributes": list(EXERCISE_PROGRESS_INDEX_ATTRS),
+        },
+    }
 
 
 def main():
@@ -47,7 +63,8 @@ def main():
                     {"AttributeName": "ExerciseSK", "KeyType": "RANGE"},
                 ],
                 "Projection": {"ProjectionType": "ALL"},
-            }
+            },
+            exercise_progress_index_spec(),
         ],
     )
 
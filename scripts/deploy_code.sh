@@ -90,10 +90,22 @@ rsync -a \
   --exclude 'build' \
   "${ROOT_DIR}/app/" "${BUILD_DIR}/app/"
 
+# --- precompile templates ---
+echo "Precompiling templates..."
+(
+  cd "$ROOT_DIR"
+  "$PY" -m scripts.compile_templates "${BUILD_DIR}/app/templates/compiled.zip"
+)
+
 # --- add the static files ---
   echo "Copying static assets..."
 if [ -d "${ROOT_DIR}/static" ]; then
   rsync -a "${ROOT_DIR}/static/" "${BUILD_DIR}/static/"
+  echo "Fingerprinting and precompressing static assets..."
+  (
+    cd "$ROOT_DIR"
+    "$PY" -m scripts.build_static "${ROOT_DIR}/static" "${BUILD_DIR}/static"
+  )
 else
   echo "⚠️ No static directory found at ${ROOT_DIR}/static, skipping"
 fi
@@ -140,6 +140,24 @@ DDB_TABLE_NAME=$(aws cloudformation list-exports \
   --query "Exports[?Name=='${PROJECT_NAME}-${ENV}-DynamoTableName'].Value" \
   --output text)
 
+IMPORT_UPLOAD_BUCKET=$(aws cloudformation list-exports \
+  --query "Exports[?Name=='${PROJECT_NAME}-${ENV}-ImportUploadBucketName'].Value" \
+  --output text)
+
+IMPORT_QUEUE_URL=$(aws cloudformation list-exports \
+  --query "Exports[?Name=='${PROJECT_NAME}-${ENV}-ImportQueueUrl'].Value" \
+  --output text)
+
+SESSION_PREFS_SECRET_ARN=$(aws cloudformation list-exports \
+  --query "Exports[?Name=='${PROJECT_NAME}-${ENV}-SessionPrefsSecretArn'].Value" \
+  --output text)
+
+SESSION_PREFS_SECRET=$(aws secretsmanager get-secret-value \
+  --region "$REGION" \
+  --secret-id "$SESSION_PREFS_SECRET_ARN" \
+  --query SecretString \
+  --output text)
+
 # Build cognito domain
 COGNITO_DOMAIN="${PROJECT_NAME}-${ENV}-${ACCOUNT_ID}-auth"
 COGNITO_REDIRECT_URI="${API_URL}/auth/callback"
@@ -149,6 +167,12 @@ if [[ -z "$USER_POOL_ID" || -z "$COGNITO_AUDIENCE" ]]; then
   exit 1
 fi
 
+# Without it the prefs cookie is never issued and every request reads the profile.
+if [[ -z "$SESSION_PREFS_SECRET" ]]; then
+  echo "Failed to read the session prefs secret. Check the app stack outputs."
+  exit 1
+fi
+
 
 
 # ====== Set Env Vars =======
@@ -159,8 +183,11 @@ aws lambda update-function-configuration \
   --function-name "${PROJECT_NAME}-${ENV}-app" \
   --environment "Variables={\
 ENV=${ENV},\
-LOG_LEVEL=DEBUG,\
+LOG_LEVEL=${LOG_LEVEL:-INFO},\
 DDB_TABLE_NAME=${DDB_TABLE_NAME},\
+IMPORT_UPLOAD_BUCKET=${IMPORT_UPLOAD_BUCKET},\
+IMPORT_QUEUE_URL=${IMPORT_QUEUE_URL},\
+SESSION_PREFS_SECRET=${SESSION_PREFS_SECRET},\
 COGNITO_REDIRECT_URI=${COGNITO_REDIRECT_URI},\
 COGNITO_ISSUER_URL=${COGNITO_ISSUER_URL},\
 COGNITO_AUDIENCE=${COGNITO_AUDIENCE},\
@@ -170,8 +197,11 @@ COGNITO_DOMAIN=${COGNITO_DOMAIN}" > /dev/null
 echo "✅ Environment variables set for Lambda ${PROJECT_NAME}-${ENV}-app:"
 echo "------------------------------------------------------------"
 echo "ENV=${ENV}"
-echo "LOG_LEVEL=DEBUG"
+echo "LOG_LEVEL=${LOG_LEVEL:-INFO}"
 echo "DDB_TABLE_NAME=${DDB_TABLE_NAME}"
+echo "IMPORT_UPLOAD_BUCKET=${IMPORT_UPLOAD_BUCKET}"
+echo "IMPORT_QUEUE_URL=${IMPORT_QUEUE_URL}"
+echo "SESSION_PREFS_SECRET=(from ${SESSION_PREFS_SECRET_ARN})"
 echo "COGNITO_REDIRECT_URI=${COGNITO_REDIRECT_URI}"
 echo "COGNITO_ISSUER_URL=${COGNITO_ISSUER_URL}"
 echo "COGNITO_AUDIENCE=${COGNITO_AUDIENCE}"
@@ -4,31 +4,142 @@
 #   uv run python -m scripts.export_user_data \
 #     --sub "<cognito sub>" \
 #     --output ./backup.json
+#
+# Pass --format json.gz, ndjson or ndjson.gz for compressed / line-delimited
+# output, or sqlite for a database with exercises, workouts and sets tables;
+# the default output filename follows the chosen format.
+#
+# Pass --since <ISO timestamp> for a schema v2 delta: only what changed
+# after that point, plus deletions. It works with --all-users too.
+#
+# Export every user (backups, migrations):
+#   ENV=prod uv run python -m scripts.export_user_data \
+#     --all-users --output-dir ./exports --segments 8 --workers 4
+#
+# Users are discovered with a parallel scan; each scan segment runs in a
+# worker process and writes one <sub>.<format> file per user (json.gz by
+# default). --archive bundles the files into a single tar instead. Each
+# finished user is appended to a manifest (<output-dir>/manifest.jsonl);
+# re-running the same command skips users and segments already recorded
+# there, so an interrupted export resumes where it stopped. The manifest
+# also records --format and --since, and a run with different ones into
+# the same directory is refused rather than resumed.
 
 import argparse
+import json
+import multiprocessing
+import os
+import re
 import sys
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from pydantic import BaseModel
 
+from app.models.export import ExportSummary
 from app.repositories.exercise import DynamoExerciseRepository
 from app.repositories.profile import DynamoProfileRepository
+from app.repositories.tombstone import DynamoTombstoneRepository
 from app.repositories.workout import DynamoWorkoutRepository
-from app.utils.export import build_export_payload, serialise_export
+from app.utils.dates import dt_to_iso, now
+from app.utils.export import (
+    EXPORT_MEDIA_TYPES,
+    ExportDelta,
+    check_delta_since,
+    export_chunks,
+)
+
+MANIFEST_NAME = "manifest.jsonl"
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Export GymByte user data to JSON")
-    parser.add_argument("--sub", required=True, help="Cognito user sub to export")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sub", help="Cognito user sub to export")
+    target.add_argument(
+        "--all-users",
+        action="store_true",
+        help="Export every user with a profile, one file per user",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(EXPORT_MEDIA_TYPES),
+        help="Export format (default: json, or json.gz with --all-users)",
+    )
     parser.add_argument(
         "--output",
-        default="backup.json",
-        help="Output file path (default: backup.json)",
+        help="Output file path (default: backup.<format>)",
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only export changes and deletions after this ISO timestamp",
+    )
+
+    bulk = parser.add_argument_group("bulk export (--all-users)")
+    bulk.add_argument(
+        "--output-dir",
+        default="exports",
+        help="Directory for per-user files and the manifest (default: exports)",
+    )
+    bulk.add_argument(
+        "--archive",
+        help="Bundle the per-user files into this tar archive instead",
+    )
+    bulk.add_argument(
+        "--segments",
+        type=int,
+        default=4,
+        help="Parallel scan segments (default: 4)",
+    )
+    bulk.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: one per segment, up to the CPU count)",
+    )
+    bulk.add_argument(
+        "--max-users-per-second",
+        type=float,
+        default=0,
+        help="Throttle exports across all workers; 0 for no limit (default: 0)",
+    )
+    bulk.add_argument(
+        "--scan-page-size",
+        type=int,
+        default=100,
+        help="Items read per scan request, to cap read throughput (default: 100)",
     )
     return parser.parse_args()
 
 
-def main() -> None:
-    args = parse_args()
+def parse_since(args: argparse.Namespace) -> datetime | None:
+    if args.since is None:
+        return None
+    try:
+        return check_delta_since(args.since)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+
+def build_delta(user_sub: str, since: datetime | None) -> ExportDelta | None:
+    if since is None:
+        return None
+    tombstones = DynamoTombstoneRepository().get_since(user_sub, since)
+    return ExportDelta(since, tombstones)
+
+
+# ─────────────────────────────────────────────────────────────
+# Single user
+# ─────────────────────────────────────────────────────────────
+
+
+def export_single(args: argparse.Namespace) -> None:
     user_sub: str = args.sub
-    output_path: str = args.output
+    export_format: str = args.format or "json"
+    output_path: str = args.output or f"backup.{export_format}"
+    since = parse_since(args)
 
     profile_repo = DynamoProfileRepository()
     workout_repo = DynamoWorkoutRepository()
@@ -39,20 +150,314 @@ def main() -> None:
         print(f"Error: no profile found for sub={user_sub}", file=sys.stderr)
         sys.exit(1)
 
-    payload_dict = build_export_payload(user_sub, profile, workout_repo, exercise_repo)
-    json_str = serialise_export(payload_dict)
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(json_str)
+    summary = ExportSummary()
+    with open(output_path, "wb") as f:
+        for chunk in export_chunks(
+            export_format,
+            user_sub,
+            profile,
+            workout_repo,
+            exercise_repo,
+            summary,
+            delta=build_delta(user_sub, since),
+        ):
+            f.write(chunk)
 
-    import json
-    data = json.loads(json_str)
     print(
         f"Exported to {output_path}: "
-        f"{len(data['exercises'])} exercise(s), "
-        f"{len(data['workouts'])} workout(s)"
+        f"{summary.exercises} exercise(s), "
+        f"{summary.workouts} workout(s)"
+        + (f", {summary.deleted} deletion(s)" if since else "")
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# All users
+# ─────────────────────────────────────────────────────────────
+
+
+class BulkOptions(BaseModel):
+    export_format: str
+    output_dir: str
+    manifest_path: str
+    total_segments: int
+    scan_page_size: int
+    # Minimum seconds between exports within one worker process.
+    min_interval: float
+    since: datetime | None = None
+
+
+class SegmentResult(BaseModel):
+    segment: int
+    users: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes: int = 0
+    files: list[str] = []
+    seconds: float = 0
+
+
+def user_filename(user_sub: str, export_format: str) -> str:
+    return f"{re.sub(r'[^A-Za-z0-9_-]', '_', user_sub)}.{export_format}"
+
+
+def append_manifest(path: str, entry: dict) -> None:
+    # One O_APPEND write per line, so concurrent workers never interleave.
+    line = (json.dumps(entry) + "\n").encode()
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+class Manifest(BaseModel):
+    # What the manifest's exports were made with, from its "run" entry.
+    export_format: str | None = None
+    since: str | None = None
+    users: dict[str, dict] = {}
+    segments: set[int] = set()
+    total_segments: int | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return self.export_format is None and not self.users and not self.segments
+
+
+def read_manifest(path: str) -> Manifest:
+    """Return the exported users, finished segments and run settings."""
+    manifest = Manifest()
+    if not os.path.exists(path):
+        return manifest
+
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line from an interrupted run
+            if entry.get("type") == "run":
+                manifest.export_format = entry["format"]
+                manifest.since = entry["since"]
+            elif entry.get("type") == "user":
+                manifest.users[entry["sub"]] = entry
+            elif entry.get("type") == "segment":
+                manifest.segments.add(entry["segment"])
+                manifest.total_segments = entry["total_segments"]
+    return manifest
+
+
+def export_segment(
+    segment: int, options: BulkOptions, done_users: frozenset[str]
+) -> SegmentResult:
+    """Scan one segment for profiles and export each user not yet done."""
+    started = time.monotonic()
+    result = SegmentResult(segment=segment)
+
+    # Repositories are created per process; boto3 sessions aren't fork-safe.
+    profile_repo = DynamoProfileRepository()
+    workout_repo = DynamoWorkoutRepository()
+    exercise_repo = DynamoExerciseRepository()
+
+    next_slot = 0.0
+    for profile in profile_repo.scan_profiles(
+        segment=segment,
+        total_segments=options.total_segments,
+        page_size=options.scan_page_size,
+    ):
+        user_sub = profile.user_sub
+        if user_sub in done_users:
+            result.skipped += 1
+            continue
+
+        wait = next_slot - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        next_slot = time.monotonic() + options.min_interval
+
+        filename = user_filename(user_sub, options.export_format)
+        path = os.path.join(options.output_dir, filename)
+        summary = ExportSummary()
+        try:
+            # Write under a temporary name so a crash never leaves a
+            # truncated file that looks complete.
+            with open(f"{path}.part", "wb") as f:
+                for chunk in export_chunks(
+                    options.export_format,
+                    user_sub,
+                    profile,
+                    workout_repo,
+                    exercise_repo,
+                    summary,
+                    delta=build_delta(user_sub, options.since),
+                ):
+                    f.write(chunk)
+            os.replace(f"{path}.part", path)
+        except Exception as e:
+            print(f"  failed sub={user_sub}: {e}", file=sys.stderr)
+            try:
+                os.remove(f"{path}.part")
+            except FileNotFoundError:
+                pass
+            append_manifest(
+                options.manifest_path,
+                {"type": "error", "sub": user_sub, "error": str(e)},
+            )
+            result.failed += 1
+            continue
+
+        size = os.path.getsize(path)
+        append_manifest(
+            options.manifest_path,
+            {
+                "type": "user",
+                "sub": user_sub,
+                "file": filename,
+                "bytes": size,
+                "exercises": summary.exercises,
+                "workouts": summary.workouts,
+                "sets": summary.sets,
+                "deleted": summary.deleted,
+                "exported_at": dt_to_iso(now()),
+            },
+        )
+        result.users += 1
+        result.bytes += size
+        result.files.append(filename)
+
+    # Failed users are retried on the next run, so only a clean segment is
+    # recorded as finished.
+    if not result.failed:
+        append_manifest(
+            options.manifest_path,
+            {
+                "type": "segment",
+                "segment": segment,
+                "total_segments": options.total_segments,
+            },
+        )
+    result.seconds = time.monotonic() - started
+    return result
+
+
+def archive_files(archive_path: str, output_dir: str, filenames: list[str]) -> None:
+    """Move finished per-user files into the (uncompressed, appendable) tar."""
+    present = [n for n in filenames if os.path.exists(os.path.join(output_dir, n))]
+    if not present:
+        return
+    with tarfile.open(archive_path, "a") as tar:
+        for name in present:
+            tar.add(os.path.join(output_dir, name), arcname=name)
+    for name in present:
+        os.remove(os.path.join(output_dir, name))
+
+
+def export_all(args: argparse.Namespace) -> None:
+    if args.segments < 1:
+        sys.exit("Error: --segments must be at least 1")
+
+    export_format: str = args.format or "json.gz"
+    since = parse_since(args)
+    output_dir: str = args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    manifest = read_manifest(manifest_path)
+    since_iso = dt_to_iso(since) if since else None
+    if manifest.is_empty:
+        append_manifest(
+            manifest_path, {"type": "run", "format": export_format, "since": since_iso}
+        )
+    elif (manifest.export_format, manifest.since) != (export_format, since_iso):
+        # Resuming would skip users whose files hold a different export.
+        sys.exit(
+            f"Error: {manifest_path} records an export with --format "
+            f"{manifest.export_format or 'unknown'} and --since "
+            f"{manifest.since or 'none'}; this run has --format {export_format} "
+            f"and --since {since_iso or 'none'}. Use a new --output-dir."
+        )
+
+    done_users, done_segments = manifest.users, manifest.segments
+    manifest_segments = manifest.total_segments
+    if manifest_segments is not None and manifest_segments != args.segments:
+        # Segment numbers only line up across runs with the same count.
+        print(
+            f"Manifest was written with --segments {manifest_segments}; "
+            f"rescanning all segments (exported users are still skipped)."
+        )
+        done_segments = set()
+
+    if args.archive:
+        # Files from an interrupted run that never made it into the tar.
+        archive_files(
+            args.archive, output_dir, [u["file"] for u in done_users.values()]
+        )
+
+    workers = args.workers or min(args.segments, os.cpu_count() or 1)
+    pending = [s for s in range(args.segments) if s not in done_segments]
+    options = BulkOptions(
+        export_format=export_format,
+        output_dir=output_dir,
+        manifest_path=manifest_path,
+        total_segments=args.segments,
+        scan_page_size=args.scan_page_size,
+        min_interval=(
+            (workers / args.max_users_per_second)
+            if args.max_users_per_second > 0
+            else 0
+        ),
+        since=since,
     )
 
+    print(
+        f"Exporting all users as {export_format}: {len(pending)}/{args.segments} "
+        f"segment(s) to scan, {workers} worker(s), {len(done_users)} user(s) "
+        f"already in the manifest."
+    )
+
+    started = time.monotonic()
+    totals = SegmentResult(segment=-1)
+    done = frozenset(done_users)
+    ctx = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = [pool.submit(export_segment, s, options, done) for s in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            if args.archive:
+                archive_files(args.archive, output_dir, result.files)
+
+            totals.users += result.users
+            totals.skipped += result.skipped
+            totals.failed += result.failed
+            totals.bytes += result.bytes
+            print(
+                f"  segment {result.segment + 1}/{args.segments}: "
+                f"{result.users} exported, {result.skipped} skipped, "
+                f"{result.failed} failed, {result.bytes / 1e6:.1f} MB "
+                f"in {result.seconds:.1f}s"
+            )
+
+    elapsed = time.monotonic() - started
+    rate = totals.users / elapsed if elapsed else 0.0
+    print(
+        f"Exported {totals.users} user(s), {totals.bytes / 1e6:.1f} MB in "
+        f"{elapsed:.1f}s ({rate:.1f} users/s, {totals.bytes / 1e6 / (elapsed or 1):.1f} MB/s); "
+        f"{totals.skipped} skipped, {totals.failed} failed. "
+        f"Manifest: {manifest_path}"
+    )
+    if totals.failed:
+        print("Re-run the same command to retry failed users.", file=sys.stderr)
+        sys.exit(1)
+
+
+def main() -> None:
+    args = parse_args()
+    if args.all_users:
+        export_all(args)
+    else:
+        export_single(args)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,120 @@
+# Cut an existing table over from the ALL-projected ExerciseIndex to the slim
+# INCLUDE-projected ExerciseProgressIndex.
+#
+# Run in two steps so reads never point at a missing index:
+#
+#   # 1. Create the slim index and wait for the backfill to finish
+#   ENV=prod uv run python -m scripts.migrate_exercise_index
+#
+#   # 2. Once the app is deployed reading from the slim index, drop the old one
+#   ENV=prod uv run python -m scripts.migrate_exercise_index --drop-legacy
+#
+# Tables managed by CloudFormation (infra/data.yaml) should be migrated by
+# deploying the stack instead; this script is for DynamoDB Local and any
+# table created outside the stack.
+
+import argparse
+import time
+
+import boto3
+
+from app.settings import settings
+from scripts.create_local_table import exercise_progress_index_spec
+
+LEGACY_INDEX_NAME = "ExerciseIndex"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Migrate ExerciseIndex to the slim ExerciseProgressIndex"
+    )
+    parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help=f"Delete {LEGACY_INDEX_NAME} once the slim index is ACTIVE",
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=5.0,
+        help="Seconds between index status checks (default: 5)",
+    )
+    return parser.parse_args()
+
+
+def get_client():
+    kwargs = {"region_name": settings.REGION}
+    if settings.DDB_ENDPOINT_URL:
+        kwargs["endpoint_url"] = settings.DDB_ENDPOINT_URL
+    return boto3.client("dynamodb", **kwargs)
+
+
+def index_statuses(client, table_name: str) -> dict[str, dict]:
+    table = client.describe_table(TableName=table_name)["Table"]
+    return {gsi["IndexName"]: gsi for gsi in table.get("GlobalSecondaryIndexes", [])}
+
+
+def wait_until_active(
+    client, table_name: str, index_name: str, poll_seconds: float
+) -> None:
+    while True:
+        gsi = index_statuses(client, table_name).get(index_name)
+        if gsi is None:
+            raise SystemExit(f"Index '{index_name}' disappeared while waiting.")
+
+        status = gsi.get("IndexStatus")
+        backfilling = gsi.get("Backfilling", False)
+        if status == "ACTIVE" and not backfilling:
+            return
+
+        print(f"  {index_name}: status={status} backfilling={backfilling}")
+        time.sleep(poll_seconds)
+
+
+def main() -> None:
+    args = parse_args()
+    client = get_client()
+    table_name = settings.DDB_TABLE_NAME
+    spec = exercise_progress_index_spec()
+    slim_name = spec["IndexName"]
+
+    existing = index_statuses(client, table_name)
+
+    if slim_name not in existing:
+        print(f"Creating {slim_name} on '{table_name}'...")
+        client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=[
+                {"AttributeName": "ExercisePK", "AttributeType": "S"},
+                {"AttributeName": "ExerciseSK", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": spec}],
+        )
+    else:
+        print(f"{slim_name} already exists on '{table_name}'.")
+
+    wait_until_active(client, table_name, slim_name, args.poll_seconds)
+    print(f"{slim_name} is ACTIVE.")
+
+    if not args.drop_legacy:
+        if LEGACY_INDEX_NAME in existing:
+            print(
+                f"{LEGACY_INDEX_NAME} kept. Re-run with --drop-legacy once reads "
+                f"have moved to {slim_name}."
+            )
+        return
+
+    if LEGACY_INDEX_NAME not in index_statuses(client, table_name):
+        print(f"{LEGACY_INDEX_NAME} already removed — nothing to do.")
+        return
+
+    print(f"Deleting {LEGACY_INDEX_NAME} from '{table_name}'...")
+    client.update_table(
+        TableName=table_name,
+        GlobalSecondaryIndexUpdates=[{"Delete": {"IndexName": LEGACY_INDEX_NAME}}],
+    )
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
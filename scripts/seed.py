@@ -3,16 +3,24 @@
 #  --sub "<cognito sub>" \
 #  --display-name "Lisa" \
 #  --email "your@email"
+#
+# Or, for load testing against DynamoDB Local, a generated history:
+# uv run python -m scripts.seed --display-name "Load" --email "load@example.com" \
+#  --reset --years 5 --per-week 4
 
 import argparse
+import time
+from datetime import date
 
 from boto3.dynamodb.conditions import Key
 
+from app.repositories.bulk import MAX_WORKERS, BulkWriter, BulkWriteResult
 from app.utils.db import get_table
 from app.utils.seed_data import (
     build_exercises,
     build_profile,
     build_workouts,
+    iter_history,
 )
 
 TEST_USER_SUB = "e6b2d244-8091-70df-730d-3a2a1b855f0f"
@@ -45,18 +53,64 @@ def parse_args() -> argparse.Namespace:
         help="Delete existing items for this user before seeding",
     )
 
+    history = parser.add_argument_group(
+        "generated history", "Seed a synthetic history instead of the demo workouts"
+    )
+    history.add_argument("--years", type=float, default=None, help="Years of history")
+    history.add_argument(
+        "--per-week", type=float, default=3, help="Workouts per week (at most 7)"
+    )
+    history.add_argument(
+        "--exercises",
+        default=None,
+        help="Comma-separated exercise keys, e.g. BB_SQUAT,BB_DEADLIFT "
+        "(default: a push/pull/legs rotation)",
+    )
+    history.add_argument("--sets-per-workout", type=int, default=6)
+    history.add_argument(
+        "--half-gain-years",
+        type=float,
+        default=1.0,
+        help="Years to reach half of the total strength gain",
+    )
+    history.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help="Parallel BatchWriteItem calls",
+    )
+
     return parser.parse_args()
 
 
-def purge_user_items(table, pk: str):
-    resp = table.query(KeyConditionExpression=Key("PK").eq(pk))
-    items = resp.get("Items", [])
+def report(action: str, result: BulkWriteResult, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    rate = result.written / elapsed if elapsed else 0
+    print(
+        f"{action}: {result.written} items in {elapsed:.1f}s ({rate:.0f} items/s)"
+        + (f", {result.failed} failed" if result.failed else "")
+    )
+
+
+def purge_user_items(table, pk: str, *, workers: int = MAX_WORKERS):
+    started = time.perf_counter()
+    kwargs = {
+        "KeyConditionExpression": Key("PK").eq(pk),
+        "ProjectionExpression": "PK, SK",
+    }
 
-    with table.batch_writer() as batch:
-        for item in items:
-            batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+    with BulkWriter(table, max_workers=workers) as writer:
+        while True:
+            resp = table.query(**kwargs)
+            for item in resp.get("Items", []):
+                writer.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+            if "LastEvaluatedKey" not in resp:
+                break
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
 
-    print(f"Deleted {len(items)} items for {pk}")
+    report(f"Deleted {pk}", writer.result, started)
 
 
 def seed_profile(table, pk: str, *, display_name: str | None, email: str | None):
@@ -70,19 +124,24 @@ def seed_profile(table, pk: str, *, display_name: str | None, email: str | None)
 
 def seed_exercises(table, pk: str):
     exercises = build_exercises(pk)
-    for ex in exercises:
-        table.put_item(Item=ex.to_ddb_item())
-    print(f"Seeded {len(exercises)} exercises")
+    with BulkWriter(table) as writer:
+        for ex in exercises:
+            writer.put_item(Item=ex.to_ddb_item())
+    print(f"Seeded {writer.result.written} exercises")
 
 
-def seed_workouts(table, pk: str):
-    workouts = build_workouts(pk)
-    for workout, sets in workouts:
-        table.put_item(Item=workout.to_ddb_item())
+def seed_workouts(table, pk: str, workouts, *, workers: int = MAX_WORKERS):
+    started = time.perf_counter()
+    count = 0
 
-        for s in sets:
-            table.put_item(Item=s.to_ddb_item())
-        print(f"Seeded workout {workout.SK} with {len(sets)} sets")
+    with BulkWriter(table, max_workers=workers) as writer:
+        for workout, sets in workouts:
+            writer.put_item(Item=workout.to_ddb_item())
+            for s in sets:
+                writer.put_item(Item=s.to_ddb_item())
+            count += 1
+
+    report(f"Seeded {count} workouts", writer.result, started)
 
 
 def main():
@@ -96,12 +155,26 @@ def main():
 
     pk = f"USER#{user_sub}"
 
+    if args.years is not None:
+        workouts = iter_history(
+            pk,
+            years=args.years,
+            per_week=args.per_week,
+            exercises=args.exercises.split(",") if args.exercises else None,
+            sets_per_workout=args.sets_per_workout,
+            half_gain_years=args.half_gain_years,
+            end=date.today(),
+            seed=args.seed,
+        )
+    else:
+        workouts = build_workouts(pk)
+
     if args.reset:
-        purge_user_items(table, pk)
+        purge_user_items(table, pk, workers=args.workers)
 
     seed_profile(table, pk, display_name=args.display_name, email=args.email)
     seed_exercises(table, pk)
-    seed_workouts(table, pk)
+    seed_workouts(table, pk, workouts, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@
 import uuid
 
 from app.models.exercise import Exercise
+from app.repositories.bulk import BulkWriter
 from app.utils.dates import now
 from app.utils.db import get_table
 from app.utils.seed_data import build_profile
@@ -135,11 +136,15 @@ def main():
         ),
     ]
 
-    for ex in exercises:
-        table.put_item(Item=ex.to_ddb_item())
-        print(f"  Created exercise: {ex.name}")
+    # One BatchWriteItem call rather than a put_item per exercise.
+    with BulkWriter(table) as writer:
+        for ex in exercises:
+            writer.put_item(Item=ex.to_ddb_item())
+            print(f"  Created exercise: {ex.name}")
 
-    print(f"\nDone — {len(exercises)} exercises added.")
+    if writer.result.failed:
+        raise RuntimeError(f"{writer.result.failed} exercises could not be written")
+    print(f"\nDone — {writer.result.written} exercises added.")
 
 
 if __name__ == "__main__":
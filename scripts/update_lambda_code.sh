@@ -42,15 +42,20 @@ echo "ZIP_NAME=$ZIP_NAME"
 
 # --- Update lambda ---
 
+# The app and the import worker run the same artifact.
+FUNCTIONS=("${PROJECT_NAME}-${ENV}-app" "${PROJECT_NAME}-${ENV}-import-worker")
+
 echo "Forcing update of lambda code whether it wants to or not..."
-aws lambda update-function-code \
-  --function-name "${PROJECT_NAME}-${ENV}-app" \
-  --s3-bucket "$ARTIFACT_BUCKET_NAME" \
-  --s3-key "$ZIP_NAME" \
-  --publish \
-  --region "${REGION}" >/dev/null
-aws lambda wait function-updated --function-name "${PROJECT_NAME}-${ENV}-app" --region "$REGION"
-aws lambda wait function-active  --function-name "${PROJECT_NAME}-${ENV}-app" --region "$REGION"
+for FUNCTION_NAME in "${FUNCTIONS[@]}"; do
+  aws lambda update-function-code \
+    --function-name "$FUNCTION_NAME" \
+    --s3-bucket "$ARTIFACT_BUCKET_NAME" \
+    --s3-key "$ZIP_NAME" \
+    --publish \
+    --region "${REGION}" >/dev/null
+  aws lambda wait function-updated --function-name "$FUNCTION_NAME" --region "$REGION"
+  aws lambda wait function-active  --function-name "$FUNCTION_NAME" --region "$REGION"
+done
 
 
 # ---- Confirmation -----
@@ -58,7 +63,9 @@ aws lambda wait function-active  --function-name "${PROJECT_NAME}-${ENV}-app" --
 echo ""
 echo "✅ Lambda update complete"
 
-aws lambda get-function \
-  --function-name "${PROJECT_NAME}-${ENV}-app" \
-  --query "{Function:Configuration.FunctionName,LastModified:Configuration.LastModified,CodeSha256:Configuration.CodeSha256}" \
-  --output table
+for FUNCTION_NAME in "${FUNCTIONS[@]}"; do
+  aws lambda get-function \
+    --function-name "$FUNCTION_NAME" \
+    --query "{Function:Configuration.FunctionName,LastModified:Configuration.LastModified,CodeSha256:Configuration.CodeSha256}" \
+    --output table
+done
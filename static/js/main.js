@@ -206,6 +206,76 @@ function init1RMChart() {
 }
 
 
+function initWorkloadChart() {
+  const canvas = document.getElementById('workload-chart');
+  if (!canvas) return;
+  const existing = Chart.getChart(canvas);
+  if (existing) existing.destroy();
+  const data = JSON.parse(canvas.dataset.chart);
+  const unit = canvas.dataset.unit;
+  const c = buildChartColors();
+  new Chart(canvas, {
+    type: 'line',
+    data: {
+      labels: data.labels,
+      datasets: [
+        {
+          label: `Acute (${unit})`,
+          data: data.acute,
+          borderColor: c.accent,
+          backgroundColor: c.accent + '22',
+          pointRadius: 0,
+          tension: 0.3,
+          fill: true,
+          yAxisID: 'y',
+        },
+        {
+          label: `Chronic (${unit})`,
+          data: data.chronic,
+          borderColor: c.bar,
+          pointRadius: 0,
+          tension: 0.3,
+          yAxisID: 'y',
+        },
+        {
+          label: 'Acute:Chronic',
+          data: data.ratio,
+          borderColor: c.muted,
+          borderDash: [4, 4],
+          pointRadius: 0,
+          spanGaps: false,
+          yAxisID: 'ratio',
+        },
+      ]
+    },
+    options: {
+      responsive: true,
+      interaction: { mode: 'index', intersect: false },
+      plugins: {
+        legend: { display: true, labels: { color: c.text } },
+      },
+      scales: {
+        x: {
+          ticks: { color: c.muted, maxTicksLimit: 12 },
+          grid: { color: c.borders + '80' },
+        },
+        y: {
+          beginAtZero: true,
+          ticks: { color: c.muted },
+          grid: { color: c.borders + '80' },
+          title: { display: true, text: unit, color: c.muted },
+        },
+        ratio: {
+          position: 'right',
+          beginAtZero: true,
+          ticks: { color: c.muted },
+          grid: { drawOnChartArea: false },
+        },
+      }
+    }
+  });
+}
+
 function initDistributionChart(view = 'by_muscle') {
   const canvas = document.getElementById('dist-chart');
   if (!canvas) return;
@@ -13,6 +13,7 @@ from app.routes import workout as workout_routes
 from app.settings import settings
 from app.utils import auth as auth_utils
 from app.utils import dates, db
+from app.utils.fragment_cache import fragment_cache
 from tests.test_data import TEST_DATE_2, TEST_WORKOUT_ID_2, USER_SUB
 
 
@@ -30,6 +31,13 @@ def disable_csrf_for_tests():
     settings.CSRF_ENABLED = True
 
 
+@pytest.fixture(autouse=True)
+def clear_fragment_cache():
+    fragment_cache.clear()
+    yield
+    fragment_cache.clear()
+
+
 @pytest.fixture
 def fixed_now(monkeypatch) -> datetime:
     now = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
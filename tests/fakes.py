@@ -1,18 +1,30 @@
+import threading
 import uuid
 from datetime import date as DateType
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from typing import Any
 
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 
 from app.models.exercise import Exercise
+from app.models.import_job import ImportJob
 from app.models.profile import Preferences, UserProfile
+from app.models.tombstone import Tombstone
 from app.models.workout import Workout
-from app.repositories.errors import ProfileRepoError
+from app.repositories.errors import (
+    ImportJobNotFoundError,
+    ImportJobRepoError,
+    ProfileRepoError,
+    TombstoneRepoError,
+)
 from app.utils import db
 
 
-def make_test_profile(*, units: str = "metric", user_sub: str = "test-user") -> UserProfile:
+def make_test_profile(
+    *, units: str = "metric", user_sub: str = "test-user"
+) -> UserProfile:
     return UserProfile(
         PK=f"USER#{user_sub}",
         SK="PROFILE",
@@ -168,6 +180,7 @@ class FakeExerciseRepo:
         self.created: list[Exercise] = []
         self.updated: list[Exercise] = []
         self.deleted: list[tuple[str, str]] = []
+        self.catalog_bumps: list[str] = []
 
         # Override to make get_exercise_by_id raise
         self.raise_on_get: bool = False
@@ -240,16 +253,21 @@ class FakeExerciseRepo:
         self.deleted.append((user_sub, exercise_id))
         self.exercises.pop(exercise_id, None)
 
+    def bump_catalog_version(self, user_sub: str) -> None:
+        self.catalog_bumps.append(user_sub)
+
 
 # --------------- DynamoDB table fakes (repo tests) ---------------
 
 
 OP_NAMES = {
     "query": "Query",
+    "scan": "Scan",
     "get_item": "GetItem",
     "put_item": "PutItem",
     "delete_item": "DeleteItem",
     "update_item": "UpdateItem",
+    "batch_write_item": "BatchWriteItem",
 }
 
 
@@ -269,7 +287,7 @@ def _client_error(
 class FakeBatchWriter:
     """
     Minimal stand-in for DynamoDB's batch_writer.
-    Forwards delete_item calls to the parent FakeTable.
+    Records put_item and delete_item calls on the parent FakeTable.
     """
 
     def __init__(self, table: "FakeTable"):
@@ -282,6 +300,9 @@ class FakeBatchWriter:
         # Don't suppress exceptions
         return False
 
+    def put_item(self, Item: dict) -> None:
+        self._table.batch_put_items.append(Item)
+
     def delete_item(self, Key: dict) -> None:
         self._table.deleted_keys.append(Key)
 
@@ -295,8 +316,8 @@ class FakeTable:
       (e.g. {"query", "put_item"})
     - `paginated_responses`: list of dicts consumed one per query() call,
       used to simulate multi-page DynamoDB results. When set, each call to
-      query() pops the next response off the front of the list (ignoring
-      `response`).
+      query() or scan() pops the next response off the front of the list
+      (ignoring `response`).
     """
 
     def __init__(
@@ -311,11 +332,13 @@ class FakeTable:
         self.paginated_responses: list[dict] = list(paginated_responses or [])
 
         self.last_query_kwargs: dict | None = None
+        self.last_scan_kwargs: dict | None = None
         self.last_get_kwargs: dict | None = None
         self.last_put_kwargs: dict | None = None
         self.last_delete_kwargs: dict | None = None
 
         self.deleted_keys: list[dict] = []
+        self.batch_put_items: list[dict] = []
 
         self.last_update_kwargs: dict | None = None
 
@@ -331,6 +354,13 @@ class FakeTable:
             return self.paginated_responses.pop(0)
         return self.response
 
+    def scan(self, **kwargs):
+        self._maybe_fail("scan")
+        self.last_scan_kwargs = kwargs
+        if self.paginated_responses:
+            return self.paginated_responses.pop(0)
+        return self.response
+
     def get_item(self, **kwargs):
         self._maybe_fail("get_item")
         self.last_get_kwargs = kwargs
@@ -358,6 +388,183 @@ class FakeTable:
         return FakeBatchWriter(self)
 
 
+# --------------- Bulk write fakes (BulkWriter) ---------------
+
+
+class FakeBatchWriteClient:
+    """
+    Stand-in for the low-level client's batch_write_item.
+
+    - `unprocessed_rounds`: how many calls return their last request as
+      UnprocessedItems before succeeding
+    - `fail`: raise ClientError on every call
+    Successful puts/deletes are recorded deserialised, for easy assertions.
+    """
+
+    def __init__(self, *, unprocessed_rounds: int = 0, fail: bool = False):
+        self.unprocessed_rounds = unprocessed_rounds
+        self.fail = fail
+        self.calls: list[dict] = []
+        self.put_items: list[dict] = []
+        self.deleted_keys: list[dict] = []
+        self._lock = threading.Lock()
+        self._deserializer = TypeDeserializer()
+
+    def _plain(self, attrs: dict) -> dict:
+        return {k: self._deserializer.deserialize(v) for k, v in attrs.items()}
+
+    def batch_write_item(self, RequestItems: dict) -> dict:
+        with self._lock:
+            self.calls.append(RequestItems)
+            if self.fail:
+                raise _client_error("BatchWriteItem")
+
+            ((table_name, requests),) = RequestItems.items()
+            unprocessed = []
+            if self.unprocessed_rounds:
+                self.unprocessed_rounds -= 1
+                requests, unprocessed = requests[:-1], requests[-1:]
+
+            for request in requests:
+                if "PutRequest" in request:
+                    self.put_items.append(self._plain(request["PutRequest"]["Item"]))
+                else:
+                    self.deleted_keys.append(
+                        self._plain(request["DeleteRequest"]["Key"])
+                    )
+
+            return {
+                "UnprocessedItems": {table_name: unprocessed} if unprocessed else {}
+            }
+
+
+class FakeBatchGetClient:
+    """
+    Stand-in for the low-level client's batch_get_item.
+
+    - `stored`: plain items that "exist"; requested keys are matched on PK/SK
+    - `unprocessed_rounds`: how many calls defer their last key to
+      UnprocessedKeys before answering fully
+    - `fail`: raise ClientError on every call
+    """
+
+    def __init__(
+        self,
+        stored: list[dict] | None = None,
+        *,
+        unprocessed_rounds: int = 0,
+        fail: bool = False,
+    ):
+        self.stored = {(i["PK"], i["SK"]): i for i in stored or []}
+        self.unprocessed_rounds = unprocessed_rounds
+        self.fail = fail
+        self.calls: list[dict] = []
+        self._serializer = TypeSerializer()
+        self._deserializer = TypeDeserializer()
+
+    def batch_get_item(self, RequestItems: dict) -> dict:
+        self.calls.append(RequestItems)
+        if self.fail:
+            raise _client_error("BatchGetItem")
+
+        ((table_name, request),) = RequestItems.items()
+        keys = [
+            {k: self._deserializer.deserialize(v) for k, v in key.items()}
+            for key in request["Keys"]
+        ]
+        unprocessed = []
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            keys, unprocessed = keys[:-1], request["Keys"][-1:]
+
+        found = [
+            self.stored[(k["PK"], k["SK"])]
+            for k in keys
+            if (k["PK"], k["SK"]) in self.stored
+        ]
+        attrs = request.get("ProjectionExpression")
+        if attrs:
+            wanted = [a.strip() for a in attrs.split(",")]
+            found = [{a: i[a] for a in wanted if a in i} for i in found]
+
+        resp: dict = {
+            "Responses": {
+                table_name: [
+                    {k: self._serializer.serialize(v) for k, v in i.items()}
+                    for i in found
+                ]
+            },
+            "UnprocessedKeys": {},
+        }
+        if unprocessed:
+            resp["UnprocessedKeys"] = {table_name: {**request, "Keys": unprocessed}}
+        return resp
+
+
+class FakeBulkTable:
+    """
+    Table stand-in exposing just name and meta.client, as used by BulkWriter
+    and DynamoRepository._safe_batch_get.
+    """
+
+    def __init__(self, client: Any = None):
+        self.name = "test-table"
+        self.meta = SimpleNamespace(client=client or FakeBatchWriteClient())
+
+    @property
+    def put_calls(self) -> list[dict]:
+        return self.meta.client.put_items
+
+
+# --------------- Import job repo fake ---------------
+
+
+class FakeImportJobRepo:
+    """
+    In-memory stand-in for DynamoImportJobRepository. Jobs are copied on the
+    way in and out, like items round-tripping through DynamoDB; `saves`
+    keeps a copy of every checkpoint written.
+    """
+
+    def __init__(self):
+        self.jobs: dict[str, ImportJob] = {}
+        self.saves: list[ImportJob] = []
+        self.fail_create = False
+
+    def create_job(
+        self, user_sub: str, job_id: str, *, filename: str, upload_path: str
+    ) -> ImportJob:
+        if self.fail_create:
+            raise ImportJobRepoError("Failed to create import job in database")
+        now = datetime.now(timezone.utc)
+        job = ImportJob(
+            PK=db.build_user_pk(user_sub),
+            SK=db.build_import_job_sk(job_id),
+            type="import_job",
+            filename=filename,
+            upload_path=upload_path,
+            created_at=now,
+            updated_at=now,
+        )
+        self.jobs[job_id] = job.model_copy(deep=True)
+        return job
+
+    def get_job(self, user_sub: str, job_id: str) -> ImportJob:
+        job = self.jobs.get(job_id)
+        if job is None or job.PK != db.build_user_pk(user_sub):
+            raise ImportJobNotFoundError(f"Import job {job_id} not found")
+        return job.model_copy(deep=True)
+
+    def save_job(self, job: ImportJob) -> ImportJob:
+        self.jobs[job.job_id] = job.model_copy(deep=True)
+        self.saves.append(job.model_copy(deep=True))
+        return job
+
+    def only(self) -> ImportJob:
+        assert len(self.jobs) == 1, f"expected one import job, found {len(self.jobs)}"
+        return next(iter(self.jobs.values()))
+
+
 # --------------- Rate-limiting table fake (utils tests) ---------------
 
 
@@ -369,3 +576,19 @@ class FakeRateLimitTable:
     def update_item(self, **kwargs):
         self.last_kwargs = kwargs
         return {"Attributes": {"count": self.count}}
+
+
+# --------------- Tombstone repo fake ---------------
+
+
+class FakeTombstoneRepo:
+    def __init__(self, tombstones: list[Tombstone] | None = None):
+        self.tombstones = tombstones or []
+        self.should_raise = False
+        self.since_calls: list[datetime] = []
+
+    def get_since(self, user_sub: str, since: datetime) -> list[Tombstone]:
+        self.since_calls.append(since)
+        if self.should_raise:
+            raise TombstoneRepoError("Failed to fetch tombstones from database")
+        return [t for t in self.tombstones if t.deleted_at >= since]
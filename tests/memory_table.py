@@ -0,0 +1,1320 @@
+"""
+In-memory stand-in for the boto3 DynamoDB Table resource and the parts of
+its low-level client the app uses.
+
+Unlike the per-test fakes in tests/fakes.py, MemoryTable behaves like the
+real table, so repositories, scripts and benchmarks can run against it
+unchanged:
+
+- query and scan with key conditions (=, <, <=, >, >=, BETWEEN,
+  begins_with), FilterExpression, ProjectionExpression, Limit, Select,
+  ScanIndexForward, parallel scan segments and 1 MB pages with
+  LastEvaluatedKey
+- the ExerciseIndex (ALL) and ExerciseProgressIndex (INCLUDE) GSIs, which
+  are eventually consistent and so reject ConsistentRead
+- get/put/delete/update_item with ConditionExpression, ReturnValues and
+  update expressions (SET, REMOVE, ADD, DELETE; if_not_exists,
+  list_append, +/-, nested paths)
+- batch_writer(), and the client's batch_write_item, batch_get_item,
+  transact_write_items and transact_get_items
+- ReturnConsumedCapacity, from DynamoDB's item size rules
+
+Expressions may be strings or boto3 Key/Attr conditions. Items are stored
+as DynamoDB returns them (numbers as Decimal), and errors are the
+ClientErrors boto3 raises.
+
+Faults makes the table slow or unreliable, for performance and resilience
+tests:
+
+    table = MemoryTable(faults=Faults(latency_ms=4, throttle=0.05, unprocessed=0.2))
+
+latency_ms and throttle take one value for every operation or a dict by
+operation name ("query", "batch_write_item", ...). `unprocessed` is the
+chance each request in a batch call comes back unprocessed.
+"""
+
+import bisect
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from app.settings import settings
+from app.utils.db import EXERCISE_PROGRESS_INDEX_ATTRS
+
+PAGE_BYTES = 1024 * 1024  # a query or scan page stops after 1 MB read
+MAX_ITEM_BYTES = 400 * 1024
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+TRANSACTION_LIMIT = 100
+# Past any key: bounds a key range from above.
+_KEY_MAX = "\uffff"
+
+# Index name -> (hash key, range key, projected attributes; None for ALL).
+DEFAULT_INDEXES: dict[str, tuple[str, str, tuple[str, ...] | None]] = {
+    "ExerciseIndex": ("ExercisePK", "ExerciseSK", None),
+    settings.DDB_EXERCISE_PROGRESS_INDEX: (
+        "ExercisePK",
+        "ExerciseSK",
+        EXERCISE_PROGRESS_INDEX_ATTRS,
+    ),
+}
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _client_error(code: str, message: str, operation: str, **extra: Any) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, **extra}, operation
+    )
+
+
+def _stored(item: dict) -> dict:
+    """The item as DynamoDB would hand it back: numbers as Decimal, etc."""
+    return {
+        k: _deserializer.deserialize(_serializer.serialize(v)) for k, v in item.items()
+    }
+
+
+def _plain(attrs: dict) -> dict:
+    return {k: _deserializer.deserialize(v) for k, v in attrs.items()}
+
+
+def _typed(item: dict) -> dict:
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+def _clone(value: Any) -> Any:
+    """A copy of a stored value: every read gets objects of its own, as from boto3."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    if isinstance(value, set):
+        return set(value)
+    return value  # str, Decimal, bool, None, Binary: immutable
+
+
+# ─────────────────────────── Item size ───────────────────────────
+
+
+def _value_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        digits = Decimal(value).normalize().as_tuple().digits
+        return (len(digits) + 1) // 2 + 1
+    if isinstance(value, dict):
+        return 3 + sum(
+            len(k.encode("utf-8")) + 1 + _value_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(1 + _value_size(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return sum(_value_size(v) for v in value)
+    return _value_size(getattr(value, "value", str(value)))  # Binary
+
+
+def item_size(item: dict | None) -> int:
+    """Bytes DynamoDB counts for an item: attribute names plus values."""
+    if not item:
+        return 0
+    return sum(len(k.encode("utf-8")) + _value_size(v) for k, v in item.items())
+
+
+# ─────────────────────────── Expressions ───────────────────────────
+#
+# Conditions, key conditions, projections and update expressions are parsed
+# from their string form; boto3 condition objects are first rendered to one
+# with ConditionExpressionBuilder, exactly as boto3 does before sending them.
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<name>#[\w]+)|(?P<value>:[\w]+)|(?P<word>[A-Za-z_][\w]*)"
+    r"|(?P<op><>|<=|>=|=|<|>|\+|-)|(?P<punct>[(),.\[\]])|(?P<num>\d+))"
+)
+_COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+_KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+
+
+class _Expression:
+    """Tokens of one expression, with its attribute names and values resolved."""
+
+    def __init__(self, text: str, names: dict | None, values: dict | None):
+        self.tokens: list[tuple[str, str]] = []
+        self.names = names or {}
+        self.values = values or {}
+        pos = 0
+        text = text.strip()
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            if not match or match.end() == pos:
+                raise _validation(f"Invalid expression near: {text[pos:]!r}")
+            pos = match.end()
+            kind = match.lastgroup
+            token = match.group(kind)
+            if kind == "word" and token.upper() in _KEYWORDS:
+                kind, token = "keyword", token.upper()
+            self.tokens.append((kind, token))
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> tuple[str, str] | None:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def take(self, expected: str | None = None) -> tuple[str, str]:
+        token = self.peek()
+        if token is None or (expected is not None and token[1] != expected):
+            raise _validation(f"Invalid expression: expected {expected or 'more'}")
+        self.pos += 1
+        return token
+
+    def at(self, *tokens: str) -> bool:
+        token = self.peek()
+        return token is not None and token[1] in tokens
+
+    def done(self) -> bool:
+        return self.pos >= len(self.tokens)
+
+    def value(self, placeholder: str) -> Any:
+        if placeholder not in self.values:
+            raise _validation(
+                f"Value {placeholder} not defined in ExpressionAttributeValues"
+            )
+        return self.values[placeholder]
+
+    def path(self) -> tuple:
+        parts: list = [self._path_name()]
+        while self.at(".", "["):
+            if self.take()[1] == ".":
+                parts.append(self._path_name())
+            else:
+                parts.append(int(self.take()[1]))
+                self.take("]")
+        return tuple(parts)
+
+    def _path_name(self) -> str:
+        kind, token = self.take()
+        if kind == "name":
+            if token not in self.names:
+                raise _validation(
+                    f"Name {token} not defined in ExpressionAttributeNames"
+                )
+            return self.names[token]
+        if kind != "word":
+            raise _validation(f"Invalid attribute name {token!r}")
+        return token
+
+
+def _validation(message: str) -> ClientError:
+    return _client_error("ValidationException", message, "Expression")
+
+
+def _render(
+    condition: Any, names: dict | None, values: dict | None, is_key: bool = False
+):
+    """A condition as (text, names, values), whatever form it was given in."""
+    if isinstance(condition, ConditionBase):
+        built = ConditionExpressionBuilder().build_expression(
+            condition, is_key_condition=is_key
+        )
+        return (
+            built.condition_expression,
+            {**(names or {}), **built.attribute_name_placeholders},
+            {**(values or {}), **_stored(built.attribute_value_placeholders)},
+        )
+    return condition, names, values
+
+
+def _parse_condition(
+    condition: Any, names: dict | None, values: dict | None, is_key=False
+):
+    text, names, values = _render(condition, names, values, is_key)
+    expr = _Expression(text, names, values)
+    node = _or(expr)
+    if not expr.done():
+        raise _validation(f"Invalid expression: unexpected {expr.peek()[1]!r}")
+    return node
+
+
+def _or(expr: _Expression):
+    node = _and(expr)
+    while expr.at("OR"):
+        expr.take()
+        node = ("or", node, _and(expr))
+    return node
+
+
+def _and(expr: _Expression):
+    node = _not(expr)
+    while expr.at("AND"):
+        expr.take()
+        node = ("and", node, _not(expr))
+    return node
+
+
+def _not(expr: _Expression):
+    if expr.at("NOT"):
+        expr.take()
+        return ("not", _not(expr))
+    return _primary(expr)
+
+
+def _primary(expr: _Expression):
+    if expr.at("("):
+        expr.take()
+        node = _or(expr)
+        expr.take(")")
+        return node
+
+    token = expr.peek()
+    following = expr.peek(1)
+    if (
+        token
+        and token[0] == "word"
+        and following
+        and following[1] == "("
+        and token[1] != "size"
+    ):
+        name = expr.take()[1]
+        expr.take("(")
+        args = [_operand(expr)]
+        while expr.at(","):
+            expr.take()
+            args.append(_operand(expr))
+        expr.take(")")
+        return ("fn", name, args)
+
+    left = _operand(expr)
+    if expr.at("BETWEEN"):
+        expr.take()
+        low = _operand(expr)
+        expr.take("AND")
+        return ("between", left, low, _operand(expr))
+    if expr.at("IN"):
+        expr.take()
+        expr.take("(")
+        options = [_operand(expr)]
+        while expr.at(","):
+            expr.take()
+            options.append(_operand(expr))
+        expr.take(")")
+        return ("in", left, options)
+    op = expr.take()[1]
+    if op not in _COMPARATORS:
+        raise _validation(f"Invalid comparison operator {op!r}")
+    return ("cmp", op, left, _operand(expr))
+
+
+def _operand(expr: _Expression):
+    token = expr.peek()
+    if token is None:
+        raise _validation("Invalid expression: expected an operand")
+    if token[0] == "value":
+        return ("value", expr.value(expr.take()[1]))
+    if token[1] == "size" and expr.peek(1) and expr.peek(1)[1] == "(":
+        expr.take()
+        expr.take("(")
+        path = expr.path()
+        expr.take(")")
+        return ("size", path)
+    return ("path", expr.path())
+
+
+_MISSING = object()
+
+
+def _get_path(item: dict, path: tuple) -> Any:
+    value: Any = item
+    for part in path:
+        try:
+            value = value[part]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return value
+
+
+def _resolve(operand, item: dict) -> Any:
+    kind, arg = operand
+    if kind == "value":
+        return arg
+    value = _get_path(item, arg)
+    if kind == "size" and value is not _MISSING:
+        return Decimal(
+            _value_size(value) if isinstance(value, (bytes, str)) else len(value)
+        )
+    return value
+
+
+def _comparable(a: Any, b: Any) -> bool:
+    if a is _MISSING or b is _MISSING:
+        return False
+    numbers = (int, float, Decimal)
+    if isinstance(a, numbers) and isinstance(b, numbers):
+        return not isinstance(a, bool) and not isinstance(b, bool)
+    return type(a) is type(b)
+
+
+def _evaluate(node, item: dict) -> bool:
+    kind = node[0]
+    if kind == "and":
+        return _evaluate(node[1], item) and _evaluate(node[2], item)
+    if kind == "or":
+        return _evaluate(node[1], item) or _evaluate(node[2], item)
+    if kind == "not":
+        return not _evaluate(node[1], item)
+    if kind == "between":
+        value, low, high = (_resolve(n, item) for n in node[1:])
+        return (
+            _comparable(value, low)
+            and _comparable(value, high)
+            and low <= value <= high
+        )
+    if kind == "in":
+        value = _resolve(node[1], item)
+        return value is not _MISSING and any(
+            value == _resolve(o, item) for o in node[2]
+        )
+    if kind == "cmp":
+        _, op, left, right = node
+        a, b = _resolve(left, item), _resolve(right, item)
+        if op == "<>":
+            return a is not _MISSING and a != b
+        if not _comparable(a, b):
+            return False
+        return {
+            "=": a == b,
+            "<": a < b,
+            "<=": a <= b,
+            ">": a > b,
+            ">=": a >= b,
+        }[op]
+    # Functions
+    _, name, args = node
+    if name == "attribute_exists":
+        return _get_path(item, args[0][1]) is not _MISSING
+    if name == "attribute_not_exists":
+        return _get_path(item, args[0][1]) is _MISSING
+    value = _resolve(args[0], item)
+    operand = _resolve(args[1], item) if len(args) > 1 else None
+    if name == "begins_with":
+        return isinstance(value, (str, bytes)) and value.startswith(operand)
+    if name == "contains":
+        return (
+            value is not _MISSING
+            and isinstance(value, (str, set, list))
+            and operand in value
+        )
+    if name == "attribute_type":
+        return value is not _MISSING and _serializer.serialize(value).keys() == {
+            operand
+        }
+    raise _validation(f"Invalid function name: {name}")
+
+
+def _conjuncts(node) -> Iterator:
+    if node[0] == "and":
+        yield from _conjuncts(node[1])
+        yield from _conjuncts(node[2])
+    else:
+        yield node
+
+
+def _key_condition(node, hash_key: str, range_key: str) -> tuple[Any, str, str]:
+    """
+    The hash key value a key condition names, and the range-key bounds it
+    allows: from `low` (inclusive) up to `high` (exclusive).
+    """
+    hash_value = None
+    low, high = "", _KEY_MAX
+    for part in _conjuncts(node):
+        if (
+            part[0] == "fn"
+            and part[1] == "begins_with"
+            and part[2][0][1] == (range_key,)
+        ):
+            prefix = part[2][1][1]
+            low, high = max(low, prefix), min(high, prefix + _KEY_MAX)
+        elif part[0] == "between" and part[1][1] == (range_key,):
+            low, high = max(low, part[2][1]), min(high, _after(part[3][1]))
+        elif part[0] == "cmp" and part[2][1] == (hash_key,) and part[1] == "=":
+            hash_value = part[3][1]
+        elif part[0] == "cmp" and part[2][1] == (range_key,) and part[1] != "<>":
+            op, value = part[1], part[3][1]
+            if op in ("=", ">="):
+                low = max(low, value)
+            if op == ">":
+                low = max(low, _after(value))
+            if op in ("=", "<="):
+                high = min(high, _after(value))
+            if op == "<":
+                high = min(high, value)
+        else:
+            raise _validation("Query key condition not supported")
+    if hash_value is None:
+        raise _validation("Query condition missed key schema element: " + hash_key)
+    return hash_value, low, high
+
+
+def _after(value: str) -> str:
+    """The first string that sorts after `value`."""
+    return value + "\0"
+
+
+def _projection(projection: str | None, names: dict | None) -> list[tuple] | None:
+    if not projection:
+        return None
+    expr = _Expression(projection, names, None)
+    paths = [expr.path()]
+    while expr.at(","):
+        expr.take()
+        paths.append(expr.path())
+    return paths
+
+
+def _project(item: dict, paths: list[tuple] | None) -> dict:
+    if paths is None:
+        return _clone(item)
+    projected: dict = {}
+    for path in paths:
+        value = _get_path(item, path)
+        if value is _MISSING:
+            continue
+        target = projected
+        for part in path[:-1]:
+            target = target.setdefault(part, {})
+        target[path[-1]] = _clone(value)
+    return projected
+
+
+# ─────────────────────── Update expressions ───────────────────────
+
+
+def _parse_update(text: str, names: dict | None, values: dict | None) -> list[tuple]:
+    expr = _Expression(text, names, values)
+    actions: list[tuple] = []
+    while not expr.done():
+        clause = expr.take()[1]
+        if clause not in ("SET", "REMOVE", "ADD", "DELETE"):
+            raise _validation(f"Invalid UpdateExpression: unexpected {clause!r}")
+        while True:
+            path = expr.path()
+            if clause == "SET":
+                expr.take("=")
+                actions.append(("SET", path, _update_value(expr)))
+            elif clause == "REMOVE":
+                actions.append(("REMOVE", path, None))
+            else:
+                actions.append((clause, path, expr.value(expr.take()[1])))
+            if not expr.at(","):
+                break
+            expr.take()
+    return actions
+
+
+def _update_value(expr: _Expression):
+    left = _update_operand(expr)
+    if expr.at("+", "-"):
+        op = expr.take()[1]
+        return ("arith", op, left, _update_operand(expr))
+    return left
+
+
+def _update_operand(expr: _Expression):
+    token = expr.peek()
+    if (
+        token
+        and token[1] in ("if_not_exists", "list_append")
+        and expr.peek(1)[1] == "("
+    ):
+        name = expr.take()[1]
+        expr.take("(")
+        first = _update_operand(expr)
+        expr.take(",")
+        second = _update_operand(expr)
+        expr.take(")")
+        return (name, first, second)
+    return _operand(expr)
+
+
+def _update_resolve(node, item: dict) -> Any:
+    kind = node[0]
+    if kind == "if_not_exists":
+        value = _resolve(node[1], item)
+        return _update_resolve(node[2], item) if value is _MISSING else value
+    if kind == "list_append":
+        first, second = _update_resolve(node[1], item), _update_resolve(node[2], item)
+        return list(first) + list(second)
+    if kind == "arith":
+        a, b = _update_resolve(node[2], item), _update_resolve(node[3], item)
+        if not isinstance(a, Decimal) or not isinstance(b, Decimal):
+            raise _validation(
+                "An operand in the update expression has an incorrect data type"
+            )
+        return a + b if node[1] == "+" else a - b
+    value = _resolve(node, item)
+    if value is _MISSING:
+        raise _validation(
+            "The provided expression refers to an attribute that does not exist in the item"
+        )
+    return _clone(value)
+
+
+def _parent(item: dict, path: tuple) -> Any:
+    parent = _get_path(item, path[:-1]) if len(path) > 1 else item
+    if parent is _MISSING or not isinstance(parent, (dict, list)):
+        raise _validation(
+            "The document path provided in the update expression is invalid for update"
+        )
+    return parent
+
+
+def _apply_update(item: dict, actions: list[tuple]) -> set[str]:
+    """Apply parsed actions to item in place; returns the top-level names touched."""
+    # Every operand reads the item as it was before the update.
+    before = _clone(item)
+    touched = set()
+    for action, path, operand in actions:
+        touched.add(path[0])
+        parent = _parent(item, path)
+        key = path[-1]
+        if action == "SET":
+            value = _update_resolve(operand, before)
+            if isinstance(parent, list) and key >= len(parent):
+                parent.append(value)
+            else:
+                parent[key] = value
+        elif action == "REMOVE":
+            if isinstance(parent, list):
+                if key < len(parent):
+                    del parent[key]
+            else:
+                parent.pop(key, None)
+        elif action == "ADD":
+            current = _get_path(item, path)
+            if current is _MISSING:
+                parent[key] = _clone(operand)
+            elif isinstance(current, Decimal) and isinstance(operand, Decimal):
+                parent[key] = current + operand
+            elif isinstance(current, set) and isinstance(operand, set):
+                parent[key] = current | operand
+            else:
+                raise _validation(
+                    "An operand in the update expression has an incorrect data type"
+                )
+        else:  # DELETE from a set
+            current = _get_path(item, path)
+            if isinstance(current, set):
+                remaining = current - operand
+                if remaining:
+                    parent[key] = remaining
+                else:
+                    parent.pop(key, None)
+    return touched
+
+
+# ─────────────────────────── Storage ───────────────────────────
+
+
+class _Partition:
+    """
+    One hash key's items, sorted lazily by position: (SK,) in the table,
+    (index range key, PK, SK) in an index, where range keys needn't be unique.
+    """
+
+    def __init__(self):
+        self.items: dict[tuple, dict] = {}
+        self.sizes: dict[tuple, int] = {}
+        self._keys: list[tuple] | None = []
+
+    def put(self, position: tuple, item: dict) -> None:
+        if position not in self.items:
+            self._keys = None
+        self.items[position] = item
+        self.sizes[position] = item_size(item)
+
+    def delete(self, position: tuple) -> None:
+        if self.items.pop(position, None) is not None:
+            del self.sizes[position]
+            self._keys = None
+
+    def keys(self) -> list[tuple]:
+        if self._keys is None:
+            self._keys = sorted(self.items)
+        return self._keys
+
+
+@dataclass
+class Faults:
+    """Latency and failures to inject; see the module docstring."""
+
+    latency_ms: float | dict[str, float] = 0.0
+    throttle: float | dict[str, float] = 0.0
+    unprocessed: float = 0.0
+    seed: int | None = 0
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    @staticmethod
+    def _for(setting: float | dict[str, float], operation: str) -> float:
+        if isinstance(setting, dict):
+            return setting.get(operation, 0.0)
+        return setting
+
+    def delay(self, operation: str) -> float:
+        return self._for(self.latency_ms, operation) / 1000
+
+    def throttled(self, operation: str) -> bool:
+        rate = self._for(self.throttle, operation)
+        return rate > 0 and self._rng.random() < rate
+
+    def unprocessed_request(self) -> bool:
+        return self.unprocessed > 0 and self._rng.random() < self.unprocessed
+
+
+class MemoryClient:
+    """
+    The low-level client shared by one or more MemoryTables (table.meta.client).
+    Batch and transaction calls take and return DynamoDB-typed attributes.
+    """
+
+    def __init__(self, faults: Faults | None = None):
+        self.faults = faults or Faults()
+        self.tables: dict[str, "MemoryTable"] = {}
+        # Calls by operation name, including failed ones.
+        self.calls: Counter = Counter()
+        self.lock = threading.RLock()
+
+    def _call(self, operation: str) -> None:
+        with self.lock:
+            self.calls[operation] += 1
+            delay = self.faults.delay(operation)
+            throttled = self.faults.throttled(operation)
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            raise _client_error(
+                "ProvisionedThroughputExceededException",
+                "The level of configured provisioned throughput for the table was exceeded.",
+                _operation_name(operation),
+            )
+
+    def _table(self, name: str, operation: str) -> "MemoryTable":
+        if name not in self.tables:
+            raise _client_error(
+                "ResourceNotFoundException", "Requested resource not found", operation
+            )
+        return self.tables[name]
+
+    # ----------------------- Batches -----------------------------
+
+    def batch_write_item(
+        self, RequestItems: dict, ReturnConsumedCapacity: str = "NONE", **kwargs
+    ) -> dict:
+        self._call("batch_write_item")
+        count = sum(len(requests) for requests in RequestItems.values())
+        if not 0 < count <= BATCH_WRITE_LIMIT:
+            raise _client_error(
+                "ValidationException",
+                f"Too many items requested for the BatchWriteItem call: {count}",
+                "BatchWriteItem",
+            )
+
+        unprocessed: dict[str, list] = {}
+        capacity: list[dict] = []
+        with self.lock:
+            for table_name, requests in RequestItems.items():
+                table = self._table(table_name, "BatchWriteItem")
+                units = 0.0
+                for request in requests:
+                    if self.faults.unprocessed_request():
+                        unprocessed.setdefault(table_name, []).append(request)
+                        continue
+                    if "PutRequest" in request:
+                        units += table._write(_plain(request["PutRequest"]["Item"]))
+                    else:
+                        units += table._remove(_plain(request["DeleteRequest"]["Key"]))
+                capacity.append({"TableName": table_name, "CapacityUnits": units})
+
+        resp: dict = {"UnprocessedItems": unprocessed}
+        if ReturnConsumedCapacity != "NONE":
+            resp["ConsumedCapacity"] = capacity
+        return resp
+
+    def batch_get_item(
+        self, RequestItems: dict, ReturnConsumedCapacity: str = "NONE", **kwargs
+    ) -> dict:
+        self._call("batch_get_item")
+        count = sum(len(request["Keys"]) for request in RequestItems.values())
+        if not 0 < count <= BATCH_GET_LIMIT:
+            raise _client_error(
+                "ValidationException",
+                f"Too many items requested for the BatchGetItem call: {count}",
+                "BatchGetItem",
+            )
+
+        responses: dict[str, list] = {}
+        unprocessed: dict[str, dict] = {}
+        capacity: list[dict] = []
+        with self.lock:
+            for table_name, request in RequestItems.items():
+                table = self._table(table_name, "BatchGetItem")
+                paths = _projection(
+                    request.get("ProjectionExpression"),
+                    request.get("ExpressionAttributeNames"),
+                )
+                found = responses.setdefault(table_name, [])
+                units = 0.0
+                for key in request["Keys"]:
+                    if self.faults.unprocessed_request():
+                        pending = unprocessed.setdefault(
+                            table_name,
+                            {k: v for k, v in request.items() if k != "Keys"},
+                        )
+                        pending.setdefault("Keys", []).append(key)
+                        continue
+                    item = table._get(_plain(key))
+                    units += _read_units(
+                        item_size(item), request.get("ConsistentRead", False)
+                    )
+                    if item is not None:
+                        found.append(_typed(_project(item, paths)))
+                capacity.append({"TableName": table_name, "CapacityUnits": units})
+
+        resp: dict = {"Responses": responses, "UnprocessedKeys": unprocessed}
+        if ReturnConsumedCapacity != "NONE":
+            resp["ConsumedCapacity"] = capacity
+        return resp
+
+    # ----------------------- Transactions -----------------------------
+
+    def transact_write_items(
+        self, TransactItems: list[dict], ReturnConsumedCapacity: str = "NONE", **kwargs
+    ) -> dict:
+        """All or nothing: every condition is checked before anything is written."""
+        self._call("transact_write_items")
+        if not 0 < len(TransactItems) <= TRANSACTION_LIMIT:
+            raise _client_error(
+                "ValidationException",
+                f"Member must have length less than or equal to {TRANSACTION_LIMIT}",
+                "TransactWriteItems",
+            )
+
+        with self.lock:
+            prepared = []
+            seen = set()
+            for entry in TransactItems:
+                ((action, spec),) = entry.items()
+                table = self._table(spec["TableName"], "TransactWriteItems")
+                item = _plain(spec["Item"]) if action == "Put" else None
+                key = table._key(item if item is not None else _plain(spec["Key"]))
+                if (spec["TableName"], key) in seen:
+                    raise _client_error(
+                        "ValidationException",
+                        "Transaction request cannot include multiple operations on one item",
+                        "TransactWriteItems",
+                    )
+                seen.add((spec["TableName"], key))
+                prepared.append((action, spec, table, key, item))
+
+            reasons = []
+            for action, spec, table, key, _ in prepared:
+                ok = table._check(
+                    key,
+                    spec.get("ConditionExpression"),
+                    spec.get("ExpressionAttributeNames"),
+                    _plain(spec.get("ExpressionAttributeValues", {})),
+                )
+                reasons.append(
+                    {"Code": "None"} if ok else {"Code": "ConditionalCheckFailed"}
+                )
+            if any(r["Code"] != "None" for r in reasons):
+                raise _client_error(
+                    "TransactionCanceledException",
+                    "Transaction cancelled, please refer cancellation reasons for specific "
+                    "reasons [" + ", ".join(r["Code"] for r in reasons) + "]",
+                    "TransactWriteItems",
+                    CancellationReasons=reasons,
+                )
+
+            units: Counter = Counter()
+            for action, spec, table, key, item in prepared:
+                if action == "Put":
+                    units[table.name] += 2 * table._write(item)
+                elif action == "Delete":
+                    units[table.name] += 2 * table._remove(
+                        dict(zip(table.key_names, key))
+                    )
+                elif action == "Update":
+                    units[table.name] += (
+                        2
+                        * table._update(
+                            dict(zip(table.key_names, key)),
+                            spec["UpdateExpression"],
+                            spec.get("ExpressionAttributeNames"),
+                            _plain(spec.get("ExpressionAttributeValues", {})),
+                        )[0]
+                    )
+                else:  # ConditionCheck
+                    units[table.name] += 2 * _read_units(
+                        item_size(table._get(key)), True
+                    )
+
+        resp: dict = {}
+        if ReturnConsumedCapacity != "NONE":
+            resp["ConsumedCapacity"] = [
+                {"TableName": name, "CapacityUnits": cu} for name, cu in units.items()
+            ]
+        return resp
+
+    def transact_get_items(
+        self, TransactItems: list[dict], ReturnConsumedCapacity: str = "NONE", **kwargs
+    ) -> dict:
+        self._call("transact_get_items")
+        responses = []
+        with self.lock:
+            for entry in TransactItems:
+                spec = entry["Get"]
+                table = self._table(spec["TableName"], "TransactGetItems")
+                item = table._get(_plain(spec["Key"]))
+                paths = _projection(
+                    spec.get("ProjectionExpression"),
+                    spec.get("ExpressionAttributeNames"),
+                )
+                responses.append(
+                    {"Item": _typed(_project(item, paths))} if item else {}
+                )
+        return {"Responses": responses}
+
+
+def _operation_name(operation: str) -> str:
+    return "".join(part.title() for part in operation.split("_"))
+
+
+def _read_units(size: int, consistent: bool) -> float:
+    units = max(math.ceil(size / 4096), 1)
+    return float(units) if consistent else units / 2
+
+
+def _write_units(size: int) -> float:
+    return float(max(math.ceil(size / 1024), 1))
+
+
+class _BatchWriter:
+    """table.batch_writer(): 25-request batches, unprocessed items resent."""
+
+    def __init__(self, table: "MemoryTable", overwrite_by_pkeys: list[str] | None):
+        self._table = table
+        self._overwrite_by = overwrite_by_pkeys
+        self._buffer: list[dict] = []
+        self._buffer_keys: list[tuple] = []
+
+    def __enter__(self) -> "_BatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        while self._buffer:
+            self._flush()
+        return False
+
+    def put_item(self, Item: dict) -> None:
+        self._add({"PutRequest": {"Item": _typed(Item)}}, Item)
+
+    def delete_item(self, Key: dict) -> None:
+        self._add({"DeleteRequest": {"Key": _typed(Key)}}, Key)
+
+    def _add(self, request: dict, attrs: dict) -> None:
+        key = tuple(attrs[name] for name in self._overwrite_by or ())
+        if self._overwrite_by and key in self._buffer_keys:
+            position = self._buffer_keys.index(key)
+            del self._buffer[position], self._buffer_keys[position]
+        self._buffer.append(request)
+        self._buffer_keys.append(key)
+        if len(self._buffer) >= BATCH_WRITE_LIMIT:
+            self._flush()
+
+    def _flush(self) -> None:
+        batch = self._buffer[:BATCH_WRITE_LIMIT]
+        self._buffer = self._buffer[BATCH_WRITE_LIMIT:]
+        self._buffer_keys = self._buffer_keys[BATCH_WRITE_LIMIT:]
+        resp = self._table.meta.client.batch_write_item(
+            RequestItems={self._table.name: batch}
+        )
+        # Like boto3, resend unprocessed requests with the next batch.
+        for request in resp["UnprocessedItems"].get(self._table.name, []):
+            self._buffer.append(request)
+            self._buffer_keys.append(())
+
+
+class MemoryTable:
+    """An in-memory table with the app's key schema and GSIs."""
+
+    key_names = ("PK", "SK")
+
+    def __init__(
+        self,
+        name: str = "memory-table",
+        *,
+        indexes: dict[str, tuple[str, str, tuple[str, ...] | None]] | None = None,
+        faults: Faults | None = None,
+        client: MemoryClient | None = None,
+    ):
+        self.name = name
+        self.indexes = DEFAULT_INDEXES if indexes is None else indexes
+        client = client or MemoryClient(faults)
+        client.tables[name] = self
+        self.meta = SimpleNamespace(client=client)
+        self._items: dict[str, _Partition] = {}
+        self._index_items: dict[str, dict[str, _Partition]] = {
+            i: {} for i in self.indexes
+        }
+
+    @property
+    def client(self) -> MemoryClient:
+        return self.meta.client
+
+    @property
+    def faults(self) -> Faults:
+        return self.client.faults
+
+    @property
+    def calls(self) -> Counter:
+        return self.client.calls
+
+    def __len__(self) -> int:
+        return sum(len(p.items) for p in self._items.values())
+
+    def items(self) -> list[dict]:
+        """Every item, in key order (a copy; for assertions)."""
+        with self.client.lock:
+            return [
+                _clone(self._items[pk].items[sk])
+                for pk in sorted(self._items)
+                for sk in self._items[pk].keys()
+            ]
+
+    # ----------------------- Storage -----------------------------
+
+    def _key(self, item: dict) -> tuple[str, str]:
+        try:
+            return item["PK"], item["SK"]
+        except KeyError:
+            raise _client_error(
+                "ValidationException",
+                "The provided key element does not match the schema",
+                "Key",
+            )
+
+    def _get(self, key: dict | tuple) -> dict | None:
+        pk, sk = self._key(key) if isinstance(key, dict) else key
+        partition = self._items.get(pk)
+        return partition.items.get((sk,)) if partition else None
+
+    def _index_entry(self, index: str, item: dict) -> tuple[str, tuple, dict] | None:
+        hash_key, range_key, projected = self.indexes[index]
+        if hash_key not in item or range_key not in item:
+            return None  # sparse index: items without its keys aren't in it
+        if projected is None:
+            entry = item
+        else:
+            names = {*self.key_names, hash_key, range_key, *projected}
+            entry = {k: v for k, v in item.items() if k in names}
+        return item[hash_key], (item[range_key], item["PK"], item["SK"]), entry
+
+    def _write(self, item: dict) -> float:
+        """Store an item, replacing any with its key; returns write units."""
+        item = _stored(item)
+        pk, sk = self._key(item)
+        size = item_size(item)
+        if size > MAX_ITEM_BYTES:
+            raise _client_error(
+                "ValidationException",
+                "Item size has exceeded the maximum allowed size",
+                "PutItem",
+            )
+        old = self._get((pk, sk))
+        if old is not None:
+            self._unindex(old)
+        self._items.setdefault(pk, _Partition()).put((sk,), item)
+        for index in self.indexes:
+            entry = self._index_entry(index, item)
+            if entry is not None:
+                hash_value, range_value, projected = entry
+                self._index_items[index].setdefault(hash_value, _Partition()).put(
+                    range_value, projected
+                )
+        return _write_units(max(size, item_size(old)))
+
+    def _remove(self, key: dict) -> float:
+        old = self._get(key)
+        if old is None:
+            return _write_units(0)
+        pk, sk = self._key(old)
+        self._items[pk].delete((sk,))
+        self._unindex(old)
+        return _write_units(item_size(old))
+
+    def _unindex(self, item: dict) -> None:
+        for index in self.indexes:
+            entry = self._index_entry(index, item)
+            if entry is not None and entry[0] in self._index_items[index]:
+                self._index_items[index][entry[0]].delete(entry[1])
+
+    def _check(self, key: tuple | dict, condition, names, values) -> bool:
+        if condition is None:
+            return True
+        node = _parse_condition(condition, names, values)
+        return _evaluate(node, self._get(key) or {})
+
+    def _conditional(self, key: dict, kwargs: dict, operation: str) -> None:
+        if not self._check(
+            self._key(key),
+            kwargs.get("ConditionExpression"),
+            kwargs.get("ExpressionAttributeNames"),
+            _stored(kwargs.get("ExpressionAttributeValues") or {}),
+        ):
+            raise _client_error(
+                "ConditionalCheckFailedException",
+                "The conditional request failed",
+                operation,
+            )
+
+    def _update(
+        self, key: dict, expression: str, names, values
+    ) -> tuple[float, dict, dict, set]:
+        old = self._get(key)
+        item = (
+            _clone(old)
+            if old is not None
+            else dict(zip(self.key_names, self._key(key)))
+        )
+        touched = _apply_update(item, _parse_update(expression, names, values))
+        if touched & set(self.key_names):
+            raise _client_error(
+                "ValidationException",
+                "Cannot update attribute PK. This attribute is part of the key",
+                "UpdateItem",
+            )
+        units = self._write(item)
+        return units, old or {}, self._get(key), touched
+
+    @staticmethod
+    def _with_capacity(resp: dict, kwargs: dict, name: str, units: float) -> dict:
+        if kwargs.get("ReturnConsumedCapacity", "NONE") != "NONE":
+            resp["ConsumedCapacity"] = {"TableName": name, "CapacityUnits": units}
+        return resp
+
+    # ----------------------- Item operations -----------------------------
+
+    def get_item(self, Key: dict, **kwargs) -> dict:
+        self.client._call("get_item")
+        with self.client.lock:
+            item = self._get(Key)
+            paths = _projection(
+                kwargs.get("ProjectionExpression"),
+                kwargs.get("ExpressionAttributeNames"),
+            )
+            resp = {"Item": _project(item, paths)} if item is not None else {}
+            units = _read_units(item_size(item), kwargs.get("ConsistentRead", False))
+        return self._with_capacity(resp, kwargs, self.name, units)
+
+    def put_item(self, Item: dict, **kwargs) -> dict:
+        self.client._call("put_item")
+        with self.client.lock:
+            old = self._get(Item)
+            self._conditional(Item, kwargs, "PutItem")
+            units = self._write(Item)
+        resp = self._return_values(kwargs, old, None, set())
+        return self._with_capacity(resp, kwargs, self.name, units)
+
+    def delete_item(self, Key: dict, **kwargs) -> dict:
+        self.client._call("delete_item")
+        with self.client.lock:
+            old = self._get(Key)
+            self._conditional(Key, kwargs, "DeleteItem")
+            units = self._remove(Key)
+        resp = self._return_values(kwargs, old, None, set())
+        return self._with_capacity(resp, kwargs, self.name, units)
+
+    def update_item(self, Key: dict, UpdateExpression: str, **kwargs) -> dict:
+        self.client._call("update_item")
+        with self.client.lock:
+            self._conditional(Key, kwargs, "UpdateItem")
+            units, old, new, touched = self._update(
+                Key,
+                UpdateExpression,
+                kwargs.get("ExpressionAttributeNames"),
+                _stored(kwargs.get("ExpressionAttributeValues") or {}),
+            )
+        resp = self._return_values(kwargs, old, new, touched)
+        return self._with_capacity(resp, kwargs, self.name, units)
+
+    @staticmethod
+    def _return_values(
+        kwargs: dict, old: dict | None, new: dict | None, touched: set
+    ) -> dict:
+        mode = kwargs.get("ReturnValues", "NONE")
+        source = {
+            "ALL_OLD": old,
+            "UPDATED_OLD": old,
+            "ALL_NEW": new,
+            "UPDATED_NEW": new,
+        }.get(mode)
+        if not source:
+            return {}
+        if mode.startswith("UPDATED"):
+            source = {k: v for k, v in source.items() if k in touched}
+        return {"Attributes": _clone(source)} if source else {}
+
+    def batch_writer(self, overwrite_by_pkeys: list[str] | None = None) -> _BatchWriter:
+        return _BatchWriter(self, overwrite_by_pkeys)
+
+    # ----------------------- Query and scan -----------------------------
+
+    def query(self, KeyConditionExpression, **kwargs) -> dict:
+        self.client._call("query")
+        index = kwargs.get("IndexName")
+        if index is not None and index not in self.indexes:
+            raise _client_error(
+                "ValidationException",
+                "The table does not have the specified index: " + index,
+                "Query",
+            )
+        if index is not None and kwargs.get("ConsistentRead"):
+            raise _client_error(
+                "ValidationException",
+                "Consistent reads are not supported on global secondary indexes",
+                "Query",
+            )
+        hash_key, range_key = (
+            self.key_names if index is None else self.indexes[index][:2]
+        )
+        key_node = _parse_condition(
+            KeyConditionExpression,
+            kwargs.get("ExpressionAttributeNames"),
+            _stored(kwargs.get("ExpressionAttributeValues") or {}),
+            is_key=True,
+        )
+        hash_value, low, high = _key_condition(key_node, hash_key, range_key)
+
+        with self.client.lock:
+            partitions = self._items if index is None else self._index_items[index]
+            partition = partitions.get(hash_value)
+            entries: Iterator[tuple[dict, int]] = iter(())
+            if partition is not None:
+                entries = self._range(partition, low, high, index, kwargs)
+            return self._page(entries, key_node, index, kwargs)
+
+    def _range(
+        self, partition: _Partition, low: str, high: str, index, kwargs
+    ) -> Iterator[tuple[dict, int]]:
+        """(entry, size) from low up to high, in the order asked for."""
+        keys = partition.keys()
+        # (low,) sorts before every position whose range key is low.
+        first, stop = bisect.bisect_left(keys, (low,)), bisect.bisect_left(
+            keys, (high,)
+        )
+        start_key = kwargs.get("ExclusiveStartKey")
+        forward = kwargs.get("ScanIndexForward", True)
+        if start_key is not None:
+            after = self._position(start_key, index)[1]
+            if forward:
+                first = max(first, bisect.bisect_right(keys, after))
+            else:
+                stop = min(stop, bisect.bisect_left(keys, after))
+        positions = range(first, stop) if forward else range(stop - 1, first - 1, -1)
+        return ((partition.items[keys[i]], partition.sizes[keys[i]]) for i in positions)
+
+    def scan(self, **kwargs) -> dict:
+        self.client._call("scan")
+        index = kwargs.get("IndexName")
+        segment, total = kwargs.get("Segment", 0), kwargs.get("TotalSegments", 1)
+        with self.client.lock:
+            partitions = self._items if index is None else self._index_items[index]
+            # A hash key always falls in the same segment, as in DynamoDB.
+            hash_values = sorted(
+                h for h in partitions if zlib.crc32(str(h).encode()) % total == segment
+            )
+            start_key = kwargs.get("ExclusiveStartKey")
+            marker = self._position(start_key, index) if start_key is not None else None
+            entries = (
+                (partitions[h].items[k], partitions[h].sizes[k])
+                for h in hash_values
+                for k in partitions[h].keys()
+                if marker is None or (h, k) > marker
+            )
+            return self._page(entries, None, index, kwargs)
+
+    def _position(self, item: dict, index: str | None) -> tuple:
+        """(hash key, position in its partition) of an item or start key."""
+        if index is None:
+            return (item["PK"], (item["SK"],))
+        hash_value, range_value, _ = self._index_entry(index, item)
+        return (hash_value, range_value)
+
+    def _page(
+        self, entries: Iterator[tuple[dict, int]], key_node, index, kwargs
+    ) -> dict:
+        """One page: up to Limit items or 1 MB read, then FilterExpression."""
+        filter_node = None
+        if kwargs.get("FilterExpression") is not None:
+            filter_node = _parse_condition(
+                kwargs["FilterExpression"],
+                kwargs.get("ExpressionAttributeNames"),
+                _stored(kwargs.get("ExpressionAttributeValues") or {}),
+            )
+        paths = _projection(
+            kwargs.get("ProjectionExpression"), kwargs.get("ExpressionAttributeNames")
+        )
+        limit = kwargs.get("Limit")
+
+        read_bytes = 0
+        scanned: list[dict] = []
+        more = False
+        for entry, size in entries:
+            scanned.append(entry)
+            read_bytes += size
+            # Like DynamoDB, stopping at the limit returns a LastEvaluatedKey
+            # even when nothing is left: the caller's next page is just empty.
+            if (
+                limit is not None and len(scanned) >= limit
+            ) or read_bytes >= PAGE_BYTES:
+                more = True
+                break
+
+        matched = [
+            e
+            for e in scanned
+            if (key_node is None or _evaluate(key_node, e))
+            and (filter_node is None or _evaluate(filter_node, e))
+        ]
+        resp: dict = {"Count": len(matched), "ScannedCount": len(scanned)}
+        if kwargs.get("Select") != "COUNT":
+            resp["Items"] = [_project(e, paths) for e in matched]
+        if more:
+            resp["LastEvaluatedKey"] = self._last_key(scanned[-1], index)
+        units = _read_units(read_bytes, kwargs.get("ConsistentRead", False))
+        return self._with_capacity(resp, kwargs, self.name, units)
+
+    def _last_key(self, entry: dict, index: str | None) -> dict:
+        names = set(self.key_names)
+        if index is not None:
+            names |= set(self.indexes[index][:2])
+        return {name: entry[name] for name in names}
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from starlette.responses import Response, StreamingResponse
+from starlette.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware
+from app.settings import settings
+
+HTML = (
+    "<html><body>"
+    + "<tr><td>Bench press</td><td>80 kg</td></tr>" * 100
+    + "</body></html>"
+)
+
+
+def _make_client(**kwargs) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/page")
+    def page() -> HTMLResponse:
+        return HTMLResponse(HTML, headers={"ETag": '"abc"'})
+
+    @app.get("/tiny")
+    def tiny() -> HTMLResponse:
+        return HTMLResponse("<p>hi</p>")
+
+    @app.get("/data")
+    def data() -> JSONResponse:
+        return JSONResponse({"sets": [{"reps": 5, "weight_kg": 80}] * 200})
+
+    @app.get("/binary")
+    def binary() -> Response:
+        return Response(b"\x00" * 5000, media_type="application/octet-stream")
+
+    @app.get("/encoded")
+    def encoded() -> Response:
+        return Response(
+            gzip.compress(HTML.encode()),
+            media_type="text/html",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        def rows():
+            for i in range(50):
+                yield f"row {i}\n".encode()
+
+        return StreamingResponse(rows(), media_type="text/plain")
+
+    @app.get("/empty", status_code=204)
+    def empty() -> Response:
+        return Response(status_code=204)
+
+    app.add_middleware(CompressionMiddleware, **kwargs)
+    return TestClient(app)
+
+
+def _get(client: TestClient, path: str, encoding: str = "gzip"):
+    return client.get(path, headers={"Accept-Encoding": encoding})
+
+
+def test_large_html_is_gzipped() -> None:
+    response = _get(_make_client(), "/page")
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(HTML)
+    assert response.text == HTML  # decoded by the client
+
+
+def test_strong_etag_is_weakened() -> None:
+    response = _get(_make_client(), "/page")
+
+    assert response.headers["etag"] == 'W/"abc"'
+
+
+def test_json_is_gzipped() -> None:
+    response = _get(_make_client(), "/data")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["sets"]) == 200
+
+
+def test_small_body_is_not_compressed() -> None:
+    response = _get(_make_client(), "/tiny")
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == "<p>hi</p>"
+
+
+def test_minimum_size_is_configurable() -> None:
+    response = _get(_make_client(minimum_size=0), "/tiny")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "<p>hi</p>"
+
+
+def test_client_without_gzip_gets_identity() -> None:
+    response = _get(_make_client(), "/page", encoding="identity")
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == HTML
+
+
+def test_gzip_refused_with_q_zero_gets_identity() -> None:
+    response = _get(_make_client(), "/page", encoding="gzip;q=0, br")
+
+    assert "content-encoding" not in response.headers
+
+
+def test_content_type_outside_allowlist_is_untouched() -> None:
+    response = _get(_make_client(), "/binary")
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+    assert len(response.content) == 5000
+
+
+def test_already_encoded_response_is_untouched() -> None:
+    client = _make_client()
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == HTML  # decoded once, so not compressed twice
+
+
+def test_streaming_response_is_compressed_without_length() -> None:
+    response = _get(_make_client(), "/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "".join(f"row {i}\n" for i in range(50))
+
+
+def test_no_content_passes_through() -> None:
+    response = _get(_make_client(), "/empty")
+
+    assert response.status_code == 204
+    assert "content-encoding" not in response.headers
+
+
+def test_disabled_by_setting(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "COMPRESSION_ENABLED", False)
+
+    response = _get(_make_client(), "/page")
+
+    assert "content-encoding" not in response.headers
+    assert response.text == HTML
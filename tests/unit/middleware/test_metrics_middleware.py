@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app.middleware.metrics import MetricsMiddleware
+from app.settings import settings
+from app.utils import metrics
+
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/work")
+    def work() -> dict[str, str]:
+        # Sync route: runs in the threadpool with the request's context.
+        metrics.ddb_call(
+            "get_item",
+            lambda **kwargs: {"ConsumedCapacity": {"CapacityUnits": 0.5}},
+            Key={"PK": "a"},
+        )
+        with metrics.timed("render"):
+            pass
+        return {"ok": "yes"}
+
+    app.add_middleware(MetricsMiddleware)
+    return TestClient(app)
+
+
+def test_dev_sends_server_timing(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "ENV", "dev")
+
+    response = _make_client().get("/work")
+
+    timing = response.headers["server-timing"]
+    assert "ddb;dur=" in timing and 'desc="1 calls, 0.5 CU"' in timing
+    assert "render;dur=" in timing
+
+
+def test_prod_logs_one_summary_line(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(settings, "ENV", "prod")
+
+    with caplog.at_level(logging.INFO, logger="gymbyte"):
+        response = _make_client().get("/work")
+
+    assert "server-timing" not in response.headers
+    lines = [
+        r.getMessage() for r in caplog.records if "Request metrics" in r.getMessage()
+    ]
+    assert len(lines) == 1
+    assert "path=/work status=200" in lines[0]
+    assert "ddb_calls=1" in lines[0]
+    assert "ddb_cu=0.5" in lines[0]
+    assert "ddb_ops=get_item:1" in lines[0]
+
+
+def test_disabled_adds_nothing(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "ENV", "dev")
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+
+    response = _make_client().get("/work")
+
+    assert "server-timing" not in response.headers
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from fastapi import FastAPI, Request, Response
+from starlette.testclient import TestClient
+
+from app.middleware.session_prefs import SessionPrefsMiddleware
+from app.settings import settings
+from app.utils import session_prefs
+from tests.fakes import FakeProfileRepo, make_test_profile
+
+
+class CountingProfileRepo(FakeProfileRepo):
+    def __init__(self, profile):
+        super().__init__(profile)
+        self.calls = 0
+
+    def get_for_user(self, user_sub: str):
+        self.calls += 1
+        return super().get_for_user(user_sub)
+
+
+def _make_client(monkeypatch, repo) -> TestClient:
+    monkeypatch.setattr(settings, "SESSION_PREFS_SECRET", "test-secret")
+
+    app = FastAPI()
+
+    @app.get("/unit")
+    def unit(request: Request) -> dict[str, str]:
+        prefs = session_prefs.load(request, "test-user", repo)
+        return {"unit": prefs.weight_unit}
+
+    @app.get("/own-cookie")
+    def own_cookie(request: Request) -> Response:
+        session_prefs.load(request, "test-user", repo)
+        response = Response("ok")
+        response.set_cookie("other", "1")
+        return response
+
+    app.add_middleware(SessionPrefsMiddleware)
+    return TestClient(app, base_url="https://testserver")
+
+
+def test_first_request_reads_profile_and_sets_cookie(monkeypatch) -> None:
+    repo = CountingProfileRepo(make_test_profile(units="imperial"))
+    client = _make_client(monkeypatch, repo)
+
+    response = client.get("/unit")
+
+    assert response.json() == {"unit": "lb"}
+    assert repo.calls == 1
+    assert session_prefs.COOKIE_NAME in response.cookies
+
+
+def test_later_requests_use_cookie_instead_of_profile(monkeypatch) -> None:
+    repo = CountingProfileRepo(make_test_profile(units="imperial"))
+    client = _make_client(monkeypatch, repo)
+
+    client.get("/unit")
+    response = client.get("/unit")
+
+    assert response.json() == {"unit": "lb"}
+    assert repo.calls == 1
+    assert "set-cookie" not in response.headers
+
+
+def test_cookie_is_added_alongside_the_routes_own_cookies(monkeypatch) -> None:
+    repo = CountingProfileRepo(make_test_profile())
+    client = _make_client(monkeypatch, repo)
+
+    response = client.get("/own-cookie")
+
+    assert response.text == "ok"
+    assert {session_prefs.COOKIE_NAME, "other"} <= set(response.cookies)
+    prefs_cookie = next(
+        h for h in response.headers.get_list("set-cookie") if h.startswith("prefs=")
+    )
+    assert "HttpOnly" in prefs_cookie
+    assert "Max-Age=3600" in prefs_cookie
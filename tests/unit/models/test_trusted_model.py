@@ -0,0 +1,91 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models.exercise import Exercise
+from app.models.profile import UserProfile
+from app.models.trusted import (
+    ITEM_SCHEMA_VERSION,
+    SCHEMA_VERSION_ATTR,
+    construct_trusted,
+    is_trusted,
+    load_model,
+)
+from app.models.workout import Workout, WorkoutSet
+from app.repositories.base import _deserialize, _serialize
+from app.settings import settings
+
+
+def _stored(item: dict) -> dict:
+    """Round-trip an item through DynamoDB's type system (numbers -> Decimal)."""
+    return _deserialize(_serialize(item))
+
+
+def test_to_ddb_item_stamps_schema_version(
+    example_workout, example_set, example_exercise, example_profile
+):
+    for model in (example_workout, example_set, example_exercise, example_profile):
+        assert model.to_ddb_item()[SCHEMA_VERSION_ATTR] == ITEM_SCHEMA_VERSION
+
+
+@pytest.mark.parametrize(
+    "model_cls, fixture",
+    [
+        (Workout, "example_workout"),
+        (WorkoutSet, "example_set"),
+        (Exercise, "example_exercise"),
+        (UserProfile, "example_profile"),
+    ],
+)
+def test_trusted_load_matches_validated_load(model_cls, fixture, request):
+    item = _stored(request.getfixturevalue(fixture).to_ddb_item())
+    assert is_trusted(item)
+
+    trusted = load_model(model_cls, item)
+
+    assert trusted == model_cls.model_validate(item)
+
+
+def test_construct_trusted_restores_types_dynamodb_drops(example_set):
+    item = _stored(example_set.to_ddb_item())
+
+    loaded = construct_trusted(WorkoutSet, item)
+
+    assert type(loaded.set_number) is int
+    assert type(loaded.reps) is int
+    assert loaded.created_at == WorkoutSet.model_validate(item).created_at
+
+
+def test_construct_trusted_builds_nested_models(example_profile):
+    loaded = construct_trusted(UserProfile, _stored(example_profile.to_ddb_item()))
+
+    assert loaded.preferences == example_profile.preferences
+    assert loaded.weight_unit == example_profile.weight_unit
+
+
+def test_load_model_validates_unstamped_items(example_exercise):
+    item = _stored(example_exercise.to_ddb_item())
+    del item[SCHEMA_VERSION_ATTR]
+    item["equipment"] = "not-equipment"
+
+    with pytest.raises(ValidationError):
+        load_model(Exercise, item)
+
+
+def test_load_model_validates_everything_when_trusted_loads_disabled(
+    example_exercise, monkeypatch
+):
+    monkeypatch.setattr(settings, "TRUSTED_MODEL_LOADS", False)
+    item = _stored(example_exercise.to_ddb_item())
+    item["equipment"] = "not-equipment"
+
+    with pytest.raises(ValidationError):
+        load_model(Exercise, item)
+
+
+def test_load_model_ignores_other_schema_versions(example_exercise):
+    item = _stored(example_exercise.to_ddb_item())
+    item[SCHEMA_VERSION_ATTR] = ITEM_SCHEMA_VERSION + 1
+    item["equipment"] = " Barbell "
+
+    # Validated, so normalised on the way in.
+    assert load_model(Exercise, item).equipment == "barbell"
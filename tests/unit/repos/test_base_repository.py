@@ -1,8 +1,10 @@
 import pytest
 from tests.test_data import TEST_WORKOUT_SK_1, USER_PK
 
+from app.repositories import base as base_module
 from app.repositories.base import DynamoRepository
 from app.repositories.errors import RepoError
+from tests.fakes import FakeBatchGetClient, FakeBulkTable, FakeTable
 
 TEST_DATA = {"PK": USER_PK, "SK": TEST_WORKOUT_SK_1}
 
@@ -79,6 +81,112 @@ def test_safe_query_wraps_client_error(failing_query_table):
     assert "Failed to query database" in str(excinfo.value)
 
 
+def test_safe_query_follows_last_evaluated_key(fake_table):
+    fake_table.paginated_responses = [
+        {"Items": [{"PK": "a"}], "LastEvaluatedKey": {"PK": "a"}},
+        {"Items": [{"PK": "b"}]},
+    ]
+    repo = FakeRepo(table=fake_table)
+
+    result = repo._safe_query()
+
+    assert result == [{"PK": "a"}, {"PK": "b"}]
+    assert fake_table.last_query_kwargs == {"ExclusiveStartKey": {"PK": "a"}}
+
+
+def test_safe_query_pages_fetches_next_page_only_when_asked(fake_table):
+    fake_table.paginated_responses = [
+        {"Items": [{"PK": "a"}], "LastEvaluatedKey": {"PK": "a"}},
+        {"Items": [{"PK": "b"}]},
+    ]
+    repo = FakeRepo(table=fake_table)
+
+    pages = repo._safe_query_pages()
+
+    assert next(pages) == [{"PK": "a"}]
+    assert len(fake_table.paginated_responses) == 1
+    assert next(pages) == [{"PK": "b"}]
+    assert list(pages) == []
+
+
+def test_safe_query_pages_wraps_client_error(failing_query_table):
+    repo = FakeRepo(table=failing_query_table)
+
+    with pytest.raises(RepoError, match="Failed to query database"):
+        next(repo._safe_query_pages())
+
+
+def test_safe_scan_pages_follows_last_evaluated_key(fake_table):
+    fake_table.paginated_responses = [
+        {"Items": [{"PK": "a"}], "LastEvaluatedKey": {"PK": "a"}},
+        {"Items": [{"PK": "b"}]},
+    ]
+    repo = FakeRepo(table=fake_table)
+
+    pages = list(repo._safe_scan_pages(Segment=1, TotalSegments=4))
+
+    assert pages == [[{"PK": "a"}], [{"PK": "b"}]]
+    assert fake_table.last_scan_kwargs == {
+        "Segment": 1,
+        "TotalSegments": 4,
+        "ExclusiveStartKey": {"PK": "a"},
+    }
+
+
+def test_safe_scan_pages_wraps_client_error():
+    repo = FakeRepo(table=FakeTable(fail_on={"scan"}))
+
+    with pytest.raises(RepoError, match="Failed to scan database"):
+        next(repo._safe_scan_pages())
+
+
+# ──────────────────────────── _safe_batch_get ────────────────────────────
+
+
+def test_safe_batch_get_returns_plain_items_in_chunks_of_100():
+    stored = [{"PK": USER_PK, "SK": f"ITEM#{n}", "n": n} for n in range(150)]
+    client = FakeBatchGetClient(stored)
+    repo = FakeRepo(table=FakeBulkTable(client))
+
+    keys = [{"PK": USER_PK, "SK": f"ITEM#{n}"} for n in range(150)]
+    result = repo._safe_batch_get(keys, projection="SK")
+
+    assert [len(c["test-table"]["Keys"]) for c in client.calls] == [100, 50]
+    assert client.calls[0]["test-table"]["ProjectionExpression"] == "SK"
+    assert len(result) == 150
+    assert result[0] == {"SK": "ITEM#0"}
+
+
+def test_safe_batch_get_retries_unprocessed_keys(monkeypatch):
+    monkeypatch.setattr(base_module.time, "sleep", lambda _: None)
+    stored = [{"PK": USER_PK, "SK": "A"}, {"PK": USER_PK, "SK": "B"}]
+    client = FakeBatchGetClient(stored, unprocessed_rounds=1)
+    repo = FakeRepo(table=FakeBulkTable(client))
+
+    result = repo._safe_batch_get(
+        [{"PK": USER_PK, "SK": "A"}, {"PK": USER_PK, "SK": "B"}]
+    )
+
+    assert len(client.calls) == 2
+    assert sorted(i["SK"] for i in result) == ["A", "B"]
+
+
+def test_safe_batch_get_raises_when_keys_stay_unprocessed(monkeypatch):
+    monkeypatch.setattr(base_module.time, "sleep", lambda _: None)
+    client = FakeBatchGetClient([], unprocessed_rounds=99)
+    repo = FakeRepo(table=FakeBulkTable(client))
+
+    with pytest.raises(RepoError, match="unprocessed"):
+        repo._safe_batch_get([{"PK": USER_PK, "SK": "A"}])
+
+
+def test_safe_batch_get_wraps_client_error():
+    repo = FakeRepo(table=FakeBulkTable(FakeBatchGetClient(fail=True)))
+
+    with pytest.raises(RepoError, match="Failed to read from database"):
+        repo._safe_batch_get([{"PK": USER_PK, "SK": "A"}])
+
+
 # ──────────────────────────── _safe_put ────────────────────────────
 
 
@@ -196,3 +304,35 @@ def test_safe_query_follows_last_evaluated_key(fake_table):
     assert result[2] == {"PK": "USER#3"}
     # Second call should have received ExclusiveStartKey from page1
     assert paginated_table.last_query_kwargs["ExclusiveStartKey"] == {"PK": "USER#1"}
+
+
+# ──────────────────────────── Request metrics ────────────────────────────
+
+
+def test_safe_calls_record_request_metrics(fake_table):
+    from app.utils import metrics
+
+    fake_table.response = {
+        "Items": [TEST_DATA],
+        "Item": TEST_DATA,
+        "ConsumedCapacity": {"TableName": "test-table", "CapacityUnits": 0.5},
+    }
+    repo = FakeRepo(table=fake_table)
+
+    with metrics.collecting() as collected:
+        repo._safe_query(KeyConditionExpression="whatever")
+        repo._safe_get(Key={"PK": USER_PK})
+        repo._safe_get(Key={"PK": USER_PK})
+
+    assert fake_table.last_query_kwargs["ReturnConsumedCapacity"] == "TOTAL"
+    assert collected.ddb["query"].count == 1
+    assert collected.ddb["get_item"].count == 2
+    assert collected.ddb_total().capacity == 1.5
+
+
+def test_safe_calls_outside_a_request_are_unchanged(fake_table):
+    repo = FakeRepo(table=fake_table)
+
+    repo._safe_put(TEST_DATA)
+
+    assert fake_table.last_put_kwargs == {"Item": TEST_DATA}
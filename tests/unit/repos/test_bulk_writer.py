@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+import pytest
+
+from app.repositories import bulk
+from app.repositories.bulk import BulkWriter
+from tests.fakes import FakeBatchWriteClient, FakeBulkTable
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    monkeypatch.setattr(bulk.time, "sleep", lambda _: None)
+
+
+def _item(n: int) -> dict:
+    return {"PK": "USER#u1", "SK": f"ITEM#{n:03d}", "weight_kg": Decimal("82.5")}
+
+
+def test_bulk_writer_shards_items_into_batches_of_25():
+    table = FakeBulkTable()
+
+    with BulkWriter(table) as writer:
+        for n in range(60):
+            writer.put_item(Item=_item(n))
+
+    sizes = sorted(len(call["test-table"]) for call in table.meta.client.calls)
+    assert sizes == [10, 25, 25]
+    assert writer.result.written == 60
+    assert writer.result.failed == 0
+
+
+def test_bulk_writer_serialises_items_for_the_client():
+    table = FakeBulkTable()
+
+    with BulkWriter(table) as writer:
+        writer.put_item(Item=_item(1))
+
+    request = table.meta.client.calls[0]["test-table"][0]
+    assert request["PutRequest"]["Item"]["weight_kg"] == {"N": "82.5"}
+    assert table.put_calls == [_item(1)]
+
+
+def test_bulk_writer_retries_unprocessed_items():
+    table = FakeBulkTable(FakeBatchWriteClient(unprocessed_rounds=2))
+
+    with BulkWriter(table) as writer:
+        for n in range(3):
+            writer.put_item(Item=_item(n))
+
+    assert len(table.meta.client.calls) == 3
+    assert writer.result.written == 3
+    assert len(table.put_calls) == 3
+
+
+def test_bulk_writer_counts_items_still_unprocessed_after_max_attempts():
+    table = FakeBulkTable(FakeBatchWriteClient(unprocessed_rounds=10))
+
+    with BulkWriter(table, max_attempts=3) as writer:
+        for n in range(3):
+            writer.put_item(Item=_item(n))
+
+    # Each attempt writes all but the last outstanding request.
+    assert writer.result.written == 2
+    assert writer.result.failed == 1
+
+
+def test_bulk_writer_counts_rejected_batch_as_failed():
+    table = FakeBulkTable(FakeBatchWriteClient(fail=True))
+
+    with BulkWriter(table) as writer:
+        for n in range(30):
+            writer.put_item(Item=_item(n))
+
+    assert writer.result.written == 0
+    assert writer.result.failed == 30
+
+
+def test_bulk_writer_replaces_duplicate_keys_within_a_batch():
+    table = FakeBulkTable()
+
+    with BulkWriter(table) as writer:
+        writer.put_item(Item=_item(1))
+        writer.put_item(Item={**_item(1), "weight_kg": Decimal("90")})
+
+    assert table.put_calls == [{**_item(1), "weight_kg": Decimal("90")}]
+    assert writer.result.written == 2
+
+
+def test_bulk_writer_supports_deletes():
+    table = FakeBulkTable()
+
+    with BulkWriter(table) as writer:
+        writer.delete_item(Key={"PK": "USER#u1", "SK": "ITEM#001"})
+
+    assert table.meta.client.deleted_keys == [{"PK": "USER#u1", "SK": "ITEM#001"}]
+
+
+def test_bulk_writer_flushes_pending_items_when_body_raises():
+    table = FakeBulkTable()
+
+    with pytest.raises(RuntimeError):
+        with BulkWriter(table) as writer:
+            writer.put_item(Item=_item(1))
+            raise RuntimeError("producer failed")
+
+    assert writer.result.written == 1
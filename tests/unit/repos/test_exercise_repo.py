@@ -1,6 +1,6 @@
 import pytest
 
-from app.models.exercise import Exercise
+from app.models.exercise import Exercise, ExerciseCreate
 from app.repositories.errors import ExerciseRepoError
 from app.repositories.exercise import DynamoExerciseRepository
 from tests.test_data import USER_PK, USER_SUB
@@ -76,6 +76,25 @@ def test_get_all_for_user_wraps_repo_error(failing_query_table):
         repo.get_all_for_user(USER_SUB)
 
 
+def test_iter_all_for_user_yields_exercises_across_pages(fake_table):
+    fake_table.paginated_responses = [
+        {"Items": [FAKE_EXERCISE_1], "LastEvaluatedKey": {"SK": "EXERCISE#squat"}},
+        {"Items": [FAKE_EXERCISE_2]},
+    ]
+    repo = DynamoExerciseRepository(table=fake_table)
+
+    exercises = list(repo.iter_all_for_user(USER_SUB))
+
+    assert [e.name for e in exercises] == ["Back Squat", "Bench Press"]
+
+
+def test_iter_all_for_user_wraps_repo_error(failing_query_table):
+    repo = DynamoExerciseRepository(table=failing_query_table)
+
+    with pytest.raises(ExerciseRepoError):
+        list(repo.iter_all_for_user(USER_SUB))
+
+
 # --------------- get_exercise_by_id ---------------
 
 
@@ -110,3 +129,68 @@ def test_get_exercise_by_id_wraps_repo_error(failing_get_table):
         repo.get_exercise_by_id(USER_SUB, "squat")
 
     assert "Failed to get exercise by id for user" in str(excinfo.value)
+
+
+# --------------- Delete ---------------
+
+
+def test_delete_exercise_leaves_a_tombstone(fake_table):
+    repo = DynamoExerciseRepository(table=fake_table)
+
+    repo.delete_exercise(USER_SUB, "squat")
+
+    assert fake_table.deleted_keys == [{"PK": USER_PK, "SK": "EXERCISE#squat"}]
+    tombstone = fake_table.last_put_kwargs["Item"]
+    assert tombstone["SK"].startswith("TOMBSTONE#")
+    assert tombstone["deleted_sk"] == "EXERCISE#squat"
+
+
+def test_delete_exercise_wraps_repo_error(failing_put_table):
+    repo = DynamoExerciseRepository(table=failing_put_table)
+
+    with pytest.raises(ExerciseRepoError, match="Failed to delete exercise"):
+        repo.delete_exercise(USER_SUB, "squat")
+
+    # No delete without its tombstone.
+    assert failing_put_table.deleted_keys == []
+
+
+# --------------- Catalog version ---------------
+
+
+def test_create_exercise_bumps_catalog_version(fake_table):
+    repo = DynamoExerciseRepository(table=fake_table)
+
+    repo.create_exercise(
+        USER_SUB, ExerciseCreate(name="Squat", equipment="barbell", muscles=["quads"])
+    )
+
+    update = fake_table.last_update_kwargs
+    assert update["Key"] == {"PK": USER_PK, "SK": "PROFILE"}
+    assert update["UpdateExpression"] == "ADD exercise_catalog_version :one"
+    assert update["ConditionExpression"] == "attribute_exists(PK)"
+
+
+def test_delete_exercise_bumps_catalog_version(fake_table):
+    repo = DynamoExerciseRepository(table=fake_table)
+
+    repo.delete_exercise(USER_SUB, "squat")
+
+    assert fake_table.last_update_kwargs["Key"] == {"PK": USER_PK, "SK": "PROFILE"}
+
+
+def test_failed_write_does_not_bump_catalog_version(failing_put_table):
+    repo = DynamoExerciseRepository(table=failing_put_table)
+
+    with pytest.raises(ExerciseRepoError):
+        repo.delete_exercise(USER_SUB, "squat")
+
+    assert failing_put_table.last_update_kwargs is None
+
+
+def test_catalog_version_bump_failure_is_not_raised(failing_update_table):
+    repo = DynamoExerciseRepository(table=failing_update_table)
+
+    repo.update_exercise(Exercise(**FAKE_EXERCISE_1))
+
+    assert failing_update_table.last_put_kwargs["Item"]["SK"] == "EXERCISE#squat"
@@ -0,0 +1,101 @@
+import pytest
+
+from app.models.import_job import ImportJob
+from app.repositories.errors import ImportJobNotFoundError, ImportJobRepoError
+from app.repositories.import_job import DynamoImportJobRepository
+from tests.test_data import USER_PK, USER_SUB
+
+_JOB_ITEM = {
+    "PK": USER_PK,
+    "SK": "IMPORT_JOB#job-1",
+    "type": "import_job",
+    "status": "running",
+    "filename": "export.json",
+    "upload_path": "/tmp/gymbyte-imports/job-1.upload",
+    "records_processed": 200,
+    "id_remap": {"old": "new"},
+    "summary": {"workouts_created": 150, "warnings": []},
+    "created_at": "2025-01-01T12:00:00Z",
+    "updated_at": "2025-01-01T12:00:05Z",
+}
+
+# ──────────────────────────── CREATE ────────────────────────────
+
+
+def test_create_job_puts_pending_item(fake_table):
+    repo = DynamoImportJobRepository(table=fake_table)
+
+    job = repo.create_job(
+        USER_SUB, "job-1", filename="export.json", upload_path="/tmp/x.upload"
+    )
+
+    assert job.job_id == "job-1"
+    assert job.status == "pending"
+    item = fake_table.last_put_kwargs["Item"]
+    assert item["PK"] == USER_PK
+    assert item["SK"] == "IMPORT_JOB#job-1"
+    assert item["records_processed"] == 0
+    assert item["expires_at"] > 0
+
+
+def test_create_job_wraps_repo_error(failing_put_table):
+    repo = DynamoImportJobRepository(table=failing_put_table)
+
+    with pytest.raises(ImportJobRepoError):
+        repo.create_job(USER_SUB, "job-1", filename="f.json", upload_path="/tmp/x")
+
+
+# ──────────────────────────── GET ────────────────────────────
+
+
+def test_get_job_reads_checkpoint(fake_table):
+    fake_table.response = {"Item": _JOB_ITEM}
+    repo = DynamoImportJobRepository(table=fake_table)
+
+    job = repo.get_job(USER_SUB, "job-1")
+
+    assert isinstance(job, ImportJob)
+    assert job.records_processed == 200
+    assert job.id_remap == {"old": "new"}
+    assert job.summary.workouts_created == 150
+    assert fake_table.last_get_kwargs == {
+        "Key": {"PK": USER_PK, "SK": "IMPORT_JOB#job-1"},
+        "ConsistentRead": True,
+    }
+
+
+def test_get_job_not_found_raises(fake_table):
+    repo = DynamoImportJobRepository(table=fake_table)
+
+    with pytest.raises(ImportJobNotFoundError):
+        repo.get_job(USER_SUB, "missing")
+
+
+def test_get_job_wraps_repo_error(failing_get_table):
+    repo = DynamoImportJobRepository(table=failing_get_table)
+
+    with pytest.raises(ImportJobRepoError):
+        repo.get_job(USER_SUB, "job-1")
+
+
+# ──────────────────────────── SAVE ────────────────────────────
+
+
+def test_save_job_writes_whole_item(fake_table):
+    repo = DynamoImportJobRepository(table=fake_table)
+    job = ImportJob.model_validate(_JOB_ITEM)
+    job.records_processed = 400
+
+    repo.save_job(job)
+
+    item = fake_table.last_put_kwargs["Item"]
+    assert item["records_processed"] == 400
+    assert item["summary"]["workouts_created"] == 150
+    assert item["updated_at"] != _JOB_ITEM["updated_at"]
+
+
+def test_save_job_wraps_repo_error(failing_put_table):
+    repo = DynamoImportJobRepository(table=failing_put_table)
+
+    with pytest.raises(ImportJobRepoError):
+        repo.save_job(ImportJob.model_validate(_JOB_ITEM))
@@ -0,0 +1,345 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from app.repositories import bulk
+from app.repositories.base import DynamoRepository
+from app.repositories.bulk import BulkWriter
+from app.repositories.exercise import DynamoExerciseRepository
+from app.repositories.profile import DynamoProfileRepository
+from app.repositories.workout import DynamoWorkoutRepository
+from app.settings import settings
+from app.utils import metrics
+from app.utils.seed_data import (
+    build_exercise_ids,
+    build_exercises,
+    build_history,
+    build_profile,
+)
+from tests import memory_table
+from tests.memory_table import Faults, MemoryTable, item_size
+
+PK = "USER#u1"
+
+
+@pytest.fixture
+def table() -> MemoryTable:
+    return MemoryTable()
+
+
+@pytest.fixture
+def seeded(table) -> MemoryTable:
+    table.put_item(Item=build_profile(PK).to_ddb_item())
+    for exercise in build_exercises(PK):
+        table.put_item(Item=exercise.to_ddb_item())
+    for workout, sets in build_history(PK, 30, end=date(2025, 1, 31)):
+        table.put_item(Item=workout.to_ddb_item())
+        for workout_set in sets:
+            table.put_item(Item=workout_set.to_ddb_item())
+    return table
+
+
+def _error_code(exc_info) -> str:
+    return exc_info.value.response["Error"]["Code"]
+
+
+# ─────────────────────────────────────────────────────────────
+# Query and scan
+# ─────────────────────────────────────────────────────────────
+
+
+def test_query_key_conditions(seeded):
+    january = seeded.query(
+        KeyConditionExpression=Key("PK").eq(PK)
+        & Key("SK").between("WORKOUT#2025-01-10", "WORKOUT#2025-01-12~")
+    )["Items"]
+    workouts = seeded.query(
+        KeyConditionExpression=Key("PK").eq(PK) & Key("SK").begins_with("WORKOUT#"),
+        FilterExpression=Attr("type").eq("workout"),
+        ScanIndexForward=False,
+    )["Items"]
+
+    assert {i["SK"][8:18] for i in january} == {
+        "2025-01-10",
+        "2025-01-11",
+        "2025-01-12",
+    }
+    assert len(workouts) == 30
+    assert workouts[0]["date"] == "2025-01-31"
+
+
+def test_query_accepts_string_expressions(seeded):
+    resp = seeded.query(
+        KeyConditionExpression="#pk = :pk AND SK = :sk",
+        ExpressionAttributeNames={"#pk": "PK"},
+        ExpressionAttributeValues={":pk": PK, ":sk": "PROFILE"},
+        ProjectionExpression="display_name",
+    )
+
+    assert resp["Items"] == [{"display_name": "Lisa Test"}]
+
+
+def test_query_pages_at_limit_and_one_megabyte(table):
+    payload = "x" * 100_000
+    for n in range(25):
+        table.put_item(Item={"PK": PK, "SK": f"ITEM#{n:02d}", "payload": payload})
+
+    limited = table.query(KeyConditionExpression=Key("PK").eq(PK), Limit=10)
+    pages = list(
+        DynamoRepository(table)._safe_query_pages(
+            KeyConditionExpression=Key("PK").eq(PK)
+        )
+    )
+
+    assert limited["Count"] == 10
+    assert limited["LastEvaluatedKey"] == {"PK": PK, "SK": "ITEM#09"}
+    # 100 KB items: a page closes once a megabyte has been read.
+    assert [len(page) for page in pages] == [11, 11, 3]
+    assert table.calls["query"] == 4
+
+
+def test_query_returns_last_key_when_limit_ends_the_partition(table):
+    for n in range(6):
+        table.put_item(Item={"PK": PK, "SK": f"ITEM#{n}"})
+    condition = Key("PK").eq(PK)
+
+    first = table.query(KeyConditionExpression=condition, Limit=3)
+    second = table.query(
+        KeyConditionExpression=condition,
+        Limit=3,
+        ExclusiveStartKey=first["LastEvaluatedKey"],
+    )
+    third = table.query(
+        KeyConditionExpression=condition,
+        Limit=3,
+        ExclusiveStartKey=second["LastEvaluatedKey"],
+    )
+
+    # DynamoDB can't tell a page that filled its Limit was the last one, so
+    # callers pay one more (empty) round trip to find out.
+    assert second["LastEvaluatedKey"] == {"PK": PK, "SK": "ITEM#5"}
+    assert third["Items"] == []
+    assert "LastEvaluatedKey" not in third
+
+
+def test_gsi_query_returns_projected_attributes_only(seeded):
+    squat_id = build_exercise_ids()["BB_SQUAT"]
+    condition = Key("ExercisePK").eq(f"EXERCISE#{squat_id}")
+
+    full = seeded.query(IndexName="ExerciseIndex", KeyConditionExpression=condition)
+    slim = seeded.query(
+        IndexName=settings.DDB_EXERCISE_PROGRESS_INDEX, KeyConditionExpression=condition
+    )
+
+    assert full["Count"] == slim["Count"] == 20
+    assert "created_at" in full["Items"][0]
+    assert set(slim["Items"][0]) == {
+        "PK",
+        "SK",
+        "ExercisePK",
+        "ExerciseSK",
+        "exercise_id",
+        "reps",
+        "weight_kg",
+        "rpe",
+    }
+
+
+def test_gsi_query_rejects_consistent_read(seeded):
+    with pytest.raises(ClientError) as exc_info:
+        seeded.query(
+            IndexName="ExerciseIndex",
+            KeyConditionExpression=Key("ExercisePK").eq("EXERCISE#x"),
+            ConsistentRead=True,
+        )
+
+    assert _error_code(exc_info) == "ValidationException"
+
+
+def test_gsi_pagination_resumes_after_last_key(seeded):
+    squat_id = build_exercise_ids()["BB_SQUAT"]
+    repo = DynamoWorkoutRepository(table=seeded)
+    kwargs = {
+        "IndexName": "ExerciseIndex",
+        "KeyConditionExpression": Key("ExercisePK").eq(f"EXERCISE#{squat_id}"),
+        "Limit": 3,
+    }
+
+    pages = list(repo._safe_query_pages(**kwargs))
+
+    assert [len(p) for p in pages] == [3, 3, 3, 3, 3, 3, 2]
+    assert len({i["SK"] for p in pages for i in p}) == 20
+
+
+def test_parallel_scan_segments_cover_the_table_once(seeded):
+    for n in range(5):
+        seeded.put_item(Item=build_profile(f"USER#other{n}").to_ddb_item())
+    repo = DynamoProfileRepository(table=seeded)
+
+    segments = [list(repo.scan_profiles(segment=s, total_segments=3)) for s in range(3)]
+
+    pks = [p.PK for segment in segments for p in segment]
+    assert sorted(pks) == sorted([PK] + [f"USER#other{n}" for n in range(5)])
+
+
+# ─────────────────────────────────────────────────────────────
+# Writes
+# ─────────────────────────────────────────────────────────────
+
+
+def test_update_item_set_add_and_return_values(seeded):
+    resp = seeded.update_item(
+        Key={"PK": PK, "SK": "PROFILE"},
+        UpdateExpression="ADD #count :inc SET preferences.theme = :th",
+        ExpressionAttributeNames={"#count": "count"},
+        ExpressionAttributeValues={":inc": 2, ":th": "volt"},
+        ReturnValues="UPDATED_NEW",
+    )
+    seeded.update_item(
+        Key={"PK": PK, "SK": "PROFILE"},
+        UpdateExpression="SET #count = #count + :inc REMOVE email",
+        ExpressionAttributeNames={"#count": "count"},
+        ExpressionAttributeValues={":inc": 1},
+    )
+
+    item = seeded.get_item(Key={"PK": PK, "SK": "PROFILE"})["Item"]
+    assert resp["Attributes"]["count"] == Decimal(2)
+    assert resp["Attributes"]["preferences"]["theme"] == "volt"
+    assert item["count"] == Decimal(3)
+    assert "email" not in item
+
+
+def test_conditional_writes(seeded):
+    repo = DynamoExerciseRepository(table=seeded)
+
+    repo.bump_catalog_version("u1")
+    repo.bump_catalog_version("nobody")  # condition fails; logged, not raised
+
+    assert seeded.get_item(Key={"PK": PK, "SK": "PROFILE"})["Item"][
+        "exercise_catalog_version"
+    ] == Decimal(1)
+    assert seeded.get_item(Key={"PK": "USER#nobody", "SK": "PROFILE"}) == {}
+    with pytest.raises(ClientError) as exc_info:
+        seeded.put_item(
+            Item={"PK": PK, "SK": "PROFILE"},
+            ConditionExpression=Attr("PK").not_exists(),
+        )
+    assert _error_code(exc_info) == "ConditionalCheckFailedException"
+
+
+def test_transaction_is_all_or_nothing(seeded):
+    client = seeded.meta.client
+    put = {
+        "Put": {"TableName": seeded.name, "Item": {"PK": {"S": PK}, "SK": {"S": "NEW"}}}
+    }
+    check = {
+        "ConditionCheck": {
+            "TableName": seeded.name,
+            "Key": {"PK": {"S": PK}, "SK": {"S": "PROFILE"}},
+            "ConditionExpression": "attribute_not_exists(PK)",
+        }
+    }
+
+    with pytest.raises(ClientError) as exc_info:
+        client.transact_write_items(TransactItems=[put, check])
+    assert _error_code(exc_info) == "TransactionCanceledException"
+    assert [r["Code"] for r in exc_info.value.response["CancellationReasons"]] == [
+        "None",
+        "ConditionalCheckFailed",
+    ]
+    assert seeded.get_item(Key={"PK": PK, "SK": "NEW"}) == {}
+
+    check["ConditionCheck"]["ConditionExpression"] = "attribute_exists(PK)"
+    client.transact_write_items(TransactItems=[put, check])
+    assert seeded.get_item(Key={"PK": PK, "SK": "NEW"})["Item"] == {
+        "PK": PK,
+        "SK": "NEW",
+    }
+
+
+def test_batch_writer_overwrites_by_key(table):
+    with table.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as writer:
+        for n in range(30):
+            writer.put_item(Item={"PK": PK, "SK": f"ITEM#{n % 20:02d}", "n": n})
+
+    assert len(table) == 20
+    assert table.get_item(Key={"PK": PK, "SK": "ITEM#05"})["Item"]["n"] == Decimal(25)
+    assert table.calls["batch_write_item"] == 1
+
+
+def test_oversized_item_is_rejected(table):
+    with pytest.raises(ClientError) as exc_info:
+        table.put_item(Item={"PK": PK, "SK": "BIG", "payload": "x" * 410_000})
+
+    assert _error_code(exc_info) == "ValidationException"
+
+
+def test_item_size_follows_dynamodb_rules():
+    assert item_size({"PK": "abc"}) == 5
+    assert item_size({"n": Decimal("12345")}) == 1 + 4
+    assert item_size({"tags": ["a", "b"]}) == 4 + 3 + 2 * 2
+
+
+# ─────────────────────────────────────────────────────────────
+# Capacity and faults
+# ─────────────────────────────────────────────────────────────
+
+
+def test_consumed_capacity_reaches_request_metrics(seeded):
+    repo = DynamoWorkoutRepository(table=seeded)
+
+    with metrics.collecting() as collected:
+        repo.get_all_workout_data_for_user("u1")
+
+    assert collected.ddb["query"].count == 1
+    assert collected.ddb["query"].capacity > 0
+
+
+def test_latency_is_added_per_call(monkeypatch):
+    slept = []
+    monkeypatch.setattr(memory_table.time, "sleep", slept.append)
+    table = MemoryTable(faults=Faults(latency_ms={"get_item": 5}))
+
+    table.get_item(Key={"PK": PK, "SK": "PROFILE"})
+    table.put_item(Item={"PK": PK, "SK": "PROFILE"})
+
+    assert slept == [0.005]
+
+
+def test_throttling_raises_client_error():
+    table = MemoryTable(faults=Faults(throttle={"query": 1.0}))
+
+    with pytest.raises(ClientError) as exc_info:
+        table.query(KeyConditionExpression=Key("PK").eq(PK))
+
+    assert _error_code(exc_info) == "ProvisionedThroughputExceededException"
+    assert table.calls["query"] == 1
+
+
+def test_unprocessed_items_are_retried_by_writers(monkeypatch):
+    monkeypatch.setattr(bulk.time, "sleep", lambda _: None)
+    table = MemoryTable(faults=Faults(unprocessed=0.3, seed=1))
+
+    with BulkWriter(table, max_attempts=20) as writer:
+        for n in range(100):
+            writer.put_item(Item={"PK": PK, "SK": f"BULK#{n:03d}"})
+    with table.batch_writer() as batch:
+        for n in range(100):
+            batch.put_item(Item={"PK": PK, "SK": f"BATCH#{n:03d}"})
+
+    assert writer.result.written == 100
+    assert len(table) == 200
+    assert table.calls["batch_write_item"] > 8
+
+
+def test_unprocessed_keys_are_retried_by_batch_get(monkeypatch, seeded):
+    monkeypatch.setattr("app.repositories.base.time.sleep", lambda _: None)
+    seeded.client.faults = Faults(unprocessed=0.2, seed=3)
+    keys = [{"PK": PK, "SK": e.SK} for e in build_exercises(PK)[:5]]
+
+    items = DynamoRepository(seeded)._safe_batch_get(keys)
+
+    assert sorted(i["SK"] for i in items) == sorted(k["SK"] for k in keys)
@@ -3,6 +3,7 @@ import pytest
 from app.models.profile import UserProfile
 from app.repositories.errors import ProfileRepoError
 from app.repositories.profile import DynamoProfileRepository
+from tests.fakes import FakeTable
 from tests.test_data import USER_EMAIL, USER_PK, USER_SUB
 
 # ──────────────────────────── GET ────────────────────────────
@@ -82,6 +83,42 @@ def test_get_for_user_invalid_item_raises_profile_repo_error(fake_table):
     assert "Failed to create profile model from item" in str(exc.value)
 
 
+# ──────────────────────────── SCAN ────────────────────────────
+
+
+def _profile_item(user_sub: str) -> dict:
+    return {
+        "PK": f"USER#{user_sub}",
+        "SK": "PROFILE",
+        "display_name": user_sub,
+        "email": USER_EMAIL,
+        "timezone": "Europe/London",
+        "created_at": "2025-01-01T12:00:00Z",
+        "updated_at": "2025-01-02T12:00:00Z",
+    }
+
+
+def test_scan_profiles_reads_one_segment_across_pages(fake_table):
+    fake_table.paginated_responses = [
+        {"Items": [_profile_item("a")], "LastEvaluatedKey": {"PK": "USER#a"}},
+        {"Items": [_profile_item("b"), {"PK": "USER#bad", "SK": "PROFILE"}]},
+    ]
+    repo = DynamoProfileRepository(table=fake_table)
+
+    profiles = list(repo.scan_profiles(segment=2, total_segments=4, page_size=50))
+
+    assert [p.user_sub for p in profiles] == ["a", "b"]
+    kwargs = fake_table.last_scan_kwargs
+    assert (kwargs["Segment"], kwargs["TotalSegments"], kwargs["Limit"]) == (2, 4, 50)
+
+
+def test_scan_profiles_wraps_repo_error():
+    repo = DynamoProfileRepository(table=FakeTable(fail_on={"scan"}))
+
+    with pytest.raises(ProfileRepoError):
+        list(repo.scan_profiles())
+
+
 # ──────────────────────────── UPDATE ────────────────────────────
 
 
@@ -191,9 +228,7 @@ def test_update_preferences_wraps_repo_error(failing_update_table):
     repo = DynamoProfileRepository(table=failing_update_table)
 
     with pytest.raises(ProfileRepoError):
-        repo.update_preferences(
-            USER_SUB, theme="prehistoric", units="metric"
-        )
+        repo.update_preferences(USER_SUB, theme="prehistoric", units="metric")
 
 
 def test_update_preferences_no_attributes_raises(fake_table):
@@ -204,6 +239,4 @@ def test_update_preferences_no_attributes_raises(fake_table):
     with pytest.raises(
         ProfileRepoError, match="Preferences update returned no attributes"
     ):
-        repo.update_preferences(
-            USER_SUB, theme="prehistoric", units="metric"
-        )
+        repo.update_preferences(USER_SUB, theme="prehistoric", units="metric")
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.repositories.errors import TombstoneRepoError
+from app.repositories.tombstone import DynamoTombstoneRepository
+from tests.test_data import USER_PK, USER_SUB
+
+_TOMBSTONE_ITEM = {
+    "PK": USER_PK,
+    "SK": "TOMBSTONE#2025-01-02T03:04:05.000000Z#EXERCISE#squat",
+    "type": "tombstone",
+    "deleted_sk": "EXERCISE#squat",
+    "deleted_at": "2025-01-02T03:04:05Z",
+    "expires_at": 1743563045,
+}
+
+
+def test_get_since_queries_tombstones_from_since(fake_table):
+    fake_table.response = {"Items": [_TOMBSTONE_ITEM]}
+    repo = DynamoTombstoneRepository(table=fake_table)
+
+    tombstones = repo.get_since(USER_SUB, datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    assert [t.deleted_sk for t in tombstones] == ["EXERCISE#squat"]
+    values = fake_table.last_query_kwargs["KeyConditionExpression"].get_expression()[
+        "values"
+    ]
+    sk_range = values[1].get_expression()["values"][1:]
+    assert sk_range == ("TOMBSTONE#2025-01-01T00:00:00.000000Z", "TOMBSTONE#~")
+
+
+def test_get_since_wraps_repo_error(failing_query_table):
+    repo = DynamoTombstoneRepository(table=failing_query_table)
+
+    with pytest.raises(TombstoneRepoError, match="Failed to fetch tombstones"):
+        repo.get_since(USER_SUB, datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+
+def test_get_since_raises_on_malformed_item(fake_table):
+    fake_table.response = {"Items": [{"PK": USER_PK, "SK": "TOMBSTONE#x"}]}
+    repo = DynamoTombstoneRepository(table=fake_table)
+
+    with pytest.raises(TombstoneRepoError, match="tombstone model"):
+        repo.get_since(USER_SUB, datetime(2025, 1, 1, tzinfo=timezone.utc))
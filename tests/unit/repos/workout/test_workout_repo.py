@@ -6,6 +6,7 @@ from app.models.workout import (
     Workout,
     WorkoutCreate,
     WorkoutSet,
+    WorkoutSetSummary,
 )
 from app.repositories import workout as workout_repo_module
 from app.repositories.errors import WorkoutNotFoundError, WorkoutRepoError
@@ -206,6 +207,50 @@ def test_get_workout_with_sets_wraps_unexpected_exception_in_workoutrepoerror(
     assert "Failed to parse workout and sets from response" in str(excinfo.value)
 
 
+# ──────────────────────────── get_set_summaries_for_exercise ────────────────────────────
+
+
+def test_get_set_summaries_for_exercise_queries_slim_index(fake_table, set_w2_1):
+    item = set_w2_1.to_ddb_item()
+    projected = {k: item[k] for k in ("SK", "exercise_id", "reps", "weight_kg", "rpe")}
+    fake_table.response = {"Items": [projected]}
+    repo = DynamoWorkoutRepository(table=fake_table)
+
+    summaries = repo.get_set_summaries_for_exercise("squat")
+
+    assert len(summaries) == 1
+    assert isinstance(summaries[0], WorkoutSetSummary)
+    assert summaries[0].workout_date == TEST_DATE_2.isoformat()
+    assert summaries[0].workout_id == TEST_WORKOUT_ID_2
+    assert summaries[0].set_number == 1
+    assert summaries[0].weight_kg == set_w2_1.weight_kg
+
+    kwargs = fake_table.last_query_kwargs
+    assert kwargs["IndexName"] == "ExerciseProgressIndex"
+    assert "created_at" not in kwargs["ProjectionExpression"]
+
+
+def test_get_set_summaries_for_exercise_raises_repoerror_on_client_error(
+    failing_query_table,
+):
+    repo = DynamoWorkoutRepository(table=failing_query_table)
+
+    with pytest.raises(WorkoutRepoError) as excinfo:
+        repo.get_set_summaries_for_exercise("squat")
+
+    assert "Failed to fetch sets for exercise from database" in str(excinfo.value)
+
+
+def test_get_set_summaries_for_exercise_raises_repoerror_on_parse_error(fake_table):
+    fake_table.response = {"Items": [{"SK": "WORKOUT#2025-11-03#2#SET#001"}]}
+    repo = DynamoWorkoutRepository(table=fake_table)
+
+    with pytest.raises(WorkoutRepoError) as excinfo:
+        repo.get_set_summaries_for_exercise("squat")
+
+    assert "Failed to parse sets for exercise" in str(excinfo.value)
+
+
 # ──────────────────────────── create_workout ────────────────────────────
 
 
@@ -63,6 +63,21 @@ def test_delete_workout_and_sets_deletes_workout_and_its_sets(
     assert fake_table.last_query_kwargs is not None
 
 
+def test_delete_workout_and_sets_leaves_tombstones(
+    fake_table, fake_table_response_w2_only
+):
+    repo = DynamoWorkoutRepository(table=fake_table)
+    fake_table.response = fake_table_response_w2_only
+
+    repo.delete_workout_and_sets(USER_SUB, TEST_DATE_2, TEST_WORKOUT_ID_2)
+
+    tombstones = fake_table.batch_put_items
+    assert [t["deleted_sk"] for t in tombstones] == [TEST_WORKOUT_SK_2, TEST_SET_SK_2]
+    assert all(t["SK"].startswith("TOMBSTONE#") for t in tombstones)
+    # One deletion, one timestamp.
+    assert len({t["deleted_at"] for t in tombstones}) == 1
+
+
 def test_delete_workout_and_sets_does_nothing_when_no_items(fake_table):
     repo = DynamoWorkoutRepository(table=fake_table)
 
@@ -1,6 +1,9 @@
 """
-Tests for DynamoWorkoutRepository.get_all_workout_data_for_user.
+Tests for DynamoWorkoutRepository.get_all_workout_data_for_user, the
+range/streaming variants built on the same query, and the keys-only
+existence check used by imports.
 """
+
 import pytest
 
 from app.models.workout import Workout, WorkoutSet
@@ -16,7 +19,7 @@ from tests.test_data import (
     TEST_WORKOUT_SK_2,
     USER_SUB,
 )
-
+from tests.fakes import FakeBatchGetClient, FakeBulkTable
 
 # ──────────────────────────── Fixtures ────────────────────────────
 
@@ -142,3 +145,128 @@ def test_get_all_workout_data_raises_repoerror_on_parse_failure(
         repo.get_all_workout_data_for_user(USER_SUB)
 
     assert "Failed to parse workout data from database response" in str(excinfo.value)
+
+
+# ──────────────────────────── get_workout_data_between ────────────────────────────
+
+
+def test_get_workout_data_between_uses_sk_range(fake_table, workout_w2, set_w2_1):
+    fake_table.response = {"Items": [workout_w2.to_ddb_item(), set_w2_1.to_ddb_item()]}
+    repo = DynamoWorkoutRepository(table=fake_table)
+
+    workouts, sets = repo.get_workout_data_between(USER_SUB, TEST_DATE_1, TEST_DATE_2)
+
+    assert [w.date for w in workouts] == [TEST_DATE_2]
+    assert len(sets) == 1
+
+    condition = fake_table.last_query_kwargs["KeyConditionExpression"]
+    sk_condition = condition.get_expression()["values"][1]
+    assert sk_condition.expression_operator == "BETWEEN"
+    assert sk_condition.get_expression()["values"][1:] == (
+        f"WORKOUT#{TEST_DATE_1.isoformat()}",
+        f"WORKOUT#{TEST_DATE_2.isoformat()}~",
+    )
+
+
+def test_get_workout_data_between_raises_repoerror_on_client_error(
+    failing_query_table,
+):
+    repo = DynamoWorkoutRepository(table=failing_query_table)
+
+    with pytest.raises(WorkoutRepoError) as excinfo:
+        repo.get_workout_data_between(USER_SUB, TEST_DATE_1, TEST_DATE_2)
+
+    assert "Failed to fetch workout data from database" in str(excinfo.value)
+
+
+# ──────────────────────────── iter_workout_data_for_user ────────────────────────────
+
+
+def test_iter_workout_data_queries_newest_first(fake_table):
+    fake_table.response = {"Items": []}
+    repo = DynamoWorkoutRepository(table=fake_table)
+
+    assert list(repo.iter_workout_data_for_user(USER_SUB)) == []
+    assert fake_table.last_query_kwargs["ScanIndexForward"] is False
+
+
+def test_iter_workout_data_groups_sets_under_their_workout(
+    fake_table, workout_w1, workout_w2, set_w2_1, set_w2_2
+):
+    # Descending SK order, as DynamoDB returns it with ScanIndexForward=False,
+    # split across pages.
+    fake_table.paginated_responses = [
+        {
+            "Items": [set_w2_2.to_ddb_item(), set_w2_1.to_ddb_item()],
+            "LastEvaluatedKey": {"SK": set_w2_1.SK},
+        },
+        {"Items": [workout_w2.to_ddb_item(), workout_w1.to_ddb_item()]},
+    ]
+    repo = DynamoWorkoutRepository(table=fake_table)
+
+    result = list(repo.iter_workout_data_for_user(USER_SUB))
+
+    assert [w.date for w, _ in result] == [TEST_DATE_2, TEST_DATE_1]
+    assert [s.set_number for s in result[0][1]] == [1, 2]
+    assert result[1][1] == []
+
+
+def test_iter_workout_data_keeps_same_day_workouts_in_sk_order(
+    workout_factory, fake_table
+):
+    first = workout_factory(SK=db.build_workout_sk(TEST_DATE_2, "a"))
+    second = workout_factory(SK=db.build_workout_sk(TEST_DATE_2, "b"))
+    fake_table.response = {"Items": [second.to_ddb_item(), first.to_ddb_item()]}
+    repo = DynamoWorkoutRepository(table=fake_table)
+
+    result = list(repo.iter_workout_data_for_user(USER_SUB))
+
+    assert [w.workout_id for w, _ in result] == ["a", "b"]
+
+
+def test_iter_workout_data_raises_repoerror_on_query_failure(failing_query_table):
+    repo = DynamoWorkoutRepository(table=failing_query_table)
+
+    with pytest.raises(WorkoutRepoError) as excinfo:
+        list(repo.iter_workout_data_for_user(USER_SUB))
+
+    assert "Failed to fetch workout data from database" in str(excinfo.value)
+
+
+def test_iter_workout_data_raises_repoerror_on_parse_failure(bad_items_table):
+    repo = DynamoWorkoutRepository(table=bad_items_table)
+
+    with pytest.raises(WorkoutRepoError):
+        list(repo.iter_workout_data_for_user(USER_SUB))
+
+
+# ──────────────────────────── get_existing_workout_ids ────────────────────────────
+
+
+def test_get_existing_workout_ids_looks_up_candidate_keys_only(workout_w1):
+    client = FakeBatchGetClient([workout_w1.to_ddb_item()])
+    repo = DynamoWorkoutRepository(table=FakeBulkTable(client))
+
+    existing = repo.get_existing_workout_ids(
+        USER_SUB,
+        [
+            (TEST_DATE_1, TEST_WORKOUT_ID_1),
+            (TEST_DATE_2, TEST_WORKOUT_ID_2),
+            (TEST_DATE_1, TEST_WORKOUT_ID_1),  # duplicates are collapsed
+        ],
+    )
+
+    assert existing == {TEST_WORKOUT_ID_1}
+    (request,) = [call["test-table"] for call in client.calls]
+    assert request["ProjectionExpression"] == "SK"
+    assert [k["SK"]["S"] for k in request["Keys"]] == [
+        TEST_WORKOUT_SK_1,
+        TEST_WORKOUT_SK_2,
+    ]
+
+
+def test_get_existing_workout_ids_raises_repoerror_on_client_error():
+    repo = DynamoWorkoutRepository(table=FakeBulkTable(FakeBatchGetClient(fail=True)))
+
+    with pytest.raises(WorkoutRepoError, match="Failed to check existing workouts"):
+        repo.get_existing_workout_ids(USER_SUB, [(TEST_DATE_1, TEST_WORKOUT_ID_1)])
@@ -276,6 +276,7 @@ def test_delete_set_successful(fake_table):
     }
 
     assert fake_table.deleted_keys == [expected_key]
+    assert fake_table.last_put_kwargs["Item"]["deleted_sk"] == expected_key["SK"]
 
 
 def test_delete_set_wraps_client_error(failing_delete_table):
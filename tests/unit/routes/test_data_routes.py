@@ -1,13 +1,18 @@
 """
 Tests for data export/import routes in app/routes/data.py.
 
-The import route reads multipart form data (including CSRF token), deduplicates
-exercises by name+equipment, remaps exercise IDs, and batch-writes to DynamoDB.
+The import route reads multipart form data (including CSRF token), stores the
+upload and queues an import job, which deduplicates exercises by
+name+equipment, remaps exercise IDs, and batch-writes to DynamoDB. Here the
+job runs inline as soon as it is queued.
 CSRF middleware is disabled globally in conftest, but the route does its own
 manual CSRF check for multipart — we test that explicitly here.
 """
+
+import gzip
 import json
-from datetime import datetime, timezone
+import os
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
 import pytest
@@ -16,11 +21,20 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 from app.models.exercise import Exercise
+from app.models.tombstone import Tombstone
 from app.models.workout import Workout, WorkoutSet
 from app.repositories.errors import RepoError
-from tests.fakes import FakeProfileRepo
+from tests.fakes import (
+    FakeBatchWriteClient,
+    FakeBulkTable,
+    FakeImportJobRepo,
+    FakeProfileRepo,
+    FakeTombstoneRepo,
+    make_test_profile,
+)
 from app.routes import data as data_routes
-from app.utils import auth as auth_utils, db
+from app.settings import settings
+from app.utils import auth as auth_utils, db, import_jobs
 
 USER_SUB = "test-import-user"
 
@@ -37,50 +51,42 @@ class FakeImportWorkoutRepo:
     def __init__(self):
         self.workouts_to_return: list[Workout] = []
         self.sets_to_return: list[WorkoutSet] = []
+        self.lookup_calls: list[list] = []
 
     def get_all_for_user(self, user_sub: str) -> list[Workout]:
-        return self.workouts_to_return
+        raise AssertionError("import must not read the full workout history")
 
     def get_all_workout_data_for_user(
         self, user_sub: str
     ) -> tuple[list[Workout], list[WorkoutSet]]:
         return self.workouts_to_return, self.sets_to_return
 
+    def get_existing_workout_ids(self, user_sub: str, keys) -> set[str]:
+        self.lookup_calls.append(list(keys))
+        stored = {(w.date, w.workout_id) for w in self.workouts_to_return}
+        return {wid for d, wid in keys if (d, wid) in stored}
+
+    def iter_workout_data_for_user(self, user_sub: str):
+        for w in self.workouts_to_return:
+            yield w, [s for s in self.sets_to_return if s.workout_id == w.workout_id]
+
 
 class FakeImportExerciseRepo:
     def __init__(self, exercises: list[Exercise] | None = None):
         self._exercises: list[Exercise] = exercises or []
         self.raise_on_get: bool = False
+        self.catalog_bumps: list[str] = []
 
     def get_all_for_user(self, user_sub: str) -> list[Exercise]:
         if self.raise_on_get:
             raise RepoError("boom")
         return self._exercises
 
+    def iter_all_for_user(self, user_sub: str):
+        yield from self.get_all_for_user(user_sub)
 
-class FakeBatchWriter:
-    def __init__(self):
-        self.put_calls: list[dict] = []
-        self.raise_on_exit: bool = False
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        if self.raise_on_exit:
-            raise Exception("batch write failed")
-        return False
-
-    def put_item(self, Item: dict) -> None:
-        self.put_calls.append(Item)
-
-
-class FakeDdbTable:
-    def __init__(self):
-        self._batch_writer = FakeBatchWriter()
-
-    def batch_writer(self):
-        return self._batch_writer
+    def bump_catalog_version(self, user_sub: str) -> None:
+        self.catalog_bumps.append(user_sub)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -89,15 +95,30 @@ class FakeDdbTable:
 
 
 @pytest.fixture
-def data_client(app_instance, monkeypatch):
+def job_repo():
+    return FakeImportJobRepo()
+
+
+@pytest.fixture
+def data_client(app_instance, monkeypatch, tmp_path, job_repo):
     """
     TestClient with auth stubbed out and data-route repo/table overrides.
+    Import jobs run inline when queued, against the same fakes.
     Yields (client, workout_repo, exercise_repo, fake_table).
     """
     workout_repo = FakeImportWorkoutRepo()
     exercise_repo = FakeImportExerciseRepo()
     profile_repo = FakeProfileRepo()
-    fake_table = FakeDdbTable()
+    fake_table = FakeBulkTable()
+
+    def run_inline(user_sub: str, job_id: str) -> None:
+        import_jobs.run_import_job(
+            user_sub,
+            job_id,
+            job_repo=job_repo,
+            exercise_repo=exercise_repo,
+            workout_repo=workout_repo,
+        )
 
     def fake_auth(request: Request):
         return {"sub": USER_SUB}
@@ -112,7 +133,12 @@ def data_client(app_instance, monkeypatch):
     app_instance.dependency_overrides[data_routes.get_profile_repo] = (
         lambda: profile_repo
     )
+    app_instance.dependency_overrides[data_routes.get_import_job_repo] = (
+        lambda: job_repo
+    )
     monkeypatch.setattr(db, "get_table", lambda: fake_table)
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(data_routes, "enqueue_import_job", run_inline)
 
     client = TestClient(app_instance, raise_server_exceptions=False)
 
@@ -123,6 +149,7 @@ def data_client(app_instance, monkeypatch):
         app_instance.dependency_overrides.pop(data_routes.get_workout_repo, None)
         app_instance.dependency_overrides.pop(data_routes.get_exercise_repo, None)
         app_instance.dependency_overrides.pop(data_routes.get_profile_repo, None)
+        app_instance.dependency_overrides.pop(data_routes.get_import_job_repo, None)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -145,7 +172,13 @@ _MINIMAL_EXPORT = {
 }
 
 
-def _post_import(client, payload: dict, *, csrf_cookie: str = CSRF_TOKEN, csrf_field: str = CSRF_TOKEN):
+def _post_import(
+    client,
+    payload: dict,
+    *,
+    csrf_cookie: str = CSRF_TOKEN,
+    csrf_field: str = CSRF_TOKEN,
+):
     """Post an import request with multipart data."""
     content = json.dumps(payload).encode()
     client.cookies.set("csrf_token", csrf_cookie)
@@ -173,6 +206,7 @@ def _make_exercise(exercise_id: str, name: str, equipment: str = "barbell") -> E
 
 def _make_workout(workout_id: str, date_str: str = "2025-03-01") -> Workout:
     from datetime import date
+
     d = date.fromisoformat(date_str)
     return Workout(
         PK=db.build_user_pk(USER_SUB),
@@ -185,6 +219,178 @@ def _make_workout(workout_id: str, date_str: str = "2025-03-01") -> Workout:
     )
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Export
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def export_client(data_client, app_instance, monkeypatch, tombstone_repo):
+    monkeypatch.setattr(data_routes, "rate_limit_hit", lambda **kwargs: (True, 0))
+    app_instance.dependency_overrides[data_routes.get_profile_repo] = (
+        lambda: FakeProfileRepo(make_test_profile(user_sub=USER_SUB))
+    )
+    app_instance.dependency_overrides[data_routes.get_tombstone_repo] = (
+        lambda: tombstone_repo
+    )
+    try:
+        yield data_client
+    finally:
+        app_instance.dependency_overrides.pop(data_routes.get_tombstone_repo, None)
+
+
+@pytest.fixture
+def tombstone_repo():
+    return FakeTombstoneRepo()
+
+
+def test_export_streams_json_attachment(export_client):
+    client, workout_repo, exercise_repo, _ = export_client
+    exercise_repo._exercises = [_make_exercise("squat-id", "Squat")]
+    workout_repo.workouts_to_return = [_make_workout("wid1")]
+
+    resp = client.get("/profile/data/export")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.headers["content-disposition"].startswith("attachment;")
+    body = resp.json()
+    assert body["schema_version"] == 1
+    assert [e["name"] for e in body["exercises"]] == ["Squat"]
+    assert [w["id"] for w in body["workouts"]] == ["wid1"]
+
+
+def test_export_json_gz_streams_gzip_attachment(export_client):
+    client, workout_repo, _, _ = export_client
+    workout_repo.workouts_to_return = [_make_workout("wid1")]
+
+    resp = client.get("/profile/data/export?format=json.gz")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/gzip"
+    assert ".json.gz" in resp.headers["content-disposition"]
+    body = json.loads(gzip.decompress(resp.content))
+    assert [w["id"] for w in body["workouts"]] == ["wid1"]
+
+
+def test_export_sqlite_streams_database_attachment(export_client):
+    client, workout_repo, _, _ = export_client
+    workout_repo.workouts_to_return = [_make_workout("wid1")]
+
+    resp = client.get("/profile/data/export?format=sqlite")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.sqlite3"
+    assert ".sqlite" in resp.headers["content-disposition"]
+    assert resp.content.startswith(b"SQLite format 3\x00")
+
+
+def test_export_rejects_unknown_format(export_client):
+    client, _, _, _ = export_client
+
+    resp = client.get("/profile/data/export?format=xml")
+
+    assert resp.status_code == 422
+
+
+def test_export_since_streams_delta(export_client, tombstone_repo):
+    client, workout_repo, exercise_repo, _ = export_client
+    since = datetime.now(timezone.utc) - timedelta(days=1)
+    exercise_repo._exercises = [_make_exercise("squat-id", "Squat")]
+    workout_repo.workouts_to_return = [
+        _make_workout("wid1").model_copy(
+            update={"updated_at": datetime.now(timezone.utc)}
+        )
+    ]
+    tombstone_repo.tombstones = [
+        Tombstone.for_item(
+            db.build_user_pk(USER_SUB),
+            db.build_workout_sk(date(2025, 2, 1), "gone"),
+            datetime.now(timezone.utc),
+        )
+    ]
+
+    resp = client.get("/profile/data/export", params={"since": since.isoformat()})
+
+    assert resp.status_code == 200
+    assert "gymbyte-delta-" in resp.headers["content-disposition"]
+    body = resp.json()
+    assert body["schema_version"] == 2
+    assert body["exercises"] == []
+    assert [w["id"] for w in body["workouts"]] == ["wid1"]
+    assert [(d["kind"], d["id"]) for d in body["deleted"]] == [("workout", "gone")]
+
+
+def test_export_since_beyond_retention_returns_400(export_client, tombstone_repo):
+    client, *_ = export_client
+
+    resp = client.get("/profile/data/export?since=2000-01-01T00:00:00Z")
+
+    assert resp.status_code == 400
+    assert "full export" in resp.text
+    assert tombstone_repo.since_calls == []
+
+
+def test_export_since_returns_500_when_tombstones_fail(export_client, tombstone_repo):
+    client, *_ = export_client
+    tombstone_repo.should_raise = True
+    since = datetime.now(timezone.utc) - timedelta(days=1)
+
+    resp = client.get("/profile/data/export", params={"since": since.isoformat()})
+
+    assert resp.status_code == 500
+
+
+def test_export_returns_500_when_exercise_read_fails(export_client):
+    client, _, exercise_repo, _ = export_client
+    exercise_repo.raise_on_get = True
+
+    resp = client.get("/profile/data/export")
+
+    assert resp.status_code == 500
+
+
+def test_export_returns_500_when_first_workout_page_fails(export_client, monkeypatch):
+    client, workout_repo, _, _ = export_client
+
+    def failing_iter(user_sub):
+        raise RepoError("boom")
+        yield
+
+    monkeypatch.setattr(workout_repo, "iter_workout_data_for_user", failing_iter)
+
+    resp = client.get("/profile/data/export?format=sqlite")
+
+    assert resp.status_code == 500
+
+
+def test_export_aborts_stream_when_a_later_page_fails(export_client, monkeypatch):
+    client, workout_repo, _, _ = export_client
+
+    def failing_iter(user_sub):
+        yield _make_workout("wid1"), []
+        raise RepoError("boom")
+
+    monkeypatch.setattr(workout_repo, "iter_workout_data_for_user", failing_iter)
+
+    resp = client.get("/profile/data/export")
+
+    # The 200 has already gone out; the body stops short instead of being
+    # closed off as if the export were complete.
+    assert resp.status_code == 200
+    with pytest.raises(ValueError):
+        json.loads(resp.content)
+
+
+def test_export_returns_404_without_profile(data_client, monkeypatch):
+    client, _, _, _ = data_client
+    monkeypatch.setattr(data_routes, "rate_limit_hit", lambda **kwargs: (True, 0))
+
+    resp = client.get("/profile/data/export")
+
+    assert resp.status_code == 404
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Import — CSRF checks
 # ──────────────────────────────────────────────────────────────────────────────
@@ -253,30 +459,81 @@ def test_import_wrong_schema_version_redirects_with_error(data_client):
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Import — repo read failure redirects with error
+# Import — job failures
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def test_import_redirects_when_exercise_repo_raises(data_client):
+def test_import_job_fails_when_exercise_repo_raises(data_client, job_repo):
     client, _, exercise_repo, _ = data_client
     exercise_repo.raise_on_get = True
     resp = _post_import(client, _MINIMAL_EXPORT)
     assert resp.status_code == 303
-    assert "import_error" in resp.headers["location"]
+    job = job_repo.only()
+    assert job.status == "failed"
+    assert "Could not read existing data" in job.error
+
+
+def test_import_redirects_with_error_when_job_cannot_be_queued(
+    data_client, monkeypatch
+):
+    client, *_ = data_client
+
+    def unavailable(user_sub: str, job_id: str) -> None:
+        raise import_jobs.ImportDispatchError("queue down")
+
+    monkeypatch.setattr(data_routes, "enqueue_import_job", unavailable)
+    resp = _post_import(client, _MINIMAL_EXPORT)
+    assert resp.status_code == 303
+    assert "Could%20not%20start%20the%20import" in resp.headers["location"]
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Import — happy path: empty payload redirects with summary
+# Import — happy path: upload queues a job and redirects to its progress
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def test_import_empty_payload_redirects_with_summary(data_client):
+def test_import_empty_payload_completes_job(data_client, job_repo):
     client, *_ = data_client
     resp = _post_import(client, _MINIMAL_EXPORT)
     assert resp.status_code == 303
-    loc = resp.headers["location"]
-    assert "import_exercises=0" in loc
-    assert "import_workouts=0" in loc
+    job = job_repo.only()
+    assert resp.headers["location"] == f"/profile/?import_job={job.job_id}"
+    assert job.status == "complete"
+    assert job.filename == "export.json"
+    assert job.summary.exercises_created == 0
+    assert job.summary.workouts_created == 0
+
+
+def test_import_removes_stored_upload_when_job_finishes(data_client, job_repo):
+    client, *_ = data_client
+    _post_import(client, _MINIMAL_EXPORT)
+
+    upload_path = job_repo.only().upload_path
+    assert upload_path.startswith(settings.IMPORT_UPLOAD_DIR)
+    assert not os.path.exists(upload_path)
+
+
+def test_import_checkpoints_after_each_chunk(data_client, job_repo, monkeypatch):
+    client, *_ = data_client
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_RECORDS", 2)
+
+    payload = dict(_MINIMAL_EXPORT)
+    payload["workouts"] = [
+        {
+            "id": f"wid-{i}",
+            "date": "2025-04-01",
+            "name": f"Workout {i}",
+            "created_at": _NOW_ISO,
+            "updated_at": _NOW_ISO,
+            "sets": [],
+        }
+        for i in range(5)
+    ]
+    _post_import(client, payload)
+
+    checkpoints = [j.records_processed for j in job_repo.saves if j.status == "running"]
+    assert checkpoints == [0, 2, 4, 5]
+    assert job_repo.only().summary.workouts_created == 5
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -284,7 +541,7 @@ def test_import_empty_payload_redirects_with_summary(data_client):
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def test_import_matches_existing_exercise_by_name_and_equipment(data_client):
+def test_import_matches_existing_exercise_by_name_and_equipment(data_client, job_repo):
     client, _, exercise_repo, fake_table = data_client
     exercise_repo._exercises = [_make_exercise("existing-id", "Squat", "barbell")]
 
@@ -302,15 +559,15 @@ def test_import_matches_existing_exercise_by_name_and_equipment(data_client):
     ]
     resp = _post_import(client, payload)
     assert resp.status_code == 303
-    loc = resp.headers["location"]
+    summary = job_repo.only().summary
     # Matched, not created
-    assert "import_matched=1" in loc
-    assert "import_exercises=0" in loc
+    assert summary.exercises_matched == 1
+    assert summary.exercises_created == 0
     # No DDB write for the matched exercise
-    assert fake_table._batch_writer.put_calls == []
+    assert fake_table.put_calls == []
 
 
-def test_import_creates_new_exercise_when_no_match(data_client):
+def test_import_creates_new_exercise_when_no_match(data_client, job_repo):
     client, _, exercise_repo, fake_table = data_client
     exercise_repo._exercises = []
 
@@ -328,8 +585,8 @@ def test_import_creates_new_exercise_when_no_match(data_client):
     ]
     resp = _post_import(client, payload)
     assert resp.status_code == 303
-    assert "import_exercises=1" in resp.headers["location"]
-    assert len(fake_table._batch_writer.put_calls) == 1
+    assert job_repo.only().summary.exercises_created == 1
+    assert len(fake_table.put_calls) == 1
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -337,7 +594,7 @@ def test_import_creates_new_exercise_when_no_match(data_client):
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def test_import_skips_workout_with_existing_id(data_client):
+def test_import_skips_workout_with_existing_id(data_client, job_repo):
     client, workout_repo, _, _ = data_client
     workout_repo.workouts_to_return = [_make_workout("wid-existing")]
 
@@ -354,11 +611,32 @@ def test_import_skips_workout_with_existing_id(data_client):
     ]
     resp = _post_import(client, payload)
     assert resp.status_code == 303
-    assert "import_skipped=1" in resp.headers["location"]
-    assert "import_workouts=0" in resp.headers["location"]
+    summary = job_repo.only().summary
+    assert summary.workouts_skipped == 1
+    assert summary.workouts_created == 0
 
 
-def test_import_creates_new_workout_when_id_not_existing(data_client):
+def test_import_checks_only_candidate_workout_keys(data_client):
+    client, workout_repo, _, _ = data_client
+
+    payload = dict(_MINIMAL_EXPORT)
+    payload["workouts"] = [
+        {
+            "id": "wid-a",
+            "date": "2025-04-01",
+            "name": "A",
+            "created_at": _NOW_ISO,
+            "updated_at": _NOW_ISO,
+            "sets": [],
+        }
+    ]
+    resp = _post_import(client, payload)
+
+    assert resp.status_code == 303
+    assert workout_repo.lookup_calls == [[(date(2025, 4, 1), "wid-a")]]
+
+
+def test_import_creates_new_workout_when_id_not_existing(data_client, job_repo):
     client, workout_repo, _, fake_table = data_client
     workout_repo.workouts_to_return = []
 
@@ -375,8 +653,8 @@ def test_import_creates_new_workout_when_id_not_existing(data_client):
     ]
     resp = _post_import(client, payload)
     assert resp.status_code == 303
-    assert "import_workouts=1" in resp.headers["location"]
-    assert len(fake_table._batch_writer.put_calls) == 1
+    assert job_repo.only().summary.workouts_created == 1
+    assert len(fake_table.put_calls) == 1
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -384,7 +662,7 @@ def test_import_creates_new_workout_when_id_not_existing(data_client):
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def test_import_sets_use_remapped_exercise_id(data_client):
+def test_import_sets_use_remapped_exercise_id(data_client, job_repo):
     client, _, exercise_repo, fake_table = data_client
     exercise_repo._exercises = [_make_exercise("real-id", "Squat", "barbell")]
 
@@ -422,13 +700,10 @@ def test_import_sets_use_remapped_exercise_id(data_client):
     ]
     resp = _post_import(client, payload)
     assert resp.status_code == 303
-    assert "import_sets=1" in resp.headers["location"]
+    assert job_repo.only().summary.sets_created == 1
 
     # The written set item should use the remapped "real-id"
-    set_items = [
-        item for item in fake_table._batch_writer.put_calls
-        if item.get("type") == "set"
-    ]
+    set_items = [item for item in fake_table.put_calls if item.get("type") == "set"]
     assert len(set_items) == 1
     assert set_items[0]["exercise_id"] == "real-id"
 
@@ -460,21 +735,112 @@ def test_import_set_with_unknown_exercise_id_is_skipped(data_client):
     resp = _post_import(client, payload)
     assert resp.status_code == 303
     # Workout created, set skipped — no set items written
-    set_items = [
-        item for item in fake_table._batch_writer.put_calls
-        if item.get("type") == "set"
-    ]
+    set_items = [item for item in fake_table.put_calls if item.get("type") == "set"]
     assert set_items == []
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Import — batch write failure redirects with error
+# Import — incremental parsing
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def test_import_redirects_when_batch_write_fails(data_client):
+def test_import_skips_invalid_record_and_keeps_the_rest(data_client, job_repo):
+    client, _, _, fake_table = data_client
+
+    payload = dict(_MINIMAL_EXPORT)
+    payload["workouts"] = [
+        {"id": "bad", "name": "Missing fields"},
+        {
+            "id": "wid-ok",
+            "date": "2025-04-01",
+            "name": "Good Workout",
+            "created_at": _NOW_ISO,
+            "updated_at": _NOW_ISO,
+            "sets": [],
+        },
+    ]
+    resp = _post_import(client, payload)
+
+    assert resp.status_code == 303
+    summary = job_repo.only().summary
+    assert summary.workouts_created == 1
+    assert len(summary.warnings) == 1
+    assert len(fake_table.put_calls) == 1
+
+
+def test_import_truncated_file_fails_job_after_earlier_records(data_client, job_repo):
+    client, _, _, fake_table = data_client
+    client.cookies.set("csrf_token", CSRF_TOKEN)
+
+    payload = dict(_MINIMAL_EXPORT)
+    payload["workouts"] = [
+        {
+            "id": "wid-ok",
+            "date": "2025-04-01",
+            "name": "Good Workout",
+            "created_at": _NOW_ISO,
+            "updated_at": _NOW_ISO,
+            "sets": [],
+        },
+    ]
+    content = json.dumps(payload).encode()[:-2]  # cut off the closing "]}"
+
+    resp = client.post(
+        "/profile/data/import",
+        data={"csrf_token": CSRF_TOKEN},
+        files={"file": ("export.json", content, "application/json")},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 303
+    job = job_repo.only()
+    assert job.status == "failed"
+    assert "Records before this point may have been imported" in job.error
+    assert job.records_processed == 1
+    assert len(fake_table.put_calls) == 1
+
+
+def test_import_accepts_gzipped_upload(data_client, job_repo):
     client, _, _, fake_table = data_client
-    fake_table._batch_writer.raise_on_exit = True
+    client.cookies.set("csrf_token", CSRF_TOKEN)
+
+    payload = dict(_MINIMAL_EXPORT)
+    payload["exercises"] = [
+        {
+            "id": "new-id",
+            "name": "Bench Press",
+            "muscles": ["chest"],
+            "equipment": "barbell",
+            "created_at": _NOW_ISO,
+            "updated_at": _NOW_ISO,
+        }
+    ]
+    resp = client.post(
+        "/profile/data/import",
+        data={"csrf_token": CSRF_TOKEN},
+        files={
+            "file": (
+                "export.json.gz",
+                gzip.compress(json.dumps(payload).encode()),
+                "application/gzip",
+            )
+        },
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 303
+    assert job_repo.only().summary.exercises_created == 1
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Import — write failures
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def test_import_reports_items_that_fail_to_write(data_client, job_repo, monkeypatch):
+    client, *_ = data_client
+    failing_table = FakeBulkTable(FakeBatchWriteClient(fail=True))
+    monkeypatch.setattr(db, "get_table", lambda: failing_table)
 
     payload = dict(_MINIMAL_EXPORT)
     payload["exercises"] = [
@@ -490,4 +856,76 @@ def test_import_redirects_when_batch_write_fails(data_client):
     ]
     resp = _post_import(client, payload)
     assert resp.status_code == 303
+    summary = job_repo.only().summary
+    assert summary.items_failed == 1
+    assert len(summary.warnings) == 1
+
+
+def test_import_redirects_when_job_cannot_be_created(data_client, job_repo):
+    client, *_ = data_client
+    job_repo.fail_create = True
+
+    resp = _post_import(client, dict(_MINIMAL_EXPORT))
+    assert resp.status_code == 303
     assert "import_error" in resp.headers["location"]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Import — status polling
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _make_job(job_repo, status: str):
+    job = job_repo.create_job(
+        USER_SUB, "job-1", filename="export.json", upload_path="/tmp/none"
+    )
+    job.status = status
+    return job_repo.save_job(job)
+
+
+def test_import_status_polls_while_job_is_running(data_client, job_repo):
+    client, *_ = data_client
+    job = _make_job(job_repo, "running")
+    job.records_processed = 400
+    job_repo.save_job(job)
+
+    resp = client.get("/profile/data/import/job-1")
+
+    assert resp.status_code == 200
+    assert 'hx-trigger="every 2s"' in resp.text
+    assert "400 records processed" in resp.text
+
+
+def test_import_status_stops_polling_once_complete(data_client, job_repo):
+    client, *_ = data_client
+    job = _make_job(job_repo, "complete")
+    job.summary.workouts_created = 3
+    job.summary.warnings = ["Workout 'x' is invalid"]
+    job_repo.save_job(job)
+
+    resp = client.get("/profile/data/import/job-1")
+
+    assert resp.status_code == 200
+    assert "hx-trigger" not in resp.text
+    assert "3 workouts" in resp.text
+    assert "Workout &#39;x&#39; is invalid" in resp.text
+
+
+def test_import_status_shows_error_when_failed(data_client, job_repo):
+    client, *_ = data_client
+    job = _make_job(job_repo, "failed")
+    job.error = "File is not valid UTF-8 text."
+    job_repo.save_job(job)
+
+    resp = client.get("/profile/data/import/job-1")
+
+    assert "hx-trigger" not in resp.text
+    assert "File is not valid UTF-8 text." in resp.text
+
+
+def test_import_status_returns_404_for_unknown_job(data_client):
+    client, *_ = data_client
+
+    resp = client.get("/profile/data/import/missing")
+
+    assert resp.status_code == 404
@@ -4,6 +4,7 @@ import pytest
 
 from app.models.exercise import Exercise
 from app.repositories.errors import ExerciseRepoError
+from app.routes import exercise as exercise_routes
 from app.utils import db
 
 USER_SUB = "test-user-sub"
@@ -43,7 +44,9 @@ def test_get_all_exercises_returns_200(authenticated_client, fake_exercise_route
     assert "Barbell Squat" in resp.text
 
 
-def test_get_all_exercises_empty_shows_message(authenticated_client, fake_exercise_route_repo):
+def test_get_all_exercises_empty_shows_message(
+    authenticated_client, fake_exercise_route_repo
+):
     resp = authenticated_client.get("/exercise/all")
 
     assert resp.status_code == 200
@@ -63,7 +66,9 @@ def test_get_all_exercises_repo_error_returns_500(
 # ---------------------- GET /exercise/new-form ---------------------------
 
 
-def test_get_new_exercise_form_returns_200(authenticated_client, fake_exercise_route_repo):
+def test_get_new_exercise_form_returns_200(
+    authenticated_client, fake_exercise_route_repo
+):
     resp = authenticated_client.get("/exercise/new-form")
 
     assert resp.status_code == 200
@@ -71,6 +76,20 @@ def test_get_new_exercise_form_returns_200(authenticated_client, fake_exercise_r
     assert "barbell" in resp.text.lower()
 
 
+def test_get_new_exercise_form_is_served_from_cache(
+    authenticated_client, fake_exercise_route_repo, monkeypatch
+):
+    first = authenticated_client.get("/exercise/new-form")
+    monkeypatch.setattr(
+        exercise_routes, "render_fragment", lambda *a, **k: pytest.fail("re-rendered")
+    )
+    second = authenticated_client.get("/exercise/new-form")
+
+    assert second.status_code == 200
+    assert second.text == first.text
+    assert second.headers["content-type"].startswith("text/html")
+
+
 # ---------------------- POST /exercise/create ---------------------------
 
 
@@ -133,7 +152,9 @@ def test_get_edit_form_returns_200_with_exercise_data(
     assert "<form" in resp.text
 
 
-def test_get_edit_form_not_found_returns_404(authenticated_client, fake_exercise_route_repo):
+def test_get_edit_form_not_found_returns_404(
+    authenticated_client, fake_exercise_route_repo
+):
     resp = authenticated_client.get("/exercise/missing/edit")
 
     assert resp.status_code == 404
@@ -155,7 +176,9 @@ def test_get_edit_form_repo_error_returns_500(
 def test_update_exercise_redirects(authenticated_client, fake_exercise_route_repo):
     fake_exercise_route_repo.seed(_make_exercise("e1"))
 
-    resp = authenticated_client.post("/exercise/e1", data={**VALID_FORM, "name": "Updated Squat"})
+    resp = authenticated_client.post(
+        "/exercise/e1", data={**VALID_FORM, "name": "Updated Squat"}
+    )
 
     assert resp.status_code == 204
     assert resp.headers.get("HX-Redirect") == "/exercise/all"
@@ -163,7 +186,9 @@ def test_update_exercise_redirects(authenticated_client, fake_exercise_route_rep
     assert fake_exercise_route_repo.updated[0].name == "Updated Squat"
 
 
-def test_update_exercise_not_found_returns_404(authenticated_client, fake_exercise_route_repo):
+def test_update_exercise_not_found_returns_404(
+    authenticated_client, fake_exercise_route_repo
+):
     resp = authenticated_client.post("/exercise/missing", data=VALID_FORM)
 
     assert resp.status_code == 404
@@ -193,7 +218,9 @@ def test_update_exercise_repo_error_on_save_returns_500(
 # ---------------------- DELETE /exercise/{id} ---------------------------
 
 
-def test_delete_exercise_returns_200_empty(authenticated_client, fake_exercise_route_repo):
+def test_delete_exercise_returns_200_empty(
+    authenticated_client, fake_exercise_route_repo
+):
     fake_exercise_route_repo.seed(_make_exercise("e1"))
 
     resp = authenticated_client.delete("/exercise/e1")
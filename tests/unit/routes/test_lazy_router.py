@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import lazy
+from app.routes.lazy import LazyRouter, include_lazy_router
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/other")
+    def other():
+        return {"ok": True}
+
+    include_lazy_router(app, "/auth", "app.routes.auth")
+    return app
+
+
+@pytest.fixture
+def lazy_app() -> FastAPI:
+    return _make_app()
+
+
+def _lazy_routes(app: FastAPI) -> list[LazyRouter]:
+    return [r for r in app.router.routes if isinstance(r, LazyRouter)]
+
+
+def test_lazy_router_is_not_loaded_by_other_requests(lazy_app):
+    client = TestClient(lazy_app)
+
+    assert client.get("/other").status_code == 200
+    assert client.get("/authentic").status_code == 404
+    assert len(_lazy_routes(lazy_app)) == 1
+
+
+def test_lazy_router_loads_and_dispatches_on_first_request(lazy_app):
+    client = TestClient(lazy_app)
+
+    resp = client.get("/auth/login", follow_redirects=False)
+
+    assert resp.status_code == 307
+    assert _lazy_routes(lazy_app) == []
+    assert lazy_app.router.url_path_for("logout") == "/auth/logout"
+
+
+def test_lazy_router_returns_404_for_unknown_paths_under_prefix(lazy_app):
+    client = TestClient(lazy_app)
+
+    assert client.get("/auth/nope").status_code == 404
+
+
+def test_lazy_router_loads_for_url_path_for(lazy_app):
+    assert lazy_app.url_path_for("auth_callback") == "/auth/callback"
+    assert _lazy_routes(lazy_app) == []
+
+
+def test_lazy_router_loads_once_under_concurrent_first_requests(lazy_app, monkeypatch):
+    import_module = lazy.importlib.import_module
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def slow_import(name):
+        time.sleep(0.01)  # widen the window between check and swap
+        return import_module(name)
+
+    monkeypatch.setattr(lazy.importlib, "import_module", slow_import)
+    placeholder = _lazy_routes(lazy_app)[0]
+
+    def first_request():
+        barrier.wait()
+        placeholder.load()
+
+    with ThreadPoolExecutor(threads) as pool:
+        for future in [pool.submit(first_request) for _ in range(threads)]:
+            future.result()
+
+    loaded_once = _make_app()
+    loaded_once.url_path_for("logout")
+    assert len(lazy_app.router.routes) == len(loaded_once.router.routes)
+    assert _lazy_routes(lazy_app) == []
+    assert lazy_app.url_path_for("logout") == "/auth/logout"
+
+
+def test_lazy_router_swaps_in_a_new_route_list(lazy_app):
+    before = lazy_app.router.routes
+    snapshot = list(before)
+
+    lazy_app.url_path_for("logout")
+
+    assert lazy_app.router.routes is not before
+    assert before == snapshot
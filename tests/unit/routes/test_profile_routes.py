@@ -6,6 +6,8 @@ from test_data import USER_EMAIL, USER_PK
 
 from app.models.profile import AccountUpdateForm, UserProfile
 from app.routes.profile import _errors_dict
+from app.settings import settings
+from app.utils import session_prefs
 
 
 @pytest.fixture(autouse=True)
@@ -93,6 +95,13 @@ def _profile(display_name="Lisa Test", tz="Europe/London") -> UserProfile:
     )
 
 
+def _set_cookie_value(resp, name: str) -> str:
+    for header in resp.headers.get_list("set-cookie"):
+        if header.startswith(f"{name}="):
+            return header.split(";", 1)[0].split("=", 1)[1]
+    raise AssertionError(f"no {name} cookie set")
+
+
 # ──────────────── /profile/account ────────────────
 
 
@@ -201,6 +210,43 @@ def test_post_preferences_success_saves_theme_and_units(
     assert resp.status_code == 200
 
 
+def test_post_preferences_success_reissues_session_prefs_cookie(
+    authenticated_client, fake_profile_repo, monkeypatch
+):
+    monkeypatch.setattr(settings, "SESSION_PREFS_SECRET", "test-secret")
+    original = _profile()
+    updated = original.model_copy(
+        update={
+            "preferences": original.preferences.model_copy(update={"units": "imperial"})
+        }
+    )
+    fake_profile_repo(profile=original, updated_profile=updated)
+
+    resp = authenticated_client.post(
+        "/profile/preferences",
+        data={"theme": "volt", "units": "imperial"},
+    )
+
+    cookie = _set_cookie_value(resp, session_prefs.COOKIE_NAME)
+    assert session_prefs.decode(cookie, updated.user_sub).weight_unit == "lb"
+
+
+def test_post_account_success_reissues_session_prefs_cookie(
+    authenticated_client, fake_profile_repo, monkeypatch
+):
+    monkeypatch.setattr(settings, "SESSION_PREFS_SECRET", "test-secret")
+    updated = _profile(tz="America/New_York")
+    fake_profile_repo(profile=_profile(), updated_profile=updated)
+
+    resp = authenticated_client.post(
+        "/profile/account",
+        data={"display_name": "New Name", "timezone": "America/New_York"},
+    )
+
+    cookie = _set_cookie_value(resp, session_prefs.COOKIE_NAME)
+    assert session_prefs.decode(cookie, updated.user_sub).timezone == "America/New_York"
+
+
 def test_post_preferences_validation_error_returns_400(
     authenticated_client, fake_profile_repo
 ):
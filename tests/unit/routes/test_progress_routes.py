@@ -6,6 +6,7 @@ Pattern mirrors the other route test files:
   - We override progress_routes.get_workout_repo, get_exercise_repo, get_profile_repo
   - FakeProfileRepo from tests.fakes is reused for progress route tests
 """
+
 from datetime import date, datetime, timezone
 from decimal import Decimal
 
@@ -29,6 +30,7 @@ class FakeProgressWorkoutRepo:
     def __init__(self):
         self.workouts_to_return: list[Workout] = []
         self.sets_to_return: list[WorkoutSet] = []
+        self.range_calls: list[tuple[date, date]] = []
 
     def get_all_for_user(self, user_sub: str) -> list[Workout]:
         return self.workouts_to_return
@@ -38,9 +40,15 @@ class FakeProgressWorkoutRepo:
     ) -> tuple[list[Workout], list[WorkoutSet]]:
         return self.workouts_to_return, self.sets_to_return
 
-    def get_sets_for_exercise(self, exercise_id: str) -> list[WorkoutSet]:
+    def get_set_summaries_for_exercise(self, exercise_id: str) -> list[WorkoutSet]:
         return [s for s in self.sets_to_return if s.exercise_id == exercise_id]
 
+    def get_workout_data_between(
+        self, user_sub: str, start_date: date, end_date: date
+    ) -> tuple[list[Workout], list[WorkoutSet]]:
+        self.range_calls.append((start_date, end_date))
+        return self.workouts_to_return, self.sets_to_return
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Factories
@@ -267,3 +275,56 @@ def test_exercise_chart_imperial_user_gets_lb_unit(progress_client):
 
     assert resp.status_code == 200
     assert '"lb"' in resp.text or "lb" in resp.text
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# GET /progress/workload
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def test_progress_page_lazy_loads_workload_chart(progress_client):
+    client, _, _, _ = progress_client
+    resp = client.get("/progress")
+    assert 'hx-get="/progress/workload"' in resp.text
+
+
+def test_workload_chart_uses_date_range_fetch(progress_client):
+    client, workout_repo, _, _ = progress_client
+
+    resp = client.get("/progress/workload")
+
+    assert resp.status_code == 200
+    assert len(workout_repo.range_calls) == 1
+    start, end = workout_repo.range_calls[0]
+    assert end == date.today()
+    assert (end - start).days == 365 + 28 - 2
+
+
+def test_workload_chart_contains_canvas_when_data_exists(progress_client):
+    client, workout_repo, _, _ = progress_client
+    d = date.today()
+    workout_repo.sets_to_return = [_make_set(d, "wid1", "squat-id", Decimal("100"))]
+
+    resp = client.get("/progress/workload")
+
+    assert 'id="workload-chart"' in resp.text
+
+
+def test_workload_chart_shows_empty_state_when_no_sets(progress_client):
+    client, _, _, _ = progress_client
+    resp = client.get("/progress/workload")
+    assert "No weighted sets logged" in resp.text
+
+
+def test_workload_chart_returns_500_on_repo_error(progress_client, monkeypatch):
+    from app.repositories.errors import WorkoutRepoError
+
+    client, workout_repo, _, _ = progress_client
+
+    def boom(*args, **kwargs):
+        raise WorkoutRepoError("boom")
+
+    monkeypatch.setattr(workout_repo, "get_workout_data_between", boom)
+
+    resp = client.get("/progress/workload")
+    assert resp.status_code == 500
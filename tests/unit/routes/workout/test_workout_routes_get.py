@@ -1,7 +1,7 @@
 from decimal import Decimal
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 
 from app.routes import workout as workout_routes
 from tests.fakes import FakeProfileRepo, make_test_profile
@@ -15,7 +15,9 @@ def test_get_weight_unit_for_user_raises_http_500_when_profile_repo_raises():
             raise Exception("kaboom")
 
     with pytest.raises(HTTPException) as exc_info:
-        workout_routes.get_weight_unit_for_user("test-user-sub", BoomProfileRepo())
+        workout_routes.get_weight_unit_for_user(
+            Request({"type": "http", "headers": []}), "test-user-sub", BoomProfileRepo()
+        )
 
     assert exc_info.value.status_code == 500
 
@@ -57,6 +59,58 @@ def test_get_new_form_renders_form(authenticated_client):
     assert 'name="name"' in response.text
 
 
+# -------------- GET /workout/{date}/{id}/add-exercise-form --------------
+
+
+def _add_exercise_form_url() -> str:
+    return f"/workout/{TEST_DATE_2.isoformat()}/{TEST_WORKOUT_ID_2}/add-exercise-form"
+
+
+def test_get_add_exercise_form_lists_exercises(
+    authenticated_client, fake_exercise_repo
+):
+    fake_exercise_repo.seed(fake_exercise_repo._make_exercise("EX-1"))
+
+    response = authenticated_client.get(_add_exercise_form_url())
+
+    assert response.status_code == 200
+    assert '<option value="EX-1">Exercise EX-1</option>' in response.text
+    assert "Weight (kg)" in response.text
+
+
+def test_get_add_exercise_form_repeat_open_skips_query(
+    authenticated_client, fake_exercise_repo, monkeypatch
+):
+    calls = []
+    real_get_all = fake_exercise_repo.get_all_for_user
+
+    def counting_get_all(user_sub):
+        calls.append(user_sub)
+        return real_get_all(user_sub)
+
+    monkeypatch.setattr(fake_exercise_repo, "get_all_for_user", counting_get_all)
+
+    first = authenticated_client.get(_add_exercise_form_url())
+    second = authenticated_client.get(_add_exercise_form_url())
+
+    assert first.text == second.text
+    assert calls == ["test-user-sub"]
+
+
+def test_get_add_exercise_form_handles_repo_error(
+    authenticated_client, fake_exercise_repo, repo_raises
+):
+    repo_raises(
+        fake_exercise_repo,
+        "get_all_for_user",
+        workout_routes.ExerciseRepoError("boom"),
+    )
+
+    response = authenticated_client.get(_add_exercise_form_url())
+
+    assert response.status_code == 500
+
+
 # -------------- GET /workout/{date}/{id}/set/form --------------
 
 
@@ -295,15 +349,8 @@ def test_get_edit_set_form_converts_kg_to_lb_for_imperial_user(
     set_factory,
     app_instance,
 ):
-    class ImperialProfileRepo:
-        def get_for_user(self, user_sub: str):
-            class Profile:
-                weight_unit = "lb"
-
-            return Profile()
-
     app_instance.dependency_overrides[workout_routes.get_profile_repo] = (
-        lambda: ImperialProfileRepo()
+        lambda: FakeProfileRepo(profile=make_test_profile(units="imperial"))
     )
 
     fake_workout_repo.set_to_return = set_factory(
@@ -2,6 +2,7 @@ from datetime import date
 from decimal import Decimal
 
 from app.routes import workout as workout_routes
+from tests.fakes import FakeProfileRepo, make_test_profile
 from tests.test_data import TEST_DATE_2, TEST_WORKOUT_ID_2
 from tests.unit.routes.workout._helpers import (
     WorkoutPath,
@@ -100,15 +101,8 @@ def test_add_set_converts_lb_to_kg_for_imperial_user(
     app_instance,
 ):
     # Fake imperial profile repo
-    class ImperialProfileRepo:
-        def get_for_user(self, user_sub: str):
-            class Profile:
-                weight_unit = "lb"
-
-            return Profile()
-
     app_instance.dependency_overrides[workout_routes.get_profile_repo] = (
-        lambda: ImperialProfileRepo()
+        lambda: FakeProfileRepo(profile=make_test_profile(units="imperial"))
     )
 
     # Capture what gets passed into the repo
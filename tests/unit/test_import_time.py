@@ -0,0 +1,62 @@
+"""
+Cold-start budget: import the Lambda handler in a fresh interpreter with
+`python -X importtime` and check what it pulled in and how long it took.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Generous, to absorb slow CI machines; a cold import here is well under 1s.
+IMPORT_BUDGET_US = 3_000_000
+
+# Loaded on first use instead of at cold start.
+DEFERRED_MODULES = {
+    "app.routes.auth",
+    "app.routes.data",
+    "app.utils.export",
+    "app.utils.import_jobs",
+    "requests",
+    "sqlite3",
+}
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Map module name -> cumulative import time in microseconds."""
+    cumulative: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:") :].split("|")
+        cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+@pytest.fixture(scope="module")
+def handler_imports() -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.handler"],
+        cwd=REPO_ROOT,
+        # Measure the imports alone, not the network calls warm-up makes.
+        env={**os.environ, "WARMUP_ENABLED": "false"},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return _parse_importtime(result.stderr)
+
+
+def test_handler_import_skips_deferred_modules(handler_imports):
+    assert "app.handler" in handler_imports
+    assert DEFERRED_MODULES.isdisjoint(handler_imports)
+
+
+def test_handler_import_fits_budget(handler_imports):
+    slowest = sorted(handler_imports.items(), key=lambda kv: kv[1], reverse=True)[:10]
+    assert handler_imports["app.handler"] < IMPORT_BUDGET_US, slowest
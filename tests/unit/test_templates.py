@@ -0,0 +1,82 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+from jinja2 import ChoiceLoader, FileSystemBytecodeCache, ModuleLoader
+
+from app.settings import settings
+from app.templates import templates as templates_module
+
+
+@pytest.fixture
+def compiled_zip(tmp_path) -> Path:
+    target = tmp_path / "compiled.zip"
+    templates_module.compile_templates(str(target))
+    return target
+
+
+def _source_templates() -> list[str]:
+    return templates_module._source_environment().list_templates(
+        extensions=templates_module.TEMPLATE_EXTENSIONS
+    )
+
+
+def test_precompiled_templates_match_sources(compiled_zip):
+    env = templates_module._source_environment()
+    names = _source_templates()
+
+    with zipfile.ZipFile(compiled_zip) as zf:
+        compiled = {info.filename: zf.read(info).decode() for info in zf.infolist()}
+
+    assert len(compiled) == len(names)
+    for name in names:
+        source, filename, _ = env.loader.get_source(env, name)
+        module = ModuleLoader.get_module_filename(name)
+        assert compiled[module] == env.compile(
+            source, name, filename, raw=True, defer_init=True
+        ), name
+
+
+def test_precompiled_templates_render_like_sources(compiled_zip, monkeypatch):
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", "")
+    precompiled = templates_module.create_environment(str(compiled_zip))
+    source = templates_module._source_environment()
+    context = {"exercise": None, "user_exercises": [], "csrf_token": "t"}
+
+    rendered_precompiled = precompiled.get_template("workouts/_set_form.html")
+    rendered_source = source.get_template("workouts/_set_form.html")
+
+    assert rendered_precompiled.render(context) == rendered_source.render(context)
+
+
+def test_create_environment_prefers_precompiled_zip(compiled_zip, monkeypatch):
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", "")
+    env = templates_module.create_environment(str(compiled_zip))
+
+    assert isinstance(env.loader, ChoiceLoader)
+    assert isinstance(env.loader.loaders[0], ModuleLoader)
+    # Loaded from a module, so never checked against (or reloaded from) source.
+    assert env.get_template("base.html").is_up_to_date
+
+
+def test_create_environment_without_zip_uses_bytecode_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "jinja-cache"
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(cache_dir))
+
+    env = templates_module.create_environment(str(tmp_path / "missing.zip"))
+    env.get_template("error.html")
+
+    assert not isinstance(env.loader, ChoiceLoader)
+    assert isinstance(env.bytecode_cache, FileSystemBytecodeCache)
+    assert list(cache_dir.iterdir())
+
+
+def test_create_environment_runs_without_bytecode_cache(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(blocker / "cache"))
+
+    env = templates_module.create_environment(str(tmp_path / "missing.zip"))
+
+    assert env.bytecode_cache is None
+    assert env.get_template("error.html")
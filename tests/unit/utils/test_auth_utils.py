@@ -1,4 +1,5 @@
 import pytest
+import requests
 from fastapi import HTTPException
 from fastapi.responses import Response
 
@@ -151,7 +152,11 @@ async def test_require_auth_success(auth_pipeline, make_request_with_cookies):
     ],
 )
 async def test_require_auth_failure_cases(
-    exc, expected_detail, monkeypatch, make_request_with_cookies, stub_basic_auth_helpers
+    exc,
+    expected_detail,
+    monkeypatch,
+    make_request_with_cookies,
+    stub_basic_auth_helpers,
 ):
     req = make_request_with_cookies({"id_token": "fake-token"})
 
@@ -184,7 +189,7 @@ def test_attempt_token_refresh_success(monkeypatch):
                 "expires_in": 3600,
             }
 
-    monkeypatch.setattr(auth_utils.requests, "post", lambda *a, **kw: FakeResp())
+    monkeypatch.setattr(requests, "post", lambda *a, **kw: FakeResp())
 
     result = auth_utils.attempt_token_refresh("valid-refresh-token")
 
@@ -201,7 +206,7 @@ def test_attempt_token_refresh_failure(monkeypatch):
         def json(self):
             return {}
 
-    monkeypatch.setattr(auth_utils.requests, "post", lambda *a, **kw: FakeResp())
+    monkeypatch.setattr(requests, "post", lambda *a, **kw: FakeResp())
 
     with pytest.raises(HTTPException) as err:
         auth_utils.attempt_token_refresh("expired-refresh-token")
@@ -213,9 +218,13 @@ def test_attempt_token_refresh_failure(monkeypatch):
 # ------------ require_auth refresh paths ------------
 
 
-def test_require_auth_expired_with_valid_refresh(monkeypatch, make_request_with_cookies, stub_basic_auth_helpers):
+def test_require_auth_expired_with_valid_refresh(
+    monkeypatch, make_request_with_cookies, stub_basic_auth_helpers
+):
     """Expired ID token + valid refresh token -> success, new cookies set."""
-    req = make_request_with_cookies({"id_token": "expired-token", "refresh_token": "valid-rt"})
+    req = make_request_with_cookies(
+        {"id_token": "expired-token", "refresh_token": "valid-rt"}
+    )
     resp = Response()
 
     call_count = {"n": 0}
@@ -226,7 +235,9 @@ def test_require_auth_expired_with_valid_refresh(monkeypatch, make_request_with_
             raise auth_utils.jwt.ExpiredSignatureError("expired")
         return {"sub": USER_SUB, "exp": 9999999999, "token_use": "id"}
 
-    monkeypatch.setattr(auth_utils, "decode_and_validate_id_token", fake_decode_and_validate)
+    monkeypatch.setattr(
+        auth_utils, "decode_and_validate_id_token", fake_decode_and_validate
+    )
     monkeypatch.setattr(
         auth_utils,
         "attempt_token_refresh",
@@ -242,14 +253,18 @@ def test_require_auth_expired_with_valid_refresh(monkeypatch, make_request_with_
     assert any(b"access_token=new-at" in h for h in set_cookie_headers)
 
 
-def test_require_auth_expired_no_refresh_token(monkeypatch, make_request_with_cookies, stub_basic_auth_helpers):
+def test_require_auth_expired_no_refresh_token(
+    monkeypatch, make_request_with_cookies, stub_basic_auth_helpers
+):
     """Expired ID token + no refresh token -> 401."""
     req = make_request_with_cookies({"id_token": "expired-token"})
 
     def fake_decode_and_validate(*args, **kwargs):
         raise auth_utils.jwt.ExpiredSignatureError("expired")
 
-    monkeypatch.setattr(auth_utils, "decode_and_validate_id_token", fake_decode_and_validate)
+    monkeypatch.setattr(
+        auth_utils, "decode_and_validate_id_token", fake_decode_and_validate
+    )
 
     with pytest.raises(HTTPException) as err:
         auth_utils.require_auth(req, Response())
@@ -258,17 +273,25 @@ def test_require_auth_expired_no_refresh_token(monkeypatch, make_request_with_co
     assert "Session expired" in err.value.detail
 
 
-def test_require_auth_expired_bad_refresh_token(monkeypatch, make_request_with_cookies, stub_basic_auth_helpers):
+def test_require_auth_expired_bad_refresh_token(
+    monkeypatch, make_request_with_cookies, stub_basic_auth_helpers
+):
     """Expired ID token + bad refresh token -> 401 from attempt_token_refresh."""
-    req = make_request_with_cookies({"id_token": "expired-token", "refresh_token": "bad-rt"})
+    req = make_request_with_cookies(
+        {"id_token": "expired-token", "refresh_token": "bad-rt"}
+    )
 
     def fake_decode_and_validate(*args, **kwargs):
         raise auth_utils.jwt.ExpiredSignatureError("expired")
 
     def fake_attempt_token_refresh(rt):
-        raise HTTPException(status_code=401, detail="Session expired. Please log in again.")
+        raise HTTPException(
+            status_code=401, detail="Session expired. Please log in again."
+        )
 
-    monkeypatch.setattr(auth_utils, "decode_and_validate_id_token", fake_decode_and_validate)
+    monkeypatch.setattr(
+        auth_utils, "decode_and_validate_id_token", fake_decode_and_validate
+    )
     monkeypatch.setattr(auth_utils, "attempt_token_refresh", fake_attempt_token_refresh)
 
     with pytest.raises(HTTPException) as err:
@@ -0,0 +1,62 @@
+import contextvars
+import threading
+
+import pytest
+
+from app.utils.concurrency import fan_out
+
+
+def test_fan_out_returns_futures_in_call_order():
+    futures = fan_out(lambda: "a", lambda: "b", lambda: "c")
+
+    assert [f.result() for f in futures] == ["a", "b", "c"]
+
+
+def test_fan_out_runs_calls_concurrently():
+    # Both calls must be in flight at the same time to pass the barrier;
+    # run sequentially, the first would time out waiting for the second.
+    barrier = threading.Barrier(2, timeout=2)
+
+    def call():
+        barrier.wait()
+        return True
+
+    futures = fan_out(call, call)
+
+    assert all(f.result() for f in futures)
+
+
+def test_fan_out_keeps_exceptions_on_their_own_future():
+    def boom():
+        raise ValueError("kaboom")
+
+    ok, failed = fan_out(lambda: 1, boom)
+
+    assert ok.result() == 1
+    with pytest.raises(ValueError, match="kaboom"):
+        failed.result()
+
+
+def test_fan_out_waits_for_every_call_before_returning():
+    done = threading.Event()
+
+    def slow():
+        done.wait(timeout=0.05)
+        return "slow"
+
+    def boom():
+        raise RuntimeError("fast failure")
+
+    slow_f, boom_f = fan_out(slow, boom)
+
+    assert slow_f.done()
+    assert boom_f.done()
+
+
+def test_fan_out_propagates_context_vars():
+    request_id = contextvars.ContextVar("request_id", default=None)
+    request_id.set("req-123")
+
+    (future,) = fan_out(request_id.get)
+
+    assert future.result() == "req-123"
@@ -55,6 +55,25 @@ def test_today_in_tz_uses_timezone_and_falls_back_to_utc(monkeypatch):
     assert dates.today_in_tz("Nope/DefinitelyNot") == DateType(2025, 1, 1)
 
 
+def test_timezone_names_are_sorted_and_built_once(monkeypatch):
+    dates.timezone_names.cache_clear()
+    dates._timezone_name_set.cache_clear()
+    calls = []
+    monkeypatch.setattr(
+        dates,
+        "available_timezones",
+        lambda: calls.append(1) or {"UTC", "Europe/London"},
+    )
+
+    assert dates.timezone_names() == ("Europe/London", "UTC")
+    assert dates.is_valid_timezone("UTC")
+    assert not dates.is_valid_timezone("Mars/Olympus")
+    assert len(calls) == 1
+
+    dates.timezone_names.cache_clear()
+    dates._timezone_name_set.cache_clear()
+
+
 # ─────────────────────────────────────────
 # Formatting
 # ─────────────────────────────────────────
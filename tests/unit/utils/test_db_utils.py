@@ -19,6 +19,7 @@ def test_get_dynamo_resource(monkeypatch):
         return "FAKE-RES"
 
     monkeypatch.setattr(boto3, "resource", fake_resource)
+    monkeypatch.setattr(db, "_dynamo_resource", None)
 
     res = db.get_dynamo_resource()
     assert res == "FAKE-RES"
@@ -26,6 +27,23 @@ def test_get_dynamo_resource(monkeypatch):
     assert store["region_name"] == settings.REGION
 
 
+def test_get_dynamo_resource_is_created_once(monkeypatch):
+    created = []
+
+    def fake_resource(service, **kwargs):
+        created.append(service)
+        return object()
+
+    monkeypatch.setattr(boto3, "resource", fake_resource)
+    monkeypatch.setattr(db, "_dynamo_resource", None)
+
+    first = db.get_dynamo_resource()
+    second = db.get_dynamo_resource()
+
+    assert first is second
+    assert created == ["dynamodb"]
+
+
 class FakeResource:
     def Table(self, name):
         self.last_name = name
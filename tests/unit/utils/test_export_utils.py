@@ -1,10 +1,28 @@
+import gzip
+import io
+import itertools
 import json
-from datetime import datetime, timezone
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
 import pytest
 
-from app.utils.export import parse_import_file
+from app.models.exercise import Exercise
+from app.models.export import ExportSummary
+from app.models.tombstone import Tombstone
+from app.models.workout import Workout, WorkoutSet
+from app.utils import db
+from app.utils import export as export_utils
+from app.utils.export import (
+    ExportDelta,
+    check_delta_since,
+    export_chunks,
+    iter_import_records,
+    parse_import_file,
+    stream_export,
+)
+from tests.fakes import make_test_profile
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -77,10 +95,19 @@ def test_parse_import_file_returns_exercises_and_workouts():
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def test_parse_import_file_rejects_oversized_content():
-    big = b"x" * (5 * 1024 * 1024 + 1)
-    with pytest.raises(ValueError, match="5 MB"):
-        parse_import_file(big)
+def test_parse_import_file_rejects_oversized_content(monkeypatch):
+    monkeypatch.setattr(export_utils, "_MAX_IMPORT_BYTES", 100)
+    padded = _encode(_MINIMAL_PAYLOAD) + b" " * 100
+    with pytest.raises(ValueError, match="50 MB size limit"):
+        parse_import_file(padded)
+
+
+def test_parse_import_file_applies_size_limit_after_decompression(monkeypatch):
+    monkeypatch.setattr(export_utils, "_MAX_IMPORT_BYTES", 100)
+    compressed = gzip.compress(_encode(_MINIMAL_PAYLOAD) + b" " * 10_000)
+    assert len(compressed) < 1000
+    with pytest.raises(ValueError, match="size limit"):
+        parse_import_file(compressed)
 
 
 def test_parse_import_file_rejects_invalid_json():
@@ -109,3 +136,550 @@ def test_parse_import_file_rejects_structurally_invalid_payload():
     # schema_version is correct but required fields are missing
     with pytest.raises(ValueError, match="invalid structure"):
         parse_import_file(json.dumps({"schema_version": 1}).encode())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# stream_export
+# ──────────────────────────────────────────────────────────────────────────────
+
+_TS = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+_TS_ISO = "2025-01-02T03:04:05Z"
+
+
+class _StreamWorkoutRepo:
+    def __init__(self, pairs):
+        self._pairs = pairs
+
+    def iter_workout_data_for_user(self, user_sub):
+        yield from self._pairs
+
+
+class _StreamExerciseRepo:
+    def __init__(self, exercises):
+        self._exercises = exercises
+
+    def iter_all_for_user(self, user_sub):
+        yield from self._exercises
+
+
+def _stream_fixtures():
+    exercise = Exercise(
+        PK=db.build_user_pk("u1"),
+        SK=db.build_exercise_sk("squat-id"),
+        type="exercise",
+        name="Squat ü",
+        muscles=["quads"],
+        equipment="barbell",
+        created_at=_TS,
+        updated_at=_TS,
+    )
+    workout = Workout(
+        PK=db.build_user_pk("u1"),
+        SK=db.build_workout_sk(date(2025, 3, 1), "wid1"),
+        type="workout",
+        date=date(2025, 3, 1),
+        name="Leg Day",
+        notes='line one\nline "two"',
+        created_at=_TS,
+        updated_at=_TS,
+    )
+    workout_set = WorkoutSet(
+        PK=db.build_user_pk("u1"),
+        SK=db.build_set_sk(date(2025, 3, 1), "wid1", 1),
+        type="set",
+        exercise_id="squat-id",
+        set_number=1,
+        reps=5,
+        weight_kg=Decimal("82.5"),
+        created_at=_TS,
+        updated_at=_TS,
+    )
+    empty_workout = workout.model_copy(
+        update={
+            "SK": db.build_workout_sk(date(2025, 2, 1), "wid0"),
+            "date": date(2025, 2, 1),
+        }
+    )
+    return exercise, [(workout, [workout_set]), (empty_workout, [])]
+
+
+def test_stream_export_matches_indented_schema_v1_document(monkeypatch):
+    monkeypatch.setattr(export_utils, "now", lambda: _TS)
+    exercise, pairs = _stream_fixtures()
+    profile = make_test_profile()
+
+    streamed = "".join(
+        stream_export(
+            "u1", profile, _StreamWorkoutRepo(pairs), _StreamExerciseRepo([exercise])
+        )
+    )
+
+    expected = {
+        "schema_version": 1,
+        "exported_at": _TS_ISO,
+        "user": {
+            "display_name": profile.display_name,
+            "email": profile.email,
+            "timezone": profile.timezone,
+            "preferences": profile.preferences.model_dump(),
+        },
+        "exercises": [
+            {
+                "id": "squat-id",
+                "name": "Squat ü",
+                "muscles": ["quads"],
+                "equipment": "barbell",
+                "category": None,
+                "created_at": _TS_ISO,
+                "updated_at": _TS_ISO,
+            }
+        ],
+        "workouts": [
+            {
+                "id": "wid1",
+                "date": "2025-03-01",
+                "name": "Leg Day",
+                "tags": None,
+                "notes": 'line one\nline "two"',
+                "created_at": _TS_ISO,
+                "updated_at": _TS_ISO,
+                "sets": [
+                    {
+                        "set_number": 1,
+                        "exercise_id": "squat-id",
+                        "reps": 5,
+                        "weight_kg": 82.5,
+                        "rpe": None,
+                        "created_at": _TS_ISO,
+                        "updated_at": _TS_ISO,
+                    }
+                ],
+            },
+            {
+                "id": "wid0",
+                "date": "2025-02-01",
+                "name": "Leg Day",
+                "tags": None,
+                "notes": 'line one\nline "two"',
+                "created_at": _TS_ISO,
+                "updated_at": _TS_ISO,
+                "sets": [],
+            },
+        ],
+    }
+    assert streamed == json.dumps(expected, indent=2)
+
+
+def test_stream_export_renders_empty_lists(monkeypatch):
+    monkeypatch.setattr(export_utils, "now", lambda: _TS)
+
+    streamed = "".join(
+        stream_export(
+            "u1", make_test_profile(), _StreamWorkoutRepo([]), _StreamExerciseRepo([])
+        )
+    )
+
+    assert '"exercises": [],' in streamed
+    assert streamed.endswith('"workouts": []\n}')
+    assert parse_import_file(streamed.encode()).workouts == []
+
+
+def test_stream_export_updates_summary_counts():
+    exercise, pairs = _stream_fixtures()
+    summary = ExportSummary()
+
+    chunks = stream_export(
+        "u1",
+        make_test_profile(),
+        _StreamWorkoutRepo(pairs),
+        _StreamExerciseRepo([exercise]),
+        summary,
+    )
+    "".join(chunks)
+
+    assert (summary.exercises, summary.workouts, summary.sets) == (1, 2, 1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# export_chunks — compressed / NDJSON formats
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _export_bytes(export_format: str) -> bytes:
+    exercise, pairs = _stream_fixtures()
+    return b"".join(
+        export_chunks(
+            export_format,
+            "u1",
+            make_test_profile(),
+            _StreamWorkoutRepo(pairs),
+            _StreamExerciseRepo([exercise]),
+        )
+    )
+
+
+def test_export_chunks_json_gz_decompresses_to_json_export(monkeypatch):
+    monkeypatch.setattr(export_utils, "now", lambda: _TS)
+
+    assert gzip.decompress(_export_bytes("json.gz")) == _export_bytes("json")
+
+
+def test_export_chunks_ndjson_writes_one_record_per_line(monkeypatch):
+    monkeypatch.setattr(export_utils, "now", lambda: _TS)
+
+    lines = _export_bytes("ndjson").decode().splitlines()
+
+    assert [json.loads(line)["type"] for line in lines] == [
+        "header",
+        "exercise",
+        "workout",
+        "workout",
+    ]
+
+
+@pytest.mark.parametrize("export_format", ["json", "json.gz", "ndjson", "ndjson.gz"])
+def test_parse_import_file_reads_every_export_format(export_format):
+    result = parse_import_file(_export_bytes(export_format))
+
+    assert [e.id for e in result.exercises] == ["squat-id"]
+    assert [w.id for w in result.workouts] == ["wid1", "wid0"]
+    assert result.workouts[0].sets[0].weight_kg == 82.5
+
+
+def test_parse_import_file_rejects_corrupt_gzip():
+    with pytest.raises(ValueError, match="gzip"):
+        parse_import_file(b"\x1f\x8b" + b"not really gzip")
+
+
+def test_parse_import_file_rejects_invalid_ndjson_line():
+    header = json.dumps({"type": "header", "schema_version": 1})
+    with pytest.raises(ValueError, match="Line 2 is not valid JSON"):
+        parse_import_file(f"{header}\n{{broken\n".encode())
+
+
+def test_parse_import_file_rejects_unknown_ndjson_record_type():
+    header = json.dumps({"type": "header", "schema_version": 1})
+    with pytest.raises(ValueError, match="unknown record type"):
+        parse_import_file(f'{header}\n{{"type": "template"}}\n'.encode())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# iter_import_records — incremental parsing
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def test_iter_import_records_parses_across_tiny_read_chunks(monkeypatch):
+    # Small reads force values to straddle chunk boundaries.
+    monkeypatch.setattr(export_utils, "_READ_CHUNK_CHARS", 7)
+    content = _export_bytes("json")
+
+    records = list(iter_import_records(io.BytesIO(content)))
+
+    document = json.loads(content)
+    assert records[0][0] == "header"
+    assert records[0][1]["schema_version"] == 1
+    assert records[1:] == [("exercise", e) for e in document["exercises"]] + [
+        ("workout", w) for w in document["workouts"]
+    ]
+
+
+def test_iter_import_records_is_lazy():
+    content = _export_bytes("json") + b"garbage"
+
+    records = iter_import_records(io.BytesIO(content))
+    kinds = [kind for kind, _ in itertools.islice(records, 3)]
+
+    assert kinds == ["header", "exercise", "workout"]
+    with pytest.raises(ValueError, match="Extra data"):
+        list(records)
+
+
+def test_iter_import_records_rejects_workouts_before_exercises():
+    payload = {"schema_version": 1, "workouts": [{}], "exercises": [{}]}
+
+    with pytest.raises(ValueError, match="Exercises must come before workouts"):
+        list(iter_import_records(io.BytesIO(_encode(payload))))
+
+
+def test_iter_import_records_rejects_repeated_ndjson_header():
+    header = json.dumps({"type": "header", "schema_version": 1})
+    lines = [header, json.dumps({"type": "exercise", "id": "x"}), header]
+
+    with pytest.raises(ValueError, match="header must come before any records"):
+        list(iter_import_records(io.BytesIO("\n".join(lines).encode())))
+
+
+def test_iter_import_records_rejects_non_utf8_content():
+    with pytest.raises(ValueError, match="UTF-8"):
+        list(iter_import_records(io.BytesIO(b'{"schema_version": "\xff"}')))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Delta (schema v2) exports
+# ──────────────────────────────────────────────────────────────────────────────
+
+_SINCE = datetime(2025, 1, 2, tzinfo=timezone.utc)
+_BEFORE_SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _tombstone(deleted_sk: str, deleted_at: datetime = _TS):
+    return Tombstone.for_item(db.build_user_pk("u1"), deleted_sk, deleted_at)
+
+
+def _delta_fixtures():
+    """Exercise unchanged; wid1 has a changed set; wid0 untouched."""
+    exercise, pairs = _stream_fixtures()
+    exercise = exercise.model_copy(update={"updated_at": _BEFORE_SINCE})
+    (workout, sets), (empty_workout, _) = pairs
+    workout = workout.model_copy(update={"updated_at": _BEFORE_SINCE})
+    empty_workout = empty_workout.model_copy(update={"updated_at": _BEFORE_SINCE})
+    return exercise, [(workout, sets), (empty_workout, [])]
+
+
+def _delta_export(export_format: str, tombstones=()) -> bytes:
+    exercise, pairs = _delta_fixtures()
+    return b"".join(
+        export_chunks(
+            export_format,
+            "u1",
+            make_test_profile(),
+            _StreamWorkoutRepo(pairs),
+            _StreamExerciseRepo([exercise]),
+            delta=ExportDelta(_SINCE, tombstones),
+        )
+    )
+
+
+def test_delta_export_contains_only_changes_and_deletions():
+    tombstones = [
+        _tombstone(db.build_exercise_sk("old-ex")),
+        _tombstone(db.build_set_sk(date(2025, 2, 1), "wid0", 2)),
+    ]
+
+    body = json.loads(_delta_export("json", tombstones))
+
+    assert body["schema_version"] == 2
+    assert body["since"] == "2025-01-02T00:00:00Z"
+    assert body["exercises"] == []
+    # The changed set re-exports its workout with all current sets.
+    assert [w["id"] for w in body["workouts"]] == ["wid1"]
+    assert [s["set_number"] for s in body["workouts"][0]["sets"]] == [1]
+    assert body["deleted"] == [
+        {"kind": "exercise", "id": "old-ex", "deleted_at": _TS_ISO},
+        {
+            "kind": "set",
+            "workout_id": "wid0",
+            "date": "2025-02-01",
+            "set_number": 2,
+            "deleted_at": _TS_ISO,
+        },
+    ]
+
+
+def test_delta_export_drops_tombstones_for_recreated_items():
+    # Set 1 of wid1 was deleted, then a new set 1 was added.
+    tombstones = [_tombstone(db.build_set_sk(date(2025, 3, 1), "wid1", 1))]
+
+    body = json.loads(_delta_export("json", tombstones))
+
+    assert body["deleted"] == []
+
+
+def test_delta_export_summary_counts_deletions():
+    exercise, pairs = _delta_fixtures()
+    summary = ExportSummary()
+    tombstones = [_tombstone(db.build_workout_sk(date(2025, 1, 5), "gone"))]
+
+    "".join(
+        stream_export(
+            "u1",
+            make_test_profile(),
+            _StreamWorkoutRepo(pairs),
+            _StreamExerciseRepo([exercise]),
+            summary,
+            ExportDelta(_SINCE, tombstones),
+        )
+    )
+
+    assert (summary.exercises, summary.workouts, summary.deleted) == (0, 1, 1)
+
+
+def test_delta_ndjson_puts_deletions_last():
+    tombstones = [_tombstone(db.build_workout_sk(date(2025, 1, 5), "gone"))]
+
+    lines = [
+        json.loads(line) for line in _delta_export("ndjson", tombstones).splitlines()
+    ]
+
+    assert [line["type"] for line in lines] == ["header", "workout", "deleted"]
+    assert lines[0]["schema_version"] == 2
+    assert lines[2]["kind"] == "workout"
+
+
+@pytest.mark.parametrize(
+    "export_format", ["json", "json.gz", "ndjson", "ndjson.gz", "sqlite"]
+)
+def test_parse_import_file_reads_delta_exports(export_format):
+    tombstones = [_tombstone(db.build_workout_sk(date(2025, 1, 5), "gone"))]
+
+    result = parse_import_file(_delta_export(export_format, tombstones))
+
+    assert result.schema_version == 2
+    assert result.since == _SINCE
+    assert [w.id for w in result.workouts] == ["wid1"]
+    assert [(d.kind, d.id, d.date) for d in result.deleted] == [
+        ("workout", "gone", date(2025, 1, 5))
+    ]
+
+
+def test_parse_import_file_rejects_deletions_in_schema_v1():
+    payload = dict(_MINIMAL_PAYLOAD, deleted=[{"kind": "exercise", "id": "x"}])
+    with pytest.raises(ValueError, match="Only delta exports"):
+        parse_import_file(_encode(payload))
+
+
+def test_parse_import_file_rejects_delta_without_since():
+    payload = dict(_MINIMAL_PAYLOAD, schema_version=2)
+    with pytest.raises(ValueError, match="missing its 'since'"):
+        parse_import_file(_encode(payload))
+
+
+def test_iter_import_records_rejects_workouts_after_deletions():
+    lines = [
+        {"type": "header", **_MINIMAL_PAYLOAD, "schema_version": 2, "since": _NOW},
+        {"type": "deleted", "kind": "exercise", "id": "x", "deleted_at": _NOW},
+        {"type": "workout", "id": "w"},
+    ]
+    content = "\n".join(json.dumps(line) for line in lines).encode()
+
+    with pytest.raises(ValueError, match="Deletions must come last"):
+        list(iter_import_records(io.BytesIO(content)))
+
+
+def test_check_delta_since_normalises_naive_timestamps():
+    since = datetime.now() - timedelta(days=1)
+
+    assert check_delta_since(since).tzinfo == timezone.utc
+
+
+def test_check_delta_since_rejects_timestamps_beyond_retention():
+    with pytest.raises(ValueError, match="full export"):
+        check_delta_since(datetime.now(timezone.utc) - timedelta(days=365))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SQLite exports
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _open_sqlite(content: bytes, tmp_path) -> sqlite3.Connection:
+    path = tmp_path / "export.sqlite"
+    path.write_bytes(content)
+    return sqlite3.connect(path)
+
+
+def test_sqlite_export_has_normalised_tables_and_indexes(tmp_path):
+    conn = _open_sqlite(_export_bytes("sqlite"), tmp_path)
+
+    assert conn.execute("SELECT id, name, muscles FROM exercises").fetchall() == [
+        ("squat-id", "Squat ü", '["quads"]')
+    ]
+    assert conn.execute("SELECT id, date FROM workouts ORDER BY date").fetchall() == [
+        ("wid0", "2025-02-01"),
+        ("wid1", "2025-03-01"),
+    ]
+    assert conn.execute(
+        "SELECT workout_id, set_number, exercise_id, reps, weight_kg FROM sets"
+    ).fetchall() == [("wid1", 1, "squat-id", 5, 82.5)]
+    indexes = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert {"workouts_date", "sets_exercise_id"} <= indexes
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    assert json.loads(meta["schema_version"]) == 1
+    conn.close()
+
+
+def test_sqlite_export_round_trips_through_parse_import_file():
+    from_json = parse_import_file(_export_bytes("json"))
+    from_sqlite = parse_import_file(_export_bytes("sqlite"))
+
+    assert from_sqlite.model_dump(exclude={"exported_at"}) == from_json.model_dump(
+        exclude={"exported_at"}
+    )
+
+
+def test_sqlite_export_removes_its_temp_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(export_utils.tempfile, "tempdir", str(tmp_path))
+
+    chunks = export_chunks(
+        "sqlite",
+        "u1",
+        make_test_profile(),
+        _StreamWorkoutRepo([]),
+        _StreamExerciseRepo([]),
+    )
+    next(chunks)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    chunks.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parse_import_file_rejects_corrupt_sqlite():
+    content = b"SQLite format 3\x00" + b"\x00" * 100
+
+    with pytest.raises(ValueError, match="not a valid GymByte SQLite export"):
+        parse_import_file(content)
+
+
+def test_parse_import_file_rejects_sqlite_without_export_tables(tmp_path):
+    path = tmp_path / "other.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE things (id INTEGER)")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(ValueError, match="not a valid GymByte SQLite export"):
+        parse_import_file(path.read_bytes())
+
+
+def _sqlite_export_with(tmp_path, *statements: str) -> bytes:
+    """A real sqlite export, altered by statements run against it."""
+    path = tmp_path / "altered.sqlite"
+    path.write_bytes(_export_bytes("sqlite"))
+    conn = sqlite3.connect(path)
+    conn.executescript(";".join(statements))
+    conn.close()
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "statements",
+    [
+        # A view standing in for a table can run any query, without bound.
+        (
+            "DROP TABLE meta",
+            "CREATE VIEW meta AS WITH RECURSIVE n(i) AS "
+            "(SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+            "SELECT 'schema_version' AS key, '1' AS value FROM n WHERE i > 1e12",
+        ),
+        ("CREATE TRIGGER t AFTER INSERT ON sets BEGIN SELECT 1; END",),
+        ("DROP TABLE deleted", "CREATE VIEW deleted AS SELECT * FROM sets"),
+    ],
+    ids=["view-as-table", "trigger", "view-as-optional-table"],
+)
+def test_parse_import_file_rejects_sqlite_views_and_triggers(tmp_path, statements):
+    content = _sqlite_export_with(tmp_path, *statements)
+
+    with pytest.raises(ValueError, match="not a valid GymByte SQLite export"):
+        parse_import_file(content)
+
+
+def test_parse_import_file_aborts_sqlite_reads_past_step_budget(monkeypatch):
+    monkeypatch.setattr(export_utils, "_SQLITE_PROGRESS_INTERVAL", 1)
+    monkeypatch.setattr(export_utils, "_SQLITE_MAX_STEPS", 10)
+
+    with pytest.raises(ValueError, match="interrupted"):
+        parse_import_file(_export_bytes("sqlite"))
@@ -0,0 +1,128 @@
+import pytest
+from fastapi import Request
+
+from app.repositories.errors import ExerciseRepoError
+from app.utils.fragment_cache import FragmentCache, exercise_options
+from tests.fakes import FakeExerciseRepo
+
+
+class CountingExerciseRepo(FakeExerciseRepo):
+    def __init__(self):
+        super().__init__()
+        self.get_all_calls = 0
+        self.raise_on_get_all = False
+
+    def get_all_for_user(self, user_sub: str):
+        self.get_all_calls += 1
+        if self.raise_on_get_all:
+            raise ExerciseRepoError("boom")
+        return super().get_all_for_user(user_sub)
+
+
+def _request(theme: str = "volt") -> Request:
+    request = Request({"type": "http", "headers": []})
+    request.state.theme = theme
+    return request
+
+
+# --------------- FragmentCache ---------------
+
+
+def test_get_or_render_renders_once_per_key():
+    cache = FragmentCache(max_entries=10)
+    renders = []
+
+    def render():
+        renders.append(True)
+        return "<b>hi</b>"
+
+    first = cache.get_or_render("k", render)
+    second = cache.get_or_render("k", render)
+
+    assert first == second == "<b>hi</b>"
+    assert len(renders) == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = FragmentCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")  # "b" is now the oldest
+
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert len(cache) == 2
+
+
+def test_cache_with_no_entries_stores_nothing():
+    cache = FragmentCache(max_entries=0)
+
+    cache.put("a", "A")
+
+    assert cache.get("a") is None
+
+
+def test_cached_fragments_are_not_escaped_again():
+    cache = FragmentCache(max_entries=1)
+
+    html = cache.get_or_render("k", lambda: "<option>x</option>")
+
+    assert html.__html__() == "<option>x</option>"
+
+
+# --------------- Exercise options ---------------
+
+
+def test_exercise_options_renders_sorted_options():
+    repo = CountingExerciseRepo()
+    repo.seed(repo._make_exercise("ex-2").model_copy(update={"name": "squat"}))
+    repo.seed(repo._make_exercise("ex-1").model_copy(update={"name": "Bench"}))
+
+    html = exercise_options(_request(), "u1", 0, repo)
+
+    assert html.index("Bench") < html.index("squat")
+    assert 'value="ex-1"' in html
+
+
+def test_exercise_options_hit_skips_query():
+    repo = CountingExerciseRepo()
+
+    exercise_options(_request(), "u1", 3, repo)
+    exercise_options(_request(), "u1", 3, repo)
+
+    assert repo.get_all_calls == 1
+
+
+def test_exercise_options_keyed_by_user_version_and_theme():
+    repo = CountingExerciseRepo()
+
+    exercise_options(_request(), "u1", 3, repo)
+    exercise_options(_request(), "u2", 3, repo)
+    exercise_options(_request(), "u1", 4, repo)
+    exercise_options(_request(theme="arctic"), "u1", 4, repo)
+
+    assert repo.get_all_calls == 4
+
+
+def test_exercise_options_without_catalog_version_is_not_cached():
+    repo = CountingExerciseRepo()
+
+    exercise_options(_request(), "u1", None, repo)
+    exercise_options(_request(), "u1", None, repo)
+
+    assert repo.get_all_calls == 2
+
+
+def test_exercise_options_query_failure_is_not_cached():
+    repo = CountingExerciseRepo()
+    repo.raise_on_get_all = True
+
+    with pytest.raises(ExerciseRepoError):
+        exercise_options(_request(), "u1", 1, repo)
+    repo.raise_on_get_all = False
+    exercise_options(_request(), "u1", 1, repo)
+
+    assert repo.get_all_calls == 2
@@ -0,0 +1,371 @@
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from app import import_worker
+from app.settings import settings
+from app.utils import import_jobs
+from tests.fakes import FakeBulkTable, FakeImportJobRepo
+
+USER_SUB = "u1"
+_NOW_ISO = datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat()
+
+
+class _Exercises:
+    def __init__(self):
+        self.catalog_bumps: list[str] = []
+
+    def get_all_for_user(self, user_sub: str):
+        return []
+
+    def bump_catalog_version(self, user_sub: str) -> None:
+        self.catalog_bumps.append(user_sub)
+
+
+class _Workouts:
+    def get_existing_workout_ids(self, user_sub: str, keys) -> set[str]:
+        return set()
+
+
+def _workout(i: int, **overrides) -> dict:
+    record = {
+        "id": f"wid-{i}",
+        "date": "2025-03-01",
+        "name": f"Workout {i}",
+        "created_at": _NOW_ISO,
+        "updated_at": _NOW_ISO,
+        "sets": [],
+    }
+    return {**record, **overrides}
+
+
+def _export(workouts: list[dict], exercises: list[dict] | None = None) -> bytes:
+    return json.dumps(
+        {
+            "schema_version": 1,
+            "exported_at": _NOW_ISO,
+            "user": {
+                "display_name": "T",
+                "email": "t@t.com",
+                "timezone": "UTC",
+                "preferences": {},
+            },
+            "exercises": exercises or [],
+            "workouts": workouts,
+        }
+    ).encode()
+
+
+@pytest.fixture
+def job_setup(tmp_path, monkeypatch):
+    """Store an upload and create its job; returns (job_repo, job, table)."""
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_RECORDS", 2)
+    job_repo = FakeImportJobRepo()
+
+    def make(content: bytes):
+        path = import_jobs.store_upload(io.BytesIO(content), "job-1")
+        job = job_repo.create_job(
+            USER_SUB, "job-1", filename="export.json", upload_path=path
+        )
+        return job_repo, job, FakeBulkTable()
+
+    return make
+
+
+def _run(job_repo, table, exercise_repo=None, **kwargs):
+    return import_jobs.run_import_job(
+        USER_SUB,
+        "job-1",
+        job_repo=job_repo,
+        exercise_repo=exercise_repo or _Exercises(),
+        workout_repo=_Workouts(),
+        table=table,
+        **kwargs,
+    )
+
+
+# ──────────────────────────── Chunks & checkpoints ────────────────────────────
+
+
+def test_run_import_job_completes_and_removes_upload(job_setup):
+    job_repo, job, table = job_setup(_export([_workout(i) for i in range(3)]))
+
+    result = _run(job_repo, table)
+
+    assert result.status == "complete"
+    assert result.records_processed == 3
+    assert result.summary.workouts_created == 3
+    assert len(table.put_calls) == 3
+    assert not os.path.exists(job.upload_path)
+
+
+def test_run_import_job_resumes_from_checkpoint(job_setup):
+    job_repo, job, table = job_setup(_export([_workout(i) for i in range(5)]))
+    job.status = "running"
+    job.records_processed = 2
+    job.summary.workouts_created = 2
+    job_repo.save_job(job)
+
+    result = _run(job_repo, table)
+
+    assert [item["SK"].split("#")[-1] for item in table.put_calls] == [
+        "wid-2",
+        "wid-3",
+        "wid-4",
+    ]
+    assert result.summary.workouts_created == 5
+
+
+def test_run_import_job_pauses_after_time_budget(job_setup):
+    job_repo, _, table = job_setup(_export([_workout(i) for i in range(5)]))
+
+    paused = _run(job_repo, table, max_seconds=0)
+
+    assert paused.status == "running"
+    assert paused.records_processed == 2
+    assert job_repo.only().records_processed == 2
+
+    resumed = _run(job_repo, table)
+
+    assert resumed.status == "complete"
+    assert resumed.summary.workouts_created == 5
+
+
+def test_run_import_job_leaves_finished_job_alone(job_setup):
+    job_repo, job, table = job_setup(_export([_workout(1)]))
+    job.status = "complete"
+    job_repo.save_job(job)
+
+    result = _run(job_repo, table)
+
+    assert result.status == "complete"
+    assert table.put_calls == []
+
+
+def test_run_import_job_caps_stored_warnings(job_setup, monkeypatch):
+    monkeypatch.setattr(import_jobs, "_MAX_JOB_WARNINGS", 3)
+    job_repo, _, table = job_setup(_export([{"id": f"bad-{i}"} for i in range(5)]))
+
+    result = _run(job_repo, table)
+
+    assert (
+        result.summary.warnings[:3]
+        == ["Workout record is invalid (date: Field required) — skipped"] * 3
+    )
+    assert result.summary.warnings[3:] == ["Further warnings omitted"]
+
+
+def test_run_import_job_bumps_catalog_version_when_exercises_change(job_setup):
+    exercise = {
+        "id": "export-squat",
+        "name": "Squat",
+        "muscles": ["quads"],
+        "equipment": "barbell",
+        "created_at": _NOW_ISO,
+        "updated_at": _NOW_ISO,
+    }
+    job_repo, _, table = job_setup(_export([_workout(0)], exercises=[exercise]))
+    exercises = _Exercises()
+
+    result = _run(job_repo, table, exercise_repo=exercises)
+
+    assert result.summary.exercises_created == 1
+    assert exercises.catalog_bumps == [USER_SUB]
+
+
+def test_run_import_job_leaves_catalog_version_without_exercises(job_setup):
+    job_repo, _, table = job_setup(_export([_workout(i) for i in range(3)]))
+    exercises = _Exercises()
+
+    _run(job_repo, table, exercise_repo=exercises)
+
+    assert exercises.catalog_bumps == []
+
+
+# ──────────────────────────── Failures ────────────────────────────
+
+
+def test_run_import_job_fails_when_upload_is_missing(job_setup):
+    job_repo, job, table = job_setup(_export([]))
+    os.remove(job.upload_path)
+
+    result = _run(job_repo, table)
+
+    assert result.status == "failed"
+    assert "upload it again" in result.error
+
+
+def test_worker_marks_job_failed_when_it_crashes(job_setup, monkeypatch):
+    job_repo, _, _ = job_setup(_export([_workout(1)]))
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("writer broke")
+
+    monkeypatch.setattr(import_jobs, "DynamoImportJobRepository", lambda: job_repo)
+    monkeypatch.setattr(import_jobs, "DynamoExerciseRepository", _Exercises)
+    monkeypatch.setattr(import_jobs, "DynamoWorkoutRepository", _Workouts)
+    monkeypatch.setattr(import_jobs, "BulkWriter", boom)
+    monkeypatch.setattr(import_jobs.db, "get_table", FakeBulkTable)
+
+    import_jobs._run_in_worker(USER_SUB, "job-1")
+
+    job = job_repo.only()
+    assert job.status == "failed"
+    assert "stopped unexpectedly" in job.error
+
+
+# ──────────────────────────── Dispatch ────────────────────────────
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        self.objects[(bucket, key)] = fileobj.read()
+
+    def download_fileobj(self, bucket, key, fileobj):
+        fileobj.write(self.objects[(bucket, key)])
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+class _FakeSQS:
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.sent.append({"QueueUrl": QueueUrl, **json.loads(MessageBody)})
+
+
+class _NoWorker:
+    def submit(self, *args, **kwargs):
+        raise AssertionError("deployed jobs must not run on the in-process pool")
+
+
+@pytest.fixture
+def deployed(monkeypatch):
+    """Non-dev settings, with fake S3 and SQS clients; returns (s3, sqs)."""
+    s3, sqs = _FakeS3(), _FakeSQS()
+    monkeypatch.setattr(settings, "ENV", "prod")
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_BUCKET", "imports-bucket")
+    monkeypatch.setattr(settings, "IMPORT_QUEUE_URL", "https://sqs/import-jobs")
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_RECORDS", 2)
+    monkeypatch.setattr(import_jobs, "_client", {"s3": s3, "sqs": sqs}.__getitem__)
+    monkeypatch.setattr(import_jobs, "_worker", _NoWorker())
+    return s3, sqs
+
+
+def test_enqueue_outside_dev_sends_to_queue_not_worker(deployed):
+    _, sqs = deployed
+
+    import_jobs.enqueue_import_job(USER_SUB, "job-1")
+
+    assert sqs.sent == [
+        {"QueueUrl": "https://sqs/import-jobs", "user_sub": USER_SUB, "job_id": "job-1"}
+    ]
+
+
+def test_enqueue_on_dev_lambda_sends_to_queue_not_worker(deployed, monkeypatch):
+    _, sqs = deployed
+    monkeypatch.setattr(settings, "ENV", "dev")
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "gymbyte-dev-app")
+
+    import_jobs.enqueue_import_job(USER_SUB, "job-1")
+
+    assert len(sqs.sent) == 1
+
+
+def test_enqueue_without_queue_url_raises(deployed, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_QUEUE_URL", "")
+
+    with pytest.raises(import_jobs.ImportDispatchError):
+        import_jobs.enqueue_import_job(USER_SUB, "job-1")
+
+
+def test_queued_job_runs_from_s3_in_slices_and_requeues(deployed, monkeypatch):
+    s3, sqs = deployed
+    job_repo = FakeImportJobRepo()
+    table = FakeBulkTable()
+    monkeypatch.setattr(settings, "IMPORT_JOB_MAX_SECONDS", 0)
+    monkeypatch.setattr(import_jobs, "DynamoImportJobRepository", lambda: job_repo)
+    monkeypatch.setattr(import_jobs, "DynamoExerciseRepository", _Exercises)
+    monkeypatch.setattr(import_jobs, "DynamoWorkoutRepository", _Workouts)
+    monkeypatch.setattr(import_jobs.db, "get_table", lambda: table)
+
+    path = import_jobs.store_upload(
+        io.BytesIO(_export([_workout(i) for i in range(5)])), "job-1"
+    )
+    job_repo.create_job(USER_SUB, "job-1", filename="export.json", upload_path=path)
+
+    import_jobs.run_queued_job(USER_SUB, "job-1")
+
+    assert path == "s3://imports-bucket/imports/job-1.upload"
+    assert job_repo.only().records_processed == 2
+    assert len(sqs.sent) == 1
+
+    while not job_repo.only().is_finished:
+        import_jobs.run_queued_job(USER_SUB, "job-1")
+
+    assert job_repo.only().status == "complete"
+    assert job_repo.only().summary.workouts_created == 5
+    assert len(sqs.sent) == 2
+    assert s3.objects == {}
+
+
+def test_queued_job_crash_is_retried_then_marked_failed(deployed, monkeypatch):
+    job_repo = FakeImportJobRepo()
+    job_repo.create_job(
+        USER_SUB,
+        "job-1",
+        filename="export.json",
+        upload_path="s3://b/imports/job-1.upload",
+    )
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("worker broke")
+
+    monkeypatch.setattr(import_jobs, "DynamoImportJobRepository", lambda: job_repo)
+    monkeypatch.setattr(import_jobs, "_run_with_dynamo", boom)
+
+    with pytest.raises(RuntimeError):
+        import_jobs.run_queued_job(USER_SUB, "job-1", attempt=1)
+    assert job_repo.only().status == "pending"
+
+    import_jobs.run_queued_job(
+        USER_SUB, "job-1", attempt=settings.IMPORT_JOB_MAX_ATTEMPTS
+    )
+
+    assert job_repo.only().status == "failed"
+    assert "stopped unexpectedly" in job_repo.only().error
+
+
+def test_import_worker_reports_failed_messages(monkeypatch):
+    calls = []
+
+    def run(user_sub, job_id, attempt):
+        calls.append((user_sub, job_id, attempt))
+        if job_id == "bad":
+            raise RuntimeError("retry me")
+
+    monkeypatch.setattr(import_worker, "run_queued_job", run)
+    event = {
+        "Records": [
+            {
+                "messageId": f"m-{job_id}",
+                "body": json.dumps({"user_sub": USER_SUB, "job_id": job_id}),
+                "attributes": {"ApproximateReceiveCount": "2"},
+            }
+            for job_id in ("good", "bad")
+        ]
+    }
+
+    result = import_worker.handler(event, None)
+
+    assert calls == [(USER_SUB, "good", 2), (USER_SUB, "bad", 2)]
+    assert result == {"batchItemFailures": [{"itemIdentifier": "m-bad"}]}
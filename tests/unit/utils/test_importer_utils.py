@@ -0,0 +1,239 @@
+from datetime import date, datetime, timezone
+
+from app.models.exercise import Exercise
+from app.utils import db
+from app.utils import importer as importer_utils
+from app.utils.importer import RecordImporter
+
+USER_SUB = "u1"
+_NOW_ISO = datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat()
+
+
+def _no_existing(keys) -> set[str]:
+    return set()
+
+
+class _ListWriter:
+    def __init__(self):
+        self.items: list[dict] = []
+
+        self.deleted: list[dict] = []
+
+    def put_item(self, Item: dict) -> None:
+        self.items.append(Item)
+
+    def delete_item(self, Key: dict) -> None:
+        self.deleted.append(Key)
+
+
+def _exercise_record(**overrides) -> dict:
+    record = {
+        "id": "export-squat",
+        "name": "Squat",
+        "muscles": ["quads"],
+        "equipment": "barbell",
+        "created_at": _NOW_ISO,
+        "updated_at": _NOW_ISO,
+    }
+    return {**record, **overrides}
+
+
+def _workout_record(**overrides) -> dict:
+    record = {
+        "id": "wid1",
+        "date": "2025-03-01",
+        "name": "Leg Day",
+        "created_at": _NOW_ISO,
+        "updated_at": _NOW_ISO,
+        "sets": [
+            {
+                "set_number": 1,
+                "exercise_id": "export-squat",
+                "reps": 5,
+                "weight_kg": 100.0,
+                "created_at": _NOW_ISO,
+                "updated_at": _NOW_ISO,
+            }
+        ],
+    }
+    return {**record, **overrides}
+
+
+def _deletion_record(**fields) -> dict:
+    return {"deleted_at": _NOW_ISO, **fields}
+
+
+def test_importer_writes_each_record_as_it_is_added():
+    writer = _ListWriter()
+    importer = RecordImporter(USER_SUB, [], _no_existing, writer)
+
+    importer.add("exercise", _exercise_record())
+    assert [i["type"] for i in writer.items] == ["exercise"]
+
+    importer.add("workout", _workout_record())
+    importer.finish()
+    assert [i["type"] for i in writer.items] == ["exercise", "workout", "set"]
+
+    s = importer.summary
+    assert (s.exercises_created, s.workouts_created, s.sets_created) == (1, 1, 1)
+
+
+def test_importer_remaps_sets_to_matched_exercise():
+    existing = Exercise(
+        PK=db.build_user_pk(USER_SUB),
+        SK=db.build_exercise_sk("real-id"),
+        type="exercise",
+        name="SQUAT",
+        muscles=["quads"],
+        equipment="Barbell",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    writer = _ListWriter()
+    importer = RecordImporter(USER_SUB, [existing], _no_existing, writer)
+
+    importer.add("exercise", _exercise_record())
+    importer.add("workout", _workout_record())
+    importer.finish()
+
+    assert importer.summary.exercises_matched == 1
+    set_items = [i for i in writer.items if i["type"] == "set"]
+    assert set_items[0]["exercise_id"] == "real-id"
+
+
+def test_importer_skips_existing_workout_ids():
+    writer = _ListWriter()
+    importer = RecordImporter(USER_SUB, [], lambda keys: {"wid1"}, writer)
+
+    importer.add("workout", _workout_record())
+    importer.finish()
+
+    assert writer.items == []
+    assert importer.summary.workouts_skipped == 1
+
+
+def test_importer_skips_invalid_record_with_warning():
+    writer = _ListWriter()
+    importer = RecordImporter(USER_SUB, [], _no_existing, writer)
+
+    importer.add("workout", _workout_record(date="not-a-date"))
+    importer.add("exercise", ["not", "an", "object"])
+
+    assert writer.items == []
+    assert len(importer.summary.warnings) == 2
+    assert "Workout 'Leg Day' is invalid (date:" in importer.summary.warnings[0]
+    assert importer.summary.warnings[1].startswith("Exercise record is invalid")
+
+
+def test_importer_checks_workouts_in_batches_of_candidate_keys(monkeypatch):
+    monkeypatch.setattr(importer_utils, "WORKOUT_LOOKUP_BATCH", 2)
+    lookups: list[list] = []
+
+    def find_existing(keys):
+        lookups.append(keys)
+        return {"w2"}
+
+    writer = _ListWriter()
+    importer = RecordImporter(USER_SUB, [], find_existing, writer)
+    for wid in ("w1", "w2", "w3"):
+        importer.add("workout", _workout_record(id=wid, sets=[]))
+
+    assert [len(keys) for keys in lookups] == [2]
+    importer.finish()
+
+    assert lookups == [
+        [(date(2025, 3, 1), "w1"), (date(2025, 3, 1), "w2")],
+        [(date(2025, 3, 1), "w3")],
+    ]
+    assert importer.summary.workouts_created == 2
+    assert importer.summary.workouts_skipped == 1
+
+
+def test_importer_resumes_with_earlier_id_remap():
+    writer = _ListWriter()
+    remap = {"export-squat": "real-squat"}
+    importer = RecordImporter(USER_SUB, [], _no_existing, writer, id_remap=remap)
+
+    importer.add("workout", _workout_record())
+    importer.finish()
+
+    sets = [item for item in writer.items if item["type"] == "set"]
+    assert sets[0]["exercise_id"] == "real-squat"
+    assert importer.id_remap is remap
+
+
+def _existing_squat(exercise_id: str = "export-squat") -> Exercise:
+    return Exercise(
+        PK=db.build_user_pk(USER_SUB),
+        SK=db.build_exercise_sk(exercise_id),
+        type="exercise",
+        name="Squat",
+        muscles=["quads"],
+        equipment="barbell",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_delta_importer_overwrites_existing_items():
+    writer = _ListWriter()
+    importer = RecordImporter(
+        USER_SUB, [_existing_squat()], lambda keys: {"wid1"}, writer, delta=True
+    )
+
+    importer.add("exercise", _exercise_record(name="Back Squat"))
+    importer.add("workout", _workout_record(name="Heavy Legs"))
+    importer.finish()
+
+    assert [(i["type"], i.get("name")) for i in writer.items] == [
+        ("exercise", "Back Squat"),
+        ("workout", "Heavy Legs"),
+        ("set", None),
+    ]
+    assert writer.items[0]["SK"] == db.build_exercise_sk("export-squat")
+    s = importer.summary
+    assert (s.exercises_updated, s.workouts_updated, s.workouts_skipped) == (1, 1, 0)
+
+
+def test_delta_importer_applies_deletions_after_pending_workouts():
+    writer = _ListWriter()
+    importer = RecordImporter(
+        USER_SUB, [_existing_squat()], _no_existing, writer, delta=True
+    )
+
+    importer.add("workout", _workout_record())
+    importer.add(
+        "deleted",
+        _deletion_record(
+            kind="set", workout_id="wid0", date="2025-02-01", set_number=3
+        ),
+    )
+    importer.add(
+        "deleted", _deletion_record(kind="workout", id="wid9", date="2025-02-02")
+    )
+    importer.add("deleted", _deletion_record(kind="exercise", id="export-squat"))
+    importer.finish()
+
+    # The buffered workout is written before any deletion is applied.
+    assert [i["type"] for i in writer.items] == ["workout", "set"]
+    assert [k["SK"] for k in writer.deleted] == [
+        db.build_set_sk(date(2025, 2, 1), "wid0", 3),
+        db.build_workout_sk(date(2025, 2, 2), "wid9"),
+        db.build_exercise_sk("export-squat"),
+    ]
+    assert importer.summary.items_deleted == 3
+
+
+def test_delta_importer_ignores_deletions_of_unknown_exercises():
+    writer = _ListWriter()
+    importer = RecordImporter(USER_SUB, [], _no_existing, writer, delta=True)
+
+    importer.add("deleted", _deletion_record(kind="exercise", id="someone-elses"))
+    importer.add("deleted", _deletion_record(kind="set", workout_id="w"))
+    importer.finish()
+
+    assert writer.deleted == []
+    assert importer.summary.items_deleted == 0
+    assert importer.summary.warnings == [
+        "Deletion record is invalid (set.date: Field required) — skipped"
+    ]
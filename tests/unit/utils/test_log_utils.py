@@ -0,0 +1,88 @@
+import json
+import logging
+import queue
+import sys
+
+from app.utils import log
+
+
+def _record(msg: str, *args, level: int = logging.INFO, **attrs) -> logging.LogRecord:
+    record = logging.LogRecord("gymbyte", level, __file__, 1, msg, args, None)
+    record.__dict__.update(attrs)
+    return record
+
+
+def test_json_formatter_merges_args_and_extra_fields():
+    record = _record("Fetched workout %s", "w1", path="/workout", ddb_calls=2)
+
+    entry = json.loads(log.JsonFormatter().format(record))
+
+    assert entry["message"] == "Fetched workout w1"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "gymbyte"
+    assert entry["path"] == "/workout"
+    assert entry["ddb_calls"] == 2
+    assert entry["time"].endswith("+00:00")
+
+
+def test_json_formatter_includes_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("failed", level=logging.ERROR, exc_info=sys.exc_info())
+
+    entry = json.loads(log.JsonFormatter().format(record))
+
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_queue_handler_merges_args_on_calling_thread():
+    records: queue.Queue = queue.Queue()
+    handler = log._QueueHandler(records)
+    sets = [1, 2]
+
+    handler.handle(_record("Set numbers: %s", sets, path="/workout"))
+    sets.append(3)  # mutated after the call; the record must not change
+
+    queued = records.get_nowait()
+    assert queued.msg == "Set numbers: [1, 2]"
+    assert queued.args is None
+    assert queued.path == "/workout"
+
+
+def test_queue_handler_renders_exception_text():
+    records: queue.Queue = queue.Queue()
+    handler = log._QueueHandler(records)
+    try:
+        raise KeyError("missing")
+    except KeyError:
+        handler.handle(_record("failed", level=logging.ERROR, exc_info=sys.exc_info()))
+
+    queued = records.get_nowait()
+    assert queued.exc_info is None
+    assert "KeyError" in queued.exc_text
+
+
+def test_sampling_filter_samples_debug_only():
+    rolls = iter([0.05, 0.5])
+    sampler = log.SamplingFilter(0.1, rand=lambda: next(rolls))
+
+    assert sampler.filter(_record("kept", level=logging.DEBUG))
+    assert not sampler.filter(_record("dropped", level=logging.DEBUG))
+    assert sampler.filter(_record("always", level=logging.INFO))
+
+
+def test_parse_sample_rates():
+    assert log.parse_sample_rates("gymbyte.render=0.1, gymbyte.repo=0.5") == {
+        "gymbyte.render": 0.1,
+        "gymbyte.repo": 0.5,
+    }
+    assert log.parse_sample_rates("") == {}
+
+
+def test_flush_waits_for_queued_records():
+    log.logger.warning("queued before flush")
+
+    log.flush()
+
+    assert log._queue.unfinished_tasks == 0
@@ -0,0 +1,106 @@
+import pytest
+
+from app.settings import settings
+from app.utils import metrics
+
+
+def test_no_collector_outside_a_request():
+    assert metrics.current() is None
+
+    with metrics.timed("render"):
+        pass  # no collector: nothing to record, nothing raised
+
+
+def test_collecting_records_timed_sections():
+    with metrics.collecting() as collected:
+        with metrics.timed("render"):
+            pass
+        with metrics.timed("render"):
+            pass
+
+    assert collected.sections["render"].count == 2
+    assert collected.closed
+
+
+def test_closed_collector_is_not_current():
+    with metrics.collecting() as collected:
+        pass
+
+    # e.g. an import job that copied the request's context
+    token = metrics._current.set(collected)
+    try:
+        assert metrics.current() is None
+    finally:
+        metrics._current.reset(token)
+
+
+def test_metrics_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+
+    with metrics.collecting():
+        assert metrics.current() is None
+
+
+def test_ddb_call_requests_capacity_and_records_it():
+    calls = []
+
+    def update_item(**kwargs):
+        calls.append(kwargs)
+        return {"ConsumedCapacity": {"TableName": "t", "CapacityUnits": 1.0}}
+
+    with metrics.collecting() as collected:
+        metrics.ddb_call("update_item", update_item, Key={"PK": "a"})
+
+    assert calls == [{"Key": {"PK": "a"}, "ReturnConsumedCapacity": "TOTAL"}]
+    assert collected.ddb["update_item"].count == 1
+    assert collected.ddb["update_item"].capacity == 1.0
+
+
+def test_ddb_call_without_collector_passes_kwargs_through():
+    calls = []
+    metrics.ddb_call("get_item", lambda **kw: calls.append(kw) or {}, Key={"PK": "a"})
+
+    assert calls == [{"Key": {"PK": "a"}}]
+
+
+def test_ddb_call_records_failed_calls():
+    def query(**kwargs):
+        raise RuntimeError("boom")
+
+    with metrics.collecting() as collected:
+        with pytest.raises(RuntimeError):
+            metrics.ddb_call("query", query)
+
+    assert collected.ddb["query"].count == 1
+    assert collected.ddb["query"].capacity == 0
+
+
+def test_consumed_capacity_sums_batch_entries():
+    response = {
+        "ConsumedCapacity": [
+            {"TableName": "t", "CapacityUnits": 2.0},
+            {"TableName": "u", "CapacityUnits": 0.5},
+        ]
+    }
+
+    assert metrics.consumed_capacity(response) == 2.5
+    assert metrics.consumed_capacity({}) == 0
+
+
+def test_server_timing_and_summary():
+    with metrics.collecting() as collected:
+        collected.record(collected.ddb, "get_item", 3.0, 0.5)
+        collected.record(collected.ddb, "query", 7.0, 2.0)
+        collected.record(collected.sections, "jwt", 1.5)
+
+    header = metrics.server_timing(collected)
+    fields = metrics.summary(collected)
+
+    assert 'ddb;dur=10.0;desc="2 calls, 2.5 CU"' in header
+    assert 'ddb-get-item;dur=3.0;desc="1 calls, 0.5 CU"' in header
+    assert "jwt;dur=1.5" in header
+    assert header.startswith("app;dur=")
+    assert fields["ddb_calls"] == 2
+    assert fields["ddb_cu"] == 2.5
+    assert fields["jwt_ms"] == 1.5
+    assert fields["ddb_ops"] == "get_item:1,query:1"
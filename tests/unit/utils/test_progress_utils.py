@@ -9,6 +9,8 @@ from app.utils.progress import (
     build_exercise_progress_data,
     build_frequency_chart_data,
     build_volume_chart_data,
+    build_workload_chart_data,
+    workload_start_date,
 )
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -36,7 +38,13 @@ def _make_workout(d: date, workout_id: str = "wid1"):
     )
 
 
-def _make_set(workout_date: date, workout_id: str, exercise_id: str, weight_kg: Decimal, set_number: int = 1):
+def _make_set(
+    workout_date: date,
+    workout_id: str,
+    exercise_id: str,
+    weight_kg: Decimal,
+    set_number: int = 1,
+):
     from datetime import datetime, timezone
 
     from app.models.workout import WorkoutSet
@@ -266,7 +274,9 @@ def test_volume_chart_exercise_id_filter():
     squat_set = _make_set(mid_week, "wid1", "squat", Decimal("100"), set_number=1)
     bench_set = _make_set(mid_week, "wid2", "bench", Decimal("80"), set_number=1)
 
-    result = build_volume_chart_data([squat_set, bench_set], "kg", weeks=4, exercise_id="squat")
+    result = build_volume_chart_data(
+        [squat_set, bench_set], "kg", weeks=4, exercise_id="squat"
+    )
     # Only squat volume: 1 × 5 × 100 = 500
     assert result["values"][-1] == 500.0
 
@@ -448,9 +458,18 @@ def test_distribution_chart_top10_plus_other():
     d = date(2025, 3, 1)
     # 12 distinct exercises, each with a valid muscle group
     valid_muscles = [
-        "chest", "shoulders", "triceps", "biceps", "lats",
-        "upper_back", "lower_back", "core", "quads", "hamstrings",
-        "glutes", "calves",
+        "chest",
+        "shoulders",
+        "triceps",
+        "biceps",
+        "lats",
+        "upper_back",
+        "lower_back",
+        "core",
+        "quads",
+        "hamstrings",
+        "glutes",
+        "calves",
     ]
     exercises = [
         _make_exercise_obj(f"ex{i}", f"Exercise {i}", [valid_muscles[i]])
@@ -465,3 +484,87 @@ def test_distribution_chart_top10_plus_other():
     assert len(result["by_exercise"]["labels"]) == 11
     assert result["by_exercise"]["labels"][-1] == "Other"
     assert result["by_exercise"]["values"][-1] == 2
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# build_workload_chart_data
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def test_workload_chart_returns_one_entry_per_day():
+    result = build_workload_chart_data([], "kg", days=30)
+    assert len(result["labels"]) == 30
+    assert len(result["acute"]) == 30
+    assert len(result["chronic"]) == 30
+    assert len(result["ratio"]) == 30
+    assert result["labels"][-1] == date.today().isoformat()
+
+
+def test_workload_chart_ratio_is_none_without_chronic_load():
+    result = build_workload_chart_data([], "kg", days=5)
+    assert result["ratio"] == [None] * 5
+    assert result["acute"] == [0.0] * 5
+
+
+def test_workload_chart_steady_load_gives_ratio_of_one():
+    today = date.today()
+    # One 500 kg session (5 reps × 100 kg) every day for 40 days
+    sets = [
+        _make_set(today - timedelta(days=i), f"w{i}", "squat", Decimal("100"))
+        for i in range(40)
+    ]
+    result = build_workload_chart_data(sets, "kg", days=10)
+
+    assert result["acute"][-1] == 3500.0  # 7 days × 500
+    assert result["chronic"][-1] == 3500.0  # 28 days × 500 scaled to 7 days
+    assert result["ratio"][-1] == 1.0
+
+
+def test_workload_chart_spike_raises_acute_ratio():
+    today = date.today()
+    sets = [_make_set(today, "w1", "squat", Decimal("100"))]
+    result = build_workload_chart_data(sets, "kg", days=10)
+
+    # All load falls in both windows: acute 500, chronic 500 × 7/28
+    assert result["acute"][-1] == 500.0
+    assert result["chronic"][-1] == 125.0
+    assert result["ratio"][-1] == 4.0
+    # The day before has no load at all
+    assert result["ratio"][-2] is None
+
+
+def test_workload_chart_matches_brute_force_windows():
+    today = date.today()
+    sets = [
+        _make_set(today - timedelta(days=i), f"w{i}", "squat", Decimal(20 + i % 9))
+        for i in range(0, 120, 3)
+    ]
+    days = 60
+    result = build_workload_chart_data(sets, "kg", days=days)
+
+    for idx in (0, 17, days - 1):
+        day = date.fromisoformat(result["labels"][idx])
+        acute = sum(
+            s.weight_kg * s.reps
+            for s in sets
+            if 0 <= (day - date.fromisoformat(s.workout_date)).days < 7
+        )
+        assert result["acute"][idx] == round(float(acute), 1)
+
+
+def test_workload_chart_ignores_sets_before_window():
+    too_old = workload_start_date(days=10) - timedelta(days=1)
+    sets = [_make_set(too_old, "w1", "squat", Decimal("100"))]
+    result = build_workload_chart_data(sets, "kg", days=10)
+    assert sum(result["chronic"]) == 0.0
+
+
+def test_workload_chart_kg_to_lb_conversion():
+    today = date.today()
+    sets = [_make_set(today, "w1", "squat", Decimal("100"))]
+    result = build_workload_chart_data(sets, "lb", days=3)
+
+    assert result["unit"] == "lb"
+    assert result["acute"][-1] == round(500 * 2.2046226218, 1)
+    # The ratio is unit-independent
+    assert result["ratio"][-1] == 4.0
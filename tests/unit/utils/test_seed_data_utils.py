@@ -0,0 +1,76 @@
+from datetime import date
+
+import pytest
+
+from app.utils.seed_data import build_exercise_ids, build_history, iter_history
+
+PK = "USER#bench"
+
+
+def test_build_history_is_deterministic():
+    first = build_history(PK, 30, seed=3)
+    second = build_history(PK, 30, seed=3)
+
+    assert [(w.model_dump(), [s.model_dump() for s in sets]) for w, sets in first] == [
+        (w.model_dump(), [s.model_dump() for s in sets]) for w, sets in second
+    ]
+
+
+def test_build_history_shape():
+    end = date(2025, 6, 1)
+    history = build_history(PK, 20, sets_per_workout=4, end=end)
+
+    assert len(history) == 20
+    assert history[-1][0].date == end
+    dates = [w.date for w, _ in history]
+    assert dates == sorted(dates)
+    assert len({w.SK for w, _ in history}) == 20
+
+    known_ids = set(build_exercise_ids().values())
+    for workout, sets in history:
+        assert [s.set_number for s in sets] == [1, 2, 3, 4]
+        assert all(s.SK.startswith(workout.SK + "#SET#") for s in sets)
+        assert all(s.exercise_id in known_ids for s in sets)
+
+
+def test_build_history_weights_progress():
+    history = build_history(PK, 300)
+    squat_id = build_exercise_ids()["BB_SQUAT"]
+    squats = [
+        s.weight_kg for _, sets in history for s in sets if s.exercise_id == squat_id
+    ]
+
+    assert squats[-1] > squats[0]
+    assert max(squats) < 2 * squats[0] + 5
+
+
+def test_iter_history_spans_years_at_frequency():
+    end = date(2025, 6, 1)
+    history = list(iter_history(PK, years=2, per_week=4, end=end, seed=1))
+
+    # Four a week, less the odd missed week.
+    assert 0.8 * 2 * 52 * 4 < len(history) <= 2 * 52 * 4 + 4
+    assert (end - history[0][0].date).days < 2 * 365
+    assert history[-1][0].date <= end
+    assert len({w.SK for w, _ in history}) == len(history)
+
+
+def test_iter_history_uses_given_exercises():
+    ids = build_exercise_ids()
+    history = list(iter_history(PK, years=0.5, exercises=["BW_SQUAT", "KB_LUNGE"]))
+
+    used = {s.exercise_id for _, sets in history for s in sets}
+    assert used == {ids["BW_SQUAT"], ids["KB_LUNGE"]}
+    bodyweight = [
+        s for _, sets in history for s in sets if s.exercise_id == ids["BW_SQUAT"]
+    ]
+    assert all(s.weight_kg is None for s in bodyweight)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"per_week": 0}, {"per_week": 8}, {"half_gain_years": 0}, {"exercises": ["NOPE"]}],
+)
+def test_iter_history_rejects_bad_arguments_eagerly(kwargs):
+    with pytest.raises(ValueError):
+        iter_history(PK, **kwargs)
@@ -0,0 +1,177 @@
+import time
+
+import pytest
+
+from app.settings import settings
+from app.utils import session_prefs
+from tests.fakes import FakeProfileRepo, make_test_profile
+
+USER = "test-user"
+
+
+class CountingProfileRepo(FakeProfileRepo):
+    def __init__(self, profile=None):
+        super().__init__(profile)
+        self.calls = 0
+
+    def get_for_user(self, user_sub: str):
+        self.calls += 1
+        return super().get_for_user(user_sub)
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_PREFS_SECRET", "test-secret")
+    monkeypatch.setattr(settings, "SESSION_PREFS_MAX_AGE_SECONDS", 3600)
+
+
+def _cookie(**overrides) -> str:
+    prefs = session_prefs.SessionPrefs.from_profile(make_test_profile(units="imperial"))
+    fields = {**prefs.__dict__, **overrides}
+    return session_prefs.encode(session_prefs.SessionPrefs(**fields))
+
+
+def _pending(request) -> str | None:
+    return getattr(request.state, session_prefs.PENDING_COOKIE_ATTR, None)
+
+
+# --------------- Encoding ---------------
+
+
+def test_encode_decode_round_trip():
+    prefs = session_prefs.SessionPrefs.from_profile(make_test_profile(units="imperial"))
+
+    decoded = session_prefs.decode(session_prefs.encode(prefs), USER)
+
+    assert decoded == prefs
+    assert decoded.weight_unit == "lb"
+    assert decoded.timezone == "Europe/London"
+
+
+def test_cookie_is_compact():
+    assert len(_cookie()) < 200
+
+
+@pytest.mark.parametrize(
+    "mangle",
+    [
+        lambda v: "x" + v,
+        lambda v: v[:-2] + ("AA" if not v.endswith("AA") else "BB"),
+        lambda v: v.split(".")[0],
+        lambda v: "",
+        lambda v: "not-base64!.sig",
+    ],
+)
+def test_decode_rejects_tampered_cookie(mangle):
+    assert session_prefs.decode(mangle(_cookie()), USER) is None
+
+
+def test_decode_rejects_cookie_signed_with_another_secret(monkeypatch):
+    value = _cookie()
+    monkeypatch.setattr(settings, "SESSION_PREFS_SECRET", "rotated")
+
+    assert session_prefs.decode(value, USER) is None
+
+
+def test_decode_rejects_another_users_cookie():
+    assert session_prefs.decode(_cookie(), "someone-else") is None
+
+
+def test_decode_rejects_expired_cookie():
+    old = int(time.time()) - settings.SESSION_PREFS_MAX_AGE_SECONDS - 1
+
+    assert session_prefs.decode(_cookie(issued_at=old), USER) is None
+
+
+# --------------- Load ---------------
+
+
+def test_load_trusts_valid_cookie(make_request_with_cookies):
+    repo = CountingProfileRepo(make_test_profile())
+    request = make_request_with_cookies({session_prefs.COOKIE_NAME: _cookie()})
+
+    prefs = session_prefs.load(request, USER, repo)
+
+    assert prefs.weight_unit == "lb"  # from the cookie, not the metric profile
+    assert repo.calls == 0
+    assert _pending(request) is None
+
+
+def test_load_without_cookie_reads_profile_and_queues_cookie(make_request_with_cookies):
+    repo = CountingProfileRepo(make_test_profile(units="imperial"))
+    request = make_request_with_cookies({})
+
+    prefs = session_prefs.load(request, USER, repo)
+
+    assert prefs.weight_unit == "lb"
+    assert repo.calls == 1
+    assert session_prefs.decode(_pending(request), USER) == prefs
+
+
+def test_load_with_stale_cookie_reads_profile(make_request_with_cookies):
+    repo = CountingProfileRepo(make_test_profile())
+    old = int(time.time()) - settings.SESSION_PREFS_MAX_AGE_SECONDS - 1
+    request = make_request_with_cookies(
+        {session_prefs.COOKIE_NAME: _cookie(issued_at=old)}
+    )
+
+    prefs = session_prefs.load(request, USER, repo)
+
+    assert prefs.weight_unit == "kg"
+    assert repo.calls == 1
+
+
+def test_load_reads_profile_once_per_request(make_request_with_cookies):
+    repo = CountingProfileRepo(make_test_profile())
+    request = make_request_with_cookies({})
+
+    session_prefs.load(request, USER, repo)
+    session_prefs.load(request, USER, repo)
+
+    assert repo.calls == 1
+
+
+def test_load_returns_none_without_profile(make_request_with_cookies):
+    request = make_request_with_cookies({})
+
+    assert session_prefs.load(request, USER, CountingProfileRepo(None)) is None
+    assert _pending(request) is None
+
+
+def test_load_without_secret_always_reads_profile(
+    monkeypatch, make_request_with_cookies
+):
+    value = _cookie()
+    monkeypatch.setattr(settings, "SESSION_PREFS_SECRET", "")
+    repo = CountingProfileRepo(make_test_profile())
+    request = make_request_with_cookies({session_prefs.COOKIE_NAME: value})
+
+    session_prefs.load(request, USER, repo)
+
+    assert repo.calls == 1
+    assert _pending(request) is None
+
+
+# --------------- Remember profile ---------------
+
+
+def test_remember_profile_reissues_outdated_cookie(make_request_with_cookies):
+    profile = make_test_profile(units="imperial")
+    request = make_request_with_cookies({session_prefs.COOKIE_NAME: _cookie(version=1)})
+
+    session_prefs.remember_profile(request, profile)
+
+    reissued = session_prefs.decode(_pending(request), USER)
+    assert reissued.version == session_prefs.profile_version(profile)
+
+
+def test_remember_profile_keeps_current_cookie(make_request_with_cookies):
+    profile = make_test_profile(units="imperial")
+    version = session_prefs.profile_version(profile)
+    request = make_request_with_cookies(
+        {session_prefs.COOKIE_NAME: _cookie(version=version)}
+    )
+
+    session_prefs.remember_profile(request, profile)
+
+    assert _pending(request) is None
@@ -0,0 +1,160 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.templates.templates import create_environment
+from app.utils import static_assets
+from app.utils.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    MANIFEST_NAME,
+    StaticAssets,
+    build_static_assets,
+)
+
+CSS = b"body { color: red; }\n" * 50
+
+
+@pytest.fixture(autouse=True)
+def clear_manifest_cache():
+    static_assets.load_manifest.cache_clear()
+    static_assets._fingerprinted.cache_clear()
+    yield
+    static_assets.load_manifest.cache_clear()
+    static_assets._fingerprinted.cache_clear()
+
+
+@pytest.fixture
+def built(tmp_path):
+    src = tmp_path / "src"
+    (src / "CSS").mkdir(parents=True)
+    (src / "CSS" / "base.css").write_bytes(CSS)
+    (src / "logo.png").write_bytes(b"\x89PNG not really")
+    dest = tmp_path / "dest"
+    manifest = build_static_assets(str(src), str(dest))
+    return dest, manifest
+
+
+@pytest.fixture
+def client(built):
+    dest, _ = built
+    app = FastAPI()
+    app.mount("/static", StaticAssets(directory=str(dest)), name="static")
+    return TestClient(app)
+
+
+# ───────────────────── Build ─────────────────────
+
+
+def test_build_writes_hashed_files_and_manifest(built):
+    dest, manifest = built
+
+    assert set(manifest) == {"CSS/base.css", "logo.png"}
+    hashed = manifest["CSS/base.css"]
+    assert hashed.startswith("CSS/base.") and hashed.endswith(".css")
+    assert (dest / hashed).read_bytes() == CSS
+    assert json.loads((dest / MANIFEST_NAME).read_text()) == manifest
+
+
+def test_build_is_deterministic(built, tmp_path):
+    dest, manifest = built
+    again = tmp_path / "again"
+
+    assert build_static_assets(str(tmp_path / "src"), str(again)) == manifest
+    hashed = manifest["CSS/base.css"]
+    assert (again / f"{hashed}.gz").read_bytes() == (dest / f"{hashed}.gz").read_bytes()
+
+
+def test_build_compresses_text_assets_only(built):
+    dest, manifest = built
+
+    assert (
+        gzip.decompress((dest / f"{manifest['CSS/base.css']}.gz").read_bytes()) == CSS
+    )
+    assert not (dest / f"{manifest['logo.png']}.gz").exists()
+
+
+# ───────────────────── Serving ─────────────────────
+
+
+def test_fingerprinted_file_is_immutable_and_served_gzipped(client, built):
+    _, manifest = built
+
+    resp = client.get(
+        f"/static/{manifest['CSS/base.css']}", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"].startswith("text/css")
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.content == CSS  # decoded by the client
+
+
+def test_identity_served_when_gzip_not_accepted(client, built):
+    _, manifest = built
+
+    resp = client.get(
+        f"/static/{manifest['CSS/base.css']}",
+        headers={"Accept-Encoding": "gzip;q=0, identity"},
+    )
+
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    assert resp.content == CSS
+
+
+def test_range_request_uses_original_bytes(client, built):
+    _, manifest = built
+
+    resp = client.get(
+        f"/static/{manifest['CSS/base.css']}",
+        headers={"Accept-Encoding": "gzip", "Range": "bytes=0-3"},
+    )
+
+    assert resp.status_code == 206
+    assert "content-encoding" not in resp.headers
+    assert resp.content == CSS[:4]
+
+
+def test_manifest_itself_is_not_immutable(client):
+    resp = client.get(f"/static/{MANIFEST_NAME}")
+
+    assert resp.status_code == 200
+    assert resp.headers.get("cache-control") != IMMUTABLE_CACHE_CONTROL
+
+
+# ───────────────────── url_for ─────────────────────
+
+
+def _request() -> Request:
+    app = FastAPI()
+    app.mount("/static", StaticAssets(directory="static"), name="static")
+    return Request({"type": "http", "app": app, "router": app.router, "headers": []})
+
+
+def test_url_for_static_resolves_through_manifest(built, monkeypatch):
+    _, manifest = built
+    monkeypatch.setattr(static_assets, "load_manifest", lambda: manifest)
+    env = create_environment(precompiled="")
+
+    url = env.from_string("{{ url_for('static', path='CSS/base.css') }}").render(
+        request=_request()
+    )
+
+    assert url.endswith(f"/static/{manifest['CSS/base.css']}")
+
+
+def test_url_for_static_without_manifest_keeps_path(monkeypatch):
+    monkeypatch.setattr(static_assets, "load_manifest", lambda: {})
+    env = create_environment(precompiled="")
+
+    url = env.from_string("{{ url_for('static', path='CSS/base.css') }}").render(
+        request=_request()
+    )
+
+    assert url.endswith("/static/CSS/base.css")
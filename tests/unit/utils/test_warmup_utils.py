@@ -0,0 +1,144 @@
+import logging
+
+import pytest
+
+from app.settings import settings
+from app.templates.templates import templates
+from app.utils import auth as auth_utils
+from app.utils import db, warmup
+
+
+class FakeTable:
+    def __init__(self, exc: Exception | None = None):
+        self.exc = exc
+        self.get_item_calls = []
+
+    def get_item(self, **kwargs):
+        self.get_item_calls.append(kwargs)
+        if self.exc:
+            raise self.exc
+        return {}
+
+
+class FakeJwksClient:
+    def __init__(self, url):
+        self.url = url
+        self.fetched = False
+
+    def get_signing_keys(self):
+        self.fetched = True
+        return []
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FakeTable()
+    monkeypatch.setattr(db, "get_table", lambda: table)
+    return table
+
+
+@pytest.fixture
+def jwks_clients(monkeypatch):
+    clients = []
+
+    def fake_get_jwks_client(url):
+        client = FakeJwksClient(url)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(auth_utils, "_get_jwks_client", fake_get_jwks_client)
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(settings, "DISABLE_AUTH_FOR_LOCAL_DEV", False)
+    monkeypatch.setattr(
+        settings, "COGNITO_ISSUER_URL", "https://issuer.example.com/pool/"
+    )
+    return clients
+
+
+def test_warm_up_does_nothing_when_disabled(monkeypatch, table):
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+
+    assert warmup.warm_up() == {}
+    assert table.get_item_calls == []
+
+
+def test_warm_up_runs_every_step_and_logs_timings(table, jwks_clients, caplog):
+    with caplog.at_level(logging.INFO, logger="gymbyte"):
+        timings = warmup.warm_up()
+
+    assert set(timings) == {"dynamodb", "jwks", "templates"}
+    assert table.get_item_calls == [{"Key": {"PK": "WARMUP", "SK": "WARMUP"}}]
+    assert len(jwks_clients) == 1
+    assert jwks_clients[0].url == auth_utils.get_jwks_url(
+        "https://issuer.example.com/pool"
+    )
+    assert jwks_clients[0].fetched
+
+    message = next(
+        r.getMessage() for r in caplog.records if "Warm-up complete" in r.getMessage()
+    )
+    for key in ("dynamodb_ms=", "jwks_ms=", "templates_ms=", "total_ms="):
+        assert key in message
+
+
+def test_warm_up_failing_step_is_logged_not_raised(monkeypatch, jwks_clients, caplog):
+    table = FakeTable(exc=RuntimeError("no route to host"))
+    monkeypatch.setattr(db, "get_table", lambda: table)
+
+    with caplog.at_level(logging.WARNING, logger="gymbyte"):
+        timings = warmup.warm_up()
+
+    assert "dynamodb" in timings
+    assert jwks_clients[0].fetched
+    assert any(
+        "step=dynamodb" in r.getMessage() and "no route to host" in r.getMessage()
+        for r in caplog.records
+    )
+
+
+@pytest.mark.parametrize(
+    "issuer, bypass",
+    [("", False), ("https://issuer.example.com/pool", True)],
+)
+def test_warm_up_skips_jwks_without_real_auth(
+    monkeypatch, table, jwks_clients, issuer, bypass
+):
+    monkeypatch.setattr(settings, "COGNITO_ISSUER_URL", issuer)
+    monkeypatch.setattr(settings, "DISABLE_AUTH_FOR_LOCAL_DEV", bypass)
+
+    warmup.warm_up()
+
+    assert jwks_clients == []
+
+
+def test_warm_up_compiles_configured_templates(monkeypatch, table, jwks_clients):
+    monkeypatch.setattr(settings, "WARMUP_TEMPLATES", ("base.html", "home.html"))
+    loaded = []
+    real_get_template = templates.env.get_template
+
+    def spy_get_template(name, *args, **kwargs):
+        loaded.append(name)
+        return real_get_template(name, *args, **kwargs)
+
+    monkeypatch.setattr(templates.env, "get_template", spy_get_template)
+
+    warmup.warm_up()
+
+    assert loaded == ["base.html", "home.html"]
+
+
+def test_default_warmup_templates_exist():
+    for name in settings.WARMUP_TEMPLATES:
+        templates.env.get_template(name)
+
+
+def test_app_lifespan_runs_warm_up(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    calls = []
+    monkeypatch.setattr(main, "warm_up", lambda: calls.append(True))
+
+    with TestClient(main.app):
+        assert calls == [True]